@@ -1,28 +1,28 @@
 from __future__ import annotations
 
-import os
 import sys
 from copy import deepcopy
 from datetime import datetime
-from typing import Any
+from typing import Any, Mapping
 from zoneinfo import ZoneInfo
 
 from app.rules.decision_boundary import enforce_decision_boundary
 from app.rules.engine import RuleEngine
 from app.rules.errors import RuleEngineError
 from app.core.track_relevance import validate_track_routing_rules
+from app.utils.run_env import run_environ
 
 
 def _warn(msg: str) -> None:
     print(f"[RULES_WARN] {msg}", file=sys.stderr)
 
 
-def should_use_enhanced(env: dict[str, str] | None = None) -> bool:
-    env = env or os.environ
+def should_use_enhanced(env: Mapping[str, str] | None = None) -> bool:
+    env = env or run_environ()
     return str(env.get("ENHANCED_RULES_PROFILE", "")).strip().lower() == "enhanced"
 
 
-def requested_profile(env: dict[str, str] | None = None) -> str:
+def requested_profile(env: Mapping[str, str] | None = None) -> str:
     return "enhanced" if should_use_enhanced(env) else "legacy"
 
 
@@ -125,10 +125,10 @@ def _adapt_email(decision: dict[str, Any], date_str: str) -> dict[str, Any]:
 
 def load_runtime_rules(
     date_str: str | None = None,
-    env: dict[str, str] | None = None,
+    env: Mapping[str, str] | None = None,
     run_id: str | None = None,
 ) -> dict[str, Any]:
-    env = env or os.environ
+    env = env or run_environ()
     profile_req = requested_profile(env)
     engine = RuleEngine()
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 from typing import Any
 
@@ -184,6 +186,66 @@ def is_navigation_page(url: str, title: str) -> bool:
     return False
 
 
+def _effective_packs(rules_runtime: dict[str, Any]) -> tuple[list[str], list[str], list[str], list[str]]:
+    anchors_cfg = rules_runtime.get("anchors_pack", {})
+    if not isinstance(anchors_cfg, dict) or not anchors_cfg:
+        anchors_cfg = DEFAULT_ANCHORS_PACK
+    negatives_cfg = rules_runtime.get("negatives_pack", [])
+    if not isinstance(negatives_cfg, list) or not negatives_cfg:
+        negatives_cfg = DEFAULT_NEGATIVES_PACK
+    negative_strong_cfg = rules_runtime.get("negatives_strong_pack", [])
+    if not isinstance(negative_strong_cfg, list) or not negative_strong_cfg:
+        negative_strong_cfg = DEFAULT_NEGATIVE_STRONG
+    return (
+        _to_kw_list(anchors_cfg.get("core")),
+        _to_kw_list(anchors_cfg.get("frontier")),
+        _to_kw_list(negatives_cfg),
+        _to_kw_list(negative_strong_cfg),
+    )
+
+
+# Bump when compute_relevance() scoring changes, so stored results are re-scored.
+RELEVANCE_ENGINE_VERSION = "1"
+_ENGINE_CONSTANTS_DIGEST: str | None = None
+
+
+def _engine_constants_digest() -> str:
+    global _ENGINE_CONSTANTS_DIGEST
+    if _ENGINE_CONSTANTS_DIGEST is None:
+        consts = [
+            NAV_URL_MARKERS,
+            sorted(NAV_TITLE_EXACT),
+            INVESTMENT_PR_MEDIA_SOURCES,
+            INVESTMENT_PR_MEDIA_KEYWORDS,
+            INVESTMENT_ABBOTT_KEEP,
+            INVESTMENT_ABBOTT_DROP,
+            INVESTMENT_PREPRINT_SOURCES,
+            INVESTMENT_PREPRINT_KEYWORDS,
+        ]
+        _ENGINE_CONSTANTS_DIGEST = hashlib.sha1(json.dumps(consts, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return _ENGINE_CONSTANTS_DIGEST
+
+
+def relevance_rules_fingerprint(rules_runtime: dict[str, Any] | None = None) -> str:
+    """
+    Stable hash of everything compute_relevance() reads besides the item itself:
+    effective anchors/negatives packs, flags, built-in scope lists and the engine version.
+    Two runtimes with equal fingerprints score any item identically.
+    """
+    rules_runtime = rules_runtime or {}
+    core, frontier, negatives, negatives_strong = _effective_packs(rules_runtime)
+    payload = {
+        "v": RELEVANCE_ENGINE_VERSION,
+        "engine": _engine_constants_digest(),
+        "core": core,
+        "frontier": frontier,
+        "negatives": negatives,
+        "negatives_strong": negatives_strong,
+        "investment_scope_enabled": bool(rules_runtime.get("investment_scope_enabled", False)),
+    }
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
 def compute_relevance(
     text: str,
     source_meta: dict[str, Any] | None = None,
@@ -198,20 +260,7 @@ def compute_relevance(
     title_lc = str(source_meta.get("title", "") or "").strip().lower()
     url_lc = str(source_meta.get("url", "") or "").strip().lower()
 
-    anchors_cfg = rules_runtime.get("anchors_pack", {})
-    if not isinstance(anchors_cfg, dict) or not anchors_cfg:
-        anchors_cfg = DEFAULT_ANCHORS_PACK
-    negatives_cfg = rules_runtime.get("negatives_pack", [])
-    if not isinstance(negatives_cfg, list) or not negatives_cfg:
-        negatives_cfg = DEFAULT_NEGATIVES_PACK
-    negative_strong_cfg = rules_runtime.get("negatives_strong_pack", [])
-    if not isinstance(negative_strong_cfg, list) or not negative_strong_cfg:
-        negative_strong_cfg = DEFAULT_NEGATIVE_STRONG
-
-    core_anchors = _to_kw_list(anchors_cfg.get("core"))
-    frontier_anchors = _to_kw_list(anchors_cfg.get("frontier"))
-    negatives = _to_kw_list(negatives_cfg)
-    negatives_strong = _to_kw_list(negative_strong_cfg)
+    core_anchors, frontier_anchors, negatives, negatives_strong = _effective_packs(rules_runtime)
 
     core_hits = [k for k in core_anchors if _has_term(text_lc, k)]
     frontier_hits = [k for k in frontier_anchors if _has_term(text_lc, k)]
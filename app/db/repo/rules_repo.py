@@ -34,6 +34,16 @@ class RulesRepo:
                 .limit(1)
             ).scalar_one_or_none()
 
+    def active_ids(self, model: Any, profiles: list[str]) -> dict[str, int]:
+        with self._Session() as s:
+            rows = s.execute(
+                select(model.profile, model.id).where(and_(model.profile.in_(profiles), model.is_active == 1))
+            ).all()
+        out: dict[str, int] = {}
+        for profile, rid in rows:
+            out[str(profile)] = max(int(rid), out.get(str(profile), 0))
+        return out
+
     def list_versions(self, model: Any, profile: str | None = None, *, active_only: bool = False) -> list[Any]:
         with self._Session() as s:
             q = select(model).order_by(model.id.desc())
@@ -326,6 +336,13 @@ class RulesRepo:
             s.commit()
             return int(row.id)
 
+    def report_artifact_run_ids(self, artifact_types: list[str] | None = None) -> set[str]:
+        with self._Session() as s:
+            q = select(ReportArtifact.run_id).distinct()
+            if artifact_types:
+                q = q.where(ReportArtifact.artifact_type.in_(list(artifact_types)))
+            return {str(r) for r in s.execute(q).scalars().all()}
+
     def recent_run_executions(self, limit: int = 20) -> list[dict[str, Any]]:
         with self._Session() as s:
             rows = list(
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.db.models.rules import Source
@@ -37,32 +37,57 @@ class SourcesRepo:
             "last_error": str(row.last_error or ""),
         }
 
-    def upsert_many(self, sources: list[dict[str, Any]], *, replace: bool, now: str) -> int:
+    @staticmethod
+    def _config_fields(src: dict[str, Any], sid: str) -> dict[str, Any]:
+        return {
+            "name": str(src.get("name", sid)),
+            "connector": str(src.get("connector", "")),
+            "url": str(src.get("url", "")),
+            "enabled": 1 if bool(src.get("enabled", True)) else 0,
+            "priority": int(src.get("priority", 0) or 0),
+            "trust_tier": str(src.get("trust_tier", "C")),
+            "tags_json": src.get("tags", []),
+            "rate_limit_json": src.get("rate_limit", {}),
+            "fetch_json": src.get("fetch", {}),
+            "parsing_json": src.get("parsing", {}),
+        }
+
+    def sync_many(self, sources: list[dict[str, Any]], *, replace: bool, now: str) -> dict[str, int]:
+        """
+        Write `sources` as a diff against the table: new ids are inserted, rows whose config
+        differs are updated, identical rows are left alone (their fetch status and
+        timestamps survive). With `replace`, rows whose id is not listed are deleted.
+        """
+        incoming: dict[str, dict[str, Any]] = {}
+        for src in sources:
+            sid = str(src.get("id", "")).strip()
+            if sid:
+                incoming[sid] = self._config_fields(src, sid)
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
         with self._Session() as s:
             try:
+                existing = {str(r.id): r for r in s.execute(select(Source)).scalars()}
                 if replace:
-                    s.query(Source).delete()
-                for src in sources:
-                    sid = str(src.get("id", "")).strip()
-                    if not sid:
-                        continue
-                    row = s.get(Source, sid)
+                    gone = [sid for sid in existing if sid not in incoming]
+                    if gone:
+                        s.execute(delete(Source).where(Source.id.in_(gone)))
+                    stats["deleted"] = len(gone)
+                for sid, fields in incoming.items():
+                    row = existing.get(sid)
                     if row is None:
-                        row = Source(id=sid, created_at=now, updated_at=now)
-                        s.add(row)
-                    row.name = str(src.get("name", sid))
-                    row.connector = str(src.get("connector", ""))
-                    row.url = str(src.get("url", ""))
-                    row.enabled = 1 if bool(src.get("enabled", True)) else 0
-                    row.priority = int(src.get("priority", 0) or 0)
-                    row.trust_tier = str(src.get("trust_tier", "C"))
-                    row.tags_json = src.get("tags", [])
-                    row.rate_limit_json = src.get("rate_limit", {})
-                    row.fetch_json = src.get("fetch", {})
-                    row.parsing_json = src.get("parsing", {})
+                        s.add(Source(id=sid, created_at=now, updated_at=now, **fields))
+                        stats["inserted"] += 1
+                        continue
+                    if all(getattr(row, k) == v for k, v in fields.items()):
+                        stats["unchanged"] += 1
+                        continue
+                    for k, v in fields.items():
+                        setattr(row, k, v)
                     row.updated_at = now
+                    stats["updated"] += 1
                 s.commit()
-                return int(s.query(Source).count())
+                stats["count"] = int(s.query(Source).count())
+                return stats
             except Exception:
                 s.rollback()
                 raise
@@ -75,6 +100,11 @@ class SourcesRepo:
             rows = list(s.execute(q).scalars().all())
         return [self._to_dict(r) for r in rows]
 
+    def watermark(self) -> dict[str, Any]:
+        with self._Session() as s:
+            count, max_updated_at = s.execute(select(func.count(Source.id), func.max(Source.updated_at))).one()
+        return {"count": int(count or 0), "max_updated_at": str(max_updated_at or "")}
+
     def get(self, source_id: str) -> dict[str, Any] | None:
         with self._Session() as s:
             row = s.get(Source, source_id)
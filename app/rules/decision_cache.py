@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CompiledDecision:
+    """
+    Validated + merged decision for one (profile, inputs fingerprint), with its build
+    time and identifying meta. Keyword matching is compiled where it runs (the report's
+    KeywordAutomaton), not here.
+
+    `decision` is a shared template: never mutate it, use RuleEngine.build_decision()
+    to get a private copy with a fresh run_id.
+    """
+
+    fingerprint: str
+    decision: dict[str, Any]
+    build_ms: float = 0.0
+    meta: dict[str, Any] = field(default_factory=dict)
+
+
+def compile_decision(fingerprint: str, decision: dict[str, Any], *, build_ms: float = 0.0) -> CompiledDecision:
+    return CompiledDecision(
+        fingerprint=fingerprint,
+        decision=decision,
+        build_ms=round(float(build_ms), 3),
+        meta={"profile": str(decision.get("profile", "")), "rules_version": dict(decision.get("rules_version", {}))},
+    )
+
+
+class DecisionCache:
+    """Small thread-safe LRU of CompiledDecision keyed by inputs fingerprint."""
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CompiledDecision] = OrderedDict()
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> CompiledDecision | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return hit
+
+    def put(self, key: str, compiled: CompiledDecision) -> None:
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_DECISION_CACHE = DecisionCache()
+
+
+def get_decision_cache() -> DecisionCache:
+    return _DECISION_CACHE
+
+
+def decision_cache_stats() -> dict[str, Any]:
+    return _DECISION_CACHE.stats()
+
+
+def invalidate_decision_cache() -> None:
+    _DECISION_CACHE.invalidate()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
+import time
 import uuid
 from copy import deepcopy
 import os
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
@@ -18,10 +21,40 @@ from .errors import (
     RULES_BOUNDARY_VIOLATION,
     RuleEngineError,
 )
+from .decision_cache import CompiledDecision, compile_decision, get_decision_cache
 from .models import ExplainRecord, RuleSelection
-from app.services.rules_store import RulesStore
 from app.services.rules_versioning import get_workspace_rules_root
 
+if TYPE_CHECKING:
+    from app.services.rules_store import RulesStore
+
+
+_DECISION_RULESETS = ("email_rules", "content_rules", "qc_rules", "output_rules")
+
+_SCHEMA_CACHE_LOCK = threading.Lock()
+_SCHEMA_CACHE: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
+def _path_signature(path: Path) -> tuple[int, int]:
+    try:
+        st = path.stat()
+    except OSError:
+        return (-1, -1)
+    return (int(st.st_mtime_ns), int(st.st_size))
+
+
+def _read_schema_cached(path: Path) -> dict[str, Any]:
+    sig = _path_signature(path)
+    key = str(path)
+    with _SCHEMA_CACHE_LOCK:
+        hit = _SCHEMA_CACHE.get(key)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    schema = json.loads(path.read_text(encoding="utf-8"))
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE[key] = (sig, schema)
+    return schema
+
 
 def _type_ok(expected: str, value: Any) -> bool:
     mapping = {
@@ -154,7 +187,20 @@ class RuleEngine:
         else:
             self.rules_root = get_workspace_rules_root(self.project_root)
         self.schemas_root = self.rules_root / "schemas"
-        self.rules_store = RulesStore(self.project_root) if self.use_db else None
+        self._rules_store: RulesStore | None = None
+
+    @property
+    def rules_store(self) -> RulesStore | None:
+        # Deferred: opening the DB (and importing SQLAlchemy) is only needed once rules are read.
+        if self._rules_store is None and self.use_db:
+            from app.services.rules_store import RulesStore
+
+            self._rules_store = RulesStore(self.project_root)
+        return self._rules_store
+
+    @rules_store.setter
+    def rules_store(self, store: RulesStore | None) -> None:
+        self._rules_store = store
 
     def _rules_dir(self, ruleset: str) -> Path:
         if ruleset not in ("email_rules", "content_rules", "qc_rules", "output_rules", "scheduler_rules"):
@@ -290,11 +336,11 @@ class RuleEngine:
     def validate(self, ruleset: str, data: dict[str, Any]) -> None:
         schema_path = self._schema_path(ruleset)
         try:
-            schema = json.loads(schema_path.read_text(encoding="utf-8"))
+            schema = _read_schema_cached(schema_path)
         except OSError:
             # Final fallback to image-bundled schema path.
             fallback = self.project_root / "app" / "rules" / "schemas" / schema_path.name
-            schema = json.loads(fallback.read_text(encoding="utf-8"))
+            schema = _read_schema_cached(fallback)
         errors = _validate_schema(data, schema)
         if errors:
             raise RuleEngineError(RULES_001_SCHEMA_INVALID, "; ".join(errors[:10]))
@@ -940,12 +986,85 @@ class RuleEngine:
                 }
             )
 
+    def _decision_fingerprint(self, profile: str, conflict_strategy: str) -> str:
+        """
+        Hash of everything build_decision reads: active DB version ids, candidate
+        profile/schema file signatures (for both `profile` and the legacy fallback).
+        """
+        profiles = sorted({profile, "legacy", "default.v1"})
+        parts: dict[str, Any] = {
+            "project_root": str(self.project_root),
+            "rules_root": str(self.rules_root),
+            "use_db": bool(self.use_db),
+            "profile": profile,
+            "conflict_strategy": conflict_strategy,
+        }
+        if self.use_db and self.rules_store is not None:
+            parts["db_active"] = self.rules_store.active_version_ids(list(_DECISION_RULESETS), profiles)
+        files: list[tuple[str, int, int]] = []
+        for ruleset in _DECISION_RULESETS:
+            for base in (self.rules_root, self.project_root / "rules"):
+                d = base / ruleset
+                for p in profiles:
+                    for ext in (".yaml", ".yml", ".json"):
+                        fp = d / f"{p}{ext}"
+                        files.append((str(fp), *_path_signature(fp)))
+            name = f"{ruleset}.schema.json"
+            for sp in (
+                self.schemas_root / name,
+                self.project_root / "app" / "rules" / "schemas" / name,
+                self.project_root / "rules" / "schemas" / name,
+            ):
+                files.append((str(sp), *_path_signature(sp)))
+        parts["files"] = files
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def compiled_decision(
+        self,
+        profile: str,
+        *,
+        conflict_strategy: str = "priority_last_match",
+    ) -> CompiledDecision:
+        """
+        Cached, validated + merged decision for `profile`. Rebuilt only when an active DB
+        version or a rules/schema file changes.
+        """
+        cache = get_decision_cache()
+        enabled = str(os.environ.get("RULES_DECISION_CACHE_ENABLED", "true")).strip().lower() not in {"0", "false", "no", "off"}
+        fingerprint = self._decision_fingerprint(profile, conflict_strategy)
+        if enabled:
+            hit = cache.get(fingerprint)
+            if hit is not None:
+                return hit
+        t0 = time.perf_counter()
+        decision = self._build_decision_uncached(profile, conflict_strategy=conflict_strategy, run_id="")
+        compiled = compile_decision(fingerprint, decision, build_ms=(time.perf_counter() - t0) * 1000.0)
+        if enabled:
+            cache.put(fingerprint, compiled)
+        return compiled
+
     def build_decision(
         self,
         profile: str,
         *,
         conflict_strategy: str = "priority_last_match",
         run_id: str | None = None,
+    ) -> dict[str, Any]:
+        compiled = self.compiled_decision(profile, conflict_strategy=conflict_strategy)
+        out = deepcopy(compiled.decision)
+        rid = run_id or uuid.uuid4().hex[:12]
+        out["run_id"] = rid
+        if isinstance(out.get("explain"), dict):
+            out["explain"]["run_id"] = rid
+        return out
+
+    def _build_decision_uncached(
+        self,
+        profile: str,
+        *,
+        conflict_strategy: str = "priority_last_match",
+        run_id: str | None = None,
     ) -> dict[str, Any]:
         email, content = self.load_pair(
             email_profile=profile,
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
 import json
+import os
 import re
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
+
+from app.services.artifact_io import artifact_glob, artifact_parts, iter_artifact_lines, locked_append
+from app.utils.url_norm import ParsedUrl, url_norm
+
+
+DEFAULT_CONTENT_CACHE_DAYS = 14
 
 
 def ensure_dir(path: Path) -> Path:
@@ -13,22 +20,6 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
-def url_norm(url: str) -> str:
-    try:
-        p = urlparse(str(url or ""))
-        host = (p.netloc or "").lower()
-        path = (p.path or "").rstrip("/")
-        query = p.query.strip()
-        kept_query = ""
-        if query:
-            low = query.lower()
-            if any(k in low for k in ("id=", "article=", "story=", "p=", "item=")):
-                kept_query = "?" + query
-        return f"{host}{path}{kept_query}"
-    except Exception:
-        return str(url or "").strip().lower()
-
-
 def _safe_dt(value: str | None) -> dt.datetime | None:
     if not value:
         return None
@@ -49,66 +40,153 @@ def _to_iso_utc(value: dt.datetime | None = None) -> str:
 
 
 class AnalysisCacheStore:
+    """
+    Analysis cache with two layers:
+
+    - content/<key[:2]>/<key>.json: one entry per content_key (url_norm + title/snippet
+      hash + model + prompt_version); looked up across days within a retention window.
+    - items-YYYYMMDD.jsonl: append-only per-day audit log of what each digest used;
+      still readable via get(item_key, day) for entries written before the content index.
+    """
+
     def __init__(self, project_root: Path, asset_dir: str = "artifacts/analysis") -> None:
         self.project_root = project_root
         self.base_dir = (project_root / asset_dir).resolve()
+        self.content_dir = self.base_dir / "content"
         ensure_dir(self.base_dir)
+        self._day_maps: dict[dt.date, tuple[tuple[int, int], dict[str, dict[str, Any]]]] = {}
 
     @staticmethod
-    def item_key(item: dict[str, Any]) -> str:
+    def item_key(item: dict[str, Any], *, parsed_url: ParsedUrl | None = None) -> str:
         story_id = str(item.get("story_id", "")).strip()
-        u = url_norm(str(item.get("url", item.get("link", ""))).strip())
+        u = url_norm(parsed_url) if parsed_url is not None else url_norm(str(item.get("url", item.get("link", ""))).strip())
         if story_id and u:
             return f"{story_id}|{u}"
         return story_id or u or str(item.get("title", "")).strip().lower()
 
+    @staticmethod
+    def content_key(
+        item: dict[str, Any],
+        *,
+        model: str,
+        prompt_version: str,
+        snippet: str = "",
+        parsed_url: ParsedUrl | None = None,
+    ) -> str:
+        u = url_norm(parsed_url) if parsed_url is not None else url_norm(str(item.get("url", item.get("link", ""))).strip())
+        title = " ".join(str(item.get("title", "")).split()).lower()
+        text_hash = hashlib.sha1(f"{title}\x1f{' '.join(str(snippet or '').split())}".encode("utf-8")).hexdigest()
+        raw = "\x1f".join((u, text_hash, str(model or "").strip(), str(prompt_version or "").strip()))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _content_file(self, content_key: str) -> Path:
+        k = str(content_key).strip()
+        return self.content_dir / k[:2] / f"{k}.json"
+
+    def get_content(
+        self,
+        content_key: str,
+        *,
+        max_age_days: int = DEFAULT_CONTENT_CACHE_DAYS,
+        now_utc: dt.datetime | None = None,
+    ) -> dict[str, Any] | None:
+        """Entry for content_key if it was cached within max_age_days (any day); 0 disables the lookup."""
+        if not content_key or int(max_age_days) <= 0:
+            return None
+        p = self._content_file(content_key)
+        try:
+            row = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        if not isinstance(row, dict):
+            return None
+        cached_at = _safe_dt(str(row.get("cached_at", ""))) or _safe_dt(str(row.get("generated_at", "")))
+        now_utc = now_utc or dt.datetime.now(dt.timezone.utc)
+        if cached_at is None:
+            return None
+        if cached_at.tzinfo is None:
+            cached_at = cached_at.replace(tzinfo=dt.timezone.utc)
+        if now_utc - cached_at > dt.timedelta(days=int(max_age_days)):
+            return None
+        return row
+
+    def put_content(self, content_key: str, payload: dict[str, Any], *, now_utc: dt.datetime | None = None) -> None:
+        if not content_key:
+            return
+        p = self._content_file(content_key)
+        ensure_dir(p.parent)
+        row = dict(payload or {})
+        row["content_key"] = str(content_key)
+        row["cached_at"] = _to_iso_utc(now_utc)
+        tmp = p.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps(row, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+
     def _day_file(self, day: dt.date) -> Path:
         return self.base_dir / f"items-{day.strftime('%Y%m%d')}.jsonl"
 
     def _load_day_map(self, day: dt.date) -> dict[str, dict[str, Any]]:
         out: dict[str, dict[str, Any]] = {}
         p = self._day_file(day)
-        if not p.exists():
+        if not artifact_parts(p):
             return out
         try:
-            with p.open("r", encoding="utf-8") as f:
-                for ln in f:
-                    ln = ln.strip()
-                    if not ln:
-                        continue
-                    try:
-                        row = json.loads(ln)
-                    except Exception:
-                        continue
-                    k = str(row.get("item_key", "")).strip()
-                    if not k:
-                        continue
-                    out[k] = row
+            for ln in iter_artifact_lines(p):
+                ln = ln.strip()
+                if not ln:
+                    continue
+                try:
+                    row = json.loads(ln)
+                except Exception:
+                    continue
+                k = str(row.get("item_key", "")).strip()
+                if not k:
+                    continue
+                out[k] = row
         except Exception:
             return out
         return out
 
+    def _day_map(self, day: dt.date) -> dict[str, dict[str, Any]]:
+        # Parsed once per file version instead of on every get().
+        try:
+            sig = tuple(
+                (p.name, int(st.st_mtime_ns), int(st.st_size))
+                for p in artifact_parts(self._day_file(day))
+                for st in (p.stat(),)
+            )
+        except OSError:
+            return {}
+        if not sig:
+            return {}
+        cached = self._day_maps.get(day)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        out = self._load_day_map(day)
+        self._day_maps[day] = (sig, out)
+        return out
+
     def get(self, item_key: str, day: dt.date) -> dict[str, Any] | None:
-        row = self._load_day_map(day).get(str(item_key).strip())
+        row = self._day_map(day).get(str(item_key).strip())
         if not isinstance(row, dict):
             return None
         return row
 
     def put(self, item_key: str, payload: dict[str, Any], day: dt.date) -> None:
         p = self._day_file(day)
-        ensure_dir(p.parent)
         row = dict(payload or {})
         row["item_key"] = str(item_key).strip()
         row.setdefault("generated_at", _to_iso_utc())
-        with p.open("a", encoding="utf-8") as f:
+        with locked_append(p) as f:
             f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._day_maps.pop(day, None)
 
     def cleanup(self, *, keep_days: int = 30, now_utc: dt.datetime | None = None) -> dict[str, int]:
         now_utc = now_utc or dt.datetime.now(dt.timezone.utc)
         keep_days = max(1, int(keep_days or 30))
         cutoff = (now_utc - dt.timedelta(days=keep_days)).date()
         removed = 0
-        for p in sorted(self.base_dir.glob("items-*.jsonl")):
+        for p in artifact_glob(self.base_dir, "items-*.jsonl"):
             m = re.match(r"items-(\d{8})\.jsonl$", p.name)
             if not m:
                 continue
@@ -118,8 +196,19 @@ class AnalysisCacheStore:
                 continue
             if d < cutoff:
                 try:
-                    p.unlink(missing_ok=True)  # type: ignore[arg-type]
+                    for part in artifact_parts(p):
+                        part.unlink(missing_ok=True)  # type: ignore[arg-type]
                     removed += 1
                 except Exception:
                     pass
-        return {"removed_files": removed}
+        removed_content = 0
+        if self.content_dir.exists():
+            cutoff_ts = (now_utc - dt.timedelta(days=keep_days)).timestamp()
+            for p in self.content_dir.glob("*/*.json"):
+                try:
+                    if p.stat().st_mtime < cutoff_ts:
+                        p.unlink(missing_ok=True)  # type: ignore[arg-type]
+                        removed_content += 1
+                except Exception:
+                    pass
+        return {"removed_files": removed, "removed_content_entries": removed_content}
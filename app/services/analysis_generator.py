@@ -3,6 +3,10 @@ from __future__ import annotations
 import datetime as dt
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any
 
 
@@ -142,6 +146,82 @@ class AnalysisGenerator:
             return out
 
 
+@dataclass
+class GenerationOutcome:
+    analysis: dict[str, Any] | None
+    error: str
+    latency_ms: float
+
+
+class _RateLimiter:
+    """Spaces call starts at least 1/rate_per_sec apart across threads; rate <= 0 disables it."""
+
+    def __init__(self, rate_per_sec: float) -> None:
+        self.interval = 1.0 / float(rate_per_sec) if float(rate_per_sec or 0) > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def generate_many(
+    generator: Any,
+    items: list[dict[str, Any]],
+    *,
+    rules: dict[str, Any] | None = None,
+    max_workers: int = 4,
+    rate_per_sec: float = 0.0,
+) -> list[GenerationOutcome]:
+    """
+    Run generator.generate() for every item, concurrently, keeping input order.
+
+    Each call still goes through the generator's own model policy, retries and
+    fallback; a failed call is returned as an outcome with `error` set rather than
+    raised, so the caller decides how to degrade. latency_ms excludes rate-limit waits.
+    """
+    limiter = _RateLimiter(rate_per_sec)
+
+    def _one(item: dict[str, Any]) -> GenerationOutcome:
+        limiter.wait()
+        t0 = time.perf_counter()
+        try:
+            out = generator.generate(item, rules=rules)
+            return GenerationOutcome(analysis=out, error="", latency_ms=(time.perf_counter() - t0) * 1000.0)
+        except Exception as e:
+            return GenerationOutcome(analysis=None, error=str(e), latency_ms=(time.perf_counter() - t0) * 1000.0)
+
+    workers = max(1, min(int(max_workers or 1), len(items)))
+    if workers <= 1:
+        return [_one(it) for it in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-gen") as ex:
+        return list(ex.map(_one, items))
+
+
+def latency_percentiles(latencies_ms: list[float]) -> dict[str, float]:
+    if not latencies_ms:
+        return {"count": 0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(float(x) for x in latencies_ms)
+
+    def _pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 3)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": _pick(0.5),
+        "p90_ms": _pick(0.9),
+        "p99_ms": _pick(0.99),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
 def degraded_analysis(item: dict[str, Any], reason: str) -> dict[str, Any]:
     title = str(item.get("title", "")).strip()
     source = str(item.get("source", "")).strip()
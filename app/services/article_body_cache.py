@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import heapq
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from app.utils.url_norm import url_norm
+
+
+DEFAULT_CACHE_DIR = "artifacts/article_cache"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+# Stale entries are retained this many TTLs so they can still be revalidated conditionally.
+DEFAULT_MAX_AGE_TTLS = 4
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.environ.get(name, "")).strip()
+    if not raw:
+        return int(default)
+    try:
+        return int(raw)
+    except Exception:
+        return int(default)
+
+
+def _now_utc() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def _to_iso_utc(value: dt.datetime) -> str:
+    return value.astimezone(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _parse_iso(value: str) -> dt.datetime | None:
+    try:
+        d = dt.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except Exception:
+        return None
+    return d if d.tzinfo else d.replace(tzinfo=dt.timezone.utc)
+
+
+def article_cache_key(url: str) -> str:
+    return hashlib.sha1(url_norm(url).encode("utf-8")).hexdigest()
+
+
+class ArticleBodyCache:
+    """
+    Persistent, content-addressed cache of extracted article bodies for RSS enrichment.
+
+    One JSON file per article at `<cache_dir>/<key[:2]>/<key>.json`, key = sha1(url_norm).
+    Entries hold the extracted snippet plus ETag/Last-Modified and fetched_at:
+    - fresh (age < ttl): served without any network request
+    - stale (ttl <= age < max_age): kept for a conditional re-fetch (If-None-Match /
+      If-Modified-Since); a 304 refreshes fetched_at without downloading the body
+    Eviction drops entries older than max_age (default DEFAULT_MAX_AGE_TTLS * ttl), then
+    oldest-first until max_entries / max_bytes fit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_age_seconds: int | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        if max_age_seconds is None or int(max_age_seconds) <= 0:
+            max_age_seconds = self.ttl_seconds * DEFAULT_MAX_AGE_TTLS
+        self.max_age_seconds = max(self.ttl_seconds, int(max_age_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._lock = threading.Lock()
+        # key -> (fetched_at epoch seconds, file size); loaded lazily from disk.
+        self._index: dict[str, tuple[float, int]] | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> dict[str, tuple[float, int]]:
+        if self._index is not None:
+            return self._index
+        idx: dict[str, tuple[float, int]] = {}
+        if self.cache_dir.exists():
+            for p in self.cache_dir.glob("*/*.json"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                idx[p.stem] = (float(st.st_mtime), int(st.st_size))
+        self._index = idx
+        return idx
+
+    def get(self, url: str, *, now_utc: dt.datetime | None = None) -> dict[str, Any] | None:
+        """Return the cached entry (with a `fresh` flag) or None."""
+        key = article_cache_key(url)
+        p = self._path(key)
+        try:
+            row = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        if not isinstance(row, dict):
+            return None
+        fetched = _parse_iso(str(row.get("fetched_at", "")))
+        now = now_utc or _now_utc()
+        row["fresh"] = bool(fetched and (now - fetched).total_seconds() < self.ttl_seconds)
+        return row
+
+    def put(
+        self,
+        url: str,
+        *,
+        snippet: str,
+        ok: bool,
+        etag: str = "",
+        last_modified: str = "",
+        body_bytes: int = 0,
+        now_utc: dt.datetime | None = None,
+    ) -> dict[str, Any]:
+        key = article_cache_key(url)
+        now = now_utc or _now_utc()
+        row = {
+            "key": key,
+            "url": str(url),
+            "url_norm": url_norm(url),
+            "ok": bool(ok),
+            "snippet": str(snippet or ""),
+            "etag": str(etag or ""),
+            "last_modified": str(last_modified or ""),
+            "body_bytes": int(body_bytes or 0),
+            "fetched_at": _to_iso_utc(now),
+        }
+        data = json.dumps(row, ensure_ascii=False).encode("utf-8")
+        p = self._path(key)
+        with self._lock:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+            tmp.write_bytes(data)
+            os.replace(tmp, p)
+            self._load_index()[key] = (now.timestamp(), len(data))
+        return row
+
+    def evict(self, *, now_utc: dt.datetime | None = None) -> dict[str, int]:
+        now = (now_utc or _now_utc()).timestamp()
+        removed_expired = 0
+        removed_capacity = 0
+        with self._lock:
+            idx = self._load_index()
+            drop: list[str] = []
+            keep: list[tuple[float, str, int]] = []
+            total = 0
+            for k, (ts, size) in idx.items():
+                if now - ts >= self.max_age_seconds:
+                    drop.append(k)
+                else:
+                    keep.append((ts, k, size))
+                    total += size
+            removed_expired = len(drop)
+            if len(keep) > self.max_entries or total > self.max_bytes:
+                # Only over capacity: pop oldest-first from a heap instead of sorting the index.
+                heapq.heapify(keep)
+                while keep and (len(keep) > self.max_entries or total > self.max_bytes):
+                    _ts, k, size = heapq.heappop(keep)
+                    total -= size
+                    drop.append(k)
+                    removed_capacity += 1
+            for k in drop:
+                try:
+                    self._path(k).unlink()
+                except OSError:
+                    pass
+                idx.pop(k, None)
+            return {
+                "removed_expired": removed_expired,
+                "removed_capacity": removed_capacity,
+                "entries": len(idx),
+                "bytes": sum(size for _ts, size in idx.values()),
+            }
+
+
+_CACHES: dict[str, ArticleBodyCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_article_body_cache(cache_dir: Path | str | None = None) -> ArticleBodyCache:
+    """
+    Process-wide cache instance per directory. Defaults come from env:
+    ARTICLE_BODY_CACHE_DIR, ARTICLE_BODY_CACHE_TTL_SECONDS, ARTICLE_BODY_CACHE_MAX_AGE_SECONDS,
+    ARTICLE_BODY_CACHE_MAX_ENTRIES, ARTICLE_BODY_CACHE_MAX_BYTES.
+    """
+    raw_dir = cache_dir or str(os.environ.get("ARTICLE_BODY_CACHE_DIR", "")).strip() or DEFAULT_CACHE_DIR
+    p = Path(raw_dir).resolve()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(str(p))
+        if cache is None:
+            cache = ArticleBodyCache(
+                p,
+                ttl_seconds=_env_int("ARTICLE_BODY_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                max_age_seconds=_env_int("ARTICLE_BODY_CACHE_MAX_AGE_SECONDS", 0) or None,
+                max_entries=_env_int("ARTICLE_BODY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                max_bytes=_env_int("ARTICLE_BODY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+            )
+            _CACHES[str(p)] = cache
+        return cache
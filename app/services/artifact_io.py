@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import gzip
+import io
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+GZIP_SUFFIX = ".gz"
+ZSTD_SUFFIX = ".zst"
+COMPRESSED_SUFFIXES = (GZIP_SUFFIX, ZSTD_SUFFIX)
+
+
+def _zstd() -> Any:
+    """The optional `zstandard` module, or None when it is not installed."""
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return zstandard
+
+
+def logical_path(path: Path) -> Path:
+    """`items.json.gz` -> `items.json`; plain paths are returned unchanged."""
+    path = Path(path)
+    for suf in COMPRESSED_SUFFIXES:
+        if path.name.endswith(suf):
+            return path.with_name(path.name[: -len(suf)])
+    return path
+
+
+def artifact_parts(path: Path) -> list[Path]:
+    """
+    Existing files holding the content of logical `path`, oldest part first: a compressed
+    copy (written by retention) and then the plain file (appended to after compression).
+    """
+    path = logical_path(path)
+    parts: list[Path] = []
+    for suf in COMPRESSED_SUFFIXES:
+        p = path.with_name(path.name + suf)
+        if p.is_file():
+            parts.append(p)
+    if path.is_file():
+        parts.append(path)
+    return parts
+
+
+def resolve_artifact(path: Path | str) -> Path | None:
+    """The plain file when present, else its compressed copy; None when neither exists."""
+    parts = artifact_parts(Path(path))
+    return parts[-1] if parts else None
+
+
+def _open_part_bytes(p: Path) -> io.BufferedIOBase:
+    if p.name.endswith(GZIP_SUFFIX):
+        return gzip.open(p, "rb")  # type: ignore[return-value]
+    if p.name.endswith(ZSTD_SUFFIX):
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError(f"zstandard is not installed; cannot read {p}")
+        return zstd.ZstdDecompressor().stream_reader(p.open("rb"), read_across_frames=True, closefd=True)
+    return p.open("rb")
+
+
+def read_artifact_bytes(path: Path | str) -> bytes:
+    parts = artifact_parts(Path(path))
+    if not parts:
+        raise FileNotFoundError(str(path))
+    out = bytearray()
+    for p in parts:
+        with _open_part_bytes(p) as f:
+            out += f.read()
+    return bytes(out)
+
+
+def read_artifact_text(path: Path | str) -> str:
+    """Whole text of a (possibly compressed) artifact; raises FileNotFoundError when absent."""
+    return read_artifact_bytes(path).decode("utf-8")
+
+
+def iter_artifact_lines(path: Path | str) -> Iterator[str]:
+    """Lines of a (possibly compressed, possibly appended-after-compression) JSONL artifact."""
+    for p in artifact_parts(Path(path)):
+        with _open_part_bytes(p) as raw, io.TextIOWrapper(raw, encoding="utf-8") as f:
+            yield from f
+
+
+def _flock_module() -> Any:
+    try:
+        import fcntl  # type: ignore
+    except Exception:  # pragma: no cover - non-POSIX: no advisory locks
+        return None
+    return fcntl
+
+
+@contextmanager
+def _locked_plain_part(path: Path, mode: str, **kwargs: Any) -> Iterator[IO[Any]]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fcntl = _flock_module()
+    while True:
+        f = path.open(mode, **kwargs)
+        if fcntl is None:
+            break
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            same = os.path.samestat(os.fstat(f.fileno()), path.stat())
+        except OSError:
+            same = False
+        if same:
+            break
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        f.close()
+    try:
+        yield f
+    finally:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        f.close()
+
+
+@contextmanager
+def locked_append(path: Path | str) -> Iterator[IO[str]]:
+    """
+    Open the plain part of `path` for appending under an exclusive flock.
+
+    Retention compresses a day file by reading it and unlinking it under the same lock, so
+    after acquiring the lock the handle is re-checked against the path: if the file was
+    moved into its compressed part meanwhile, a fresh plain part is opened instead, and no
+    appended line can land in an unlinked inode.
+    """
+    with _locked_plain_part(logical_path(Path(path)), "a", encoding="utf-8") as f:
+        yield f
+        f.flush()
+
+
+@contextmanager
+def artifact_write_lock(path: Path | str) -> Iterator[None]:
+    """
+    Hold the appenders' lock on logical `path` while its parts are rewritten or removed.
+
+    An empty plain part is created when there is none, so the parts listed under the lock
+    include the file the next appender will write to, and it cannot change until release.
+    """
+    with _locked_plain_part(logical_path(Path(path)), "ab"):
+        yield
+
+
+def artifact_glob(base: Path, pattern: str) -> list[Path]:
+    """Logical paths matching `pattern` under `base`, whether stored plain or compressed."""
+    seen: set[Path] = set()
+    for suf in ("",) + COMPRESSED_SUFFIXES:
+        for p in base.glob(pattern + suf):
+            seen.add(logical_path(p))
+    return sorted(seen)
+
+
+def compress_artifact(path: Path, *, codec: str = "gzip", level: int | None = None) -> tuple[int, int] | None:
+    """
+    Compress `path` in place (`x.json` -> `x.json.gz`/`.zst`), appending to an existing
+    compressed part. Returns (bytes before, bytes after) or None when the file was kept
+    plain (missing, or compression would not make it smaller).
+    """
+    path = Path(path)
+    try:
+        f = path.open("rb")
+    except OSError:
+        return None
+    fcntl = _flock_module()
+    with f:
+        if fcntl is not None:
+            # The appenders' lock (see locked_append): nothing is appended between the
+            # read below and the unlink, so no line is lost with the plain part.
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            return _compress_locked(path, f, codec=codec, level=level)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _compress_locked(path: Path, f: IO[bytes], *, codec: str, level: int | None) -> tuple[int, int] | None:
+    try:
+        if not os.path.samestat(os.fstat(f.fileno()), path.stat()):
+            return None  # compressed by a concurrent retention run
+    except OSError:
+        return None
+    data = f.read()
+    if path.with_name(path.name + ZSTD_SUFFIX).exists():
+        codec = "zstd"  # keep appending to the part that is already there
+    elif path.with_name(path.name + GZIP_SUFFIX).exists():
+        codec = "gzip"
+    zstd = _zstd() if codec == "zstd" else None
+    if zstd is not None:
+        dst = path.with_name(path.name + ZSTD_SUFFIX)
+        blob = zstd.ZstdCompressor(level=level or 10).compress(data)
+    else:
+        dst = path.with_name(path.name + GZIP_SUFFIX)
+        blob = gzip.compress(data, compresslevel=level or 6, mtime=0)
+    if len(blob) >= len(data):
+        return None
+    before = len(data) + (dst.stat().st_size if dst.exists() else 0)
+    tmp = dst.with_name(f"{dst.name}.tmp{os.getpid()}")
+    with tmp.open("wb") as out:
+        if dst.exists():
+            # Both formats decode concatenated frames/members, so an earlier part is kept as-is.
+            out.write(dst.read_bytes())
+        out.write(blob)
+    st = os.fstat(f.fileno())
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, dst)
+    path.unlink()
+    return before, dst.stat().st_size
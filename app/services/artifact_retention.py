@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from app.services.artifact_io import artifact_glob, artifact_parts, compress_artifact, logical_path
+from app.services.fetch_snapshot import FetchSnapshotStore
+
+RETENTION_DIRNAME = ".retention"
+REPORT_FILENAME = "last_run.json"
+COMPRESSIBLE_SUFFIXES = (".json", ".jsonl")
+# Run ids with one of these recorded in report_artifacts are never deleted (only compressed).
+DEFAULT_REFERENCE_TYPES = ("report_text",)
+# What `protect_referenced` checks unit names against.
+REFERENCES_REPORTS = "report_artifacts"
+REFERENCES_SNAPSHOTS = "fetch_snapshot_manifests"
+# Files written to within this window are left plain: a writer may still be appending.
+COMPRESS_MIN_IDLE_SECONDS = 15 * 60
+
+_NAME_DATE_RE = re.compile(r"(\d{8})")
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Retention for one artifact class under `artifacts/`.
+
+    A unit (a run directory, or one logical day/progress file) is kept when it is among the
+    `keep_last` newest, younger than `keep_days`, or (with `protect_referenced`) its name is
+    referenced: a run id with a `report_artifacts` row, or for `references=
+    REFERENCES_SNAPSHOTS` a blob digest named by a surviving fetch snapshot manifest;
+    everything else is deleted. Kept units older than `compress_after_days` have their
+    JSON/JSONL compressed in place.
+
+    A file unit's age comes from the YYYYMMDD date in its name; `age_source="mtime"` is for
+    hash-named files, where a run of eight digits in the name is not a date.
+    """
+
+    name: str
+    pattern: str
+    unit: str = "dir"
+    keep_last: int | None = None
+    keep_days: int | None = None
+    compress_after_days: int | None = None
+    protect_referenced: bool = False
+    age_source: str = "name"
+    references: str = REFERENCES_REPORTS
+
+
+DEFAULT_POLICIES: tuple[RetentionPolicy, ...] = (
+    RetentionPolicy("digest_runs", "run-*", keep_last=60, keep_days=30, compress_after_days=3, protect_referenced=True),
+    RetentionPolicy("collect_runs", "collect-*", keep_last=60, keep_days=14, compress_after_days=2),
+    RetentionPolicy("dryrun_runs", "dryrun-*", keep_last=30, keep_days=14, compress_after_days=2),
+    RetentionPolicy("dryrun_progress", "dryrun_jobs/*.progress.json", unit="file", keep_last=50, keep_days=7),
+    RetentionPolicy("collect_assets", "collect/items-*.jsonl", unit="file", keep_days=30, compress_after_days=3),
+    RetentionPolicy("collect_sealed", "collect/items-*.cols", unit="file", keep_days=30),
+    RetentionPolicy("collect_indexes", "collect/index-*.json", unit="file", keep_days=30),
+    RetentionPolicy("analysis_assets", "analysis/items-*.jsonl", unit="file", keep_days=30, compress_after_days=3),
+    RetentionPolicy(
+        "opportunity_signals", "opportunity/opportunity_signals-*.jsonl", unit="file", keep_days=90, compress_after_days=7
+    ),
+    RetentionPolicy("analysis_content", "analysis/content/*/*.json", unit="file", keep_days=30, age_source="mtime"),
+    # Manifests first, so blob GC below sees only the runs that survived.
+    RetentionPolicy(
+        "fetch_snapshots", "fetch_snapshots/runs/*.json", unit="file", keep_last=30, keep_days=14, age_source="mtime"
+    ),
+    # Unreferenced blobs get a short grace period: a recording run writes its manifest last.
+    RetentionPolicy(
+        "fetch_snapshot_blobs",
+        "fetch_snapshots/blobs/*/*.gz",
+        unit="file",
+        keep_days=2,
+        protect_referenced=True,
+        age_source="mtime",
+        references=REFERENCES_SNAPSHOTS,
+    ),
+)
+
+
+def _utc_now() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def default_codec() -> str:
+    return "zstd" if str(os.environ.get("ARTIFACTS_COMPRESSION", "")).strip().lower() == "zstd" else "gzip"
+
+
+def retention_report_path(artifacts_dir: Path) -> Path:
+    return Path(artifacts_dir) / RETENTION_DIRNAME / REPORT_FILENAME
+
+
+def _unit_files(unit: Path, kind: str) -> list[Path]:
+    if kind == "file":
+        return artifact_parts(unit)
+    return [p for p in unit.rglob("*") if p.is_file()]
+
+
+def _unit_time(unit: Path, kind: str, files: list[Path], age_source: str = "name") -> float:
+    """
+    When the unit was last written. Day files go by the date in their name; run
+    directories by their newest file (compression keeps file mtimes, while it does bump
+    the directory's own mtime).
+    """
+    if kind == "file" and age_source == "name":
+        m = _NAME_DATE_RE.search(unit.name)
+        if m:
+            try:
+                d = dt.datetime.strptime(m.group(1), "%Y%m%d").replace(tzinfo=dt.timezone.utc)
+                return (d + dt.timedelta(days=1)).timestamp()
+            except ValueError:
+                pass
+    mtimes = []
+    for p in files:
+        try:
+            mtimes.append(p.stat().st_mtime)
+        except OSError:
+            continue
+    if mtimes:
+        return max(mtimes)
+    try:
+        return unit.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _size(files: list[Path]) -> int:
+    total = 0
+    for p in files:
+        try:
+            total += p.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def _list_units(artifacts_dir: Path, policy: RetentionPolicy) -> list[Path]:
+    if policy.unit == "file":
+        return artifact_glob(artifacts_dir, policy.pattern)
+    return sorted(p for p in artifacts_dir.glob(policy.pattern) if p.is_dir())
+
+
+def _compress_candidates(files: list[Path]) -> list[Path]:
+    return [p for p in files if p.name.endswith(COMPRESSIBLE_SUFFIXES) and logical_path(p) == p]
+
+
+def _recently_modified(p: Path, idle_before: float) -> bool:
+    try:
+        return p.stat().st_mtime > idle_before
+    except OSError:
+        return True
+
+
+def apply_policy(
+    artifacts_dir: Path,
+    policy: RetentionPolicy,
+    *,
+    referenced: set[str],
+    now: dt.datetime,
+    dry_run: bool = False,
+    codec: str = "gzip",
+) -> dict[str, Any]:
+    stats: dict[str, Any] = {
+        "units": 0,
+        "kept": 0,
+        "kept_referenced": 0,
+        "deleted": 0,
+        "compressed_files": 0,
+        "bytes_deleted": 0,
+        "bytes_saved_by_compression": 0,
+        "compress_candidates": 0,
+        "compress_skipped_active": 0,
+    }
+    entries = []
+    for unit in _list_units(artifacts_dir, policy):
+        files = _unit_files(unit, policy.unit)
+        entries.append((_unit_time(unit, policy.unit, files, policy.age_source), unit, files))
+    entries.sort(key=lambda e: (e[0], e[1].name), reverse=True)
+    now_ts = now.timestamp()
+    idle_before = time.time() - COMPRESS_MIN_IDLE_SECONDS
+    for idx, (mtime, unit, files) in enumerate(entries):
+        stats["units"] += 1
+        age_days = max(0.0, (now_ts - mtime) / 86400.0)
+        is_referenced = policy.protect_referenced and unit.name in referenced
+        keep = policy.keep_last is None and policy.keep_days is None
+        if policy.keep_last is not None and idx < policy.keep_last:
+            keep = True
+        if policy.keep_days is not None and age_days < policy.keep_days:
+            keep = True
+        if not keep and is_referenced:
+            keep = True
+            stats["kept_referenced"] += 1
+        if not keep:
+            stats["deleted"] += 1
+            stats["bytes_deleted"] += _size(files)
+            if not dry_run:
+                if policy.unit == "file":
+                    for p in files:
+                        p.unlink(missing_ok=True)
+                else:
+                    shutil.rmtree(unit, ignore_errors=True)
+            continue
+        stats["kept"] += 1
+        if policy.compress_after_days is None or age_days < policy.compress_after_days:
+            continue
+        for p in _compress_candidates(files):
+            stats["compress_candidates"] += 1
+            if _recently_modified(p, idle_before):
+                stats["compress_skipped_active"] += 1
+                continue
+            if dry_run:
+                continue
+            out = compress_artifact(p, codec=codec)
+            if out is not None:
+                stats["compressed_files"] += 1
+                stats["bytes_saved_by_compression"] += out[0] - out[1]
+    stats["bytes_reclaimed"] = stats["bytes_deleted"] + stats["bytes_saved_by_compression"]
+    return stats
+
+
+def _referenced_from_db(project_root: Path) -> tuple[set[str], str]:
+    try:
+        from app.services.rules_store import RulesStore
+
+        return RulesStore(project_root).report_artifact_run_ids(list(DEFAULT_REFERENCE_TYPES)), ""
+    except Exception as exc:
+        return set(), f"{type(exc).__name__}: {exc}"
+
+
+def run_retention(
+    project_root: Path,
+    *,
+    policies: tuple[RetentionPolicy, ...] | list[RetentionPolicy] = DEFAULT_POLICIES,
+    referenced_run_ids: set[str] | None = None,
+    dry_run: bool = False,
+    codec: str | None = None,
+    now: dt.datetime | None = None,
+    artifacts_dir: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Apply every policy under `artifacts/` and report bytes reclaimed per class. Unless
+    `dry_run`, the report is also written to `artifacts/.retention/last_run.json` (with a
+    running total) for the ops dashboard.
+
+    `referenced_run_ids` defaults to the run ids with a report artifact in the rules DB;
+    when the DB cannot be read, protected classes are only compressed, never deleted.
+    Snapshot blobs are checked against the manifests left after the manifest policy ran
+    (in a dry run nothing is deleted, so blobs of expiring manifests still count as used).
+    """
+    t0 = time.perf_counter()
+    artifacts_dir = Path(artifacts_dir) if artifacts_dir is not None else Path(project_root) / "artifacts"
+    now = now or _utc_now()
+    codec = codec or default_codec()
+    lookup_error = ""
+    if referenced_run_ids is None:
+        referenced_run_ids, lookup_error = _referenced_from_db(Path(project_root))
+    classes: dict[str, Any] = {}
+    for policy in policies:
+        referenced = referenced_run_ids
+        if policy.protect_referenced and policy.references == REFERENCES_SNAPSHOTS:
+            referenced = FetchSnapshotStore(artifacts_dir / "fetch_snapshots").referenced_blobs()
+        elif lookup_error and policy.protect_referenced:
+            policy = replace(policy, keep_last=None, keep_days=None)
+        classes[policy.name] = {
+            "policy": asdict(policy),
+            **apply_policy(artifacts_dir, policy, referenced=referenced, now=now, dry_run=dry_run, codec=codec),
+        }
+    report: dict[str, Any] = {
+        "ok": True,
+        "dry_run": bool(dry_run),
+        "generated_at": now.isoformat(),
+        "artifacts_dir": str(artifacts_dir),
+        "codec": codec,
+        "referenced_runs": len(referenced_run_ids),
+        "bytes_deleted": sum(int(c["bytes_deleted"]) for c in classes.values()),
+        "bytes_saved_by_compression": sum(int(c["bytes_saved_by_compression"]) for c in classes.values()),
+        "bytes_reclaimed": sum(int(c["bytes_reclaimed"]) for c in classes.values()),
+        "classes": classes,
+        "duration_ms": int((time.perf_counter() - t0) * 1000),
+    }
+    if lookup_error:
+        report["referenced_lookup_error"] = lookup_error
+    if not dry_run:
+        _write_report(artifacts_dir, report)
+    return report
+
+
+def _write_report(artifacts_dir: Path, report: dict[str, Any]) -> None:
+    path = retention_report_path(artifacts_dir)
+    previous = load_retention_report(artifacts_dir) or {}
+    report["bytes_reclaimed_total"] = int(previous.get("bytes_reclaimed_total", 0) or 0) + int(report["bytes_reclaimed"])
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{REPORT_FILENAME}.tmp{os.getpid()}")
+        tmp.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        return
+
+
+def load_retention_report(artifacts_dir: Path) -> dict[str, Any] | None:
+    try:
+        obj = json.loads(retention_report_path(artifacts_dir).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import copy
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, Callable
 
 import yaml
 
+from app.utils.domain_trie import DomainSuffixTrie
+from app.utils.url_norm import UrlLike, as_parsed_url
+
 
 def normalize_unknown(value: Any) -> str:
     s = str(value or "").strip()
@@ -31,57 +36,138 @@ def _read_yaml(path: Path) -> dict[str, Any]:
     return raw if isinstance(raw, dict) else {}
 
 
-def load_region_map(rules_root: Path | str | None = None) -> dict[str, Any]:
-    rr = _resolve_rules_root(rules_root)
-    return _read_yaml(rr / "mappings" / "region_map.v1.yaml")
+@dataclass(frozen=True)
+class RegionMatcher:
+    """
+    Compiled region map: `domain_contains` pre-sorted (longest key first) and
+    `domain_suffix` folded into a DomainSuffixTrie (first rule wins on overlap).
+    """
 
+    contains: tuple[tuple[str, str], ...] = ()
+    suffixes: DomainSuffixTrie = field(default_factory=DomainSuffixTrie)
 
-def load_lane_map(rules_root: Path | str | None = None) -> dict[str, Any]:
-    rr = _resolve_rules_root(rules_root)
-    return _read_yaml(rr / "mappings" / "lane_map.v1.yaml")
 
+@dataclass(frozen=True)
+class LaneMatcher:
+    lanes: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    default_lane: str = "__unknown__"
 
-def classify_region(url: str, maps: dict[str, Any] | None = None) -> str:
-    mm = maps or {}
-    host = str(urlparse(str(url or "")).netloc or "").strip().lower()
-    if not host:
-        return "__unknown__"
 
+def compile_region_map(maps: dict[str, Any] | None) -> RegionMatcher:
+    mm = maps or {}
     domain_contains = mm.get("domain_contains", {}) if isinstance(mm.get("domain_contains"), dict) else {}
+    contains: list[tuple[str, str]] = []
     for k, v in sorted(domain_contains.items(), key=lambda kv: len(str(kv[0])), reverse=True):
         kk = str(k).strip().lower()
         vv = normalize_unknown(v)
-        if kk and kk in host and vv != "__unknown__":
-            return vv
+        if kk and vv != "__unknown__":
+            contains.append((kk, vv))
 
     domain_suffix = mm.get("domain_suffix", {}) if isinstance(mm.get("domain_suffix"), dict) else {}
+    trie = DomainSuffixTrie()
     for k, v in domain_suffix.items():
         kk = str(k).strip().lower()
         vv = normalize_unknown(v)
         if not kk or vv == "__unknown__":
             continue
-        clean = kk[1:] if kk.startswith(".") else kk
-        if host == clean or host.endswith("." + clean):
-            return vv
-    return "__unknown__"
+        trie.add(kk[1:] if kk.startswith(".") else kk, vv)
+    return RegionMatcher(contains=tuple(contains), suffixes=trie)
 
 
-def classify_lane(text: str, maps: dict[str, Any] | None = None) -> str:
+def compile_lane_map(maps: dict[str, Any] | None) -> LaneMatcher:
     mm = maps or {}
     lanes = mm.get("lanes", {}) if isinstance(mm.get("lanes"), dict) else {}
-    default_lane = normalize_unknown(mm.get("default_lane", "__unknown__"))
-    t = str(text or "").lower()
-    if not t:
-        return default_lane
-
+    out: list[tuple[str, tuple[str, ...]]] = []
     for lane, cfg in lanes.items():
         if not isinstance(cfg, dict):
             continue
         any_terms = cfg.get("any", [])
         if not isinstance(any_terms, list):
             continue
-        for kw in any_terms:
-            k = str(kw or "").strip().lower()
-            if k and k in t:
-                return str(lane)
-    return default_lane
+        terms = tuple(k for k in (str(kw or "").strip().lower() for kw in any_terms) if k)
+        if terms:
+            out.append((str(lane), terms))
+    return LaneMatcher(lanes=tuple(out), default_lane=normalize_unknown(mm.get("default_lane", "__unknown__")))
+
+
+class _MapCache:
+    """Per-rules-root cache of mapping YAML (+ compiled matcher), keyed by file signature."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple[int, int], dict[str, Any], Any]] = {}
+
+    def get(self, path: Path, compile_fn: Callable[[dict[str, Any]], Any]) -> tuple[dict[str, Any], Any]:
+        key = str(path.resolve())
+        try:
+            st = path.stat()
+            sig = (int(st.st_mtime_ns), int(st.st_size))
+        except OSError:
+            sig = (-1, -1)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] == sig:
+                return hit[1], hit[2]
+        raw = _read_yaml(path)
+        compiled = compile_fn(raw)
+        with self._lock:
+            self._entries[key] = (sig, raw, compiled)
+        return raw, compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_REGION_CACHE = _MapCache()
+_LANE_CACHE = _MapCache()
+
+
+def clear_classification_map_cache() -> None:
+    _REGION_CACHE.clear()
+    _LANE_CACHE.clear()
+
+
+def load_region_map(rules_root: Path | str | None = None) -> dict[str, Any]:
+    rr = _resolve_rules_root(rules_root)
+    raw, _ = _REGION_CACHE.get(rr / "mappings" / "region_map.v1.yaml", compile_region_map)
+    return copy.deepcopy(raw)
+
+
+def load_lane_map(rules_root: Path | str | None = None) -> dict[str, Any]:
+    rr = _resolve_rules_root(rules_root)
+    raw, _ = _LANE_CACHE.get(rr / "mappings" / "lane_map.v1.yaml", compile_lane_map)
+    return copy.deepcopy(raw)
+
+
+def load_region_matcher(rules_root: Path | str | None = None) -> RegionMatcher:
+    rr = _resolve_rules_root(rules_root)
+    return _REGION_CACHE.get(rr / "mappings" / "region_map.v1.yaml", compile_region_map)[1]
+
+
+def load_lane_matcher(rules_root: Path | str | None = None) -> LaneMatcher:
+    rr = _resolve_rules_root(rules_root)
+    return _LANE_CACHE.get(rr / "mappings" / "lane_map.v1.yaml", compile_lane_map)[1]
+
+
+def classify_region(url: UrlLike, maps: dict[str, Any] | RegionMatcher | None = None) -> str:
+    matcher = maps if isinstance(maps, RegionMatcher) else compile_region_map(maps)
+    host = as_parsed_url(url).netloc.strip()
+    if not host:
+        return "__unknown__"
+    for kk, vv in matcher.contains:
+        if kk in host:
+            return vv
+    return matcher.suffixes.lookup(host, "__unknown__")
+
+
+def classify_lane(text: str, maps: dict[str, Any] | LaneMatcher | None = None) -> str:
+    matcher = maps if isinstance(maps, LaneMatcher) else compile_lane_map(maps)
+    t = str(text or "").lower()
+    if not t:
+        return matcher.default_lane
+    for lane, terms in matcher.lanes:
+        for k in terms:
+            if k in t:
+                return lane
+    return matcher.default_lane
@@ -7,23 +7,30 @@ import json
 import re
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
 
-from app.core.track_relevance import compute_relevance
-from app.services.analysis_cache_store import AnalysisCacheStore
-from app.services.analysis_generator import AnalysisGenerator, degraded_analysis
+from app.core.track_relevance import compute_relevance, relevance_rules_fingerprint
+from app.services.analysis_cache_store import DEFAULT_CONTENT_CACHE_DAYS, AnalysisCacheStore
+from app.services.artifact_io import artifact_parts, iter_artifact_lines, locked_append
+from app.services.analysis_generator import AnalysisGenerator, degraded_analysis, generate_many, latency_percentiles
 from app.services.classification_maps import (
     classify_lane as map_classify_lane,
     classify_region as map_classify_region,
-    load_lane_map,
-    load_region_map,
+    load_lane_matcher,
+    load_region_matcher,
     normalize_unknown as map_normalize_unknown,
 )
+from app.services.collect_columnar import (
+    ColumnarDayFile,
+    collect_day_files,
+    columnar_path,
+    is_missing,
+    seal_day_file,
+)
 from app.services.page_classifier import is_static_or_listing_url
 from app.services.opportunity_index import compute_opportunity_index
 from app.services.opportunity_store import EVENT_WEIGHT, OpportunityStore, normalize_event_type
-from app.services.source_policy import exclusion_reason, filter_rows_for_digest, normalize_source_policy
-from app.utils.url_norm import url_norm
+from app.services.source_policy import filter_rows_for_digest, normalize_source_policy
+from app.utils.url_norm import parse_url, url_norm
 
 
 def ensure_dir(path: Path) -> Path:
@@ -32,8 +39,7 @@ def ensure_dir(path: Path) -> Path:
 
 
 def append_jsonl(file: Path, obj: dict[str, Any]) -> None:
-    ensure_dir(file.parent)
-    with file.open("a", encoding="utf-8") as f:
+    with locked_append(file) as f:
         f.write(json.dumps(obj, ensure_ascii=False) + "\n")
 
 
@@ -59,6 +65,28 @@ def _to_iso_utc(d: dt.datetime) -> str:
     return d.astimezone(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+def relevance_runtime_for(profile: str, cfg: dict[str, Any] | None = None) -> dict[str, Any]:
+    """compute_relevance() runtime for a profile and its content config (anchors/negatives packs)."""
+    cfg = cfg or {}
+    return {
+        "profile": str(profile or "legacy").strip().lower() or "legacy",
+        "investment_scope_enabled": bool(str(profile or "").strip().lower() == "enhanced"),
+        "anchors_pack": cfg.get("anchors_pack", {}) if isinstance(cfg.get("anchors_pack"), dict) else {},
+        "negatives_pack": cfg.get("negatives_pack", []) if isinstance(cfg.get("negatives_pack"), list) else [],
+        "frontier_policy": cfg.get("frontier_policy", {}) if isinstance(cfg.get("frontier_policy"), dict) else {},
+    }
+
+
+def _add_token_usage(total: dict[str, int], usage: Any) -> None:
+    if not isinstance(usage, dict):
+        return
+    for k in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        try:
+            total[k] = total.get(k, 0) + int(usage.get(k, 0) or 0)
+        except (TypeError, ValueError):
+            continue
+
+
 def _extract_evidence_snippet(item: dict[str, Any], *, max_chars: int = 240) -> tuple[str, str]:
     def _clean_evidence_text(raw: str) -> str:
         s = str(raw or "")
@@ -186,6 +214,7 @@ class CollectAssetStore:
         dropped_static_or_listing = 0
 
         rows: list[str] = []
+        relevance_fp = relevance_rules_fingerprint(rules_runtime)
         source_guard = rules_runtime.get("source_guard", {}) if isinstance(rules_runtime.get("source_guard"), dict) else {}
         source_guard_enabled = bool(source_guard.get("enabled", str(rules_runtime.get("profile", "legacy")).strip().lower() == "enhanced"))
         for it in items:
@@ -194,11 +223,12 @@ class CollectAssetStore:
             if not title or not url:
                 skipped += 1
                 continue
-            if source_guard_enabled and is_static_or_listing_url(url):
+            parsed = parse_url(url)
+            if source_guard_enabled and is_static_or_listing_url(parsed):
                 skipped += 1
                 dropped_static_or_listing += 1
                 continue
-            drop_reason = exclusion_reason(source_id, url, source_policy)
+            drop_reason = source_policy.exclusion_reason(source_id, parsed)
             if drop_reason:
                 skipped += 1
                 dropped_by_source_policy += 1
@@ -207,7 +237,8 @@ class CollectAssetStore:
             summary = str(it.get("summary", "")).strip()
             published = str(it.get("published_at", "")).strip()
             pdt = _safe_dt(published) or now_utc
-            key_seed = url_norm(url) or title.lower()
+            un = parsed.norm
+            key_seed = un or title.lower()
             dedupe_key = _sha1(key_seed)
             if dedupe_key in index:
                 skipped += 1
@@ -234,7 +265,7 @@ class CollectAssetStore:
                 "source_group": source_group,
                 "trust_tier": str(source_trust_tier or "C").strip().upper() or "C",
                 "url": url,
-                "url_norm": url_norm(url),
+                "url_norm": un,
                 "canonical_url": str(it.get("canonical_url", "")).strip(),
                 "dedupe_key": dedupe_key,
                 "title": title,
@@ -245,6 +276,7 @@ class CollectAssetStore:
                 "track": track,
                 "relevance_level": int(level),
                 "relevance_explain": explain,
+                "relevance_fingerprint": relevance_fp,
                 "event_type": str(it.get("event_type", "")).strip(),
                 "region": str(it.get("region", "")).strip(),
                 "lane": str(it.get("lane", "")).strip(),
@@ -255,8 +287,7 @@ class CollectAssetStore:
             written += 1
 
         if rows:
-            ensure_dir(target.parent)
-            with target.open("a", encoding="utf-8") as f:
+            with locked_append(target) as f:
                 for ln in rows:
                     f.write(ln + "\n")
         self._save_day_index(day, index)
@@ -340,25 +371,14 @@ class CollectAssetStore:
             window_start_utc = window_end_utc - dt.timedelta(hours=window_hours)
 
         rows: list[dict[str, Any]] = []
-        for p in sorted(self.base_dir.glob("items-*.jsonl")):
+        # A day file holds the rows collected on that day; one day of slack covers non-UTC clocks.
+        first_day = window_start_utc.date() - dt.timedelta(days=1)
+        last_day = window_end_utc.date() + dt.timedelta(days=1)
+        for d, p in collect_day_files(self.base_dir).items():
+            if d < first_day or d > last_day:
+                continue
             try:
-                with p.open("r", encoding="utf-8") as f:
-                    for ln in f:
-                        ln = ln.strip()
-                        if not ln:
-                            continue
-                        try:
-                            r = json.loads(ln)
-                        except Exception:
-                            continue
-                        ca = _safe_dt(str(r.get("collected_at", "")))
-                        if ca is None:
-                            continue
-                        if ca < window_start_utc:
-                            continue
-                        if ca > window_end_utc:
-                            continue
-                        rows.append(r)
+                rows.extend(self._window_rows(p, window_start_utc, window_end_utc))
             except Exception:
                 continue
 
@@ -379,27 +399,70 @@ class CollectAssetStore:
         out.sort(key=lambda x: str(x.get("published_at", "")), reverse=True)
         return out
 
+    def _window_rows(self, day_file: Path, start: dt.datetime, end: dt.datetime) -> list[dict[str, Any]]:
+        def _in_window(v: Any) -> bool:
+            ca = None if is_missing(v) else _safe_dt(str(v))
+            return ca is not None and start <= ca <= end
+
+        out: list[dict[str, Any]] = []
+        sealed = columnar_path(day_file)
+        if sealed.is_file():
+            # Only the collected_at column is read for days that fall outside the window.
+            cf = ColumnarDayFile(sealed)
+            hits = [i for i, v in enumerate(cf.column("collected_at")) if _in_window(v)]
+            if hits:
+                out.extend(cf.rows(indexes=hits))
+        if not artifact_parts(day_file):
+            return out
+        for ln in iter_artifact_lines(day_file):
+            ln = ln.strip()
+            if not ln:
+                continue
+            try:
+                r = json.loads(ln)
+            except Exception:
+                continue
+            if isinstance(r, dict) and _in_window(r.get("collected_at", "")):
+                out.append(r)
+        return out
+
+    def seal_days(self, *, before: dt.date | None = None) -> dict[str, Any]:
+        """
+        Convert the JSONL of every day before `before` (default: today, UTC) to the compact
+        columnar format. The active day stays JSONL; rows appended to a sealed day later go
+        to a fresh JSONL and are folded in on the next call.
+        """
+        before = before or dt.datetime.now(dt.timezone.utc).date()
+        sealed: list[str] = []
+        bytes_before = 0
+        bytes_after = 0
+        for d, p in collect_day_files(self.base_dir).items():
+            if d >= before:
+                continue
+            out = seal_day_file(p)
+            if out is None:
+                continue
+            sealed.append(d.isoformat())
+            bytes_before += out["bytes_before"]
+            bytes_after += out["bytes_after"]
+        return {"sealed_days": sealed, "bytes_before": bytes_before, "bytes_after": bytes_after}
+
     def cleanup(self, *, keep_days: int = 30, now_utc: dt.datetime | None = None) -> dict[str, int]:
         now_utc = now_utc or dt.datetime.now(dt.timezone.utc)
         keep_days = max(1, int(keep_days or 30))
         cutoff = (now_utc - dt.timedelta(days=keep_days)).date()
         removed_files = 0
         removed_indexes = 0
-        for p in sorted(self.base_dir.glob("items-*.jsonl")):
-            m = re.match(r"items-(\d{8})\.jsonl$", p.name)
-            if not m:
-                continue
-            try:
-                d = dt.datetime.strptime(m.group(1), "%Y%m%d").date()
-            except Exception:
-                continue
+        for d, p in collect_day_files(self.base_dir).items():
             if d < cutoff:
                 try:
-                    p.unlink(missing_ok=True)  # type: ignore[arg-type]
+                    for part in artifact_parts(p):
+                        part.unlink(missing_ok=True)  # type: ignore[arg-type]
+                    columnar_path(p).unlink(missing_ok=True)
                     removed_files += 1
                 except Exception:
                     pass
-                ip = self.base_dir / f"index-{m.group(1)}.json"
+                ip = self.base_dir / f"index-{d.strftime('%Y%m%d')}.json"
                 if ip.exists():
                     try:
                         ip.unlink(missing_ok=True)  # type: ignore[arg-type]
@@ -445,13 +508,10 @@ def render_digest_from_assets(
     opportunity_tail_lines_scan = max(1, int(opportunity_dedupe_cfg.get("tail_lines_scan", 2000) or 2000))
     opportunity_top_n = max(1, int(opportunity_display_cfg.get("top_n", 5) or 5))
     opportunity_store = OpportunityStore(Path("."), asset_dir=opportunity_asset_dir) if opportunity_enabled else None
-    relevance_runtime = {
-        "profile": profile,
-        "investment_scope_enabled": bool(profile == "enhanced"),
-        "anchors_pack": analysis_cfg.get("anchors_pack", {}) if isinstance(analysis_cfg.get("anchors_pack"), dict) else {},
-        "negatives_pack": analysis_cfg.get("negatives_pack", []) if isinstance(analysis_cfg.get("negatives_pack"), list) else [],
-        "frontier_policy": analysis_cfg.get("frontier_policy", {}) if isinstance(analysis_cfg.get("frontier_policy"), dict) else {},
-    }
+    relevance_runtime = relevance_runtime_for(profile, analysis_cfg)
+    relevance_fp = relevance_rules_fingerprint(relevance_runtime)
+    relevance_reused = 0
+    relevance_recomputed = 0
     enable_analysis_cache = bool(analysis_cfg.get("enable_analysis_cache", True))
     always_generate = bool(analysis_cfg.get("always_generate", False))
     prompt_version = str(analysis_cfg.get("prompt_version", "v1"))
@@ -465,7 +525,12 @@ def render_digest_from_assets(
     retries = int(analysis_cfg.get("retries", 1) or 1)
     timeout_seconds = int(analysis_cfg.get("timeout_seconds", 20) or 20)
     backoff_seconds = float(analysis_cfg.get("backoff_seconds", 0.5) or 0.5)
+    generate_workers = max(1, int(analysis_cfg.get("generate_workers", 4) or 1))
+    generate_rate_per_sec = max(0.0, float(analysis_cfg.get("generate_rate_per_sec", 0) or 0))
     run_day = dt.datetime.strptime(date_str, "%Y-%m-%d").date()
+    content_cache_days = int(analysis_cfg.get("content_cache_days", DEFAULT_CONTENT_CACHE_DAYS) or 0)
+    # Cross-day entries are only valid for the same model configuration and prompt.
+    content_model_sig = f"{model_policy}:{model_primary or model_name}/{model_fallback}"
     cache_store = _cache_store
     if cache_store is None and enable_analysis_cache:
         cache_store = AnalysisCacheStore(Path("."), asset_dir=str(analysis_cfg.get("asset_dir", "artifacts/analysis")))
@@ -486,7 +551,10 @@ def render_digest_from_assets(
     cache_hit = 0
     cache_miss = 0
     cache_key_mismatch = 0
+    cache_cross_day_hit = 0
     generated_count = 0
+    generate_latencies_ms: list[float] = []
+    generated_tokens = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
     degraded_count = 0
     degraded_reasons: dict[str, int] = {}
     source_policy_dropped_rows: dict[str, int] = {}
@@ -500,9 +568,10 @@ def render_digest_from_assets(
     opportunity_signals_written = 0
     opportunity_signals_deduped = 0
     opportunity_signals_dropped_probe = 0
+    opportunity_signals: list[dict[str, Any]] = []
     opportunity_index_kpis: dict[str, Any] = {}
-    region_maps = load_region_map(Path("."))
-    lane_maps = load_lane_map(Path("."))
+    region_maps = load_region_matcher(Path("."))
+    lane_maps = load_lane_matcher(Path("."))
     style_cfg = analysis_cfg.get("style", {}) if isinstance(analysis_cfg.get("style"), dict) else {}
     style_lang = "en" if str(style_cfg.get("language", "zh")).strip().lower() == "en" else "zh"
     style_tone = str(style_cfg.get("tone", "concise_decision")).strip().lower()
@@ -542,9 +611,10 @@ def render_digest_from_assets(
     items = []
     for r in items_filtered:
         item_url = str(r.get("url", "")).strip()
-        if source_guard_enabled and is_static_or_listing_url(item_url):
+        parsed = parse_url(item_url)
+        if source_guard_enabled and is_static_or_listing_url(parsed):
             dropped_static_or_listing_count += 1
-            dm = str(urlparse(item_url).hostname or "").strip().lower() if item_url else ""
+            dm = parsed.host if item_url else ""
             if dm:
                 dropped_static_or_listing_domains[dm] = dropped_static_or_listing_domains.get(dm, 0) + 1
             continue
@@ -554,25 +624,37 @@ def render_digest_from_assets(
                 am = r.get("article_meta", {}) if isinstance(r.get("article_meta"), dict) else {}
                 if not am:
                     dropped_static_or_listing_count += 1
-                    dm = str(urlparse(item_url).hostname or "").strip().lower() if item_url else ""
+                    dm = parsed.host if item_url else ""
                     if dm:
                         dropped_static_or_listing_domains[dm] = dropped_static_or_listing_domains.get(dm, 0) + 1
                     continue
         title = str(r.get("title", "")).strip()
         summary = str(r.get("summary", "")).strip()
         text = f"{title} {summary}".strip()
-        track, level, explain = compute_relevance(
-            text,
-            {
-                "source_group": str(r.get("source_group", "")).strip(),
-                "source": str(r.get("source", "")).strip(),
-                "source_id": str(r.get("source_id", "")).strip(),
-                "event_type": str(r.get("event_type", "")).strip(),
-                "url": str(r.get("url", "")).strip(),
-                "title": title,
-            },
-            relevance_runtime,
-        )
+        stored_explain = r.get("relevance_explain")
+        if (
+            str(r.get("relevance_fingerprint", "")) == relevance_fp
+            and str(r.get("raw_text", "")) == text
+            and str(r.get("track", "")).strip().lower() in ("core", "frontier", "drop")
+            and isinstance(stored_explain, dict)
+        ):
+            # Scored at collect time under the same rules and text: reuse instead of re-scoring.
+            track, level, explain = str(r.get("track", "")).strip().lower(), int(r.get("relevance_level", 0) or 0), stored_explain
+            relevance_reused += 1
+        else:
+            track, level, explain = compute_relevance(
+                text,
+                {
+                    "source_group": str(r.get("source_group", "")).strip(),
+                    "source": str(r.get("source", "")).strip(),
+                    "source_id": str(r.get("source_id", "")).strip(),
+                    "event_type": str(r.get("event_type", "")).strip(),
+                    "url": str(r.get("url", "")).strip(),
+                    "title": title,
+                },
+                relevance_runtime,
+            )
+            relevance_recomputed += 1
         if str(track).strip().lower() == "drop":
             if str(explain.get("final_reason", "")).strip() == "bio_general_without_diagnostic_anchor":
                 dropped_bio_general_count += 1
@@ -591,7 +673,7 @@ def render_digest_from_assets(
             rr["region"] = region_in
             rr["region_source"] = "item"
         else:
-            rm = map_classify_region(str(rr.get("url", "")).strip(), region_maps)
+            rm = map_classify_region(parsed, region_maps)
             rr["region"] = rm
             rr["region_source"] = "domain_map" if rm != "__unknown__" else "unknown"
         if lane_in != "__unknown__":
@@ -619,10 +701,10 @@ def render_digest_from_assets(
                             str(rr.get("summary", "")).strip(),
                         ]
                     ),
-                    url=str(rr.get("url", "")).strip(),
+                    url=parsed,
                 )
                 wk = _event_weight_key(et)
-                wres = opportunity_store.append_signal(
+                opportunity_signals.append(
                     {
                         "date": date_str,
                         "region": str(rr.get("region", "")).strip() or "__unknown__",
@@ -630,18 +712,26 @@ def render_digest_from_assets(
                         "event_type": et,
                         "weight": int(EVENT_WEIGHT.get(wk, 1)),
                         "source_id": str(rr.get("source_id", "")).strip(),
-                        "url_norm": url_norm(str(rr.get("url", "")).strip()),
+                        "url_norm": parsed.norm,
                     }
-                    ,
-                    dedupe_enabled=opportunity_dedupe_enabled,
-                    tail_lines_scan=opportunity_tail_lines_scan,
                 )
-                opportunity_signals_written += int((wres or {}).get("written", 0) or 0)
-                opportunity_signals_deduped += int((wres or {}).get("deduped", 0) or 0)
-                opportunity_signals_dropped_probe += int((wres or {}).get("dropped_probe", 0) or 0)
             except Exception:
                 pass
 
+    # One buffered append per day file instead of one open/append/close per kept item.
+    if opportunity_store is not None and opportunity_signals:
+        try:
+            wres = opportunity_store.append_signals_batch(
+                opportunity_signals,
+                dedupe_enabled=opportunity_dedupe_enabled,
+                tail_lines_scan=opportunity_tail_lines_scan,
+            )
+            opportunity_signals_written += int((wres or {}).get("written", 0) or 0)
+            opportunity_signals_deduped += int((wres or {}).get("deduped", 0) or 0)
+            opportunity_signals_dropped_probe += int((wres or {}).get("dropped_probe", 0) or 0)
+        except Exception:
+            pass
+
     core_items = [r for r in items if str(r.get("track", "")) == "core" and int(r.get("relevance_level", 0) or 0) >= int(core_min_level_for_A)]
     frontier_items = [r for r in items if str(r.get("track", "")) == "frontier" and int(r.get("relevance_level", 0) or 0) >= int(frontier_min_level_for_F)]
 
@@ -666,7 +756,8 @@ def render_digest_from_assets(
         lines.append(f"{lbl_platform}：跨平台/未标注")
         lines.append("")
     else:
-        for idx, r in enumerate(top, 1):
+        prepared: list[dict[str, Any]] = []
+        for r in top:
             analysis = None
             item_key = ""
             evidence_snippet, evidence_from = _extract_evidence_snippet(r, max_chars=240)
@@ -695,12 +786,24 @@ def render_digest_from_assets(
             else:
                 if evidence_ok:
                     evidence_present_core_count += 1
+            content_key = ""
             if enable_analysis_cache:
                 item_key = AnalysisCacheStore.item_key(r)
+                content_key = AnalysisCacheStore.content_key(
+                    r,
+                    model=content_model_sig,
+                    prompt_version=prompt_version,
+                    snippet=evidence_snippet if evidence_ok else "",
+                )
                 if analysis is not None:
                     cache_miss += 1
                 elif not always_generate and cache_store is not None:
-                    analysis = cache_store.get(item_key, run_day)
+                    analysis = cache_store.get_content(content_key, max_age_days=content_cache_days)
+                    if analysis and str(analysis.get("cache_day", "")) != run_day.isoformat():
+                        cache_cross_day_hit += 1
+                    if not analysis:
+                        # Day-file entries predate the content index (or were written without one).
+                        analysis = cache_store.get(item_key, run_day)
                     if analysis:
                         cache_hit += 1
                         computed_un = url_norm(str(r.get("url", "")).strip())
@@ -712,12 +815,47 @@ def render_digest_from_assets(
                         cache_miss += 1
                 else:
                     cache_miss += 1
+            prepared.append(
+                {
+                    "item": r,
+                    "analysis": analysis,
+                    "item_key": item_key,
+                    "content_key": content_key,
+                    "evidence_snippet": evidence_snippet,
+                    "evidence_from": evidence_from,
+                    "evidence_ok": evidence_ok,
+                }
+            )
+
+        # Prefetch: every cache miss is generated up front (concurrently, rate limited), then rendered in order.
+        pending = [p for p in prepared if p["analysis"] is None]
+        outcomes = generate_many(
+            generator,
+            [p["item"] for p in pending],
+            rules=analysis_cfg,
+            max_workers=generate_workers,
+            rate_per_sec=generate_rate_per_sec,
+        )
+        for p, outcome in zip(pending, outcomes):
+            p["outcome"] = outcome
+            generate_latencies_ms.append(outcome.latency_ms)
+
+        for idx, p in enumerate(prepared, 1):
+            r = p["item"]
+            analysis = p["analysis"]
+            item_key = p["item_key"]
+            content_key = p["content_key"]
+            evidence_snippet = p["evidence_snippet"]
+            evidence_from = p["evidence_from"]
+            evidence_ok = p["evidence_ok"]
             if analysis is None:
-                try:
-                    analysis = generator.generate(r, rules=analysis_cfg)
+                outcome = p["outcome"]
+                if outcome.analysis is not None:
+                    analysis = outcome.analysis
                     generated_count += 1
-                except Exception as e:
-                    analysis = degraded_analysis(r, str(e))
+                    _add_token_usage(generated_tokens, analysis.get("token_usage"))
+                else:
+                    analysis = degraded_analysis(r, outcome.error)
                 if bool(analysis.get("degraded")):
                     degraded_count += 1
                     rs = str(analysis.get("degraded_reason", "")).strip() or "analysis_generation_failed"
@@ -742,6 +880,8 @@ def render_digest_from_assets(
                         }
                     )
                     cache_store.put(item_key, payload, run_day)
+                    if not bool(analysis.get("degraded")):
+                        cache_store.put_content(content_key, {**payload, "cache_day": run_day.isoformat()})
             elif enable_analysis_cache and cache_store is not None and item_key:
                 payload = dict(analysis)
                 payload.update(
@@ -900,9 +1040,11 @@ def render_digest_from_assets(
     )
     reason_top = "; ".join([f"{k}:{v}" for k, v in sorted(degraded_reasons.items(), key=lambda kv: (-kv[1], kv[0]))[:3]]) or "无"
     lines.append(
-        f"analysis_cache_hit/miss：{cache_hit}/{cache_miss} | analysis_cache_key_mismatch：{cache_key_mismatch} | generated_count：{generated_count} | "
+        f"analysis_cache_hit/miss：{cache_hit}/{cache_miss} | analysis_cache_cross_day_hit：{cache_cross_day_hit} | "
+        f"analysis_cache_key_mismatch：{cache_key_mismatch} | generated_count：{generated_count} | "
         f"degraded_count：{degraded_count} | degraded_reason_top3：{reason_top}"
     )
+    lines.append(f"relevance_reused/recomputed：{relevance_reused}/{relevance_recomputed} | relevance_rules_fingerprint：{relevance_fp}")
     bio_top = "; ".join([f"{k}:{v}" for k, v in sorted(bio_general_terms_count.items(), key=lambda kv: (-kv[1], kv[0]))[:5]]) or "无"
     lines.append(
         f"dropped_bio_general_count：{dropped_bio_general_count} | top_bio_general_terms：{bio_top}"
@@ -1000,10 +1142,20 @@ def render_digest_from_assets(
         lines.append("分流规则缺口说明：collect 资产窗口内无条目，请检查 collect 调度、信源可达性和资产目录。")
     txt = "\n".join(lines).rstrip() + "\n"
     meta = {
+        "relevance_rules_fingerprint": relevance_fp,
+        "relevance_reused": relevance_reused,
+        "relevance_recomputed": relevance_recomputed,
         "analysis_cache_hit": cache_hit,
         "analysis_cache_miss": cache_miss,
         "analysis_cache_key_mismatch": cache_key_mismatch,
+        "analysis_cache_cross_day_hit": cache_cross_day_hit,
+        "analysis_cache_cross_day_hit_rate": round(cache_cross_day_hit / max(1, cache_hit + cache_miss), 4),
+        "analysis_content_cache_days": content_cache_days,
         "analysis_generated_count": generated_count,
+        "analysis_generate_workers": generate_workers,
+        "analysis_generate_rate_per_sec": generate_rate_per_sec,
+        "analysis_generate_latency_ms": latency_percentiles(generate_latencies_ms),
+        "analysis_token_usage": generated_tokens,
         "analysis_degraded_count": degraded_count,
         "analysis_degraded_reason_top3": [
             {"reason": k, "count": v}
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import json
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from app.services.artifact_io import artifact_glob, artifact_parts, artifact_write_lock, iter_artifact_lines
+
+COLUMNAR_SUFFIX = ".cols"
+COLUMNAR_MAGIC = b"IVDCOL1\n"
+DAY_FILE_RE = re.compile(r"^items-(\d{8})\.(?:jsonl|cols)$")
+
+_HEADER_LEN = struct.Struct(">I")
+_MISSING = object()
+_DERIVE = object()
+
+
+def collect_asset_format() -> str:
+    """`COLLECT_ASSET_FORMAT`: `jsonl` (default) or `columnar` (seal finished days after each collect)."""
+    return "columnar" if str(os.environ.get("COLLECT_ASSET_FORMAT", "")).strip().lower() == "columnar" else "jsonl"
+
+
+def _derive_raw_text(row: dict[str, Any]) -> Any:
+    title, summary = row.get("title"), row.get("summary")
+    if not isinstance(title, str) or not isinstance(summary, str):
+        return _MISSING
+    return f"{title} {summary}".strip()
+
+
+def _derive_normalized_text(row: dict[str, Any]) -> Any:
+    raw = row.get("raw_text")
+    if not isinstance(raw, str):
+        return _MISSING
+    return re.sub(r"\s+", " ", raw).strip().lower()
+
+
+# Columns the collect writer derives from others: stored only where a row differs (stubs).
+_DERIVED: dict[str, tuple[tuple[str, ...], Any]] = {
+    "raw_text": (("title", "summary"), _derive_raw_text),
+    "normalized_text": (("raw_text",), _derive_normalized_text),
+}
+
+
+def _value_key(v: Any) -> Any:
+    if isinstance(v, (dict, list)):
+        return "\x00" + json.dumps(v, ensure_ascii=False, sort_keys=True)
+    return (type(v).__name__, v)
+
+
+def _merge_key_order(order: list[str], keys: Iterable[str]) -> None:
+    """Add unseen keys right after the key that precedes them in this row."""
+    prev: str | None = None
+    for k in keys:
+        if k not in order:
+            order.insert(order.index(prev) + 1 if prev is not None else 0, k)
+        prev = k
+
+
+def _encode_column(values: list[Any], derived: bool) -> dict[str, Any]:
+    missing = [i for i, v in enumerate(values) if v is _MISSING]
+    payload: dict[str, Any] = {}
+    if missing:
+        payload["missing"] = missing
+    if derived:
+        nulls = [i for i, v in enumerate(values) if v is None]
+        if nulls:
+            payload["nulls"] = nulls
+    present = [None if (v is _MISSING or v is _DERIVE) else v for v in values]
+    index: dict[Any, int] = {}
+    distinct: list[Any] = []
+    codes: list[int] = []
+    for v in present:
+        k = _value_key(v)
+        code = index.get(k)
+        if code is None:
+            code = index[k] = len(distinct)
+            distinct.append(v)
+        codes.append(code)
+    if len(distinct) <= max(1, len(values) // 2):
+        payload.update({"enc": "dict", "dict": distinct, "codes": codes})
+    else:
+        payload.update({"enc": "plain", "values": present})
+    return payload
+
+
+def write_columnar(path: Path, rows: list[dict[str, Any]], *, level: int = 6) -> int:
+    """
+    Write collect rows to a sealed columnar day file and return its size. Each column is
+    a separately gzip-compressed block (dictionary-encoded when it has few distinct values,
+    e.g. source/group/track), so readers decompress only the columns they project.
+    """
+    path = Path(path)
+    order: list[str] = []
+    for r in rows:
+        _merge_key_order(order, r.keys())
+    blocks: list[bytes] = []
+    columns: dict[str, Any] = {}
+    offset = 0
+    for name in order:
+        derive = _DERIVED.get(name)
+        values: list[Any] = []
+        for r in rows:
+            v = r.get(name, _MISSING)
+            if derive is not None and v is not _MISSING and v is not None and derive[1](r) == v:
+                v = _DERIVE  # stored as null, rebuilt by the reader
+            values.append(v)
+        blob = gzip.compress(
+            json.dumps(_encode_column(values, derive is not None), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            compresslevel=level,
+            mtime=0,
+        )
+        columns[name] = {"offset": offset, "length": len(blob)}
+        blocks.append(blob)
+        offset += len(blob)
+    header = json.dumps(
+        {"rows": len(rows), "order": order, "columns": columns, "derived": [c for c in _DERIVED if c in columns]},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    with tmp.open("wb") as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for blob in blocks:
+            f.write(blob)
+    os.replace(tmp, path)
+    return path.stat().st_size
+
+
+class ColumnarDayFile:
+    """Reader for one sealed day file; columns are decoded on first use and cached."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+                raise ValueError(f"not a columnar collect file: {self.path}")
+            (n,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+            header = json.loads(f.read(n).decode("utf-8"))
+        self._data_start = len(COLUMNAR_MAGIC) + _HEADER_LEN.size + n
+        self.row_count = int(header.get("rows", 0))
+        self.order: list[str] = list(header.get("order", []))
+        self._blocks: dict[str, dict[str, int]] = dict(header.get("columns", {}))
+        self._derived = set(header.get("derived", []))
+        self._cache: dict[str, list[Any]] = {}
+
+    @property
+    def loaded_columns(self) -> set[str]:
+        return set(self._cache)
+
+    def _decode(self, name: str) -> list[Any]:
+        meta = self._blocks[name]
+        with self.path.open("rb") as f:
+            f.seek(self._data_start + int(meta["offset"]))
+            payload = json.loads(gzip.decompress(f.read(int(meta["length"]))).decode("utf-8"))
+        if payload.get("enc") == "dict":
+            table = payload.get("dict", [])
+            values = [table[c] for c in payload.get("codes", [])]
+        else:
+            values = list(payload.get("values", []))
+        for i in payload.get("missing", []):
+            values[i] = _MISSING
+        if name in self._derived:
+            deps, fn = _DERIVED[name]
+            nulls = set(payload.get("nulls", []))
+            dep_cols = {d: self.column(d) for d in deps if d in self._blocks}
+            for i, v in enumerate(values):
+                if v is None and i not in nulls:
+                    values[i] = fn({d: col[i] for d, col in dep_cols.items()})
+        return values
+
+    def column(self, name: str) -> list[Any]:
+        """All values of one column (the internal missing marker where a row lacks the key)."""
+        if name not in self._blocks:
+            return [_MISSING] * self.row_count
+        col = self._cache.get(name)
+        if col is None:
+            col = self._cache[name] = self._decode(name)
+        return col
+
+    def rows(self, columns: Iterable[str] | None = None, indexes: Iterable[int] | None = None) -> list[dict[str, Any]]:
+        """Rows as dicts, restricted to `columns` (all by default) and to `indexes` (all by default)."""
+        wanted = None if columns is None else set(columns)
+        names = self.order if wanted is None else [c for c in self.order if c in wanted]
+        cols = [(n, self.column(n)) for n in names]
+        idx = range(self.row_count) if indexes is None else indexes
+        out: list[dict[str, Any]] = []
+        for i in idx:
+            out.append({n: col[i] for n, col in cols if col[i] is not _MISSING})
+        return out
+
+
+def is_missing(value: Any) -> bool:
+    return value is _MISSING
+
+
+def day_of(path: Path) -> dt.date | None:
+    m = DAY_FILE_RE.match(Path(path).name)
+    if not m:
+        return None
+    try:
+        return dt.datetime.strptime(m.group(1), "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def columnar_path(day_file: Path) -> Path:
+    """`items-YYYYMMDD.jsonl` -> `items-YYYYMMDD.cols`."""
+    day_file = Path(day_file)
+    return day_file.with_name(day_file.name.rsplit(".", 1)[0] + COLUMNAR_SUFFIX)
+
+
+def jsonl_path(day_file: Path) -> Path:
+    day_file = Path(day_file)
+    return day_file.with_name(day_file.name.rsplit(".", 1)[0] + ".jsonl")
+
+
+def collect_day_files(base_dir: Path) -> dict[dt.date, Path]:
+    """Day -> `items-YYYYMMDD.jsonl` (logical name) for every day stored sealed, as JSONL, or both."""
+    out: dict[dt.date, Path] = {}
+    for p in artifact_glob(base_dir, "items-*.jsonl") + sorted(Path(base_dir).glob("items-*" + COLUMNAR_SUFFIX)):
+        d = day_of(p)
+        if d is not None:
+            out.setdefault(d, jsonl_path(p))
+    return dict(sorted(out.items()))
+
+
+def _iter_jsonl_rows(path: Path, columns: set[str] | None) -> Iterator[dict[str, Any]]:
+    for ln in iter_artifact_lines(path):
+        ln = ln.strip()
+        if not ln:
+            continue
+        try:
+            r = json.loads(ln)
+        except Exception:
+            continue
+        if not isinstance(r, dict):
+            continue
+        yield r if columns is None else {k: v for k, v in r.items() if k in columns}
+
+
+def iter_day_rows(day_file: Path, columns: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Rows of one collect day in write order: the sealed columnar part first (if any), then
+    JSONL appended since. `columns` projects rows to those keys; for sealed days only the
+    projected column blocks are read.
+    """
+    cols = None if columns is None else set(columns)
+    sealed = columnar_path(day_file)
+    if sealed.is_file():
+        yield from ColumnarDayFile(sealed).rows(cols)
+    if artifact_parts(jsonl_path(day_file)):
+        yield from _iter_jsonl_rows(jsonl_path(day_file), cols)
+
+
+def iter_collect_rows(
+    base_dir: Path,
+    *,
+    since: dt.date | None = None,
+    until: dt.date | None = None,
+    columns: Iterable[str] | None = None,
+    newest_first: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Rows of every collect day in [since, until] (inclusive; open-ended when None)."""
+    days = collect_day_files(base_dir)
+    for d in sorted(days, reverse=newest_first):
+        if (since is not None and d < since) or (until is not None and d > until):
+            continue
+        try:
+            yield from iter_day_rows(days[d], columns)
+        except (OSError, ValueError):
+            continue
+
+
+def seal_day_file(day_file: Path) -> dict[str, int] | None:
+    """
+    Fold a day's JSONL (plain or compressed) into its columnar file, merging with rows
+    sealed earlier, and remove the JSONL parts. None when there was nothing to seal.
+
+    Runs under the collect appenders' lock (see `artifact_write_lock`): a late append
+    either lands before the read and is sealed, or waits and starts a fresh JSONL part.
+    """
+    day_file = jsonl_path(day_file)
+    if not artifact_parts(day_file):
+        return None
+    sealed = columnar_path(day_file)
+    with artifact_write_lock(day_file):
+        parts = artifact_parts(day_file)
+        before = sum(p.stat().st_size for p in parts) + (sealed.stat().st_size if sealed.is_file() else 0)
+        rows = list(iter_day_rows(day_file))
+        after = write_columnar(sealed, rows)
+        for p in parts:
+            p.unlink(missing_ok=True)
+    return {"rows": len(rows), "bytes_before": before, "bytes_after": after}
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import json
 import sqlite3
+import time
 from urllib.parse import urlparse, unquote
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import Column, Integer, Table, text
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.db.base import Base
 from app.db.engine import make_engine
 from app.db.models.rules import (
     ContentRulesVersion,
@@ -21,6 +24,8 @@ from app.db.models.rules import (
     SchedulerRulesVersion,
     Source,
 )
+from app.db.types import JSONText
+from app.services.merkle_verify import DEFAULT_CHUNK_SIZE, DEFAULT_FANOUT, DEFAULT_LEAF_SIZE, merkle_verify, table_sides
 from app.services.rules_store_sa import SQLAlchemyRulesStore
 
 MVP_TABLES = [
@@ -387,6 +392,356 @@ def migrate_sqlite_to_target(
         session.close()
 
 
+# Bulk path: every data table, streamed in keyset batches.
+BULK_TABLES = MVP_TABLES + [
+    "run_executions",
+    "source_fetch_events",
+    "report_artifacts",
+    "send_attempts",
+    "dedupe_keys",
+    "raw_items",
+    "stories",
+    "story_items",
+]
+
+
+def _bulk_table(table: str) -> Table:
+    return Base.metadata.tables[table]
+
+
+def _bulk_pk(table: Table) -> Column:
+    pk = list(table.primary_key.columns)
+    if len(pk) != 1:
+        raise RuntimeError(f"bulk migration needs a single-column primary key: {table.name}")
+    return pk[0]
+
+
+def _pk_is_int(pk: Column) -> bool:
+    return isinstance(pk.type, Integer)
+
+
+def _source_tables(src: sqlite3.Connection) -> set[str]:
+    return {str(r[0]) for r in src.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+
+
+def _source_columns(src: sqlite3.Connection, table: Table) -> list[str]:
+    present = {str(r[1]) for r in src.execute(f"PRAGMA table_info({table.name})").fetchall()}
+    return [c.name for c in table.columns if c.name in present]
+
+
+def _bulk_value(col: Column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(col.type, JSONText):
+        return _norm_json_obj(value)
+    if isinstance(col.type, Integer):
+        return int(value)
+    return str(value)
+
+
+def _copy_text_field(value: Any, *, as_json: bool = False) -> str:
+    if value is None:
+        return "\\N"
+    if as_json:
+        value = json.dumps(value, ensure_ascii=False)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _pg_copy_upsert(session: Session, table: Table, cols: list[str], rows: list[dict[str, Any]]) -> bool:
+    """
+    COPY one batch into a temp staging table, then upsert it into `table`. Returns False
+    when the driver has no COPY support (caller falls back to multi-row INSERT).
+    """
+    raw = session.connection().connection.dbapi_connection
+    cur = raw.cursor()
+    try:
+        if not hasattr(cur, "copy") and not hasattr(cur, "copy_expert"):
+            return False
+        pk = _bulk_pk(table).name
+        json_cols = {c.name for c in table.columns if isinstance(c.type, JSONText)}
+        stage = f"_bulk_stage_{table.name}"
+        col_sql = ", ".join(f'"{c}"' for c in cols)
+        updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in cols if c != pk)
+        payload = "".join(
+            "\t".join(_copy_text_field(r.get(c), as_json=c in json_cols) for c in cols) + "\n" for r in rows
+        )
+        cur.execute(
+            f'CREATE TEMP TABLE IF NOT EXISTS "{stage}" (LIKE "{table.name}" INCLUDING DEFAULTS) ON COMMIT DELETE ROWS'
+        )
+        copy_sql = f'COPY "{stage}" ({col_sql}) FROM STDIN'
+        if hasattr(cur, "copy"):  # psycopg 3
+            with cur.copy(copy_sql) as cp:
+                cp.write(payload)
+        else:  # psycopg2
+            cur.copy_expert(copy_sql, io.StringIO(payload))
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        cur.execute(
+            f'INSERT INTO "{table.name}" ({col_sql}) SELECT {col_sql} FROM "{stage}" '
+            f'ON CONFLICT ("{pk}") {conflict}'
+        )
+        return True
+    finally:
+        cur.close()
+
+
+def _insert_upsert(session: Session, table: Table, cols: list[str], rows: list[dict[str, Any]]) -> None:
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise RuntimeError(f"bulk migration does not support target dialect: {dialect}")
+    pk = _bulk_pk(table).name
+    # Stay under the driver's bind-parameter limit (SQLite < 3.32 allows only 999).
+    max_params = 999 if (dialect == "sqlite" and sqlite3.sqlite_version_info < (3, 32)) else 30000
+    step = max(1, max_params // max(1, len(cols)))
+    for i in range(0, len(rows), step):
+        stmt = dialect_insert(table).values([{c: r.get(c) for c in cols} for r in rows[i : i + step]])
+        updates = {c: stmt.excluded[c] for c in cols if c != pk}
+        if updates:
+            stmt = stmt.on_conflict_do_update(index_elements=[pk], set_=updates)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[pk])
+        session.execute(stmt)
+
+
+def _sync_pk_sequence(session: Session, table: Table, pk: Column) -> bool:
+    """
+    Advance the Postgres serial sequence behind an integer primary key past the copied ids.
+
+    Bulk rows carry their explicit ids, which never touch the sequence, so without this
+    the first application insert after cutover collides with a migrated row. Other
+    targets derive the next id from MAX(pk) and need nothing.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    session.execute(
+        text(
+            f'SELECT setval(pg_get_serial_sequence(:table, :pk), COALESCE((SELECT MAX("{pk.name}") FROM "{table.name}"), 1), true)'
+        ),
+        {"table": table.name, "pk": pk.name},
+    )
+    session.commit()
+    return True
+
+
+def bulk_migrate_sqlite_to_target(
+    *,
+    project_root: Path,
+    target_url: str,
+    source_sqlite_path: Path | None = None,
+    source_sqlite_url_or_path: str | Path | None = None,
+    batch_size: int = 5000,
+    resume: bool = True,
+    checkpoint_path: Path | None = None,
+    tables: list[str] | None = None,
+    use_copy: bool = True,
+) -> dict[str, Any]:
+    """
+    Streaming migration of all data tables (BULK_TABLES), including the feed/event tables
+    the ORM path cannot move at production size.
+
+    Rows are read in primary-key keyset batches and written per batch with Postgres
+    `COPY FROM STDIN` into a staging table + `INSERT .. ON CONFLICT` (multi-row
+    `INSERT .. ON CONFLICT` on other targets or when the driver has no COPY), so a
+    resumed batch is idempotent. Checkpoints are the same file/table ones used by
+    migrate_sqlite_to_target and advance after every committed batch. Tables with an
+    integer primary key get their Postgres sequence moved past the copied ids.
+    """
+    src_path = _sqlite_path_from_input(source_sqlite_url_or_path or source_sqlite_path, project_root)
+    if not src_path.exists():
+        raise RuntimeError(f"source sqlite not found: {src_path}")
+
+    src = _connect_source(src_path)
+    session = _target_session(target_url, project_root)
+    present = _source_tables(src)
+    requested = [t for t in (tables or BULK_TABLES) if t in BULK_TABLES]
+    target_tables = [t for t in requested if t in present]
+    cp_path = checkpoint_path or (project_root / "data" / "db_migrate_checkpoint.json")
+    cp = _load_checkpoint_file(cp_path)
+    if not resume:
+        cp = {"tables": {}, "updated_at": _utc_now(), "status": "reset"}
+        _save_checkpoint_file(cp_path, cp)
+
+    conflicts = _detect_unique_conflicts(src)
+    if conflicts:
+        src.close()
+        session.close()
+        return {
+            "ok": False,
+            "error": "unique_conflicts_detected",
+            "source": str(src_path),
+            "target": target_url,
+            "conflicts": conflicts,
+        }
+
+    _ensure_checkpoint_table(session)
+    if not resume:
+        _clear_checkpoint(session)
+
+    dialect = session.get_bind().dialect.name
+    moved: dict[str, int] = {t: 0 for t in target_tables}
+    checkpoints: dict[str, str | None] = {}
+    stats: dict[str, dict[str, Any]] = {}
+
+    try:
+        for name in target_tables:
+            table = _bulk_table(name)
+            pk = _bulk_pk(table)
+            int_pk = _pk_is_int(pk)
+            cols = _source_columns(src, table)
+            col_map = {c.name: c for c in table.columns}
+            last_key = None
+            if resume:
+                last_key = str((cp.get("tables") or {}).get(name) or "") or None
+                if not last_key:
+                    last_key = _get_checkpoint(session, name)
+            checkpoints[name] = last_key
+            writer = "copy" if (dialect == "postgresql" and use_copy) else "insert"
+            batches = 0
+            t0 = time.monotonic()
+            select_sql = ", ".join(f'"{c}"' for c in cols)
+            while True:
+                if last_key is not None:
+                    key = int(last_key) if int_pk else last_key
+                    rows = src.execute(
+                        f'SELECT {select_sql} FROM {name} WHERE "{pk.name}" > ? ORDER BY "{pk.name}" ASC LIMIT ?',
+                        (key, batch_size),
+                    ).fetchall()
+                else:
+                    rows = src.execute(
+                        f'SELECT {select_sql} FROM {name} ORDER BY "{pk.name}" ASC LIMIT ?', (batch_size,)
+                    ).fetchall()
+                if not rows:
+                    break
+                batch = [{c: _bulk_value(col_map[c], r[c]) for c in cols} for r in rows]
+                if writer == "copy" and not _pg_copy_upsert(session, table, cols, batch):
+                    writer = "insert"
+                if writer == "insert":
+                    _insert_upsert(session, table, cols, batch)
+                session.commit()
+                last_key = str(rows[-1][pk.name])
+                moved[name] += len(rows)
+                batches += 1
+                _set_checkpoint(session, name, last_key)
+                checkpoints[name] = last_key
+                cp_tables = cp.setdefault("tables", {})
+                if isinstance(cp_tables, dict):
+                    cp_tables[name] = last_key
+                _save_checkpoint_file(cp_path, cp)
+            sequence_synced = _sync_pk_sequence(session, table, pk) if int_pk else False
+            elapsed = time.monotonic() - t0
+            stats[name] = {
+                "rows": moved[name],
+                "batches": batches,
+                "writer": writer,
+                "sequence_synced": sequence_synced,
+                "seconds": round(elapsed, 3),
+                "rows_per_sec": round(moved[name] / elapsed, 1) if elapsed > 0 else 0.0,
+            }
+
+        return {
+            "ok": True,
+            "source": str(src_path),
+            "target": target_url,
+            "mode": "bulk",
+            "batch_size": int(batch_size),
+            "resume": bool(resume),
+            "moved": moved,
+            "stats": stats,
+            "checkpoints": checkpoints,
+            "checkpoint_file": str(cp_path),
+            "tables": target_tables,
+            "missing_in_source": [t for t in requested if t not in present],
+        }
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        src.close()
+        session.close()
+
+
+def verify_sqlite_vs_target_chunked(
+    *,
+    project_root: Path,
+    target_url: str,
+    source_sqlite_path: Path | None = None,
+    source_sqlite_url_or_path: str | Path | None = None,
+    tables: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fanout: int = DEFAULT_FANOUT,
+    leaf_size: int = DEFAULT_LEAF_SIZE,
+    max_reported: int = 20,
+    max_keys: int = 200,
+    deadline_seconds: float = 0,
+    state_path: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Verify a bulk migration with the Merkle range verifier (app.services.merkle_verify):
+    primary-key ranges cut from the source every `chunk_size` rows are compared by count
+    and content hash, and only mismatching ranges are drilled into to list diverged keys.
+    `deadline_seconds` + `state_path` make it an incremental, time-bounded check.
+    """
+    src_path = _sqlite_path_from_input(source_sqlite_url_or_path or source_sqlite_path, project_root)
+    if not src_path.exists():
+        raise RuntimeError(f"source sqlite not found: {src_path}")
+    src_engine = make_engine(f"sqlite:///{src_path.as_posix()}")
+    dst_engine = make_engine(target_url)
+    try:
+        requested = [t for t in (tables or BULK_TABLES) if t in BULK_TABLES]
+        out = merkle_verify(
+            src_engine,
+            dst_engine,
+            requested,
+            chunk_size=chunk_size,
+            fanout=fanout,
+            leaf_size=leaf_size,
+            max_keys=max_keys,
+            deadline_seconds=deadline_seconds,
+            state_path=state_path,
+        )
+        mismatches: list[dict[str, Any]] = []
+        counts: dict[str, dict[str, int]] = {}
+        chunks: dict[str, dict[str, int]] = {}
+        diverged: dict[str, list[dict[str, Any]]] = {}
+        for name, res in out["tables"].items():
+            sides = table_sides(src_engine, dst_engine, name)
+            if sides is not None:
+                counts[name] = {"source": sides[0].count(), "target": sides[1].count()}
+            chunks[name] = {"chunks": res["chunks_checked"], "mismatched": res["chunks_mismatched"]}
+            if res["diverged_keys"]:
+                diverged[name] = res["diverged_keys"]
+            for rng in res["mismatched_ranges"]:
+                if len(mismatches) < max_reported:
+                    mismatches.append({"table": name, "type": "chunk_hash_mismatch", **rng})
+        return {
+            "ok": bool(out["ok"]),
+            "complete": bool(out["complete"]),
+            "source": str(src_path),
+            "target": target_url,
+            "method": "merkle",
+            "chunk_size": int(chunk_size),
+            "counts": counts,
+            "chunks": chunks,
+            "mismatches": mismatches,
+            "diverged_keys": diverged,
+            "tables": list(out["tables"]),
+            "skipped_tables": out["skipped_tables"],
+            "state_file": out["state_file"],
+        }
+    finally:
+        src_engine.dispose()
+        dst_engine.dispose()
+
+
 def verify_sqlite_vs_target(
     *,
     project_root: Path,
@@ -395,7 +750,22 @@ def verify_sqlite_vs_target(
     source_sqlite_url_or_path: str | Path | None = None,
     tables: list[str] | None = None,
     sample_rate: float = 0.05,
+    method: str = "rows",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    deadline_seconds: float = 0,
+    state_path: Path | None = None,
 ) -> dict[str, Any]:
+    if method == "merkle":
+        return verify_sqlite_vs_target_chunked(
+            project_root=project_root,
+            target_url=target_url,
+            source_sqlite_path=source_sqlite_path,
+            source_sqlite_url_or_path=source_sqlite_url_or_path,
+            tables=tables,
+            chunk_size=chunk_size,
+            deadline_seconds=deadline_seconds,
+            state_path=state_path,
+        )
     src_path = _sqlite_path_from_input(source_sqlite_url_or_path or source_sqlite_path, project_root)
     src = _connect_source(src_path)
     session = _target_session(target_url, project_root)
@@ -507,7 +877,21 @@ def verify_sqlite_vs_target(
         session.close()
 
 
-def dual_replay_compare(*, project_root: Path, primary_url: str, secondary_url: str) -> dict[str, Any]:
+def dual_replay_compare(
+    *,
+    project_root: Path,
+    primary_url: str,
+    secondary_url: str,
+    tables: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    deadline_seconds: float = 0,
+    state_path: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Compare active rules and the source list between primary and secondary. `tables`
+    (e.g. the feed tables) are additionally compared with the Merkle range verifier,
+    which only drills into mismatching key ranges and lists diverged keys.
+    """
     primary = SQLAlchemyRulesStore(project_root=project_root, database_url=primary_url, auto_init=False)
     secondary = SQLAlchemyRulesStore(project_root=project_root, database_url=secondary_url, auto_init=False)
 
@@ -540,9 +924,39 @@ def dual_replay_compare(*, project_root: Path, primary_url: str, secondary_url:
             }
         )
 
-    return {
+    merkle: dict[str, Any] | None = None
+    if tables:
+        p_engine = make_engine(primary_url)
+        s_engine = make_engine(secondary_url)
+        try:
+            merkle = merkle_verify(
+                p_engine,
+                s_engine,
+                [t for t in tables if t in BULK_TABLES],
+                chunk_size=chunk_size,
+                deadline_seconds=deadline_seconds,
+                state_path=state_path,
+            )
+        finally:
+            p_engine.dispose()
+            s_engine.dispose()
+        for name in merkle["mismatched_tables"]:
+            res = merkle["tables"][name]
+            mismatches.append(
+                {
+                    "table": name,
+                    "type": "merkle_range_diff",
+                    "chunks_mismatched": res["chunks_mismatched"],
+                    "diverged_count": res["diverged_count"],
+                }
+            )
+
+    out = {
         "ok": len(mismatches) == 0,
         "primary": primary_url,
         "secondary": secondary_url,
         "mismatches": mismatches,
     }
+    if merkle is not None:
+        out["merkle"] = merkle
+    return out
@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session, sessionmaker
 
 from app.db.engine import make_engine
 from app.db.models.rules import RawItem, Story, StoryItem
+from app.services.collect_columnar import collect_day_files, iter_day_rows
 from app.services.event_type_rules import infer_event_type
 from app.services.source_meta_index import build_source_meta_index
 from app.services.zh_enricher import ZhEnricher
@@ -194,7 +195,14 @@ class FeedDBService:
     def __init__(self, database_url: str) -> None:
         self.engine = make_engine(database_url)
         self._Session = sessionmaker(bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False)
-        self.zh_enricher = ZhEnricher(Path(__file__).resolve().parents[2])
+        self._zh_enricher: ZhEnricher | None = None
+
+    @property
+    def zh_enricher(self) -> ZhEnricher:
+        # Built on first feed read; ingest/backfill commands never touch it.
+        if self._zh_enricher is None:
+            self._zh_enricher = ZhEnricher(Path(__file__).resolve().parents[2])
+        return self._zh_enricher
 
     def _session(self) -> Session:
         return self._Session()
@@ -259,89 +267,69 @@ class FeedDBService:
             return {"ok": True, "loaded_files": 0, "upserted": 0, "skipped": 0}
 
         cutoff = dt.date.today() - dt.timedelta(days=max(1, int(scan_artifacts_days)))
-        files: list[Path] = []
-        for p in sorted(collect_dir.glob("items-*.jsonl")):
-            stem = p.stem.replace("items-", "").strip()
-            try:
-                d = dt.datetime.strptime(stem, "%Y%m%d").date()
-            except Exception:
-                continue
-            if d >= cutoff:
-                files.append(p)
+        days = [p for d, p in collect_day_files(collect_dir).items() if d >= cutoff]
 
         upserted = 0
         skipped = 0
         seen_ids: set[str] = set()
         source_meta = build_source_meta_index(project_root)
         with self._session() as s:
-            for p in files:
-                with p.open("r", encoding="utf-8") as f:
-                    for ln in f:
-                        ln = ln.strip()
-                        if not ln:
-                            continue
-                        try:
-                            row = json.loads(ln)
-                        except Exception:
-                            skipped += 1
-                            continue
-                        if not isinstance(row, dict):
-                            skipped += 1
-                            continue
-                        title_raw = str(row.get("title", "")).strip()
-                        url_raw = str(row.get("url", "")).strip()
-                        source_id = str(row.get("source_id", "")).strip()
-                        if not title_raw or not url_raw or not source_id:
-                            skipped += 1
-                            continue
-                        canonical = str(row.get("url_norm", "")).strip() or url_norm(url_raw)
-                        title_norm = _normalize_title(title_raw)
-                        published_at = str(row.get("published_at", "")).strip() or ""
-                        item_id_seed = "|".join([source_id, canonical, title_norm, published_at])
-                        item_id = "ri_" + hashlib.sha1(item_id_seed.encode("utf-8")).hexdigest()[:24]
-                        if item_id in seen_ids:
-                            skipped += 1
-                            continue
-                        seen_ids.add(item_id)
-                        existing = s.get(RawItem, item_id)
-                        if existing is None:
-                            existing = RawItem(id=item_id)
-                            s.add(existing)
-                        existing.source_id = source_id
-                        existing.fetched_at = str(row.get("fetched_at", "")).strip() or _iso_now()
-                        existing.published_at = published_at or None
-                        existing.title_raw = title_raw
-                        existing.title_norm = title_norm
-                        existing.url_raw = url_raw
-                        existing.canonical_url = canonical
-                        existing.content_snippet = (
-                            str(row.get("evidence_snippet", "")).strip()
-                            or str(row.get("summary", "")).strip()
-                            or str(row.get("description", "")).strip()
-                            or None
-                        )
-                        existing.raw_payload = row
-                        meta = source_meta.get(source_id, {})
-                        group = str(meta.get("group", "")).strip() or str(row.get("source_group", "")).strip() or "unknown"
-                        region = str(meta.get("region", "")).strip() or "Global"
-                        trust_tier = str(meta.get("trust_tier", "")).strip().upper() or str(row.get("trust_tier", "")).strip().upper() or "C"
-                        existing.source_group = group
-                        existing.region = region
-                        existing.trust_tier = trust_tier
-                        existing.event_type = infer_event_type(
-                            group=group,
-                            title=title_raw,
-                            snippet=existing.content_snippet,
-                            source_id=source_id,
-                            url=canonical,
-                        )
-                        try:
-                            existing.priority = int(meta.get("priority", row.get("priority", 10)) or 10)
-                        except Exception:
-                            existing.priority = 10
-                        upserted += 1
+            for p in days:
+                for row in iter_day_rows(p):
+                    title_raw = str(row.get("title", "")).strip()
+                    url_raw = str(row.get("url", "")).strip()
+                    source_id = str(row.get("source_id", "")).strip()
+                    if not title_raw or not url_raw or not source_id:
+                        skipped += 1
+                        continue
+                    canonical = str(row.get("url_norm", "")).strip() or url_norm(url_raw)
+                    title_norm = _normalize_title(title_raw)
+                    published_at = str(row.get("published_at", "")).strip() or ""
+                    item_id_seed = "|".join([source_id, canonical, title_norm, published_at])
+                    item_id = "ri_" + hashlib.sha1(item_id_seed.encode("utf-8")).hexdigest()[:24]
+                    if item_id in seen_ids:
+                        skipped += 1
+                        continue
+                    seen_ids.add(item_id)
+                    existing = s.get(RawItem, item_id)
+                    if existing is None:
+                        existing = RawItem(id=item_id)
+                        s.add(existing)
+                    existing.source_id = source_id
+                    existing.fetched_at = str(row.get("fetched_at", "")).strip() or _iso_now()
+                    existing.published_at = published_at or None
+                    existing.title_raw = title_raw
+                    existing.title_norm = title_norm
+                    existing.url_raw = url_raw
+                    existing.canonical_url = canonical
+                    existing.content_snippet = (
+                        str(row.get("evidence_snippet", "")).strip()
+                        or str(row.get("summary", "")).strip()
+                        or str(row.get("description", "")).strip()
+                        or None
+                    )
+                    existing.raw_payload = row
+                    meta = source_meta.get(source_id, {})
+                    group = str(meta.get("group", "")).strip() or str(row.get("source_group", "")).strip() or "unknown"
+                    region = str(meta.get("region", "")).strip() or "Global"
+                    trust_tier = str(meta.get("trust_tier", "")).strip().upper() or str(row.get("trust_tier", "")).strip().upper() or "C"
+                    existing.source_group = group
+                    existing.region = region
+                    existing.trust_tier = trust_tier
+                    existing.event_type = infer_event_type(
+                        group=group,
+                        title=title_raw,
+                        snippet=existing.content_snippet,
+                        source_id=source_id,
+                        url=canonical,
+                    )
+                    try:
+                        existing.priority = int(meta.get("priority", row.get("priority", 10)) or 10)
+                    except Exception:
+                        existing.priority = 10
+                    upserted += 1
             s.commit()
-        return {"ok": True, "loaded_files": len(files), "upserted": upserted, "skipped": skipped}
+        return {"ok": True, "loaded_files": len(days), "upserted": upserted, "skipped": skipped}
 
     def rebuild_stories(self, *, window_days: int = 30) -> dict[str, Any]:
         cutoff_dt = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=max(1, int(window_days)))
@@ -7,6 +7,7 @@ import json
 from pathlib import Path
 from typing import Any
 
+from app.services.collect_columnar import iter_collect_rows
 from app.utils.url_norm import url_norm
 
 
@@ -82,27 +83,31 @@ def _decode_cursor(cur: str | None) -> tuple[dt.datetime | None, str]:
         return None, ""
 
 
+# Columns _project_feed_row reads; sealed collect days decode only these.
+FEED_COLUMNS = (
+    "dedupe_key",
+    "url_norm",
+    "url",
+    "published_at",
+    "source_id",
+    "title",
+    "source_group",
+    "region",
+    "lane",
+    "event_type",
+    "trust_tier",
+    "summary",
+    "relevance_level",
+    "track",
+    "source",
+)
+
+
 def _iter_collect_rows(project_root: Path) -> list[dict[str, Any]]:
     base = project_root / "artifacts" / "collect"
     if not base.exists():
         return []
-    rows: list[dict[str, Any]] = []
-    for p in sorted(base.glob("items-*.jsonl"), reverse=True):
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                for ln in f:
-                    ln = ln.strip()
-                    if not ln:
-                        continue
-                    try:
-                        r = json.loads(ln)
-                    except Exception:
-                        continue
-                    if isinstance(r, dict):
-                        rows.append(r)
-        except Exception:
-            continue
-    return rows
+    return list(iter_collect_rows(base, columns=FEED_COLUMNS, newest_first=True))
 
 
 def _project_feed_row(row: dict[str, Any]) -> dict[str, Any]:
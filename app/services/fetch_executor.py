@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import contextvars
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, TextIO
+from urllib.parse import urlparse
+
+
+DEFAULT_MAX_WORKERS = 6
+DEFAULT_PER_HOST = 2
+MAX_WORKERS_CAP = 64
+DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+def host_of(url: str) -> str:
+    try:
+        return (urlparse(str(url or "").strip()).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+@dataclass
+class FetchJob:
+    key: str
+    host: str
+    run: Callable[[], Any]
+
+
+class FetchExecutor:
+    """
+    Bounded concurrent runner for per-source fetch jobs.
+
+    - at most `max_workers` jobs run at once, and at most `per_host` per host
+      (jobs with an empty host share no limit);
+    - `deadline_seconds` (> 0) is a budget for the whole batch: once it is spent no new
+      job starts, and jobs still running or queued are reported via `on_skip(job, DEADLINE_EXCEEDED)`
+      (running threads are abandoned, not killed; their late results are discarded);
+    - `on_progress(event)` is called from the caller's thread after every finished job;
+    - results come back in job order regardless of completion order.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+        deadline_seconds: float = 0,
+        on_progress: Callable[[dict[str, Any]], None] | None = None,
+        name: str = "fetch",
+    ) -> None:
+        self.max_workers = max(1, min(MAX_WORKERS_CAP, int(max_workers or 1)))
+        self.per_host = max(1, int(per_host or 1))
+        self.deadline_seconds = max(0.0, float(deadline_seconds or 0))
+        self.on_progress = on_progress
+        self.name = name
+        self.deadline_hit = False
+
+    def map(
+        self,
+        jobs: list[FetchJob],
+        *,
+        on_error: Callable[[FetchJob, BaseException], Any],
+        on_skip: Callable[[FetchJob, str], Any],
+    ) -> list[Any]:
+        n = len(jobs)
+        results: list[Any] = [None] * n
+        if n == 0:
+            return results
+        started = time.monotonic()
+        deadline = started + self.deadline_seconds if self.deadline_seconds > 0 else None
+        queued: deque[int] = deque(range(n))
+        running: dict[Future, int] = {}
+        host_active: dict[str, int] = {}
+        done_n = 0
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, n), thread_name_prefix=self.name)
+        try:
+            while queued or running:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.deadline_hit = True
+                    break
+                self._fill(pool, jobs, queued, running, host_active)
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                finished, _ = wait(list(running), timeout=remaining, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    i = running.pop(fut)
+                    job = jobs[i]
+                    if job.host:
+                        host_active[job.host] -= 1
+                    try:
+                        results[i] = fut.result()
+                        status = "ok"
+                    except Exception as e:
+                        results[i] = on_error(job, e)
+                        status = "error"
+                    done_n += 1
+                    self._progress(job, status, done_n, n, len(running), started)
+            for i in sorted(list(running.values()) + list(queued)):
+                results[i] = on_skip(jobs[i], DEADLINE_EXCEEDED)
+                done_n += 1
+                self._progress(jobs[i], DEADLINE_EXCEEDED, done_n, n, 0, started)
+        finally:
+            pool.shutdown(wait=not self.deadline_hit, cancel_futures=True)
+        return results
+
+    def _fill(
+        self,
+        pool: ThreadPoolExecutor,
+        jobs: list[FetchJob],
+        queued: deque[int],
+        running: dict[Future, int],
+        host_active: dict[str, int],
+    ) -> None:
+        # Start queued jobs in order, skipping (not reordering) ones whose host is saturated.
+        blocked: list[int] = []
+        while queued and len(running) < self.max_workers:
+            i = queued.popleft()
+            host = jobs[i].host
+            if host and host_active.get(host, 0) >= self.per_host:
+                blocked.append(i)
+                continue
+            if host:
+                host_active[host] = host_active.get(host, 0) + 1
+            # Each job runs in a copy of the caller's context (active fetch snapshot session, run env).
+            running[pool.submit(contextvars.copy_context().run, jobs[i].run)] = i
+        queued.extendleft(reversed(blocked))
+
+    def _progress(self, job: FetchJob, status: str, done: int, total: int, running: int, started: float) -> None:
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(
+                {
+                    "key": job.key,
+                    "host": job.host,
+                    "status": status,
+                    "done": done,
+                    "total": total,
+                    "running": running,
+                    "elapsed_ms": int((time.monotonic() - started) * 1000),
+                }
+            )
+        except Exception:
+            pass
+
+
+def progress_printer(label: str, stream: TextIO | None = None) -> Callable[[dict[str, Any]], None]:
+    """on_progress callback that writes one line per finished job (to stderr by default)."""
+    lock = threading.Lock()
+
+    def _print(ev: dict[str, Any]) -> None:
+        out = stream or sys.stderr
+        with lock:
+            out.write(
+                f"[{label}] {ev.get('done')}/{ev.get('total')} {ev.get('key')} {ev.get('status')} "
+                f"running={ev.get('running')} elapsed_ms={ev.get('elapsed_ms')}\n"
+            )
+            out.flush()
+
+    return _print
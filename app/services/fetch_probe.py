@@ -3,12 +3,14 @@ from __future__ import annotations
 import datetime as dt
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import urlparse
 
 import yaml
 
 from app.services.collect_asset_store import CollectAssetStore
+from app.services.fetch_executor import DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST, FetchExecutor, FetchJob, host_of
+from app.services.ops_metrics import record_latest_artifact
 from app.services.source_registry import fetch_source_entries, load_sources_registry_bundle
 
 
@@ -98,6 +100,8 @@ def _classify_error_kind(source: dict[str, Any], result: dict[str, Any]) -> tupl
         return "needs_api_key", "去 api.data.gov / SAM.gov 申请 key，并在 source 的 auth_ref 或 env 注入"
     if et == "dns_error" or "nodename nor servname" in msg or "name or service not known" in msg:
         return "dns", "检查网络/DNS 或代理配置；必要时改为可访问镜像源"
+    if et == "deadline_exceeded":
+        return "deadline", "整体探测时间预算耗尽；提高 deadline_seconds 或减少本次探测的源数量"
     if et == "timeout" or "timed out" in msg:
         return "timeout", "提高 timeout/retry 或降低抓取频率"
     if status == 403 or "403" in msg:
@@ -209,6 +213,10 @@ def run_procurement_probe(
     include_source_groups: list[str] | None = None,
     write_assets: bool = False,
     output_dir: str = "artifacts/procurement",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    deadline_seconds: float = 0,
+    progress: Callable[[dict[str, Any]], None] | None = None,
 ) -> dict[str, Any]:
     include_source_ids = include_source_ids or []
     include_source_groups = include_source_groups or ["procurement"]
@@ -226,18 +234,35 @@ def run_procurement_probe(
     today = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d")
     run_id = f"procurement-probe-{today}"
 
-    for s in selected:
-        res = fetch_source_entries(
+    def _fetch(s: dict[str, Any]) -> dict[str, Any]:
+        fetch_cfg = s.get("fetch", {}) if isinstance(s.get("fetch"), dict) else {}
+        return fetch_source_entries(
             s,
             limit=max(1, int(fetch_limit or 5)),
             source_guard={
                 "enabled": True,
                 "enforce_article_only": True,
-                "article_min_paragraphs": int((s.get("fetch", {}) if isinstance(s.get("fetch"), dict) else {}).get("article_min_paragraphs", 1) or 1),
-                "article_min_text_chars": int((s.get("fetch", {}) if isinstance(s.get("fetch"), dict) else {}).get("article_min_text_chars", 80) or 80),
+                "article_min_paragraphs": int(fetch_cfg.get("article_min_paragraphs", 1) or 1),
+                "article_min_text_chars": int(fetch_cfg.get("article_min_text_chars", 80) or 80),
                 "allow_body_fetch_for_rss": False,
             },
         )
+
+    executor = FetchExecutor(
+        max_workers=max_workers,
+        per_host=per_host,
+        deadline_seconds=deadline_seconds,
+        on_progress=progress,
+        name="procurement-probe",
+    )
+    fetched = executor.map(
+        [FetchJob(key=str(s.get("id", "")), host=host_of(str(s.get("url", ""))), run=lambda s=s: _fetch(s)) for s in selected],
+        on_error=lambda job, e: {"ok": False, "error_type": "unexpected", "error_message": f"{type(e).__name__}: {e}"},
+        on_skip=lambda job, reason: {"ok": False, "error_type": reason, "error_message": f"{reason}: probe budget of {deadline_seconds}s spent"},
+    )
+
+    # Asset writes and report rows stay sequential, in selection order.
+    for s, res in zip(selected, fetched):
         written = 0
         if write_assets and bool(res.get("ok")):
             entries = list(res.get("entries", [])) if isinstance(res.get("entries"), list) else []
@@ -265,6 +290,12 @@ def run_procurement_probe(
         "generated_at": _now_iso(),
         "selected_sources": len(selected),
         "write_assets": bool(write_assets),
+        "concurrency": {
+            "max_workers": executor.max_workers,
+            "per_host": executor.per_host,
+            "deadline_seconds": executor.deadline_seconds,
+            "deadline_hit": executor.deadline_hit,
+        },
         "totals": totals,
         "by_error_kind": by_error,
         "per_source": per,
@@ -273,6 +304,8 @@ def run_procurement_probe(
     md_path = out_root / f"probe_report-{ts}.md"
     json_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
     md_path.write_text(_render_probe_md(report), encoding="utf-8")
+    if out_root.resolve() == (project_root / "artifacts" / "procurement").resolve():
+        record_latest_artifact(project_root / "artifacts", "procurement_probe", json_path)
     report["artifacts"] = {"json": str(json_path), "md": str(md_path)}
     report["ok"] = True
     return report
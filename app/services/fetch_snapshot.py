@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Iterator
+
+
+DEFAULT_SNAPSHOT_DIR = "artifacts/fetch_snapshots"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+
+class FetchSnapshotError(RuntimeError):
+    pass
+
+
+def _env_bool(name: str, default: bool = True) -> bool:
+    raw = str(os.environ.get(name, "")).strip().lower()
+    if not raw:
+        return bool(default)
+    return raw in {"1", "true", "yes", "y", "on"}
+
+
+def _safe_run_id(run_id: str) -> str:
+    rid = str(run_id or "").strip()
+    if not rid or "/" in rid or "\\" in rid or rid.startswith("."):
+        raise FetchSnapshotError(f"invalid snapshot run_id: {run_id!r}")
+    return rid
+
+
+def snapshots_enabled() -> bool:
+    return _env_bool("FETCH_SNAPSHOT_ENABLED", True)
+
+
+def snapshot_root(project_root: Path) -> Path:
+    raw = str(os.environ.get("FETCH_SNAPSHOT_DIR", "")).strip()
+    if raw:
+        return Path(raw)
+    return project_root / DEFAULT_SNAPSHOT_DIR
+
+
+class FetchSnapshotStore:
+    """
+    Content-addressed store of raw fetch responses.
+
+    - blobs/<sha256[:2]>/<sha256>.gz: gzip body (mtime=0, so identical bodies give identical files)
+    - runs/<run_id>.json: manifest url -> {blob, http_status, content_type, etag, error_type, ...}
+      plus `derived` records (e.g. extracted article snippets) needed for a faithful replay.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}.gz"
+
+    def manifest_path(self, run_id: str) -> Path:
+        return self.root / "runs" / f"{_safe_run_id(run_id)}.json"
+
+    def put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        p = self._blob_path(digest)
+        if p.exists():
+            try:
+                # Reused by a run whose manifest is not flushed yet: restart retention's grace period.
+                os.utime(p)
+                return digest
+            except OSError:
+                pass
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        tmp.write_bytes(gzip.compress(data, compresslevel=6, mtime=0))
+        os.replace(tmp, p)
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        return gzip.decompress(self._blob_path(digest).read_bytes())
+
+    def write_manifest(self, run_id: str, manifest: dict[str, Any]) -> Path:
+        p = self.manifest_path(run_id)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, p)
+        return p
+
+    def load_manifest(self, run_id: str) -> dict[str, Any]:
+        p = self.manifest_path(run_id)
+        if not p.exists():
+            raise FetchSnapshotError(f"snapshot not found: {run_id} ({p})")
+        raw = json.loads(p.read_text(encoding="utf-8"))
+        if not isinstance(raw, dict):
+            raise FetchSnapshotError(f"invalid snapshot manifest: {p}")
+        return raw
+
+    def list_runs(self) -> list[str]:
+        d = self.root / "runs"
+        if not d.exists():
+            return []
+        return sorted(p.stem for p in d.glob("*.json"))
+
+    def referenced_blobs(self) -> set[str]:
+        """Digests of every blob named by a manifest on disk (unreadable manifests are skipped)."""
+        out: set[str] = set()
+        for run_id in self.list_runs():
+            try:
+                requests = self.load_manifest(run_id).get("requests", {})
+            except (OSError, ValueError, FetchSnapshotError):
+                continue
+            if not isinstance(requests, dict):
+                continue
+            for rec in requests.values():
+                if isinstance(rec, dict) and rec.get("blob"):
+                    out.add(str(rec["blob"]))
+        return out
+
+
+class FetchSnapshotSession:
+    """One run's record or replay session. Thread-safe; installed for the starting context while active."""
+
+    def __init__(self, store: FetchSnapshotStore, run_id: str, mode: str, *, report_date: str = "") -> None:
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise FetchSnapshotError(f"invalid snapshot mode: {mode}")
+        self.store = store
+        self.run_id = _safe_run_id(run_id)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._token: Token[FetchSnapshotSession | None] | None = None
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        if mode == MODE_REPLAY:
+            self._manifest = store.load_manifest(self.run_id)
+        else:
+            self._manifest = {
+                "run_id": self.run_id,
+                "report_date": str(report_date or ""),
+                "created_at": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat(),
+                "requests": {},
+                "derived": {},
+            }
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    @property
+    def report_date(self) -> str:
+        return str(self._manifest.get("report_date", "") or "")
+
+    def record(self, url: str, response: dict[str, Any]) -> None:
+        if self.replaying:
+            return
+        data = bytes(response.get("data") or b"")
+        rec = {
+            "ok": bool(response.get("ok")),
+            "blob": self.store.put_blob(data) if data else "",
+            "size": len(data),
+            "http_status": response.get("http_status"),
+            "content_type": str(response.get("content_type", "") or ""),
+            "etag": str(response.get("etag", "") or ""),
+            "last_modified": str(response.get("last_modified", "") or ""),
+            "not_modified": bool(response.get("not_modified", False)),
+            "error_type": str(response.get("error_type", "") or ""),
+            "error_message": str(response.get("error_message", "") or ""),
+        }
+        with self._lock:
+            prev = self._manifest["requests"].get(url)
+            # Keep the first successful response for a URL; a later failure must not shadow it.
+            if prev is None or not bool(prev.get("ok")):
+                self._manifest["requests"][url] = rec
+            self.recorded += 1
+
+    def replay(self, url: str) -> dict[str, Any]:
+        with self._lock:
+            rec = self._manifest.get("requests", {}).get(url)
+            if rec is None:
+                self.misses += 1
+            else:
+                self.replayed += 1
+        if rec is None:
+            return {
+                "ok": False,
+                "data": b"",
+                "http_status": None,
+                "content_type": "",
+                "error_type": "snapshot_miss",
+                "error_message": f"url not in snapshot {self.run_id}",
+            }
+        data = self.store.get_blob(str(rec["blob"])) if rec.get("blob") else b""
+        out = {k: v for k, v in rec.items() if k not in ("blob", "size")}
+        out["data"] = data
+        return out
+
+    def record_derived(self, kind: str, key: str, payload: dict[str, Any]) -> None:
+        if self.replaying:
+            return
+        with self._lock:
+            self._manifest["derived"].setdefault(kind, {})[key] = payload
+
+    def lookup_derived(self, kind: str, key: str) -> dict[str, Any] | None:
+        derived = self._manifest.get("derived", {})
+        bucket = derived.get(kind, {}) if isinstance(derived, dict) else {}
+        row = bucket.get(key) if isinstance(bucket, dict) else None
+        return dict(row) if isinstance(row, dict) else None
+
+    def flush(self) -> Path | None:
+        if self.replaying:
+            return None
+        with self._lock:
+            manifest = json.loads(json.dumps(self._manifest, ensure_ascii=False))
+        return self.store.write_manifest(self.run_id, manifest)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "mode": self.mode,
+                "urls": len(self._manifest.get("requests", {})),
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+
+
+# Scoped to the context that started the session (and the fetch pools it spawns, which
+# copy the context per job): concurrent requests in the same process never see it.
+_ACTIVE: ContextVar[FetchSnapshotSession | None] = ContextVar("fetch_snapshot_session", default=None)
+
+
+def active_snapshot_session() -> FetchSnapshotSession | None:
+    return _ACTIVE.get()
+
+
+def start_snapshot_session(
+    project_root: Path,
+    run_id: str,
+    mode: str,
+    *,
+    report_date: str = "",
+) -> FetchSnapshotSession:
+    sess = FetchSnapshotSession(FetchSnapshotStore(snapshot_root(project_root)), run_id, mode, report_date=report_date)
+    sess._token = _ACTIVE.set(sess)
+    return sess
+
+
+def end_snapshot_session(sess: FetchSnapshotSession | None) -> dict[str, Any]:
+    if sess is None:
+        return {}
+    if _ACTIVE.get() is sess:
+        try:
+            _ACTIVE.reset(sess._token)
+        except (TypeError, ValueError):
+            # Ended from a different context than the one that started it.
+            _ACTIVE.set(None)
+    sess._token = None
+    path = sess.flush()
+    out = sess.summary()
+    if path is not None:
+        out["manifest"] = str(path)
+    return out
+
+
+@contextmanager
+def snapshot_session(project_root: Path, run_id: str, mode: str, *, report_date: str = "") -> Iterator[FetchSnapshotSession]:
+    sess = start_snapshot_session(project_root, run_id, mode, report_date=report_date)
+    try:
+        yield sess
+    finally:
+        end_snapshot_session(sess)
+
+
+def snapshot_report_date(project_root: Path, run_id: str) -> str:
+    """Report date recorded with a snapshot (used to pin REPORT_DATE on replay)."""
+    manifest = FetchSnapshotStore(snapshot_root(project_root)).load_manifest(run_id)
+    return str(manifest.get("report_date", "") or "")
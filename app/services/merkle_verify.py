@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Column, Engine, Integer, Table, func, inspect, select
+
+from app.db.base import Base
+from app.db.types import JSONText
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_FANOUT = 16
+DEFAULT_LEAF_SIZE = 64
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _canonical_value(col: Column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(col.type, JSONText):
+        if isinstance(value, (str, bytes)):
+            try:
+                return json.loads(value)
+            except Exception:
+                return value
+        return value
+    if isinstance(col.type, Integer):
+        return int(value)
+    return str(value)
+
+
+class TableSide:
+    """
+    One database's view of a table for range hashing. Keys are compared in byte order on
+    both SQLite and Postgres (COLLATE "C" for text keys), so a key range selects the same
+    rows on either side.
+    """
+
+    def __init__(self, engine: Engine, table: Table, columns: list[str]) -> None:
+        pk = list(table.primary_key.columns)
+        if len(pk) != 1:
+            raise RuntimeError(f"merkle verify needs a single-column primary key: {table.name}")
+        self.engine = engine
+        self.table = table
+        self.pk = pk[0]
+        self.columns = [table.c[c] for c in columns]
+        text_key = not isinstance(self.pk.type, Integer)
+        self._key = self.pk.collate("C") if (text_key and engine.dialect.name == "postgresql") else self.pk
+
+    def _where(self, q: Any, lo: Any, hi: Any) -> Any:
+        if lo is not None:
+            q = q.where(self._key > lo)
+        if hi is not None:
+            q = q.where(self._key <= hi)
+        return q
+
+    def key_at(self, lo: Any, n: int) -> Any:
+        """The n-th key after `lo`, or None when fewer than n keys remain."""
+        q = self._where(select(self.pk), lo, None).order_by(self._key).offset(max(0, n - 1)).limit(1)
+        with self.engine.connect() as conn:
+            row = conn.execute(q).first()
+        return None if row is None else row[0]
+
+    def count(self, lo: Any = None, hi: Any = None) -> int:
+        q = self._where(select(func.count()).select_from(self.table), lo, hi)
+        with self.engine.connect() as conn:
+            return int(conn.execute(q).scalar() or 0)
+
+    def rows(self, lo: Any, hi: Any) -> list[tuple[Any, str]]:
+        """(key, row digest) for a range, in key order."""
+        q = self._where(select(*self.columns), lo, hi).order_by(self._key)
+        idx = self.columns.index(self.pk)
+        out: list[tuple[Any, str]] = []
+        with self.engine.connect() as conn:
+            for r in conn.execution_options(stream_results=True).execute(q):
+                payload = {c.name: _canonical_value(c, v) for c, v in zip(self.columns, r)}
+                blob = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+                out.append((r[idx], hashlib.sha256(blob).hexdigest()))
+        return out
+
+    def digest(self, lo: Any, hi: Any) -> tuple[int, str]:
+        rows = self.rows(lo, hi)
+        h = hashlib.sha256()
+        for _key, d in rows:
+            h.update(d.encode("ascii"))
+        return len(rows), h.hexdigest()
+
+
+def table_sides(left: Engine, right: Engine, name: str) -> tuple[TableSide, TableSide] | None:
+    """Sides for a model table present in both databases, over their shared columns."""
+    table = Base.metadata.tables.get(name)
+    if table is None:
+        return None
+    cols: list[str] | None = None
+    for eng in (left, right):
+        insp = inspect(eng)
+        if not insp.has_table(name):
+            return None
+        present = {c["name"] for c in insp.get_columns(name)}
+        have = [c.name for c in table.columns if c.name in present]
+        cols = have if cols is None else [c for c in cols if c in have]
+    if not cols or list(table.primary_key.columns)[0].name not in cols:
+        return None
+    return TableSide(left, table, cols), TableSide(right, table, cols)
+
+
+class MerkleTableCompare:
+    """
+    Compare one table between two databases by key range: the left side is cut into
+    chunks of `chunk_size` keys, each chunk compared by row count (SQL) and then by a
+    hash of its row digests. Only mismatching chunks are drilled into, `fanout` sub-ranges
+    at a time, down to `leaf_size` rows where individual diverged keys are listed.
+    """
+
+    def __init__(
+        self,
+        left: TableSide,
+        right: TableSide,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        fanout: int = DEFAULT_FANOUT,
+        leaf_size: int = DEFAULT_LEAF_SIZE,
+        max_keys: int = 200,
+    ) -> None:
+        self.left = left
+        self.right = right
+        self.chunk_size = max(1, int(chunk_size))
+        self.fanout = max(2, int(fanout))
+        self.leaf_size = max(1, int(leaf_size))
+        self.max_keys = max(0, int(max_keys))
+        self.chunks_checked = 0
+        self.chunks_mismatched = 0
+        self.ranges_drilled = 0
+        self.mismatched_ranges: list[dict[str, Any]] = []
+        self.diverged_keys: list[dict[str, Any]] = []
+        self.diverged_count = 0
+
+    def _same(self, lo: Any, hi: Any) -> bool:
+        if self.left.count(lo, hi) != self.right.count(lo, hi):
+            return False
+        return self.left.digest(lo, hi) == self.right.digest(lo, hi)
+
+    def _leaf_diff(self, lo: Any, hi: Any) -> None:
+        lrows = dict(self.left.rows(lo, hi))
+        rrows = dict(self.right.rows(lo, hi))
+        for key in sorted(set(lrows) | set(rrows)):
+            if key not in rrows:
+                kind = "missing_in_right"
+            elif key not in lrows:
+                kind = "missing_in_left"
+            elif lrows[key] != rrows[key]:
+                kind = "content_differs"
+            else:
+                continue
+            self.diverged_count += 1
+            if len(self.diverged_keys) < self.max_keys:
+                self.diverged_keys.append({"key": key, "kind": kind})
+
+    def _drill(self, lo: Any, hi: Any, size: int) -> None:
+        self.ranges_drilled += 1
+        if size <= self.leaf_size:
+            self._leaf_diff(lo, hi)
+            return
+        step = max(self.leaf_size, math.ceil(size / self.fanout))
+        sub_lo = lo
+        while True:
+            sub_hi = self.left.key_at(sub_lo, step)
+            if sub_hi is None or (hi is not None and sub_hi >= hi):
+                sub_hi = hi
+            if not self._same(sub_lo, sub_hi):
+                self._drill(sub_lo, sub_hi, step)
+            if sub_hi == hi:
+                return
+            sub_lo = sub_hi
+
+    def run(self, *, start_after: Any = None, deadline: float | None = None) -> dict[str, Any]:
+        """Walk chunks from `start_after`; stops early (complete=False) once `deadline` passes."""
+        lo = start_after
+        complete = False
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            hi = self.left.key_at(lo, self.chunk_size)
+            self.chunks_checked += 1
+            if not self._same(lo, hi):
+                self.chunks_mismatched += 1
+                self.mismatched_ranges.append({"key_after": lo, "key_through": hi})
+                self._drill(lo, hi, self.chunk_size)
+            if hi is None:
+                complete = True
+                lo = None
+                break
+            lo = hi
+        return {
+            "complete": complete,
+            "cursor": lo,
+            "chunks_checked": self.chunks_checked,
+            "chunks_mismatched": self.chunks_mismatched,
+            "ranges_drilled": self.ranges_drilled,
+            "mismatched_ranges": self.mismatched_ranges,
+            "diverged_count": self.diverged_count,
+            "diverged_keys": self.diverged_keys,
+        }
+
+
+def _load_state(path: Path | None) -> dict[str, Any]:
+    if path is None or not path.exists():
+        return {"tables": {}}
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {"tables": {}}
+    if not isinstance(obj, dict):
+        return {"tables": {}}
+    obj.setdefault("tables", {})
+    return obj
+
+
+def _save_state(path: Path | None, state: dict[str, Any]) -> None:
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = dict(state)
+    payload["updated_at"] = _utc_now()
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+
+
+def merkle_verify(
+    left: Engine,
+    right: Engine,
+    tables: list[str],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fanout: int = DEFAULT_FANOUT,
+    leaf_size: int = DEFAULT_LEAF_SIZE,
+    max_keys: int = 200,
+    deadline_seconds: float = 0,
+    state_path: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Merkle-style range comparison of `tables` between two databases.
+
+    With `deadline_seconds` > 0 the run stops at the first chunk boundary past the budget;
+    with `state_path` the per-table cursor is saved there and the next run resumes after
+    it (skipping tables already verified earlier in the same cycle), so large tables are
+    verified incrementally across runs. Divergence found in a partial run is reported as
+    usual; `complete` is True once the last table of the cycle finished.
+    """
+    deadline = time.monotonic() + float(deadline_seconds) if deadline_seconds and deadline_seconds > 0 else None
+    state = _load_state(state_path)
+    st_tables = state.setdefault("tables", {})
+    per_table: dict[str, Any] = {}
+    skipped: list[str] = []
+    complete = True
+    order = list(tables)
+    resume_table = state.get("resume_table") if state_path is not None else None
+    if resume_table in order:
+        # Finish the cycle the previous time-bounded run left off; earlier tables already passed in it.
+        order = order[order.index(resume_table) :]
+    state["resume_table"] = None
+    for name in order:
+        sides = table_sides(left, right, name)
+        if sides is None:
+            skipped.append(name)
+            continue
+        entry = st_tables.get(name) if isinstance(st_tables.get(name), dict) else {}
+        cmp = MerkleTableCompare(
+            sides[0], sides[1], chunk_size=chunk_size, fanout=fanout, leaf_size=leaf_size, max_keys=max_keys
+        )
+        started_at = entry.get("cursor") if state_path is not None else None
+        out = cmp.run(start_after=started_at, deadline=deadline)
+        out["started_after"] = started_at
+        per_table[name] = out
+        new_entry = {"cursor": out["cursor"], "passes": int(entry.get("passes", 0) or 0)}
+        if out["complete"]:
+            new_entry["passes"] += 1
+            new_entry["last_full_pass_at"] = _utc_now()
+        elif entry.get("last_full_pass_at"):
+            new_entry["last_full_pass_at"] = entry["last_full_pass_at"]
+        st_tables[name] = new_entry
+        if not out["complete"]:
+            complete = False
+            state["resume_table"] = name
+            _save_state(state_path, state)
+            break
+        _save_state(state_path, state)
+    mismatched = [t for t, v in per_table.items() if v["chunks_mismatched"]]
+    return {
+        "ok": not mismatched,
+        "complete": complete,
+        "method": "merkle",
+        "chunk_size": int(chunk_size),
+        "fanout": int(fanout),
+        "leaf_size": int(leaf_size),
+        "tables": per_table,
+        "mismatched_tables": mismatched,
+        "skipped_tables": skipped,
+        "state_file": str(state_path) if state_path is not None else "",
+    }
@@ -8,8 +8,8 @@ from urllib.parse import urlparse
 from app.services.classification_maps import (
     classify_lane as map_classify_lane,
     classify_region as map_classify_region,
-    load_lane_map,
-    load_region_map,
+    load_lane_matcher,
+    load_region_matcher,
 )
 from app.services.opportunity_store import OpportunityStore, normalize_event_type
 
@@ -84,8 +84,8 @@ def compute_opportunity_index(
     store = OpportunityStore(project_root, asset_dir=asset_dir)
     cur_rows = store.load_signals(wd, now_utc=now_utc)
     prev_rows = store.load_signals(wd * 2, now_utc=now_utc - dt.timedelta(days=wd))
-    region_map = load_region_map(project_root / "rules")
-    lane_map = load_lane_map(project_root / "rules")
+    region_map = load_region_matcher(project_root / "rules")
+    lane_map = load_lane_matcher(project_root / "rules")
 
     cur_scores: dict[tuple[str, str], int] = {}
     prev_scores: dict[tuple[str, str], int] = {}
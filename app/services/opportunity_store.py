@@ -7,7 +7,10 @@ import re
 from collections import deque
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
+
+from app.services.artifact_io import artifact_glob, artifact_parts, iter_artifact_lines, locked_append
+from app.utils.url_norm import ParsedUrl, UrlLike, parse_url
+
 
 EVENT_WEIGHT = {
     "procurement": 6,
@@ -85,27 +88,26 @@ CANONICAL_EVENT_TYPES = {
 }
 
 
-def _extract_domain(url: str) -> str:
+def _parsed(url: UrlLike) -> ParsedUrl | None:
+    if isinstance(url, ParsedUrl):
+        return url
     u = str(url or "").strip()
     if not u:
-        return ""
-    try:
-        return str(urlparse(u).netloc or "").strip().lower()
-    except Exception:
-        return ""
+        return None
+    return parse_url(u)
 
 
-def _extract_path(url: str) -> str:
-    u = str(url or "").strip()
-    if not u:
-        return ""
-    try:
-        return str(urlparse(u).path or "").strip().lower()
-    except Exception:
-        return ""
+def _extract_domain(url: UrlLike) -> str:
+    p = _parsed(url)
+    return p.netloc.strip() if p is not None else ""
 
 
-def normalize_event_type(event_type: str, *, text: str = "", url: str = "") -> str:
+def _extract_path(url: UrlLike) -> str:
+    p = _parsed(url)
+    return p.path_lower if p is not None else ""
+
+
+def normalize_event_type(event_type: str, *, text: str = "", url: UrlLike = "") -> str:
     et = str(event_type or "").strip()
     et_l = et.lower()
     full = (et + " " + str(text or "")).strip().lower()
@@ -195,11 +197,10 @@ class OpportunityStore:
 
         seen: set[str] = set()
         p = self._day_file(day)
-        if p.exists():
+        if artifact_parts(p):
             tail_n = max(1, int(tail_lines_scan or 2000))
             try:
-                with p.open("r", encoding="utf-8") as f:
-                    tail = deque(f, maxlen=tail_n)
+                tail = deque(iter_artifact_lines(p), maxlen=tail_n)
                 for ln in tail:
                     ln = str(ln or "").strip()
                     if not ln:
@@ -226,13 +227,8 @@ class OpportunityStore:
         self._seen_by_day[day_iso] = seen
         return seen
 
-    def append_signal(
-        self,
-        signal: dict[str, Any],
-        *,
-        dedupe_enabled: bool = True,
-        tail_lines_scan: int = 2000,
-    ) -> dict[str, int]:
+    def _build_row(self, signal: dict[str, Any], *, observed_at: str) -> tuple[dt.date, dict[str, Any] | None]:
+        """(day, row) for one signal; row is None for window probes."""
         raw_date = str(signal.get("date", "")).strip()
         day = _safe_date(raw_date) or dt.date.today()
         day_iso = day.isoformat()
@@ -240,7 +236,7 @@ class OpportunityStore:
         lane = self.normalize_unknown(signal.get("lane", ""))
         event_type = self.normalize_unknown(signal.get("event_type", ""))
         if self._is_probe_value(region) or self._is_probe_value(lane):
-            return {"written": 0, "deduped": 0, "dropped_probe": 1}
+            return day, None
         weight_raw = signal.get("weight", 1)
         try:
             weight = int(weight_raw)
@@ -254,11 +250,7 @@ class OpportunityStore:
             region=region,
             lane=lane,
         )
-        seen = self._build_seen_for_day(day, tail_lines_scan=tail_lines_scan)
-        if dedupe_enabled and signal_key in seen:
-            return {"written": 0, "deduped": 1, "dropped_probe": 0}
-
-        row = {
+        return day, {
             "date": day_iso,
             "region": region,
             "lane": lane,
@@ -267,16 +259,54 @@ class OpportunityStore:
             "source_id": str(signal.get("source_id", "")).strip(),
             "url_norm": url_norm_v,
             "signal_key": signal_key,
-            "observed_at": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+            "observed_at": observed_at,
             "run_id": str(signal.get("run_id", "")).strip(),
             "interval_source": str(signal.get("interval_source", "")).strip(),
         }
-        p = self._day_file(day)
-        _ensure_dir(p.parent)
-        with p.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
-        seen.add(signal_key)
-        return {"written": 1, "deduped": 0, "dropped_probe": 0}
+
+    def _append_lines_locked(self, p: Path, lines: list[str]) -> None:
+        with locked_append(p) as f:
+            f.write("".join(lines))
+
+    def append_signals_batch(
+        self,
+        signals: list[dict[str, Any]],
+        *,
+        dedupe_enabled: bool = True,
+        tail_lines_scan: int = 2000,
+    ) -> dict[str, int]:
+        """
+        append_signal() for many signals: dedupe against the in-memory seen index (and
+        within the batch), then one buffered, flock-guarded append per day file.
+        Counters match the sum of per-signal append_signal() results.
+        """
+        out = {"written": 0, "deduped": 0, "dropped_probe": 0}
+        observed_at = dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+        pending: dict[dt.date, list[str]] = {}
+        for signal in signals:
+            day, row = self._build_row(signal, observed_at=observed_at)
+            if row is None:
+                out["dropped_probe"] += 1
+                continue
+            seen = self._build_seen_for_day(day, tail_lines_scan=tail_lines_scan)
+            if dedupe_enabled and row["signal_key"] in seen:
+                out["deduped"] += 1
+                continue
+            pending.setdefault(day, []).append(json.dumps(row, ensure_ascii=False) + "\n")
+            seen.add(row["signal_key"])
+            out["written"] += 1
+        for day, lines in pending.items():
+            self._append_lines_locked(self._day_file(day), lines)
+        return out
+
+    def append_signal(
+        self,
+        signal: dict[str, Any],
+        *,
+        dedupe_enabled: bool = True,
+        tail_lines_scan: int = 2000,
+    ) -> dict[str, int]:
+        return self.append_signals_batch([signal], dedupe_enabled=dedupe_enabled, tail_lines_scan=tail_lines_scan)
 
     def load_signals(self, window_days: int, *, now_utc: dt.datetime | None = None) -> list[dict[str, Any]]:
         now_utc = now_utc or dt.datetime.now(dt.timezone.utc)
@@ -284,7 +314,7 @@ class OpportunityStore:
         latest = now_utc.date()
         oldest = (now_utc - dt.timedelta(days=wd - 1)).date()
         out: list[dict[str, Any]] = []
-        for p in sorted(self.base_dir.glob("opportunity_signals-*.jsonl")):
+        for p in artifact_glob(self.base_dir, "opportunity_signals-*.jsonl"):
             m = re.match(r"opportunity_signals-(\d{8})\.jsonl$", p.name)
             if not m:
                 continue
@@ -297,18 +327,17 @@ class OpportunityStore:
             if d > latest:
                 continue
             try:
-                with p.open("r", encoding="utf-8") as f:
-                    for ln in f:
-                        ln = ln.strip()
-                        if not ln:
-                            continue
-                        try:
-                            row = json.loads(ln)
-                        except Exception:
-                            continue
-                        if not isinstance(row, dict):
-                            continue
-                        out.append(row)
+                for ln in iter_artifact_lines(p):
+                    ln = ln.strip()
+                    if not ln:
+                        continue
+                    try:
+                        row = json.loads(ln)
+                    except Exception:
+                        continue
+                    if not isinstance(row, dict):
+                        continue
+                    out.append(row)
             except Exception:
                 continue
         return out
@@ -318,7 +347,7 @@ class OpportunityStore:
         kd = max(1, int(keep_days or 90))
         cutoff = (now_utc - dt.timedelta(days=kd)).date()
         removed = 0
-        for p in sorted(self.base_dir.glob("opportunity_signals-*.jsonl")):
+        for p in artifact_glob(self.base_dir, "opportunity_signals-*.jsonl"):
             m = re.match(r"opportunity_signals-(\d{8})\.jsonl$", p.name)
             if not m:
                 continue
@@ -328,7 +357,8 @@ class OpportunityStore:
                 continue
             if d < cutoff:
                 try:
-                    p.unlink(missing_ok=True)  # type: ignore[arg-type]
+                    for part in artifact_parts(p):
+                        part.unlink(missing_ok=True)  # type: ignore[arg-type]
                     removed += 1
                 except Exception:
                     pass
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
 import json
+import os
+from datetime import datetime, timezone
 from glob import glob
 from pathlib import Path
 from typing import Any
 
+from app.services.artifact_io import read_artifact_text, resolve_artifact
+
+LATEST_DIRNAME = ".latest"
+
+# Per ops-summary kind: fixed files always considered, and the globs scanned only when no
+# worker has recorded a `.latest` pointer for the kind yet.
+OPS_ARTIFACT_SOURCES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "digest": (("run_meta.json",), ("run-*/run_meta.json", "*digest*.json")),
+    "collect": (("collect_meta.json",), ("collect-*/run_meta.json", "*collect*.json")),
+    "acceptance": (("acceptance/acceptance_report.json",), ()),
+    "procurement_probe": ((), ("procurement/probe_report-*.json",)),
+}
+
 
 def find_latest_json(glob_pattern: str) -> str | None:
     candidates = [Path(p) for p in glob(glob_pattern, recursive=True)]
@@ -15,14 +30,106 @@ def find_latest_json(glob_pattern: str) -> str | None:
     return str(files[0])
 
 
+def file_stamp(path: str | None) -> tuple[str, int, int] | None:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), int(st.st_mtime_ns), int(st.st_size))
+
+
+def _latest_pointer_path(artifacts_dir: Path, kind: str) -> Path:
+    return Path(artifacts_dir) / LATEST_DIRNAME / f"{kind}.json"
+
+
+def read_latest_artifact(artifacts_dir: Path, kind: str) -> str | None:
+    """Target of the `.latest/<kind>.json` pointer, or None when unset or the file is gone."""
+    try:
+        obj = json.loads(_latest_pointer_path(artifacts_dir, kind).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    raw = str(obj.get("path", "")).strip() if isinstance(obj, dict) else ""
+    if not raw:
+        return None
+    p = Path(raw)
+    if not p.is_absolute():
+        p = Path(artifacts_dir) / p
+    # Retention may have compressed an older target in place; report the file as it is now.
+    found = resolve_artifact(p)
+    return str(found) if found is not None else None
+
+
+def record_latest_artifact(artifacts_dir: Path, kind: str, path: Path) -> None:
+    """
+    Point `artifacts/.latest/<kind>.json` at `path`; workers call this when a run finishes
+    so the ops summary never has to scan run directories. Best effort: a pointer that
+    cannot be written only costs the reader a fallback scan.
+    """
+    try:
+        artifacts_dir = Path(artifacts_dir)
+        path = Path(path)
+        st = path.stat()
+        current = file_stamp(read_latest_artifact(artifacts_dir, kind))
+        if current is not None and current[1] > int(st.st_mtime_ns):
+            return  # a newer run already recorded itself
+        try:
+            rel = path.resolve().relative_to(artifacts_dir.resolve()).as_posix()
+        except ValueError:
+            rel = str(path.resolve())
+        ptr = _latest_pointer_path(artifacts_dir, kind)
+        ptr.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ptr.with_name(f"{kind}.json.tmp{os.getpid()}")
+        payload = {
+            "kind": kind,
+            "path": rel,
+            "mtime_ns": int(st.st_mtime_ns),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, ptr)
+    except Exception:
+        return
+
+
+def _pick_latest_file(paths: list[str | None]) -> str | None:
+    best: tuple[int, str] | None = None
+    for p in paths:
+        st = file_stamp(p)
+        if st is not None and (best is None or st[1] > best[0]):
+            best = (st[1], st[0])
+    return best[1] if best is not None else None
+
+
+def latest_ops_artifacts(artifacts_dir: Path) -> dict[str, str | None]:
+    """
+    Latest artifact per ops-summary kind. Recorded pointers are used as-is (plus the fixed
+    top-level files); only kinds without a pointer are found by globbing, and the result is
+    recorded so the scan happens once.
+    """
+    artifacts_dir = Path(artifacts_dir)
+    out: dict[str, str | None] = {}
+    for kind, (fixed, patterns) in OPS_ARTIFACT_SOURCES.items():
+        candidates: list[str | None] = [str(artifacts_dir / f) for f in fixed]
+        pointed = read_latest_artifact(artifacts_dir, kind)
+        if pointed is not None:
+            candidates.append(pointed)
+        else:
+            candidates.extend(find_latest_json(str(artifacts_dir / pat)) for pat in patterns)
+        out[kind] = _pick_latest_file(candidates)
+        if pointed is None and out[kind] is not None and patterns:
+            record_latest_artifact(artifacts_dir, kind, Path(out[kind]))
+    return out
+
+
 def safe_load_json(path: str | None) -> tuple[dict[str, Any] | None, str | None]:
     if not path:
         return None, "file missing"
-    p = Path(path)
-    if not p.exists():
+    if resolve_artifact(path) is None:
         return None, f"file missing: {path}"
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
+        obj = json.loads(read_artifact_text(path))
         if not isinstance(obj, dict):
             return None, f"json root is not object: {path}"
         return obj, None
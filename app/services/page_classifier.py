@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import re
 from typing import Any
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qs
+
+from app.utils.url_norm import ParsedUrl, UrlLike, parse_url
 
 
 STATIC_PATH_KEYWORDS = [
@@ -25,15 +27,17 @@ LISTING_PATH_KEYWORDS = [
 ]
 
 
-def is_static_or_listing_url(url: str, *, source_group: str | None = None) -> bool:
-    u = str(url or "").strip()
-    if not u:
-        return False
-    try:
-        p = urlparse(u)
-    except Exception:
+def is_static_or_listing_url(url: UrlLike, *, source_group: str | None = None) -> bool:
+    if isinstance(url, ParsedUrl):
+        p = url
+    else:
+        u = str(url or "").strip()
+        if not u:
+            return False
+        p = parse_url(u)
+    if not p.raw.strip() or not p.ok:
         return False
-    path = str(p.path or "").strip().lower()
+    path = p.path_lower
     query = parse_qs(str(p.query or ""))
     sg = str(source_group or "").strip().lower()
 
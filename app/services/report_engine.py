@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from app.utils.run_env import run_env
+
+
+REPORT_SCRIPT = "scripts/generate_ivd_report.py"
+MODE_INPROCESS = "inprocess"
+MODE_SUBPROCESS = "subprocess"
+_MODES = (MODE_INPROCESS, MODE_SUBPROCESS)
+
+
+def report_engine_mode(explicit: str | None = None, *, default: str = MODE_SUBPROCESS) -> str:
+    """
+    Resolve how the report script runs: explicit argument > REPORT_ENGINE_MODE env > default.
+
+    `inprocess` reuses an already imported script module (warm imports, rule and
+    registry caches); `subprocess` keeps the original one-interpreter-per-run isolation.
+    """
+    for raw in (explicit, os.environ.get("REPORT_ENGINE_MODE", ""), default):
+        mode = str(raw or "").strip().lower().replace("-", "")
+        if mode in _MODES:
+            return mode
+    return MODE_SUBPROCESS
+
+
+@dataclass
+class ReportRunResult:
+    stdout: str
+    stderr: str
+    returncode: int
+    mode: str
+    warm: bool
+    import_ms: int
+    wall_ms: int
+
+    def meta(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "warm": self.warm,
+            "import_ms": self.import_ms,
+            "wall_ms": self.wall_ms,
+        }
+
+
+class _ThreadStream(io.TextIOBase):
+    """sys.stdout/sys.stderr stand-in: writes from registered threads are captured, others pass through."""
+
+    def __init__(self, fallback: Any) -> None:
+        self.fallback = fallback
+        self.buffers: dict[int, io.StringIO] = {}
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        buf = self.buffers.get(threading.get_ident())
+        if buf is not None:
+            return buf.write(s)
+        return self.fallback.write(s)
+
+    def flush(self) -> None:
+        try:
+            self.fallback.flush()
+        except Exception:
+            pass
+
+
+class ReportEngine:
+    """
+    Warm, importable wrapper around scripts/generate_ivd_report.py.
+
+    The script module is imported once per process; every run restores the module's
+    mutable defaults (RUNTIME_CONTENT), sees the run's env through a context-local
+    overlay (app.utils.run_env; os.environ is never modified) and captures the report
+    text written to stdout by the run thread only. The fetch snapshot session is
+    context-local as well, so other request threads neither replay from nor record into
+    it. Runs are serialized because module state is process-wide. A timed-out run keeps
+    the engine busy until the script returns on its own (the fetch timeouts bound it).
+    """
+
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = Path(project_root)
+        self.script_path = self.project_root / REPORT_SCRIPT
+        self._module: ModuleType | None = None
+        self._defaults: dict[str, Any] = {}
+        self._load_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self.runs = 0
+
+    @property
+    def warm(self) -> bool:
+        return self._module is not None
+
+    def _load(self) -> tuple[ModuleType, int]:
+        with self._load_lock:
+            if self._module is not None:
+                return self._module, 0
+            t0 = time.perf_counter()
+            name = f"_ivd_report_engine_{abs(hash(str(self.script_path.resolve())))}"
+            spec = importlib.util.spec_from_file_location(name, self.script_path)
+            if spec is None or spec.loader is None:
+                raise FileNotFoundError(f"report script not found: {self.script_path}")
+            module = importlib.util.module_from_spec(spec)
+            # dataclasses (and pickling) resolve the defining module through sys.modules.
+            sys.modules[name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(name, None)
+                raise
+            self._defaults = {"RUNTIME_CONTENT": deepcopy(getattr(module, "RUNTIME_CONTENT", {}))}
+            self._module = module
+            return module, int((time.perf_counter() - t0) * 1000)
+
+    def _reset_module_state(self, module: ModuleType) -> None:
+        runtime = getattr(module, "RUNTIME_CONTENT", None)
+        if isinstance(runtime, dict):
+            runtime.clear()
+            runtime.update(deepcopy(self._defaults.get("RUNTIME_CONTENT", {})))
+
+    def run(self, env: dict[str, str], *, timeout: float | None = None) -> ReportRunResult:
+        """Run the report in-process; raises CalledProcessError/TimeoutExpired like subprocess.run(check=True)."""
+        cmd = [MODE_INPROCESS, REPORT_SCRIPT]
+        started = time.perf_counter()
+        warm = self.warm
+        module, import_ms = self._load()
+        out = io.StringIO()
+        err = io.StringIO()
+        state: dict[str, Any] = {"returncode": None}
+
+        def _target() -> None:
+            with self._run_lock:
+                ident = threading.get_ident()
+                prev_out, prev_err = sys.stdout, sys.stderr
+                sys.stdout, sys.stderr = _ThreadStream(prev_out), _ThreadStream(prev_err)
+                sys.stdout.buffers[ident] = out
+                sys.stderr.buffers[ident] = err
+                try:
+                    with run_env(env):
+                        self._reset_module_state(module)
+                        state["returncode"] = int(module.main() or 0)
+                except SystemExit as exc:
+                    code = exc.code
+                    state["returncode"] = code if isinstance(code, int) else (0 if code is None else 1)
+                except BaseException:
+                    err.write(traceback.format_exc())
+                    state["returncode"] = 1
+                finally:
+                    sys.stdout, sys.stderr = prev_out, prev_err
+                    self.runs += 1
+
+        worker = threading.Thread(target=_target, name="report-engine", daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if worker.is_alive():
+            raise subprocess.TimeoutExpired(cmd, timeout or 0)
+        result = ReportRunResult(
+            stdout=out.getvalue(),
+            stderr=err.getvalue(),
+            returncode=int(state["returncode"] if state["returncode"] is not None else 1),
+            mode=MODE_INPROCESS,
+            warm=warm,
+            import_ms=import_ms,
+            wall_ms=int((time.perf_counter() - started) * 1000),
+        )
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, output=result.stdout, stderr=result.stderr)
+        return result
+
+
+_ENGINES: dict[str, ReportEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_report_engine(project_root: Path) -> ReportEngine:
+    key = str(Path(project_root).resolve())
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = ReportEngine(Path(project_root))
+            _ENGINES[key] = engine
+        return engine
+
+
+def run_report(
+    project_root: Path,
+    env: dict[str, str],
+    *,
+    mode: str | None = None,
+    timeout: float | None = None,
+) -> ReportRunResult:
+    """Generate one report (text on stdout) either in-process or via `python3 scripts/generate_ivd_report.py`."""
+    resolved = report_engine_mode(mode)
+    if resolved == MODE_INPROCESS:
+        return get_report_engine(project_root).run(env, timeout=timeout)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        ["python3", REPORT_SCRIPT],
+        cwd=project_root,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    return ReportRunResult(
+        stdout=proc.stdout,
+        stderr=proc.stderr,
+        returncode=proc.returncode,
+        mode=MODE_SUBPROCESS,
+        warm=False,
+        import_ms=0,
+        wall_ms=int((time.perf_counter() - started) * 1000),
+    )
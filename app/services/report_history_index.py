@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+
+INDEX_DIRNAME = ".history_index"
+INDEX_SCHEMA = 1
+DEFAULT_LOOKBACK_DAYS = 31
+REPORT_NAME_RE = re.compile(r"^ivd_morning_(\d{4}-\d{2}-\d{2})\.txt$")
+
+_NUMBERED_TITLE_RE = re.compile(r"^\d+\)\s+\[[^\]]+\]\s+(.+)$")
+_SECTION_A_ITEM_RE = re.compile(r"^(\d+)\)\s*\[(.*?)\]\s*(.*)$")
+_SECTION_END_RE = re.compile(r"^[B-G]\.\s")
+
+
+def normalize_report_title(title: str) -> str:
+    """Title fingerprint used by the report's repeat/freshness checks."""
+    t = title.lower()
+    t = re.sub(r"https?://\S+", " ", t)
+    t = re.sub(r"[^0-9a-z\u4e00-\u9fff]+", " ", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def repeat_title_fp(title: str) -> str:
+    """Title fingerprint used by the dry-run repeat rates (items without a link)."""
+    s = str(title or "").strip().lower()
+    s = re.sub(r"^(update|breaking|exclusive)\s*[:：]\s*", "", s)
+    s = re.sub(r"[\W_]+", " ", s, flags=re.U)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def item_repeat_key(title: str, link: str) -> str:
+    link = str(link or "").strip()
+    return link if link else repeat_title_fp(title)
+
+
+def report_title_keys(text: str) -> set[str]:
+    """Normalized titles of every numbered item line (`N) [tag] title`) in a report."""
+    out: set[str] = set()
+    for ln in text.splitlines():
+        m = _NUMBERED_TITLE_RE.match(ln.strip())
+        if m:
+            out.add(normalize_report_title(m.group(1)))
+    return out
+
+
+def parse_report_items(text: str) -> list[dict[str, Any]]:
+    """Section-A items of a report (`N) [tag] title` plus their 摘要/来源/地区/... lines)."""
+    lines = text.splitlines()
+    items: list[dict[str, Any]] = []
+    in_a = False
+    current: dict[str, Any] | None = None
+
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+
+        if line.startswith("A. "):
+            in_a = True
+            continue
+        if in_a and _SECTION_END_RE.match(line):
+            if current:
+                items.append(current)
+                current = None
+            break
+        if not in_a:
+            continue
+
+        m = _SECTION_A_ITEM_RE.match(line)
+        if m:
+            if current:
+                items.append(current)
+            current = {
+                "index": int(m.group(1)),
+                "window_tag": m.group(2),
+                "title": m.group(3),
+                "summary": "",
+                "published": "",
+                "source": "",
+                "link": "",
+                "region": "",
+                "lane": "",
+                "event_type": "",
+                "platform": "",
+            }
+            continue
+
+        if not current:
+            continue
+
+        if line.startswith("摘要：") or line.lower().startswith("summary:"):
+            current["summary"] = re.sub(r"^(摘要：|[Ss]ummary:\s*)", "", line, count=1).strip()
+        elif line.startswith("发布日期：") or line.lower().startswith("published:"):
+            current["published"] = re.sub(r"^(发布日期：|[Pp]ublished:\s*)", "", line, count=1).strip()
+        elif line.startswith("来源：") or line.lower().startswith("source:"):
+            src = re.sub(r"^(来源：|[Ss]ource:\s*)", "", line, count=1).strip()
+            if "|" in src:
+                left, right = src.split("|", 1)
+                current["source"] = left.strip()
+                current["link"] = right.strip()
+            else:
+                current["source"] = src
+        elif line.startswith("地区：") or line.lower().startswith("region:"):
+            current["region"] = re.sub(r"^(地区：|[Rr]egion:\s*)", "", line, count=1).strip()
+        elif line.startswith("赛道：") or line.lower().startswith("lane:"):
+            current["lane"] = re.sub(r"^(赛道：|[Ll]ane:\s*)", "", line, count=1).strip()
+        elif line.startswith("事件类型：") or line.lower().startswith("event type:"):
+            current["event_type"] = re.sub(r"^(事件类型：|[Ee]vent [Tt]ype:\s*)", "", line, count=1).strip()
+        elif line.startswith("技术平台：") or line.lower().startswith("platform:"):
+            current["platform"] = re.sub(r"^(技术平台：|[Pp]latform:\s*)", "", line, count=1).strip()
+        elif not current.get("summary"):
+            # 兼容历史格式（摘要行可能不以“摘要：”开头）
+            current["summary"] = line
+
+    if in_a and current:
+        items.append(current)
+
+    return items
+
+
+def report_repeat_keys(text: str) -> set[str]:
+    """Link (or title fingerprint) of each section-A item, as the dry-run repeat rates key them."""
+    out = {item_repeat_key(it["title"], it["link"]) for it in parse_report_items(text)}
+    out.discard("")
+    return out
+
+
+_FIELDS = {
+    "titles": report_title_keys,
+    "repeat_keys": report_repeat_keys,
+}
+
+
+class ReportHistoryIndex:
+    """
+    Per-day fingerprints of `reports/ivd_morning_<date>.txt`, persisted under
+    `reports/.history_index/<date>.json` so history checks read a handful of small files
+    instead of re-parsing every report ever written.
+
+    Each entry records the size/mtime of the report it was built from; a report that was
+    rewritten (or produced by a shell redirect that never called `record`) is re-indexed
+    on first lookup. Recent days are found by stepping back over calendar days, falling
+    back to a directory listing only when reports are sparser than the lookback window.
+    """
+
+    def __init__(self, reports_dir: Path, *, lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> None:
+        self.reports_dir = Path(reports_dir)
+        self.index_dir = self.reports_dir / INDEX_DIRNAME
+        self.lookback_days = max(1, int(lookback_days))
+        self._cache: dict[str, dict[str, Any]] = {}
+
+    def report_path(self, date_str: str) -> Path:
+        return self.reports_dir / f"ivd_morning_{date_str}.txt"
+
+    def _index_path(self, date_str: str) -> Path:
+        return self.index_dir / f"{date_str}.json"
+
+    @staticmethod
+    def _stamp(p: Path) -> list[int] | None:
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        return [int(st.st_size), int(st.st_mtime_ns)]
+
+    def record(self, date_str: str, text: str | None = None) -> dict[str, Any] | None:
+        """Index the report for `date_str` (call right after writing it)."""
+        p = self.report_path(date_str)
+        stamp = self._stamp(p)
+        if stamp is None:
+            return None
+        if text is None:
+            try:
+                text = p.read_text(encoding="utf-8", errors="ignore")
+            except Exception:
+                return None
+        entry: dict[str, Any] = {"schema": INDEX_SCHEMA, "date": date_str, "stamp": stamp}
+        for name, fn in _FIELDS.items():
+            entry[name] = sorted(fn(text))
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            ip = self._index_path(date_str)
+            tmp = ip.with_suffix(f".tmp{os.getpid()}")
+            tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, ip)
+        except Exception:
+            pass  # read-only reports dir: still answer from the in-memory entry
+        self._cache[date_str] = entry
+        return entry
+
+    def _entry(self, date_str: str) -> dict[str, Any] | None:
+        stamp = self._stamp(self.report_path(date_str))
+        if stamp is None:
+            return None
+        entry = self._cache.get(date_str)
+        if entry is None:
+            try:
+                entry = json.loads(self._index_path(date_str).read_text(encoding="utf-8"))
+            except Exception:
+                entry = None
+        if (
+            not isinstance(entry, dict)
+            or entry.get("schema") != INDEX_SCHEMA
+            or entry.get("stamp") != stamp
+            or any(not isinstance(entry.get(name), list) for name in _FIELDS)
+        ):
+            return self.record(date_str)
+        self._cache[date_str] = entry
+        return entry
+
+    def keys(self, date_str: str, field: str = "titles") -> frozenset[str]:
+        """Fingerprints of one day's report (`titles` or `repeat_keys`); empty when there is no report."""
+        if field not in _FIELDS:
+            raise ValueError(f"unknown history field: {field}")
+        entry = self._entry(date_str)
+        if entry is None:
+            return frozenset()
+        return frozenset(str(x) for x in entry.get(field, []))
+
+    def recent_days(self, before: str, limit: int = 7) -> list[str]:
+        """Up to `limit` most recent report dates strictly before `before`, newest first."""
+        limit = max(0, int(limit))
+        if limit == 0:
+            return []
+        try:
+            d0 = dt.date.fromisoformat(str(before))
+        except Exception:
+            return self._listed_days(before, limit)
+        days: list[str] = []
+        for off in range(1, self.lookback_days + 1):
+            ds = (d0 - dt.timedelta(days=off)).isoformat()
+            if self.report_path(ds).is_file():
+                days.append(ds)
+                if len(days) >= limit:
+                    return days
+        return self._listed_days(before, limit)
+
+    def _listed_days(self, before: str, limit: int) -> list[str]:
+        found: list[str] = []
+        try:
+            with os.scandir(self.reports_dir) as it:
+                for de in it:
+                    m = REPORT_NAME_RE.match(de.name)
+                    if m and m.group(1) < str(before):
+                        found.append(m.group(1))
+        except OSError:
+            return []
+        return sorted(found, reverse=True)[:limit]
+
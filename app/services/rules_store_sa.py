@@ -25,6 +25,7 @@ from app.db.models.rules import (
     SchedulerRulesVersion,
 )
 from app.db.repo import RulesRepo, SourcesRepo
+from app.rules.decision_cache import invalidate_decision_cache
 
 
 def _utc_now() -> str:
@@ -334,6 +335,10 @@ class SQLAlchemyRulesStore:
             )
         return out
 
+    def active_version_ids(self, rulesets: list[str], profiles: list[str]) -> dict[str, dict[str, int]]:
+        """Active version row ids per ruleset/profile (cheap key for decision caching)."""
+        return {rs: self.rules_repo.active_ids(self._table_model(rs), profiles) for rs in rulesets}
+
     def list_versions(
         self,
         ruleset: str,
@@ -397,6 +402,8 @@ class SQLAlchemyRulesStore:
             created_by=created_by,
             activate=activate,
         )
+        if activate:
+            invalidate_decision_cache()
         self._dual_write(
             "create_version",
             ruleset,
@@ -421,6 +428,7 @@ class SQLAlchemyRulesStore:
         ok = self.rules_repo.activate_version(model, profile=profile, version=version)
         if not ok:
             raise RuntimeError(f"version not found: ruleset={ruleset} profile={profile} version={version}")
+        invalidate_decision_cache()
         self._dual_write("activate_version", ruleset, profile=profile, version=version)
         return {"ok": True, "ruleset": ruleset, "profile": profile, "version": version, "is_active": True}
 
@@ -433,6 +441,7 @@ class SQLAlchemyRulesStore:
                 raise RuntimeError(f"no active version: ruleset={ruleset} profile={profile}")
             raise RuntimeError(f"no previous version to rollback: ruleset={ruleset} profile={profile}")
         active_version, previous_version = rolled
+        invalidate_decision_cache()
         self._dual_write("rollback", ruleset, profile=profile)
         return {
             "ok": True,
@@ -444,9 +453,10 @@ class SQLAlchemyRulesStore:
 
     def upsert_sources(self, sources: list[dict[str, Any]], *, replace: bool = True) -> dict[str, Any]:
         now = _utc_now()
-        cnt = self.sources_repo.upsert_many(sources, replace=replace, now=now)
+        stats = self.sources_repo.sync_many(sources, replace=replace, now=now)
         self._dual_write("upsert_sources", sources, replace=replace)
-        return {"ok": True, "source_count": cnt}
+        cnt = stats.pop("count")
+        return {"ok": True, "source_count": cnt, **stats}
 
     def list_sources(self, *, enabled_only: bool = False) -> list[dict[str, Any]]:
         out = self.sources_repo.list(enabled_only=enabled_only)
@@ -459,6 +469,10 @@ class SQLAlchemyRulesStore:
             )
         return out
 
+    def sources_watermark(self) -> dict[str, Any]:
+        """Cheap change marker for the sources table: row count + max(updated_at)."""
+        return self.sources_repo.watermark()
+
     def get_source(self, source_id: str) -> dict[str, Any] | None:
         out = self.sources_repo.get(source_id)
         if self._secondary_store is not None and self.read_mode == "shadow_compare":
@@ -826,6 +840,10 @@ class SQLAlchemyRulesStore:
             created_at=created_at,
         )
 
+    def report_artifact_run_ids(self, artifact_types: list[str] | None = None) -> set[str]:
+        """Run ids with at least one recorded report artifact (optionally of the given types)."""
+        return self.rules_repo.report_artifact_run_ids(artifact_types)
+
     def recent_run_executions(self, limit: int = 20) -> list[dict[str, Any]]:
         return self.rules_repo.recent_run_executions(limit=limit)
 
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import shutil
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
-from app.services.rules_store import RulesStore
+from app.rules.decision_cache import invalidate_decision_cache
+
+if TYPE_CHECKING:
+    from app.services.rules_store import RulesStore
+
+
+def _open_rules_store(project_root: Path) -> RulesStore:
+    # Imported on use so that importing this module does not pull in SQLAlchemy.
+    from app.services.rules_store import RulesStore
+
+    return RulesStore(project_root)
 
 
 def _utc_now() -> str:
@@ -101,7 +112,7 @@ def _load_sources_registry_docs(rules_root: Path) -> list[dict[str, Any]]:
 
 
 def _bootstrap_rules_db(project_root: Path, rules_root: Path) -> None:
-    store = RulesStore(project_root)
+    store = _open_rules_store(project_root)
     for ruleset in ("email_rules", "content_rules"):
         if store.has_any_versions(ruleset):
             continue
@@ -122,19 +133,144 @@ def _bootstrap_rules_db(project_root: Path, rules_root: Path) -> None:
         store.upsert_sources(sources, replace=True)
 
 
+_RULES_TREE_DIRS = ("email_rules", "content_rules", "sources", "schemas")
+# Optional unified sources registry file.
+_RULES_TREE_FILES = ("sources_registry.v1.yaml",)
+
+
+def get_objects_root(project_root: Path) -> Path:
+    return get_console_root(project_root) / "objects"
+
+
+def _iter_rules_files(rules_root: Path) -> list[tuple[str, Path]]:
+    out: list[tuple[str, Path]] = []
+    for d in _RULES_TREE_DIRS:
+        base = rules_root / d
+        if not base.is_dir():
+            continue
+        for p in sorted(base.rglob("*")):
+            if p.is_file():
+                out.append((p.relative_to(rules_root).as_posix(), p))
+    for name in _RULES_TREE_FILES:
+        p = rules_root / name
+        if p.is_file():
+            out.append((name, p))
+    return out
+
+
+def _blob_path(objects_root: Path, digest: str) -> Path:
+    return objects_root / digest[:2] / digest
+
+
+def _store_blob(objects_root: Path, src: Path) -> str:
+    data = src.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    dst = _blob_path(objects_root, digest)
+    if not dst.exists():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f"{digest}.tmp{os.getpid()}")
+        tmp.write_bytes(data)
+        # Blobs are shared by every version that links them: keep them read-only.
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, dst)
+    return digest
+
+
+def _file_stat(p: Path) -> list[int]:
+    st = p.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _store_rules_tree(
+    project_root: Path, rules_root: Path, previous: dict[str, Any] | None = None
+) -> tuple[dict[str, str], dict[str, list[int]]]:
+    """
+    Store every rules file as a content-addressed blob; returns the manifest {relpath: sha256}
+    and {relpath: [size, mtime_ns]}. A file whose size and mtime match `previous` (the active
+    version's manifest) reuses its digest without being read, so an unchanged publish hashes
+    nothing.
+    """
+    objects_root = get_objects_root(project_root)
+    prev_files = (previous or {}).get("files") or {}
+    prev_stat = (previous or {}).get("stat") or {}
+    files: dict[str, str] = {}
+    stat: dict[str, list[int]] = {}
+    for rel, p in _iter_rules_files(rules_root):
+        stat[rel] = _file_stat(p)
+        digest = prev_files.get(rel)
+        if digest and prev_stat.get(rel) == stat[rel] and _blob_path(objects_root, digest).is_file():
+            files[rel] = digest
+        else:
+            files[rel] = _store_blob(objects_root, p)
+    return files, stat
+
+
+def _materialize_rules_tree(
+    project_root: Path, files: dict[str, str], dst_rules_root: Path, stat: dict[str, list[int]] | None = None
+) -> None:
+    """
+    Lay out a manifest as a plain rules directory. Files are copies, never hard links: the
+    active version tree is the editable workspace (source upserts write through its paths),
+    and a linked file would rewrite the shared blob under every manifest that references it.
+    Recorded mtimes are restored so the next publish can skip re-hashing untouched files.
+    """
+    objects_root = get_objects_root(project_root)
+    if dst_rules_root.exists():
+        shutil.rmtree(dst_rules_root)
+    dst_rules_root.mkdir(parents=True, exist_ok=True)
+    for rel, digest in sorted(files.items()):
+        blob = _blob_path(objects_root, digest)
+        dst = dst_rules_root / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(blob, dst)
+        rec = (stat or {}).get(rel)
+        if rec and len(rec) == 2 and dst.stat().st_size == rec[0]:
+            os.utime(dst, ns=(rec[1], rec[1]))
+
+
+def _read_manifest_doc(project_root: Path, version: str) -> dict[str, Any] | None:
+    doc = _read_json(get_versions_root(project_root) / version / "manifest.json")
+    return doc if isinstance(doc.get("files"), dict) else None
+
+
+def _write_version_tree(
+    project_root: Path, src_rules_root: Path, version_root: Path, previous: dict[str, Any] | None = None
+) -> dict[str, str]:
+    """
+    Record `src_rules_root` as a new version and lay it out as the active tree. Only changed
+    files are read (see _store_rules_tree); the tree is copied from the source with mtimes
+    kept, so the stat recorded in the manifest matches the files on disk.
+    """
+    files, stat = _store_rules_tree(project_root, src_rules_root, previous)
+    _write_json(version_root / "manifest.json", {"version": version_root.name, "files": files, "stat": stat})
+    _copy_rules_tree(src_rules_root, version_root / "rules")
+    return files
+
+
+def _drop_version_tree(project_root: Path, version: str | None) -> None:
+    """Remove an inactive version's rules directory; _version_tree lays it out again on demand."""
+    if version:
+        shutil.rmtree(get_version_rules_root(project_root, str(version)), ignore_errors=True)
+
+
+def _manifest_changes(old: dict[str, str] | None, new: dict[str, str]) -> dict[str, list[str]] | None:
+    if old is None:
+        return None
+    return {
+        "added": sorted(k for k in new if k not in old),
+        "modified": sorted(k for k in new if k in old and old[k] != new[k]),
+        "removed": sorted(k for k in old if k not in new),
+    }
+
+
 def _copy_rules_tree(src_rules_root: Path, dst_rules_root: Path) -> None:
     if dst_rules_root.exists():
         shutil.rmtree(dst_rules_root)
     dst_rules_root.mkdir(parents=True, exist_ok=True)
-    for d in ("email_rules", "content_rules", "sources", "schemas"):
-        src = src_rules_root / d
-        dst = dst_rules_root / d
-        if src.exists() and src.is_dir():
-            shutil.copytree(src, dst)
-    # Optional unified sources registry file.
-    src_registry = src_rules_root / "sources_registry.v1.yaml"
-    if src_registry.exists() and src_registry.is_file():
-        shutil.copy2(src_registry, dst_rules_root / "sources_registry.v1.yaml")
+    for rel, p in _iter_rules_files(src_rules_root):
+        dst = dst_rules_root / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(p, dst)
 
 
 def _next_version_id(versions_root: Path) -> str:
@@ -172,13 +308,28 @@ def get_version_rules_root(project_root: Path, version: str) -> Path:
     return get_versions_root(project_root) / version / "rules"
 
 
+def _version_tree(project_root: Path, version: str) -> Path | None:
+    """The version's rules directory, re-laid from its manifest if the directory was removed."""
+    p = get_version_rules_root(project_root, version)
+    if p.exists():
+        return p
+    doc = _read_manifest_doc(project_root, version)
+    if doc is None:
+        return None
+    try:
+        _materialize_rules_tree(project_root, doc["files"], p, doc.get("stat"))
+    except OSError:
+        return None
+    return p
+
+
 def get_runtime_rules_root(project_root: Path) -> Path:
     ensure_bootstrap_published(project_root)
     pointer = get_published_pointer(project_root)
     active = str(pointer.get("active_version", "")).strip()
     if active:
-        p = get_version_rules_root(project_root, active)
-        if p.exists():
+        p = _version_tree(project_root, active)
+        if p is not None:
             return p
     return project_root / "rules"
 
@@ -188,19 +339,16 @@ def ensure_bootstrap_published(project_root: Path) -> None:
     if pointer_path.exists():
         pointer = _read_json(pointer_path)
         active = str(pointer.get("active_version", "")).strip()
-        runtime_root = get_version_rules_root(project_root, active) if active else (project_root / "rules")
-        if not runtime_root.exists():
-            runtime_root = project_root / "rules"
+        runtime_root = (_version_tree(project_root, active) if active else None) or (project_root / "rules")
         _bootstrap_rules_db(project_root, runtime_root)
         return
 
     versions_root = get_versions_root(project_root)
     version = _next_version_id(versions_root)
     version_root = versions_root / version
-    version_rules_root = version_root / "rules"
 
     src_rules_root = project_root / "rules"
-    _copy_rules_tree(src_rules_root, version_rules_root)
+    _write_version_tree(project_root, src_rules_root, version_root)
 
     meta = {
         "version": version,
@@ -217,7 +365,7 @@ def ensure_bootstrap_published(project_root: Path) -> None:
         "updated_at": _utc_now(),
     }
     _write_json(pointer_path, pointer)
-    _bootstrap_rules_db(project_root, version_rules_root)
+    _bootstrap_rules_db(project_root, version_root / "rules")
 
 
 def publish_rules_version(
@@ -231,9 +379,12 @@ def publish_rules_version(
     versions_root = get_versions_root(project_root)
     version = _next_version_id(versions_root)
     version_root = versions_root / version
-    version_rules_root = version_root / "rules"
+    pointer = get_published_pointer(project_root)
+    prev = pointer.get("active_version")
 
-    _copy_rules_tree(staged_rules_root, version_rules_root)
+    previous = _read_manifest_doc(project_root, str(prev)) if prev else None
+    files = _write_version_tree(project_root, staged_rules_root, version_root, previous)
+    changes = _manifest_changes(previous["files"] if previous is not None else None, files)
 
     meta = {
         "version": version,
@@ -241,10 +392,10 @@ def publish_rules_version(
         "created_by": created_by,
         "note": note,
     }
+    if changes is not None:
+        meta["changes"] = changes
     _write_json(version_root / "meta.json", meta)
 
-    pointer = get_published_pointer(project_root)
-    prev = pointer.get("active_version")
     history = list(pointer.get("history", []))
     history.append(version)
     pointer = {
@@ -254,7 +405,9 @@ def publish_rules_version(
         "updated_at": _utc_now(),
     }
     _write_json(get_published_pointer_path(project_root), pointer)
-    store = RulesStore(project_root)
+    if prev and prev != version:
+        _drop_version_tree(project_root, str(prev))
+    store = _open_rules_store(project_root)
     for ruleset in ("email_rules", "content_rules"):
         profiles = _iter_rule_profiles(staged_rules_root, ruleset)
         for profile, doc in profiles:
@@ -267,8 +420,9 @@ def publish_rules_version(
                 activate=True,
             )
     sources = _load_sources_registry_docs(staged_rules_root)
-    store.upsert_sources(sources, replace=True)
-    return {"ok": True, **meta, "previous_version": prev}
+    sources_sync = store.upsert_sources(sources, replace=True)
+    invalidate_decision_cache()
+    return {"ok": True, **meta, "previous_version": prev, "sources_sync": sources_sync}
 
 
 def rollback_to_previous(project_root: Path, created_by: str) -> dict[str, Any]:
@@ -280,6 +434,8 @@ def rollback_to_previous(project_root: Path, created_by: str) -> dict[str, Any]:
 
     current = history[-1]
     previous = history[-2]
+    # Lay the target tree back out first (a no-op while it is still on disk).
+    _version_tree(project_root, previous)
     history.append(previous)
     pointer = {
         "active_version": previous,
@@ -289,7 +445,9 @@ def rollback_to_previous(project_root: Path, created_by: str) -> dict[str, Any]:
         "rolled_back_by": created_by,
     }
     _write_json(get_published_pointer_path(project_root), pointer)
-    store = RulesStore(project_root)
+    if current != previous:
+        _drop_version_tree(project_root, current)
+    store = _open_rules_store(project_root)
     rollback_rows: list[dict[str, Any]] = []
     for ruleset in ("email_rules", "content_rules"):
         active = store.list_versions(ruleset, active_only=True)
@@ -301,6 +459,7 @@ def rollback_to_previous(project_root: Path, created_by: str) -> dict[str, Any]:
                 rollback_rows.append(store.rollback(ruleset, profile=profile))
             except RuntimeError:
                 continue
+    invalidate_decision_cache()
     return {
         "ok": True,
         "active_version": previous,
@@ -323,6 +482,8 @@ def stage_rules_overlay(project_root: Path, overlays: dict[str, str]) -> Path:
     tmp_root.mkdir(parents=True, exist_ok=True)
 
     staged_rules_root = tmp_root / "rules"
+    # Always from the files on disk: source upserts edit the active tree in place, and
+    # those edits are not in its manifest until the next publish.
     _copy_rules_tree(runtime_root, staged_rules_root)
 
     for rel, content in overlays.items():
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import logging
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
-from urllib.parse import urlparse
+
+from app.utils.domain_trie import DomainSuffixTrie
+from app.utils.url_norm import ParsedUrl, UrlLike, as_parsed_url
 
 
 TRUST_RANK = {"A": 3, "B": 2, "C": 1}
 
+_logger = logging.getLogger("source_policy")
+
 
 def _as_list(v: Any) -> list[str]:
     if not isinstance(v, list):
@@ -37,7 +44,7 @@ def source_policy_default(profile: str = "legacy") -> dict[str, Any]:
     }
 
 
-def normalize_source_policy(raw: dict[str, Any] | None, *, profile: str = "legacy") -> dict[str, Any]:
+def normalize_source_policy(raw: dict[str, Any] | None, *, profile: str = "legacy") -> SourcePolicy:
     base = source_policy_default(profile)
     cfg = raw if isinstance(raw, dict) else {}
 
@@ -56,33 +63,123 @@ def normalize_source_policy(raw: dict[str, Any] | None, *, profile: str = "legac
         if h:
             domains.append(h)
 
-    return {
-        "enabled": enabled,
-        "min_trust_tier": min_tt,
-        "exclude_domains": domains,
-        "exclude_source_ids": _as_list(cfg.get("exclude_source_ids", [])),
-        "drop_if_url_matches": _as_list(cfg.get("drop_if_url_matches", [])),
-    }
+    return SourcePolicy(
+        {
+            "enabled": enabled,
+            "min_trust_tier": min_tt,
+            "exclude_domains": domains,
+            "exclude_source_ids": _as_list(cfg.get("exclude_source_ids", [])),
+            "drop_if_url_matches": _as_list(cfg.get("drop_if_url_matches", [])),
+        }
+    )
 
 
-def host_from_url(url: str) -> str:
-    try:
-        return str(urlparse(str(url or "")).hostname or "").strip().lower()
-    except Exception:
-        return ""
+def host_from_url(url: UrlLike) -> str:
+    return as_parsed_url(url).host
+
+
+@lru_cache(maxsize=256)
+def _exclude_domain_trie(exclude_domains: tuple[str, ...]) -> DomainSuffixTrie:
+    trie = DomainSuffixTrie()
+    for d in exclude_domains:
+        dd = str(d or "").strip().lower().lstrip(".")
+        if dd:
+            trie.add(dd)
+    return trie
 
 
-def is_domain_excluded(url: str, exclude_domains: list[str]) -> bool:
+def is_domain_excluded(url: UrlLike, exclude_domains: list[str] | tuple[str, ...]) -> bool:
     host = host_from_url(url)
     if not host:
         return False
-    for d in exclude_domains:
-        dd = str(d or "").strip().lower().lstrip(".")
-        if not dd:
+    return _exclude_domain_trie(tuple(exclude_domains)).matches(host)
+
+
+@dataclass(frozen=True)
+class CompiledUrlPatterns:
+    """
+    `drop_if_url_matches` compiled once. Valid patterns are joined into a single
+    alternation when that is safe (no backreferences / clashing group names),
+    otherwise each is kept as its own compiled regex.
+    """
+
+    combined: re.Pattern[str] | None = None
+    patterns: tuple[re.Pattern[str], ...] = ()
+    invalid: tuple[str, ...] = ()
+
+    def search(self, text: str) -> bool:
+        if self.combined is not None:
+            return self.combined.search(text) is not None
+        return any(p.search(text) is not None for p in self.patterns)
+
+
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+@lru_cache(maxsize=256)
+def compile_url_patterns(patterns: tuple[str, ...]) -> CompiledUrlPatterns:
+    valid: list[str] = []
+    compiled: list[re.Pattern[str]] = []
+    invalid: list[str] = []
+    for ptn in patterns:
+        try:
+            compiled.append(re.compile(ptn, flags=re.IGNORECASE))
+        except re.error as e:
+            invalid.append(ptn)
+            # Memoized per pattern set: a bad pattern is reported once, not once per URL.
+            _logger.warning("ignoring invalid drop_if_url_matches pattern=%r error=%s", ptn, e)
             continue
-        if host == dd or host.endswith("." + dd):
-            return True
-    return False
+        valid.append(ptn)
+    combined: re.Pattern[str] | None = None
+    if valid and not any(_BACKREF_RE.search(p) for p in valid):
+        try:
+            combined = re.compile("|".join(f"(?:{p})" for p in valid), flags=re.IGNORECASE)
+        except re.error:
+            combined = None
+    return CompiledUrlPatterns(combined=combined, patterns=tuple(compiled), invalid=tuple(invalid))
+
+
+class SourcePolicy(dict):
+    """
+    Normalized source policy. Still a plain dict for config/JSON consumers, with the
+    per-URL matchers (source id set, domain suffix trie, URL regex) compiled once at
+    construction. Treat as read-only: copy and re-wrap to change it.
+    """
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        super().__init__(data or {})
+        self.enabled = bool(self.get("enabled", True))
+        self.excluded_source_ids: frozenset[str] = frozenset(_as_list(self.get("exclude_source_ids", [])))
+        self.domain_matcher = _exclude_domain_trie(tuple(_as_list(self.get("exclude_domains", []))))
+        self.url_patterns = compile_url_patterns(tuple(_as_list(self.get("drop_if_url_matches", []))))
+        self.min_trust_rank = TRUST_RANK.get(_tier(self.get("min_trust_tier", "C"), default="C"), 1)
+
+    def passes_min_trust_tier(self, trust_tier: str) -> bool:
+        return TRUST_RANK.get(_tier(trust_tier, default="C"), 0) >= self.min_trust_rank
+
+    @property
+    def invalid_url_patterns(self) -> tuple[str, ...]:
+        return self.url_patterns.invalid
+
+    def exclusion_reason(self, source_id: str, url: UrlLike) -> str:
+        if not self.enabled:
+            return ""
+        sid = str(source_id or "").strip()
+        if sid and sid in self.excluded_source_ids:
+            return "excluded_source"
+        pu = as_parsed_url(url)
+        if pu.host and self.domain_matcher.matches(pu.host):
+            return "excluded_domain"
+        raw = url.raw if isinstance(url, ParsedUrl) else str(url or "")
+        if self.url_patterns.search(raw):
+            return "excluded_url_pattern"
+        return ""
+
+
+def as_source_policy(policy: dict[str, Any]) -> SourcePolicy:
+    if isinstance(policy, SourcePolicy):
+        return policy
+    return SourcePolicy(policy if isinstance(policy, dict) else {})
 
 
 def source_passes_min_trust_tier(trust_tier: str, policy: dict[str, Any]) -> bool:
@@ -91,21 +188,8 @@ def source_passes_min_trust_tier(trust_tier: str, policy: dict[str, Any]) -> boo
     return TRUST_RANK.get(tt, 0) >= TRUST_RANK.get(min_tt, 1)
 
 
-def exclusion_reason(source_id: str, url: str, policy: dict[str, Any]) -> str:
-    if not bool(policy.get("enabled", True)):
-        return ""
-    sid = str(source_id or "").strip()
-    if sid and sid in set(_as_list(policy.get("exclude_source_ids", []))):
-        return "excluded_source"
-    if is_domain_excluded(url, _as_list(policy.get("exclude_domains", []))):
-        return "excluded_domain"
-    for ptn in _as_list(policy.get("drop_if_url_matches", [])):
-        try:
-            if re.search(ptn, str(url or ""), flags=re.IGNORECASE):
-                return "excluded_url_pattern"
-        except Exception:
-            continue
-    return ""
+def exclusion_reason(source_id: str, url: UrlLike, policy: dict[str, Any]) -> str:
+    return as_source_policy(policy).exclusion_reason(source_id, url)
 
 
 def filter_entries_for_collect(
@@ -114,14 +198,15 @@ def filter_entries_for_collect(
     source_id: str,
     policy: dict[str, Any],
 ) -> tuple[list[dict[str, Any]], int, dict[str, int]]:
-    if not bool(policy.get("enabled", True)):
+    policy = as_source_policy(policy)
+    if not policy.enabled:
         return list(entries), 0, {}
     kept: list[dict[str, Any]] = []
     dropped = 0
     reasons: dict[str, int] = {}
     for it in entries:
         url = str((it or {}).get("url", (it or {}).get("link", ""))).strip()
-        rs = exclusion_reason(source_id, url, policy)
+        rs = policy.exclusion_reason(source_id, url)
         if rs:
             dropped += 1
             reasons[rs] = reasons.get(rs, 0) + 1
@@ -135,7 +220,8 @@ def filter_rows_for_digest(
     *,
     policy: dict[str, Any],
 ) -> tuple[list[dict[str, Any]], int, dict[str, int]]:
-    if not bool(policy.get("enabled", True)):
+    policy = as_source_policy(policy)
+    if not policy.enabled:
         return list(rows), 0, {}
     kept: list[dict[str, Any]] = []
     dropped = 0
@@ -145,11 +231,11 @@ def filter_rows_for_digest(
         url = str((r or {}).get("url", "")).strip()
         tt_raw = str((r or {}).get("trust_tier", "")).strip().upper()
         if tt_raw:
-            if not source_passes_min_trust_tier(tt_raw, policy):
+            if not policy.passes_min_trust_tier(tt_raw):
                 dropped += 1
                 reasons["below_min_trust_tier"] = reasons.get("below_min_trust_tier", 0) + 1
                 continue
-        rs = exclusion_reason(sid, url, policy)
+        rs = policy.exclusion_reason(sid, url)
         if rs:
             dropped += 1
             reasons[rs] = reasons.get(rs, 0) + 1
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import contextvars
 import json
 import os
 import re
 import time
 import html as ihtml
+import threading
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable
 from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse
 from urllib.request import Request, urlopen
@@ -16,14 +20,65 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import feedparser
 import yaml
 
+from app.services.article_body_cache import ArticleBodyCache, get_article_body_cache
+from app.services.fetch_executor import DEFAULT_PER_HOST, FetchExecutor, FetchJob, host_of
+from app.services.fetch_snapshot import active_snapshot_session
 from app.services.html_article_extractor import extract_article
-from app.services.rules_store import RulesStore
+from app.utils.url_norm import url_norm
+
+if TYPE_CHECKING:
+    from app.services.rules_store import RulesStore
 
 
 class SourceRegistryError(RuntimeError):
     pass
 
 
+def _open_rules_store(project_root: Path) -> RulesStore:
+    # Lazy: parsing feeds and fetching sources never needs the DB layer.
+    from app.services.rules_store import RulesStore
+
+    return RulesStore(project_root)
+
+
+_SHARED_STORES: dict[tuple[str, ...], RulesStore] = {}
+_SHARED_STORES_LOCK = threading.Lock()
+_SHARED_STORES_MAX = 16
+
+
+def _shared_rules_store(project_root: Path) -> RulesStore:
+    """
+    One RulesStore (engine + schema check) per project root and DB settings, reused by the
+    registry snapshot path so a cache hit costs a watermark query, not a store setup.
+    """
+    from app.db.config import get_db_settings
+
+    settings = get_db_settings()
+    key = (
+        str(Path(project_root).resolve()),
+        os.environ.get("DATABASE_URL", "").strip(),
+        str(settings.database_url_secondary or ""),
+        settings.db_write_mode,
+        settings.db_read_mode,
+    )
+    with _SHARED_STORES_LOCK:
+        store = _SHARED_STORES.get(key)
+        if store is None:
+            store = _open_rules_store(project_root)
+            if len(_SHARED_STORES) >= _SHARED_STORES_MAX:
+                _SHARED_STORES.pop(next(iter(_SHARED_STORES)))
+            _SHARED_STORES[key] = store
+        return store
+
+
+def _forget_shared_rules_store(store: RulesStore) -> None:
+    """Drop a shared store whose queries fail, so the next call sets up a fresh one."""
+    with _SHARED_STORES_LOCK:
+        for key, cached in list(_SHARED_STORES.items()):
+            if cached is store:
+                del _SHARED_STORES[key]
+
+
 REGISTRY_FILE_NAME = "sources_registry.v1.yaml"
 OVERRIDES_FILE_NAME = "sources_overrides.json"
 ALLOWED_FETCHERS = {"rss", "html", "rsshub", "google_news", "web", "api"}
@@ -325,6 +380,20 @@ def _generic_html_list_entries(
 
 
 def _fetch_url_with_retry(url: str, headers: dict[str, str], timeout: int, retries: int) -> dict[str, Any]:
+    """
+    Network fetch used by every connector. When a fetch snapshot session is active the
+    response is recorded (collect / live runs) or served from the snapshot (offline replay).
+    """
+    snap = active_snapshot_session()
+    if snap is not None and snap.replaying:
+        return snap.replay(url)
+    res = _fetch_url_live(url, headers, timeout, retries)
+    if snap is not None:
+        snap.record(url, res)
+    return res
+
+
+def _fetch_url_live(url: str, headers: dict[str, str], timeout: int, retries: int) -> dict[str, Any]:
     attempt = 0
     last_err = ""
     last_type = "network_error"
@@ -335,16 +404,30 @@ def _fetch_url_with_retry(url: str, headers: dict[str, str], timeout: int, retri
             with urlopen(req, timeout=timeout) as r:
                 data = r.read()
                 status = int(getattr(r, "status", 200))
-                ctype = str(getattr(r, "headers", {}).get("Content-Type", "")) if getattr(r, "headers", None) else ""
+                rh = getattr(r, "headers", None)
+                ctype = str(rh.get("Content-Type", "")) if rh else ""
                 return {
                     "ok": True,
                     "data": data,
                     "http_status": status,
                     "content_type": ctype,
+                    "etag": str(rh.get("ETag", "") or "") if rh else "",
+                    "last_modified": str(rh.get("Last-Modified", "") or "") if rh else "",
                     "error_type": "",
                     "error_message": "",
                 }
         except HTTPError as e:
+            if int(getattr(e, "code", 0) or 0) == 304:
+                # Conditional request (If-None-Match / If-Modified-Since) hit: the cached copy is current.
+                return {
+                    "ok": False,
+                    "not_modified": True,
+                    "data": b"",
+                    "http_status": 304,
+                    "content_type": "",
+                    "error_type": "not_modified",
+                    "error_message": "",
+                }
             last_type = "http_error"
             last_err = f"HTTPError: {getattr(e, 'code', '')} {e}"
             if int(getattr(e, "code", 0) or 0) in (403, 404):
@@ -495,6 +578,211 @@ def _infer_groups_from_tags(sources: list[dict[str, Any]]) -> dict[str, list[str
     return groups
 
 
+def _file_signature(path: Path) -> tuple[str, int, int, int]:
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), -1, -1, -1)
+    return (str(path), int(st.st_mtime_ns), int(st.st_size), int(st.st_ino))
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(x) for x in obj)
+    return obj
+
+
+def _thaw(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thaw(x) for x in obj]
+    return obj
+
+
+class _RegistryCache:
+    """
+    Process-level cache of merged v1 registry bundles.
+
+    Entries are keyed by (project_root, registry path) and validated against
+    registry/overrides file signatures plus the DB sources watermark, so a
+    hit never serves stale data. Snapshots are stored frozen; callers get
+    thawed copies and cannot corrupt the cached state.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], tuple[tuple[Any, ...], Mapping[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple[str, str], signature: tuple[Any, ...]) -> Mapping[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple[str, str], signature: tuple[Any, ...], snapshot: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (signature, snapshot)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_REGISTRY_CACHE = _RegistryCache()
+
+
+def sources_registry_cache_stats() -> dict[str, Any]:
+    return _REGISTRY_CACHE.stats()
+
+
+def invalidate_sources_registry_cache() -> None:
+    _REGISTRY_CACHE.invalidate()
+
+
+def _sources_db_watermark(store: RulesStore | None) -> tuple[int, str] | None:
+    if store is None:
+        return None
+    try:
+        wm = store.sources_watermark()
+    except Exception:
+        return None
+    return (int(wm.get("count", 0) or 0), str(wm.get("max_updated_at", "")))
+
+
+def _build_registry_bundle_v1(project_root: Path, reg_path: Path, store: RulesStore | None) -> dict[str, Any]:
+    doc = _load_yaml(reg_path)
+    version = str(doc.get("version", "1.0.0"))
+    raw_sources = doc.get("sources", [])
+    if not isinstance(raw_sources, list):
+        raise SourceRegistryError(f"{reg_path}: sources must be array")
+    groups = doc.get("groups", {})
+    if not isinstance(groups, dict):
+        raise SourceRegistryError(f"{reg_path}: groups must be object")
+
+    sources: list[dict[str, Any]] = []
+    id_set: set[str] = set()
+    for s in raw_sources:
+        if not isinstance(s, dict):
+            continue
+        row = _normalize_source(s, reg_path)
+        sid = str(row.get("id", "")).strip()
+        if not sid:
+            continue
+        if sid in id_set:
+            raise SourceRegistryError(f"{reg_path}: duplicate source id={sid}")
+        id_set.add(sid)
+        sources.append(row)
+
+    gid_to_ids: dict[str, list[str]] = {}
+    sid_to_groups: dict[str, list[str]] = {}
+    for g, raw_ids in groups.items():
+        gid = str(g).strip()
+        if not gid:
+            continue
+        if not isinstance(raw_ids, list):
+            raise SourceRegistryError(f"{reg_path}: groups.{gid} must be array")
+        ids: list[str] = []
+        for x in raw_ids:
+            sid = str(x).strip()
+            if not sid:
+                continue
+            ids.append(sid)
+            sid_to_groups.setdefault(sid, []).append(gid)
+        gid_to_ids[gid] = ids
+
+    for row in sources:
+        sid = str(row.get("id", "")).strip()
+        row["registry_groups"] = sid_to_groups.get(sid, [])
+        row["source_group"] = _resolve_source_group(row)
+
+    overrides = _load_overrides(project_root)
+    merged = _apply_overrides(sources, overrides)
+    # Merge runtime fetch/test status from DB so /admin/sources can show "最近抓取" and status pills.
+    try:
+        if store is None:
+            raise RuntimeError("rules store unavailable")
+        db_rows = store.list_sources()
+        by_id = {str(x.get("id", "")).strip(): x for x in db_rows if str(x.get("id", "")).strip()}
+        sync_fields = (
+            "last_fetched_at",
+            "last_fetch_status",
+            "last_fetch_http_status",
+            "last_fetch_error",
+            "last_success_at",
+            "last_http_status",
+            "last_error",
+            "updated_at",
+        )
+        for row in merged:
+            sid = str(row.get("id", "")).strip()
+            db = by_id.get(sid)
+            if not isinstance(db, dict):
+                continue
+            for f in sync_fields:
+                if f in db:
+                    row[f] = db.get(f)
+        for row in merged:
+            row["source_group"] = _resolve_source_group(row)
+    except Exception:
+        # Keep registry loading resilient; UI can still operate without runtime stats.
+        pass
+    return {
+        "version": version,
+        "sources": merged,
+        "groups": gid_to_ids,
+        "source_file": str(reg_path),
+        "overrides_file": str(_overrides_path(project_root)),
+    }
+
+
+def load_sources_registry_snapshot(project_root: Path, reg_path: Path) -> Mapping[str, Any]:
+    """
+    Returns the frozen (read-only) merged v1 bundle for `reg_path`, served from
+    the process cache while registry/overrides files and the DB watermark are unchanged.
+    """
+    try:
+        store: RulesStore | None = _shared_rules_store(project_root)
+    except Exception:
+        store = None
+    watermark = _sources_db_watermark(store)
+    if store is not None and watermark is None:
+        _forget_shared_rules_store(store)
+    signature = (
+        _file_signature(reg_path),
+        _file_signature(_overrides_path(project_root)),
+        watermark,
+    )
+    if not _env_bool("SOURCES_REGISTRY_CACHE_ENABLED", True):
+        return _freeze(_build_registry_bundle_v1(project_root, reg_path, store))
+    key = (str(project_root.resolve()), str(reg_path.resolve()))
+    snap = _REGISTRY_CACHE.get(key, signature)
+    if snap is None:
+        snap = _freeze(_build_registry_bundle_v1(project_root, reg_path, store))
+        _REGISTRY_CACHE.put(key, signature, snap)
+    return snap
+
+
 def load_sources_registry_bundle(
     project_root: Path,
     rules_root: Path | None = None,
@@ -512,94 +800,14 @@ def load_sources_registry_bundle(
     """
     reg_path = _first_existing(_candidate_registry_paths(project_root, rules_root=rules_root))
     if reg_path is not None:
-        doc = _load_yaml(reg_path)
-        version = str(doc.get("version", "1.0.0"))
-        raw_sources = doc.get("sources", [])
-        if not isinstance(raw_sources, list):
-            raise SourceRegistryError(f"{reg_path}: sources must be array")
-        groups = doc.get("groups", {})
-        if not isinstance(groups, dict):
-            raise SourceRegistryError(f"{reg_path}: groups must be object")
-
-        sources: list[dict[str, Any]] = []
-        id_set: set[str] = set()
-        for s in raw_sources:
-            if not isinstance(s, dict):
-                continue
-            row = _normalize_source(s, reg_path)
-            sid = str(row.get("id", "")).strip()
-            if not sid:
-                continue
-            if sid in id_set:
-                raise SourceRegistryError(f"{reg_path}: duplicate source id={sid}")
-            id_set.add(sid)
-            sources.append(row)
-
-        gid_to_ids: dict[str, list[str]] = {}
-        sid_to_groups: dict[str, list[str]] = {}
-        for g, raw_ids in groups.items():
-            gid = str(g).strip()
-            if not gid:
-                continue
-            if not isinstance(raw_ids, list):
-                raise SourceRegistryError(f"{reg_path}: groups.{gid} must be array")
-            ids: list[str] = []
-            for x in raw_ids:
-                sid = str(x).strip()
-                if not sid:
-                    continue
-                ids.append(sid)
-                sid_to_groups.setdefault(sid, []).append(gid)
-            gid_to_ids[gid] = ids
-
-        for row in sources:
-            sid = str(row.get("id", "")).strip()
-            row["registry_groups"] = sid_to_groups.get(sid, [])
-            row["source_group"] = _resolve_source_group(row)
-
-        overrides = _load_overrides(project_root)
-        merged = _apply_overrides(sources, overrides)
-        # Merge runtime fetch/test status from DB so /admin/sources can show "最近抓取" and status pills.
-        try:
-            store = RulesStore(project_root)
-            db_rows = store.list_sources()
-            by_id = {str(x.get("id", "")).strip(): x for x in db_rows if str(x.get("id", "")).strip()}
-            sync_fields = (
-                "last_fetched_at",
-                "last_fetch_status",
-                "last_fetch_http_status",
-                "last_fetch_error",
-                "last_success_at",
-                "last_http_status",
-                "last_error",
-                "updated_at",
-            )
-            for row in merged:
-                sid = str(row.get("id", "")).strip()
-                db = by_id.get(sid)
-                if not isinstance(db, dict):
-                    continue
-                for f in sync_fields:
-                    if f in db:
-                        row[f] = db.get(f)
-            for row in merged:
-                row["source_group"] = _resolve_source_group(row)
-        except Exception:
-            # Keep registry loading resilient; UI can still operate without runtime stats.
-            pass
+        bundle = _thaw(load_sources_registry_snapshot(project_root, reg_path))
         if not include_deleted:
-            merged = [row for row in merged if not row.get("deleted_at")]
-        return {
-            "version": version,
-            "sources": merged,
-            "groups": gid_to_ids,
-            "source_file": str(reg_path),
-            "overrides_file": str(_overrides_path(project_root)),
-        }
+            bundle["sources"] = [row for row in bundle["sources"] if not row.get("deleted_at")]
+        return bundle
 
     # Legacy fallback path: existing DB-first behavior, then split yaml.
     if rules_root is None and not os.environ.get("RULES_WORKSPACE_DIR", "").strip():
-        store = RulesStore(project_root)
+        store = _open_rules_store(project_root)
         db_sources = store.list_sources()
         if db_sources:
             out: list[dict[str, Any]] = []
@@ -910,6 +1118,7 @@ def upsert_source_registry(
     doc["sources"] = sources
     doc.setdefault("groups", {})
     _write_registry_doc(reg_path, doc)
+    invalidate_sources_registry_cache()
     return {"ok": True, "source": _normalize_source(normalized, reg_path), "registry_file": str(reg_path)}
 
 
@@ -930,6 +1139,7 @@ def set_source_enabled_override(
     ov["enabled"] = em
     ov["updated_at"] = datetime.now(timezone.utc).isoformat()
     _save_overrides(project_root, ov)
+    invalidate_sources_registry_cache()
     src2 = dict(src)
     src2["enabled"] = bool(new_enabled)
     src2["enabled_overridden"] = True
@@ -969,6 +1179,105 @@ def _rss_entries_from_bytes(data: bytes, limit: int) -> list[dict[str, str]]:
     return _normalize_sample_rows(rows, limit)
 
 
+def _body_fetch_one(
+    link: str,
+    *,
+    headers: dict[str, str],
+    timeout: int,
+    retry_n: int,
+    source_group: str,
+    fetch_cfg: dict[str, Any],
+    cache: ArticleBodyCache | None,
+) -> dict[str, Any]:
+    """Snapshot-aware wrapper: replays the recorded snippet offline, records it otherwise."""
+    snap = active_snapshot_session()
+    if snap is not None and snap.replaying:
+        # Offline replay: use the snippet resolved during the recorded run, never the local cache.
+        rec = snap.lookup_derived("article_body", url_norm(link))
+        if rec is None:
+            return {"outcome": "failed", "snippet": "", "bytes_avoided": 0}
+        return {"outcome": "snapshot", "snippet": str(rec.get("snippet", "")), "bytes_avoided": 0}
+    res = _body_fetch_resolve(
+        link,
+        headers=headers,
+        timeout=timeout,
+        retry_n=retry_n,
+        source_group=source_group,
+        fetch_cfg=fetch_cfg,
+        cache=cache,
+    )
+    if snap is not None:
+        snap.record_derived("article_body", url_norm(link), {"snippet": str(res.get("snippet", ""))})
+    return res
+
+
+def _body_fetch_resolve(
+    link: str,
+    *,
+    headers: dict[str, str],
+    timeout: int,
+    retry_n: int,
+    source_group: str,
+    fetch_cfg: dict[str, Any],
+    cache: ArticleBodyCache | None,
+) -> dict[str, Any]:
+    """
+    Resolve one article body: fresh cache hit -> no request; stale hit -> conditional
+    request; miss -> full download + extract_article. Extraction outcomes (including
+    "not an article") are cached so the same link is not downloaded again within the TTL.
+    """
+    cached = cache.get(link) if cache is not None else None
+    if cached is not None and bool(cached.get("fresh")):
+        return {"outcome": "cache_hit", "snippet": str(cached.get("snippet", "")), "bytes_avoided": int(cached.get("body_bytes", 0) or 0)}
+
+    req_headers = dict(headers)
+    if cached is not None:
+        if str(cached.get("etag", "")).strip():
+            req_headers["If-None-Match"] = str(cached["etag"])
+        if str(cached.get("last_modified", "")).strip():
+            req_headers["If-Modified-Since"] = str(cached["last_modified"])
+    r = _fetch_url_with_retry(link, req_headers, timeout, retry_n)
+    if cached is not None and bool(r.get("not_modified")):
+        snippet = str(cached.get("snippet", ""))
+        if cache is not None:
+            cache.put(
+                link,
+                snippet=snippet,
+                ok=bool(cached.get("ok")),
+                etag=str(cached.get("etag", "")),
+                last_modified=str(cached.get("last_modified", "")),
+                body_bytes=int(cached.get("body_bytes", 0) or 0),
+            )
+        return {"outcome": "not_modified", "snippet": snippet, "bytes_avoided": int(cached.get("body_bytes", 0) or 0)}
+    if not r.get("ok"):
+        return {"outcome": "failed", "snippet": "", "bytes_avoided": 0}
+
+    data = bytes(r.get("data") or b"")
+    html = data.decode("utf-8", errors="ignore")
+    article = extract_article(
+        link,
+        html,
+        {
+            "source_group": source_group,
+            "article_min_paragraphs": int(fetch_cfg.get("article_min_paragraphs", 1) or 1),
+            "article_min_text_chars": int(fetch_cfg.get("article_min_text_chars", 120) or 120),
+            "snippet_max_chars": 420,
+        },
+    )
+    ok = bool(article.get("ok")) and not bool(article.get("dropped"))
+    snippet = str(article.get("evidence_snippet", "")).strip() if ok else ""
+    if cache is not None:
+        cache.put(
+            link,
+            snippet=snippet,
+            ok=ok,
+            etag=str(r.get("etag", "") or ""),
+            last_modified=str(r.get("last_modified", "") or ""),
+            body_bytes=len(data),
+        )
+    return {"outcome": "fetched", "snippet": snippet, "bytes_avoided": 0}
+
+
 def _enrich_rss_rows_with_body(
     rows: list[dict[str, str]],
     *,
@@ -978,38 +1287,79 @@ def _enrich_rss_rows_with_body(
     limit: int,
     source_group: str,
     fetch_cfg: dict[str, Any],
+    stats: dict[str, Any] | None = None,
 ) -> list[dict[str, str]]:
-    out: list[dict[str, str]] = []
     max_n = max(1, min(len(rows), limit))
-    for row in rows[:max_n]:
-        cur = dict(row)
+    out: list[dict[str, str]] = [dict(row) for row in rows[:max_n]]
+    # Links still missing a summary; the same url_norm is only resolved once per batch.
+    pending: dict[str, list[int]] = {}
+    links: dict[str, str] = {}
+    for i, cur in enumerate(out):
         if str(cur.get("summary", "")).strip():
-            out.append(cur)
             continue
         link = str(cur.get("url", "")).strip()
         if not link:
-            out.append(cur)
             continue
-        r = _fetch_url_with_retry(link, headers, timeout, retry_n)
-        if not r.get("ok"):
-            out.append(cur)
-            continue
-        html = bytes(r.get("data") or b"").decode("utf-8", errors="ignore")
-        article = extract_article(
-            link,
-            html,
+        un = url_norm(link)
+        pending.setdefault(un, []).append(i)
+        links.setdefault(un, link)
+
+    cache = get_article_body_cache() if _env_bool("ARTICLE_BODY_CACHE_ENABLED", True) else None
+    workers = max(1, min(16, _safe_int(fetch_cfg.get("body_fetch_concurrency"), _safe_int(os.environ.get("RSS_BODY_FETCH_CONCURRENCY"), 4))))
+    results: dict[str, dict[str, Any]] = {}
+
+    def _run(un: str) -> dict[str, Any]:
+        return _body_fetch_one(
+            links[un],
+            headers=headers,
+            timeout=timeout,
+            retry_n=retry_n,
+            source_group=source_group,
+            fetch_cfg=fetch_cfg,
+            cache=cache,
+        )
+
+    if len(pending) <= 1 or workers <= 1:
+        for un in pending:
+            results[un] = _run(un)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as ex:
+            fut_map = {ex.submit(contextvars.copy_context().run, _run, un): un for un in pending}
+            for fut in as_completed(fut_map):
+                un = fut_map[fut]
+                try:
+                    results[un] = fut.result()
+                except Exception:  # pragma: no cover - defensive
+                    results[un] = {"outcome": "failed", "snippet": "", "bytes_avoided": 0}
+
+    counts = {"cache_hit": 0, "not_modified": 0, "fetched": 0, "failed": 0, "snapshot": 0}
+    bytes_avoided = 0
+    for un, idxs in pending.items():
+        res = results.get(un, {})
+        outcome = str(res.get("outcome", "failed"))
+        counts[outcome] = counts.get(outcome, 0) + 1
+        bytes_avoided += int(res.get("bytes_avoided", 0) or 0)
+        sn = str(res.get("snippet", "")).strip()
+        if sn:
+            for i in idxs:
+                out[i]["summary"] = sn
+    if cache is not None and pending:
+        cache.evict()
+    if stats is not None:
+        candidates = len(pending)
+        reused = counts["cache_hit"] + counts["not_modified"]
+        stats.update(
             {
-                "source_group": source_group,
-                "article_min_paragraphs": int(fetch_cfg.get("article_min_paragraphs", 1) or 1),
-                "article_min_text_chars": int(fetch_cfg.get("article_min_text_chars", 120) or 120),
-                "snippet_max_chars": 420,
-            },
+                "candidates": candidates,
+                "cache_hits": counts["cache_hit"],
+                "not_modified": counts["not_modified"],
+                "downloaded": counts["fetched"],
+                "failed": counts["failed"],
+                "hit_rate": round(reused / candidates, 4) if candidates else 0.0,
+                "bytes_avoided": bytes_avoided,
+                "concurrency": workers,
+            }
         )
-        if bool(article.get("ok")) and not bool(article.get("dropped")):
-            sn = str(article.get("evidence_snippet", "")).strip()
-            if sn:
-                cur["summary"] = sn
-        out.append(cur)
     return _normalize_sample_rows(out, limit)
 
 
@@ -1198,6 +1548,7 @@ def fetch_source_entries(
                     return out
             if samples and bool(fetch.get("allow_body_fetch_for_rss", False)):
                 src_group = str(source.get("source_group") or "").strip().lower()
+                body_stats: dict[str, Any] = {}
                 samples = _enrich_rss_rows_with_body(
                     samples,
                     headers=h,
@@ -1206,7 +1557,9 @@ def fetch_source_entries(
                     limit=limit,
                     source_group=src_group,
                     fetch_cfg=fetch,
+                    stats=body_stats,
                 )
+                out["body_fetch"] = body_stats
             out["samples"] = samples
             out["entries"] = samples
             out["sample"] = samples
@@ -1516,6 +1869,9 @@ def run_sources_test_harness(
     max_workers: int = 6,
     timeout_seconds: int = 20,
     retries: int = 2,
+    per_host: int = DEFAULT_PER_HOST,
+    deadline_seconds: float = 0,
+    progress: Callable[[dict[str, Any]], None] | None = None,
 ) -> dict[str, Any]:
     bundle = load_sources_registry_bundle(project_root, rules_root=rules_root)
     rows = bundle.get("sources", []) if isinstance(bundle, dict) else []
@@ -1531,36 +1887,47 @@ def run_sources_test_harness(
             continue
         targets.append(s)
 
-    workers = max(1, min(8, int(max_workers or 6)))
-    results: list[dict[str, Any]] = []
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        fut_map = {
-            ex.submit(test_source, src, max(1, limit), timeout_seconds, retries): str(src.get("id", ""))
-            for src in targets
+    def _failed_row(src: dict[str, Any], error_type: str, message: str) -> dict[str, Any]:
+        sid = str(src.get("id", ""))
+        return {
+            "id": sid,
+            "source_id": sid,
+            "status": "failed",
+            "ok": False,
+            "http_status": None,
+            "items_count": 0,
+            "samples": [],
+            "duration_ms": 0,
+            "error_type": error_type,
+            "error_message": message,
+            "error": message,
+            "fetcher": str(src.get("fetcher") or src.get("connector") or ""),
+            "enabled": bool(src.get("enabled", True)),
+            "url": str(src.get("url", "")),
+            "name": str(src.get("name", sid)),
         }
-        for fut in as_completed(fut_map):
-            sid = fut_map[fut]
-            try:
-                row = fut.result()
-            except Exception as e:  # pragma: no cover - defensive
-                row = {
-                    "id": sid,
-                    "source_id": sid,
-                    "status": "failed",
-                    "ok": False,
-                    "http_status": None,
-                    "items_count": 0,
-                    "samples": [],
-                    "duration_ms": 0,
-                    "error_type": "unexpected",
-                    "error_message": f"{type(e).__name__}: {e}",
-                    "error": f"{type(e).__name__}: {e}",
-                    "fetcher": "",
-                    "enabled": True,
-                    "url": "",
-                    "name": sid,
-                }
-            results.append(row)
+
+    executor = FetchExecutor(
+        max_workers=max_workers,
+        per_host=per_host,
+        deadline_seconds=deadline_seconds,
+        on_progress=progress,
+        name="sources-test",
+    )
+    by_id = {str(src.get("id", "")): src for src in targets}
+    jobs = [
+        FetchJob(
+            key=str(src.get("id", "")),
+            host=host_of(str(src.get("url", ""))),
+            run=lambda src=src: test_source(src, max(1, limit), timeout_seconds, retries),
+        )
+        for src in targets
+    ]
+    results: list[dict[str, Any]] = executor.map(
+        jobs,
+        on_error=lambda job, e: _failed_row(by_id[job.key], "unexpected", f"{type(e).__name__}: {e}"),
+        on_skip=lambda job, reason: _failed_row(by_id[job.key], reason, f"{reason}: run budget of {deadline_seconds}s spent"),
+    )
 
     ok_n = sum(1 for r in results if bool(r.get("ok")))
     skip_n = sum(1 for r in results if str(r.get("status", "")).lower() in {"skip", "skipped"})
@@ -1647,6 +2014,7 @@ def retire_source(
         if changed:
             doc["sources"] = sources
             _write_registry_doc(reg_path, doc)
+            invalidate_sources_registry_cache()
             return {"ok": True, "source_id": source_id, "file": str(reg_path), "reason": reason, "retired_at": now}
         raise SourceRegistryError(f"source_id not found: {source_id}")
 
@@ -1773,4 +2141,5 @@ def merge_registry_sources(
     doc["sources"] = out_sources
     doc["groups"] = groups
     _write_registry_doc(reg_path, doc)
+    invalidate_sources_registry_cache()
     return {"ok": True, "registry_file": str(reg_path), "source_count": len(out_sources), "group_count": len(groups)}
@@ -4,11 +4,11 @@ import hashlib
 import json
 import os
 import re
-import threading
 from pathlib import Path
 from typing import Any
 from urllib import request
 
+from app.services.zh_enrichment_cache import zh_cache_from_env
 from app.utils.url_norm import url_norm
 
 
@@ -95,11 +95,7 @@ class ZhEnricher:
     def __init__(self, project_root: Path, *, prompt_version: str = "zh-v1") -> None:
         self.project_root = project_root
         self.prompt_version = prompt_version
-        self.cache_file = (project_root / "artifacts" / "zh_enrichment" / "cache.jsonl").resolve()
-        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
-        self._cache: dict[str, dict[str, Any]] = {}
-        self._loaded = False
+        self.cache = zh_cache_from_env((project_root / "artifacts" / "zh_enrichment").resolve())
         self.llm_enabled = str(os.environ.get("FEED_ZH_LLM_ENABLED", "")).strip().lower() in {"1", "true", "yes", "on"}
         self.llm_provider = str(os.environ.get("FEED_ZH_PROVIDER", "openai")).strip().lower() or "openai"
         self.llm_url = str(os.environ.get("FEED_ZH_LLM_URL", "")).strip()
@@ -116,40 +112,6 @@ class ZhEnricher:
     def begin_request(self) -> None:
         self._request_budget = int(self.max_per_request)
 
-    def _load_cache(self) -> None:
-        if self._loaded:
-            return
-        self._loaded = True
-        if not self.cache_file.exists():
-            return
-        try:
-            with self.cache_file.open("r", encoding="utf-8") as f:
-                for ln in f:
-                    ln = ln.strip()
-                    if not ln:
-                        continue
-                    try:
-                        row = json.loads(ln)
-                    except Exception:
-                        continue
-                    k = str(row.get("cache_key", "")).strip()
-                    if not k:
-                        continue
-                    self._cache[k] = row
-        except Exception:
-            return
-
-    def _put_cache(self, key: str, payload: dict[str, Any]) -> None:
-        row = dict(payload or {})
-        row["cache_key"] = key
-        with self._lock:
-            self._cache[key] = row
-            try:
-                with self.cache_file.open("a", encoding="utf-8") as f:
-                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
-            except Exception:
-                pass
-
     def _cache_key(self, *, title: str, snippet: str, url: str) -> str:
         u = url_norm(str(url or ""))
         content_hash = hashlib.sha1((str(title or "") + "|" + str(snippet or "")).encode("utf-8")).hexdigest()
@@ -339,12 +301,11 @@ class ZhEnricher:
         url: str,
         event_type: str,
     ) -> dict[str, Any]:
-        self._load_cache()
         t = _compact_spaces(title)
         sn = _compact_spaces(snippet)
         sid = _compact_spaces(source_id)
         key = self._cache_key(title=t, snippet=sn, url=url)
-        cached = self._cache.get(key)
+        cached = self.cache.get(key)
         if isinstance(cached, dict):
             cached_model = str(cached.get("used_model", "")).strip().lower()
             # If historical cache was heuristic and LLM is available now, allow opportunistic refresh.
@@ -362,7 +323,7 @@ class ZhEnricher:
                             "source_id": sid,
                             "url_norm": url_norm(url),
                         }
-                        self._put_cache(key, refreshed)
+                        self.cache.put(key, refreshed)
                         return {**refreshed, "cache_hit": False}
             return {
                 "title_zh": str(cached.get("title_zh", "")).strip() or _heuristic_title_zh(t, event_type=event_type),
@@ -403,5 +364,5 @@ class ZhEnricher:
             "source_id": sid,
             "url_norm": url_norm(url),
         }
-        self._put_cache(key, payload)
+        self.cache.put(key, payload)
         return {**payload, "cache_hit": False}
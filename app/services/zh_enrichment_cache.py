@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_MAX_RESIDENT = 5000
+DEFAULT_TTL_DAYS = 90
+DEFAULT_COMPACT_INTERVAL_HOURS = 24
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.environ.get(name, "")).strip()
+    if not raw:
+        return int(default)
+    try:
+        return int(raw)
+    except Exception:
+        return int(default)
+
+
+class ZhEnrichmentCache:
+    """
+    Indexed zh enrichment cache backed by one SQLite table (one row per cache_key).
+
+    - get/put go through a bounded LRU (max_resident rows); misses are point lookups,
+      so startup never reads the whole history.
+    - put() replaces the row for its key, so heuristic -> LLM upgrades do not leave
+      superseded rows behind.
+    - compact() drops rows older than ttl_seconds and reclaims file space; put() runs it
+      whenever compact_interval_seconds have passed since the last compaction (persisted).
+    - A legacy append-only cache.jsonl next to the DB is imported once (last row per
+      key wins) and renamed to cache.jsonl.imported.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        max_resident: int = DEFAULT_MAX_RESIDENT,
+        ttl_seconds: int = DEFAULT_TTL_DAYS * 86400,
+        compact_interval_seconds: int = DEFAULT_COMPACT_INTERVAL_HOURS * 3600,
+        legacy_jsonl: Path | None = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.max_resident = max(1, int(max_resident))
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.compact_interval_seconds = max(0, int(compact_interval_seconds))
+        self.legacy_jsonl = Path(legacy_jsonl) if legacy_jsonl else None
+        self._lock = threading.Lock()
+        self._lru: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._next_compact_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS zh_cache ("
+            "cache_key TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_zh_cache_updated_at ON zh_cache(updated_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS zh_cache_meta (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+        self._conn = conn
+        self._import_legacy(conn)
+        last = conn.execute("SELECT v FROM zh_cache_meta WHERE k = 'last_compacted_at'").fetchone()
+        if last is None:
+            self._set_meta(conn, "last_compacted_at", time.time())
+            self._next_compact_at = time.time() + self.compact_interval_seconds
+        else:
+            self._next_compact_at = float(last[0]) + self.compact_interval_seconds
+        return conn
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute("INSERT OR REPLACE INTO zh_cache_meta(k, v) VALUES (?, ?)", (key, str(value)))
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        src = self.legacy_jsonl
+        if src is None or not src.exists():
+            return
+        now = time.time()
+        rows: list[tuple[str, str, float]] = []
+        conn.execute("BEGIN")
+        try:
+            with src.open("r", encoding="utf-8") as f:
+                for ln in f:
+                    ln = ln.strip()
+                    if not ln:
+                        continue
+                    try:
+                        row = json.loads(ln)
+                    except Exception:
+                        continue
+                    k = str(row.get("cache_key", "")).strip() if isinstance(row, dict) else ""
+                    if not k:
+                        continue
+                    rows.append((k, json.dumps(row, ensure_ascii=False), now))
+                    if len(rows) >= 1000:
+                        conn.executemany("INSERT OR REPLACE INTO zh_cache VALUES (?, ?, ?)", rows)
+                        rows = []
+            if rows:
+                conn.executemany("INSERT OR REPLACE INTO zh_cache VALUES (?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            return
+        try:
+            os.replace(src, src.with_name(src.name + ".imported"))
+        except OSError:
+            pass
+
+    def _remember(self, key: str, row: dict[str, Any]) -> None:
+        self._lru[key] = row
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_resident:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._lru.get(key)
+            if row is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return dict(row)
+            found = self._connect().execute(
+                "SELECT payload, updated_at FROM zh_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if found is None or (self.ttl_seconds and time.time() - float(found[1]) >= self.ttl_seconds):
+                self.misses += 1
+                return None
+            try:
+                row = json.loads(found[0])
+            except Exception:
+                self.misses += 1
+                return None
+            self._remember(key, row)
+            self.hits += 1
+            return dict(row)
+
+    def put(self, key: str, payload: dict[str, Any]) -> dict[str, Any]:
+        row = dict(payload or {})
+        row["cache_key"] = key
+        with self._lock:
+            self._remember(key, row)
+            try:
+                conn = self._connect()
+                now = time.time()
+                conn.execute("INSERT OR REPLACE INTO zh_cache VALUES (?, ?, ?)", (key, json.dumps(row, ensure_ascii=False), now))
+                if now >= self._next_compact_at and self._compact(conn, now):
+                    self._lru.clear()
+                    self._remember(key, row)
+            except sqlite3.Error:
+                pass
+        return row
+
+    def _compact(self, conn: sqlite3.Connection, now: float) -> int:
+        removed = 0
+        if self.ttl_seconds:
+            removed = conn.execute("DELETE FROM zh_cache WHERE updated_at < ?", (now - self.ttl_seconds,)).rowcount
+        self._set_meta(conn, "last_compacted_at", now)
+        self._next_compact_at = now + self.compact_interval_seconds
+        if removed:
+            conn.execute("VACUUM")
+        return int(removed or 0)
+
+    def compact(self, *, now: float | None = None) -> dict[str, int]:
+        with self._lock:
+            conn = self._connect()
+            removed = self._compact(conn, time.time() if now is None else float(now))
+            if removed:
+                # Resident rows may have just expired; they are reloaded from the table on demand.
+                self._lru.clear()
+            rows = int(conn.execute("SELECT COUNT(*) FROM zh_cache").fetchone()[0])
+            return {"removed_expired": removed, "rows": rows, "resident": len(self._lru)}
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            rows = int(self._connect().execute("SELECT COUNT(*) FROM zh_cache").fetchone()[0])
+            return {"rows": rows, "resident": len(self._lru), "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def zh_cache_from_env(cache_dir: Path) -> ZhEnrichmentCache:
+    """Cache under `cache_dir`, sized by FEED_ZH_CACHE_MAX_RESIDENT / FEED_ZH_CACHE_TTL_DAYS / FEED_ZH_CACHE_COMPACT_HOURS."""
+    return ZhEnrichmentCache(
+        Path(cache_dir) / "cache.sqlite3",
+        max_resident=_env_int("FEED_ZH_CACHE_MAX_RESIDENT", DEFAULT_MAX_RESIDENT),
+        ttl_seconds=_env_int("FEED_ZH_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS) * 86400,
+        compact_interval_seconds=_env_int("FEED_ZH_CACHE_COMPACT_HOURS", DEFAULT_COMPACT_INTERVAL_HOURS) * 3600,
+        legacy_jsonl=Path(cache_dir) / "cache.jsonl",
+    )
@@ -1,3 +1,5 @@
-from app.utils.url_norm import url_norm
+from app.utils.domain_trie import DomainSuffixTrie
+from app.utils.keyword_automaton import KeywordAutomaton, KeywordHits
+from app.utils.url_norm import ParsedUrl, as_parsed_url, parse_url, url_norm
 
-__all__ = ["url_norm"]
+__all__ = ["DomainSuffixTrie", "KeywordAutomaton", "KeywordHits", "ParsedUrl", "as_parsed_url", "parse_url", "url_norm"]
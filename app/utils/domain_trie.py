@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+
+class _Node:
+    __slots__ = ("children", "rank", "value")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.rank = -1
+        self.value: Any = None
+
+
+class DomainSuffixTrie:
+    """
+    Reversed-label trie over domain suffixes ("a.b.com" is stored as com -> b -> a).
+
+    A suffix `d` matches host `h` when `h == d or h.endswith("." + d)`, i.e. when the
+    labels of `d` are a tail of the labels of `h`. When several suffixes match, the one
+    added first wins, so a trie built in rule order returns what a first-match scan would.
+    Lookups cost O(labels in host) regardless of how many suffixes are stored.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items: Iterable[tuple[str, Any]] = ()) -> None:
+        self._root = _Node()
+        self._size = 0
+        for domain, value in items:
+            self.add(domain, value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, domain: str, value: Any = True) -> None:
+        node = self._root
+        for label in reversed(str(domain).split(".")):
+            nxt = node.children.get(label)
+            if nxt is None:
+                nxt = _Node()
+                node.children[label] = nxt
+            node = nxt
+        if node.rank >= 0:
+            # Duplicate suffix: the earlier rule keeps precedence.
+            return
+        node.rank = self._size
+        node.value = value
+        self._size += 1
+
+    def lookup(self, host: str, default: Any = None) -> Any:
+        if not self._size or not host:
+            return default
+        node = self._root
+        best_rank = -1
+        best: Any = default
+        for label in reversed(host.split(".")):
+            node = node.children.get(label)  # type: ignore[assignment]
+            if node is None:
+                break
+            if node.rank >= 0 and (best_rank < 0 or node.rank < best_rank):
+                best_rank = node.rank
+                best = node.value
+        return best
+
+    def matches(self, host: str) -> bool:
+        if not self._size or not host:
+            return False
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.children.get(label)  # type: ignore[assignment]
+            if node is None:
+                return False
+            if node.rank >= 0:
+                return True
+        return False
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Mapping
+
+
+def word_bounded(term_lc: str) -> bool:
+    """Short ASCII words, which the report's `has_term` tests with its regex rule rather than as substrings."""
+    return term_lc.isascii() and term_lc.isalpha() and len(term_lc) <= 5
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over all keywords of a rule set, so a text is scanned once (one
+    step per character) instead of once per keyword. Every occurrence of every keyword is
+    reported, overlapping ones included.
+
+    Goto transitions are a trie; the failure-resolved transition for a (state, char) pair
+    is memoized on first use, so repeated scans become one dict lookup per character.
+    Terms are lowercased (not stripped: "phase " is a different keyword from "phase") at
+    build time; scanned text is lowercased once.
+    """
+
+    __slots__ = ("terms", "bounded", "_goto", "_fail", "_out", "_delta")
+
+    _DELTA_CAP = 256  # memoized transitions per state; rare chars beyond that are resolved each time
+
+    def __init__(self, terms: Iterable[str]) -> None:
+        uniq: dict[str, None] = {}
+        for t in terms:
+            k = str(t or "").lower()
+            if k:
+                uniq[k] = None
+        self.terms = frozenset(uniq)
+        self.bounded = frozenset(k for k in uniq if word_bounded(k))
+        goto: list[dict[str, int]] = [{}]
+        out: list[tuple[str, ...]] = [()]
+        for k in uniq:
+            state = 0
+            for ch in k:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    out.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state] = (k,)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            r = queue.popleft()
+            for ch, u in goto[r].items():
+                queue.append(u)
+                f = fail[r]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                v = goto[f].get(ch, 0)
+                fail[u] = v if v != u else 0
+                out[u] = out[u] + out[fail[u]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._delta: list[dict[str, int]] = [{} for _ in goto]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        s = state
+        while s and ch not in goto[s]:
+            s = fail[s]
+        nxt = goto[s].get(ch, 0)
+        d = self._delta[state]
+        if len(d) < self._DELTA_CAP:
+            d[ch] = nxt
+        return nxt
+
+    def scan(self, parts: Mapping[str, str] | str) -> "KeywordHits":
+        """Scan `parts` (one text, or named fields joined by single spaces) in one pass."""
+        fields = {"text": parts} if isinstance(parts, str) else parts
+        raw = " ".join(str(v or "") for v in fields.values())
+        text = raw.lower()
+        spans: dict[str, tuple[int, int]] | None = {}
+        pos = 0
+        for name, v in fields.items():
+            n = len(str(v or "").lower())
+            spans[name] = (pos, pos + n)  # type: ignore[index]
+            pos += n + 1
+        if pos - 1 != len(text):
+            # Case folding changed the length (e.g. U+0130); field offsets are unusable.
+            spans = None
+        occ: dict[str, list[int]] = {}
+        delta, out, step = self._delta, self._out, self._step
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = delta[state].get(ch)
+            state = step(state, ch) if nxt is None else nxt
+            if out[state]:
+                for k in out[state]:
+                    occ.setdefault(k, []).append(i - len(k) + 1)
+        return KeywordHits(self, text, fields, spans, occ)
+
+
+class KeywordHits:
+    """
+    Result of one KeywordAutomaton scan. Queries take an optional run of consecutive field
+    names and answer exactly as scanning that field text on its own would. Keyword rules
+    (substring vs. has_term) are applied by the caller, see the report's _TermProbe.
+    """
+
+    __slots__ = ("_automaton", "text", "_fields", "_spans", "_occ", "_present")
+
+    def __init__(
+        self,
+        automaton: KeywordAutomaton,
+        text: str,
+        fields: Mapping[str, str],
+        spans: dict[str, tuple[int, int]] | None,
+        occ: dict[str, list[int]],
+    ) -> None:
+        self._automaton = automaton
+        self.text = text
+        self._fields = fields
+        self._spans = spans
+        self._occ = occ
+        self._present: dict[tuple[str, ...] | None, frozenset[str]] = {}
+
+    @property
+    def automaton(self) -> KeywordAutomaton:
+        return self._automaton
+
+    def _window(self, fields: tuple[str, ...] | None) -> tuple[int, int] | None:
+        if not fields:
+            return 0, len(self.text)
+        if self._spans is None:
+            return None
+        return self._spans[fields[0]][0], self._spans[fields[-1]][1]
+
+    def window_text(self, fields: tuple[str, ...] | None = None) -> str:
+        if not fields:
+            return self.text
+        win = self._window(fields)
+        if win is not None:
+            return self.text[win[0] : win[1]]
+        return " ".join(str(self._fields[f] or "") for f in fields).lower()
+
+    def present(self, fields: tuple[str, ...] | None = None) -> frozenset[str]:
+        """Automaton keywords occurring as substrings of the window."""
+        got = self._present.get(fields)
+        if got is not None:
+            return got
+        win = self._window(fields)
+        if win is None:
+            text = self.window_text(fields)
+            got = frozenset(k for k in self._occ if k in text)
+        elif win == (0, len(self.text)):
+            got = frozenset(self._occ)
+        else:
+            lo, hi = win
+            got = frozenset(k for k, starts in self._occ.items() if any(lo <= s and s + len(k) <= hi for s in starts))
+        self._present[fields] = got
+        return got
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping
+
+
+_RUN_ENV: ContextVar[Mapping[str, str] | None] = ContextVar("run_env", default=None)
+
+
+def run_environ() -> Mapping[str, str]:
+    """
+    Environment seen by the current run: the overlay installed by `run_env`, else os.environ.
+
+    The overlay lives in a context variable, so an in-process report run sees its own
+    REPORT_DATE / DRYRUN_* values while other threads keep reading the real process env.
+    """
+    overlay = _RUN_ENV.get()
+    return os.environ if overlay is None else overlay
+
+
+def run_getenv(name: str, default: str = "") -> str:
+    return str(run_environ().get(name, default))
+
+
+@contextmanager
+def run_env(env: Mapping[str, str]) -> Iterator[Mapping[str, str]]:
+    """Install `env` as the complete environment of the current context (never touches os.environ)."""
+    overlay = {str(k): str(v) for k, v in env.items()}
+    token = _RUN_ENV.set(overlay)
+    try:
+        yield overlay
+    finally:
+        _RUN_ENV.reset(token)
@@ -1,20 +1,99 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Union
 from urllib.parse import urlparse
 
 
-def url_norm(url: str) -> str:
-    """Normalize URL for stable cache/dedupe keys."""
+_KEPT_QUERY_HINTS = ("id=", "article=", "story=", "p=", "item=")
+
+
+@dataclass(frozen=True)
+class ParsedUrl:
+    """
+    One-shot parse of an item URL shared by every pipeline stage
+    (dedupe key, source policy, page classifier, region map, opportunity signals).
+
+    - netloc: lowercased netloc (may include port/userinfo)
+    - host: lowercased hostname (no port)
+    - norm: same value as url_norm(raw)
+    - suffixes: host label suffix chain, e.g. ("a.b.com", "b.com", "com")
+    """
+
+    raw: str
+    ok: bool
+    scheme: str = ""
+    netloc: str = ""
+    host: str = ""
+    path: str = ""
+    query: str = ""
+    norm: str = ""
+    suffixes: tuple[str, ...] = ()
+
+    @property
+    def path_lower(self) -> str:
+        return self.path.strip().lower()
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+UrlLike = Union[str, ParsedUrl]
+
+
+def _host_suffixes(host: str) -> tuple[str, ...]:
+    h = host.strip(".")
+    if not h:
+        return ()
+    labels = h.split(".")
+    return tuple(".".join(labels[i:]) for i in range(len(labels)))
+
+
+@lru_cache(maxsize=32768)
+def parse_url(url: str) -> ParsedUrl:
+    raw = str(url or "")
     try:
-        p = urlparse(str(url or ""))
-        host = (p.netloc or "").lower()
-        path = (p.path or "").rstrip("/")
+        p = urlparse(raw)
+        netloc = (p.netloc or "").lower()
+        path = p.path or ""
         query = p.query.strip()
         kept_query = ""
         if query:
             low = query.lower()
-            if any(k in low for k in ("id=", "article=", "story=", "p=", "item=")):
+            if any(k in low for k in _KEPT_QUERY_HINTS):
                 kept_query = "?" + query
-        return f"{host}{path}{kept_query}"
+        norm = f"{netloc}{path.rstrip('/')}{kept_query}"
+    except Exception:
+        return ParsedUrl(raw=raw, ok=False, norm=raw.strip().lower())
+    try:
+        host = str(p.hostname or "").strip().lower()
     except Exception:
-        return str(url or "").strip().lower()
+        host = ""
+    return ParsedUrl(
+        raw=raw,
+        ok=True,
+        scheme=str(p.scheme or "").lower(),
+        netloc=netloc,
+        host=host,
+        path=path,
+        query=str(p.query or ""),
+        norm=norm,
+        suffixes=_host_suffixes(host),
+    )
+
+
+def as_parsed_url(url: UrlLike) -> ParsedUrl:
+    if isinstance(url, ParsedUrl):
+        return url
+    return parse_url(str(url or ""))
+
+
+def parse_url_cache_info() -> dict[str, Any]:
+    info = parse_url.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+def url_norm(url: UrlLike) -> str:
+    """Normalize URL for stable cache/dedupe keys."""
+    return as_parsed_url(url).norm
@@ -21,8 +21,17 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBasic, HTTPBasicC
 from pydantic import BaseModel, Field
 
 from app.rules.engine import RuleEngine
-from app.services.ops_metrics import evaluate_health, find_latest_json, normalize_metrics, safe_load_json
-from app.services.feed_db import FeedDBService
+from app.services.artifact_io import logical_path, read_artifact_text, resolve_artifact
+from app.services.artifact_retention import load_retention_report, retention_report_path
+from app.services.ops_metrics import (
+    OPS_ARTIFACT_SOURCES,
+    evaluate_health,
+    file_stamp,
+    latest_ops_artifacts,
+    normalize_metrics,
+    safe_load_json,
+)
+from app.services.report_engine import MODE_INPROCESS, report_engine_mode
 from app.services.rules_store import RulesStore
 from app.services.rules_versioning import get_workspace_rules_root
 from app.services.source_registry import (
@@ -411,7 +420,8 @@ def _auth_guard(
 def create_app(project_root: Path | None = None) -> FastAPI:
     root = project_root or Path(__file__).resolve().parents[2]
     store = RulesStore(root)
-    feed_db = FeedDBService(store.database_url)
+    feed_db_holder: list[Any] = []
+    feed_db_lock = threading.Lock()
     source_group_defaults_path = root / "data" / "source_group_defaults.json"
     engine = RuleEngine(project_root=root)
     app = FastAPI(title="Rules Admin API", version="1.0.0")
@@ -424,24 +434,38 @@ def create_app(project_root: Path | None = None) -> FastAPI:
     )
     dryrun_jobs: dict[str, dict[str, Any]] = {}
     dryrun_jobs_lock = threading.Lock()
+    ops_summary_cache: dict[str, Any] = {}
+    ops_summary_lock = threading.Lock()
+
+    def _feed_db() -> Any:
+        # The feed service (SQLAlchemy session factory + zh enricher) is built on the first feed request.
+        if not feed_db_holder:
+            with feed_db_lock:
+                if not feed_db_holder:
+                    from app.services.feed_db import FeedDBService
+
+                    feed_db_holder.append(FeedDBService(store.database_url))
+        return feed_db_holder[0]
+
+    def _run_dryrun(**kwargs: Any) -> dict[str, Any]:
+        # Long-lived API process: keep the report engine warm unless REPORT_ENGINE_MODE=subprocess.
+        return run_dryrun(report_mode=report_engine_mode(default=MODE_INPROCESS), **kwargs)
 
     def _build_unified_payload(out: dict[str, Any], lite: bool) -> dict[str, Any]:
         artifacts = out.get("artifacts", {}) if isinstance(out.get("artifacts"), dict) else {}
 
         def _read_json(path: str) -> Any:
             try:
-                p = Path(path)
-                if p.exists():
-                    return json.loads(p.read_text(encoding="utf-8"))
+                if path and resolve_artifact(path) is not None:
+                    return json.loads(read_artifact_text(path))
             except Exception:
                 return None
             return None
 
         def _read_text(path: str) -> str:
             try:
-                p = Path(path)
-                if p.exists():
-                    return p.read_text(encoding="utf-8")
+                if path and resolve_artifact(path) is not None:
+                    return read_artifact_text(path)
             except Exception:
                 return ""
             return ""
@@ -454,6 +478,9 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             "run_id": out.get("run_id"),
             "profile": out.get("profile"),
             "date": out.get("date"),
+            "from_snapshot": str(out.get("from_snapshot") or ""),
+            "fetch_snapshot_run_id": str(out.get("fetch_snapshot_run_id") or ""),
+            "report_engine": out.get("report_engine", {}) if isinstance(out.get("report_engine"), dict) else {},
             "items_before": int(out.get("items_before_count") or 0),
             "items_after": int(out.get("items_after_count") or 0),
             "items_before_count": int(out.get("items_before_count") or 0),
@@ -482,7 +509,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             payload["items"] = _read_json(str(artifacts.get("items", ""))) or []
         return payload
 
-    def _start_dryrun_job(profile: str, date: str, lite: bool) -> str:
+    def _start_dryrun_job(profile: str, date: str, lite: bool, from_snapshot: str = "") -> str:
         job_id = f"dryrun-job-{uuid.uuid4().hex[:10]}"
         progress_path = root / "artifacts" / "dryrun_jobs" / f"{job_id}.progress.json"
         progress_path.parent.mkdir(parents=True, exist_ok=True)
@@ -493,6 +520,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
                 "profile": profile,
                 "date": date,
                 "lite": bool(lite),
+                "from_snapshot": from_snapshot,
                 "started_at": time.time(),
                 "progress_path": str(progress_path),
                 "result": None,
@@ -501,11 +529,12 @@ def create_app(project_root: Path | None = None) -> FastAPI:
 
         def _runner() -> None:
             try:
-                out = run_dryrun(
+                out = _run_dryrun(
                     profile=profile,
                     report_date=(date or None),
                     lite_mode=bool(lite),
                     progress_file=str(progress_path),
+                    from_snapshot=(from_snapshot or None),
                 )
                 payload = _build_unified_payload(out, bool(lite))
                 with dryrun_jobs_lock:
@@ -554,7 +583,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
         end: str = "",
         since: str = "",
     ) -> dict[str, Any]:
-        return feed_db.list_stories(
+        return _feed_db().list_stories(
             cursor=cursor,
             limit=limit,
             view_mode=view_mode,
@@ -571,7 +600,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
 
     @app.get("/api/feed/{item_id}")
     def api_feed_detail(item_id: str) -> dict[str, Any]:
-        out = feed_db.get_story_detail(item_id)
+        out = _feed_db().get_story_detail(item_id)
         if out is None:
             raise HTTPException(status_code=404, detail="feed item not found")
         return out
@@ -591,7 +620,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
         end: str = "",
         since: str = "",
     ) -> dict[str, Any]:
-        return feed_db.list_raw_items(
+        return _feed_db().list_raw_items(
             cursor=cursor,
             limit=limit,
             group=group,
@@ -607,14 +636,14 @@ def create_app(project_root: Path | None = None) -> FastAPI:
 
     @app.get("/api/feed-items/{item_id}")
     def api_feed_item_detail(item_id: str) -> dict[str, Any]:
-        out = feed_db.get_raw_item_detail(item_id)
+        out = _feed_db().get_raw_item_detail(item_id)
         if out is None:
             raise HTTPException(status_code=404, detail="feed item not found")
         return out
 
     @app.get("/api/feed-summary")
     def api_feed_summary(mode: str = "item") -> dict[str, Any]:
-        return feed_db.get_feed_summary(mode=mode)
+        return _feed_db().get_feed_summary(mode=mode)
 
     @app.exception_handler(HTTPException)
     async def _http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:  # type: ignore[override]
@@ -704,7 +733,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             return []
         files: list[tuple[float, Path]] = []
         for p in art_root.glob("*/*"):
-            if p.name != "run_meta.json":
+            if logical_path(p).name != "run_meta.json":
                 continue
             try:
                 files.append((p.stat().st_mtime, p))
@@ -717,7 +746,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             if len(out) >= limit:
                 break
             try:
-                payload = json.loads(p.read_text(encoding="utf-8"))
+                payload = json.loads(read_artifact_text(p))
             except Exception:
                 continue
             if not isinstance(payload, dict):
@@ -1191,7 +1220,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
     ) -> dict[str, Any]:
         profile = str(payload.get("profile", "enhanced"))
         date = str(payload.get("date", "") or "")
-        out = run_dryrun(profile=profile, report_date=date or None)
+        out = _run_dryrun(profile=profile, report_date=date or None)
         preview_path = Path(str(out.get("artifacts", {}).get("preview", "")))
         preview_text = preview_path.read_text(encoding="utf-8") if preview_path.exists() else ""
         return {
@@ -1210,7 +1239,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
     ) -> dict[str, Any]:
         profile = str(payload.get("profile", "enhanced"))
         date = str(payload.get("date", "") or "")
-        out = run_dryrun(profile=profile, report_date=date or None)
+        out = _run_dryrun(profile=profile, report_date=date or None)
         return {
             "ok": True,
             "run_id": out.get("run_id"),
@@ -1236,7 +1265,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
     ) -> dict[str, Any]:
         profile = str(payload.get("profile", "enhanced"))
         date = str(payload.get("date", "") or "")
-        out = run_dryrun(profile=profile, report_date=date or None)
+        out = _run_dryrun(profile=profile, report_date=date or None)
         artifacts = out.get("artifacts", {}) if isinstance(out.get("artifacts"), dict) else {}
         qc_path = Path(str(artifacts.get("qc_report", "")))
         qc_report = json.loads(qc_path.read_text(encoding="utf-8")) if qc_path.exists() else {}
@@ -1249,7 +1278,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
     ) -> dict[str, Any]:
         profile = str(payload.get("profile", "enhanced"))
         date = str(payload.get("date", "") or "")
-        out = run_dryrun(profile=profile, report_date=date or None)
+        out = _run_dryrun(profile=profile, report_date=date or None)
         artifacts = out.get("artifacts", {}) if isinstance(out.get("artifacts"), dict) else {}
         out_path = Path(str(artifacts.get("output_render", "")))
         output_render = json.loads(out_path.read_text(encoding="utf-8")) if out_path.exists() else {}
@@ -1260,14 +1289,21 @@ def create_app(project_root: Path | None = None) -> FastAPI:
         date: str | None = None,
         profile: str = "enhanced",
         lite: bool = False,
+        from_snapshot: str | None = None,
         _: dict[str, str] = Depends(_auth_guard),
     ) -> dict[str, Any]:
         """
         Unified dry-run: one call returns preview + clustered items + explain payloads.
         Note: dry-run only, no DB write, no email send.
+        `from_snapshot=<run_id>` replays a recorded fetch snapshot instead of crawling live.
         """
         try:
-            out = run_dryrun(profile=profile, report_date=(date or None), lite_mode=bool(lite))
+            out = _run_dryrun(
+                profile=profile,
+                report_date=(date or None),
+                lite_mode=bool(lite),
+                from_snapshot=(from_snapshot or None),
+            )
         except Exception as exc:
             return {
                 "ok": False,
@@ -1282,9 +1318,10 @@ def create_app(project_root: Path | None = None) -> FastAPI:
         date: str | None = None,
         profile: str = "enhanced",
         lite: bool = False,
+        from_snapshot: str | None = None,
         _: dict[str, str] = Depends(_auth_guard),
     ) -> dict[str, Any]:
-        job_id = _start_dryrun_job(profile=profile, date=(date or ""), lite=bool(lite))
+        job_id = _start_dryrun_job(profile=profile, date=(date or ""), lite=bool(lite), from_snapshot=(from_snapshot or ""))
         return {"ok": True, "job_id": job_id, "status": "running"}
 
     @app.get("/admin/api/dryrun/progress")
@@ -4734,36 +4771,43 @@ def create_app(project_root: Path | None = None) -> FastAPI:
         except Exception:
             return str(path)
 
-    def _pick_latest(*paths: str | None) -> str | None:
-        candidates: list[Path] = []
-        for p in paths:
-            if not p:
-                continue
-            pp = Path(p)
-            if pp.exists() and pp.is_file():
-                candidates.append(pp)
-        if not candidates:
+    def _retention_summary(report: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not isinstance(report, dict):
             return None
-        candidates.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        return str(candidates[0])
+        classes = report.get("classes") if isinstance(report.get("classes"), dict) else {}
+        return {
+            "generated_at": report.get("generated_at"),
+            "bytes_reclaimed": int(report.get("bytes_reclaimed", 0) or 0),
+            "bytes_reclaimed_total": int(report.get("bytes_reclaimed_total", 0) or 0),
+            "by_class": {
+                str(k): {"deleted": int(v.get("deleted", 0) or 0), "bytes_reclaimed": int(v.get("bytes_reclaimed", 0) or 0)}
+                for k, v in classes.items()
+                if isinstance(v, dict)
+            },
+        }
 
     @app.get("/admin/api/ops/summary")
     def api_ops_summary(limit: int = 20, _: dict[str, str] = Depends(_auth_guard)) -> dict[str, Any]:
         artifacts_dir = root / "artifacts"
         errors: list[str] = []
 
-        digest_meta_path = _pick_latest(
-            str(artifacts_dir / "run_meta.json"),
-            find_latest_json(str(artifacts_dir / "run-*/run_meta.json")),
-            find_latest_json(str(artifacts_dir / "*digest*.json")),
+        latest = latest_ops_artifacts(artifacts_dir)
+        # The summary only changes when one of the selected files does: serve it from cache
+        # while their (path, mtime, size) stamps are unchanged.
+        stamp = (
+            int(limit or 20),
+            tuple(file_stamp(latest[k]) for k in OPS_ARTIFACT_SOURCES),
+            file_stamp(retention_report_path(artifacts_dir)),
         )
-        collect_meta_path = _pick_latest(
-            str(artifacts_dir / "collect_meta.json"),
-            find_latest_json(str(artifacts_dir / "collect-*/run_meta.json")),
-            find_latest_json(str(artifacts_dir / "*collect*.json")),
-        )
-        acceptance_path = _pick_latest(str(artifacts_dir / "acceptance" / "acceptance_report.json"))
-        probe_path = _pick_latest(find_latest_json(str(artifacts_dir / "procurement" / "probe_report-*.json")))
+        with ops_summary_lock:
+            cached = ops_summary_cache.get("summary")
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+
+        digest_meta_path = latest["digest"]
+        collect_meta_path = latest["collect"]
+        acceptance_path = latest["acceptance"]
+        probe_path = latest["procurement_probe"]
 
         digest_obj, digest_err = safe_load_json(digest_meta_path)
         collect_obj, collect_err = safe_load_json(collect_meta_path)
@@ -4790,6 +4834,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             "collect": normalize_metrics(collect_obj) if isinstance(collect_obj, dict) else None,
             "acceptance": normalize_metrics(acceptance_obj) if isinstance(acceptance_obj, dict) else None,
             "procurement_probe": probe_metrics,
+            "retention": _retention_summary(load_retention_report(artifacts_dir)),
             "files": {
                 "digest_meta_path": _to_rel(digest_meta_path or ""),
                 "collect_meta_path": _to_rel(collect_meta_path or ""),
@@ -4799,6 +4844,8 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             "errors": errors,
         }
         summary["health"] = evaluate_health(summary)
+        with ops_summary_lock:
+            ops_summary_cache["summary"] = (stamp, summary)
         return summary
 
     @app.get("/admin/ops", response_class=HTMLResponse)
@@ -4914,6 +4961,14 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             </div>
           </div>
         </div>
+        <div class="card" style="margin-top:14px">
+          <h4>存储清理（Retention）</h4>
+          <div class="kvs" id="retentionMeta">
+            <div>上次清理</div><b>-</b>
+            <div>本次回收</div><b>-</b>
+            <div>累计回收</div><b>-</b>
+          </div>
+        </div>
         <div class="card" style="margin-top:14px">
           <h4>告警</h4>
           <div id="warnings" class="ops-warn-list">加载中...</div>
@@ -4968,6 +5023,21 @@ def create_app(project_root: Path | None = None) -> FastAPI:
             ? `<ul>${rules.map(r => `<li>${esc(r.metric)}：当前值=${esc(JSON.stringify(r.value))}，阈值=${esc(JSON.stringify(r.threshold))}，级别=${esc(r.level)}</li>`).join('')}</ul>`
             : '无触发规则';
         }
+        function fmtBytes(n){
+          const v = Number(n||0);
+          if(v >= 1024*1024*1024) return (v/1024/1024/1024).toFixed(2) + ' GB';
+          if(v >= 1024*1024) return (v/1024/1024).toFixed(1) + ' MB';
+          if(v >= 1024) return (v/1024).toFixed(1) + ' KB';
+          return String(v) + ' B';
+        }
+        function renderRetention(r){
+          const at = r && r.generated_at ? fmtTime(r.generated_at) : fmt('');
+          document.getElementById('retentionMeta').innerHTML = `
+            <div>上次清理</div><b>${esc(at)}</b>
+            <div>本次回收</div><b>${esc(r ? fmtBytes(r.bytes_reclaimed) : '-')}</b>
+            <div>累计回收</div><b>${esc(r ? fmtBytes(r.bytes_reclaimed_total) : '-')}</b>
+          `;
+        }
         async function loadOps(){
           const j = await api('/admin/api/ops/summary?limit=20');
           renderHealth(j?.health || {});
@@ -4979,6 +5049,7 @@ def create_app(project_root: Path | None = None) -> FastAPI:
           renderJson('collectJson', j?.collect || null);
           renderJson('acceptanceJson', j?.acceptance || null);
           renderJson('probeJson', j?.procurement_probe || null);
+          renderRetention(j?.retention || null);
           const errs = Array.isArray(j?.errors) ? j.errors : [];
           document.getElementById('warnings').innerHTML = errs.length
             ? `<ul>${errs.map(e=>`<li>${esc(e)}</li>`).join('')}</ul>`
@@ -5220,7 +5291,13 @@ def create_app(project_root: Path | None = None) -> FastAPI:
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> Any:
+    # `app` is built on first access (uvicorn "app.web.rules_admin_api:app"), not at import time.
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def run_server() -> None:
@@ -8,33 +8,15 @@ import sys
 from importlib.util import find_spec
 from pathlib import Path
 from subprocess import CalledProcessError
+from typing import TYPE_CHECKING
 
 from app.rules.errors import RULES_003_RULESET_MISMATCH, RuleEngineError
-from app.rules.engine import RuleEngine
-from app.rules.models import RuleSelection
-from app.services.db_migration import dual_replay_compare, migrate_sqlite_to_target, verify_sqlite_vs_target
-from app.services.rules_store import RulesStore
-from app.services.source_registry import (
-    SourceRegistryError,
-    diff_sources_for_profiles,
-    effective_source_ids_for_profile,
-    list_sources_for_profile,
-    load_sources_registry_bundle,
-    load_sources_registry,
-    retire_source,
-    run_sources_test_harness,
-    test_source,
-    validate_sources_registry,
-)
-from app.services.collect_asset_store import CollectAssetStore
-from app.services.analysis_cache_store import AnalysisCacheStore
-from app.services.analysis_generator import AnalysisGenerator, degraded_analysis
-from app.services.feed_db import FeedDBService
-from scripts.acceptance_run import run_acceptance
-from app.workers.dryrun import main as dryrun_main
-from app.workers.live_run import run_digest
-from app.workers.replay import main as replay_main
-from app.workers.scheduler_worker import SchedulerWorker
+
+if TYPE_CHECKING:
+    from app.services.rules_store import RulesStore
+
+# Subcommands import their services on entry: `env-check` or `sources:list` must not
+# pay for SQLAlchemy/alembic, the analysis stack or the scheduler just to start.
 
 
 def _get_opt(argv: list[str], key: str) -> str | None:
@@ -129,6 +111,10 @@ def _env_check_payload() -> dict[str, object]:
 
 
 def cmd_rules_validate(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+    from app.rules.models import RuleSelection
+    from app.services.source_registry import effective_source_ids_for_profile, validate_sources_registry
+
     engine = RuleEngine()
     source_validate = validate_sources_registry(engine.project_root, rules_root=engine.rules_root)
     profile = _get_opt(argv, "--profile")
@@ -193,6 +179,8 @@ def cmd_rules_validate(argv: list[str]) -> int:
 
 
 def cmd_rules_print(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+
     profile = _get_opt(argv, "--profile") or "legacy"
     strategy = _get_opt(argv, "--strategy") or "priority_last_match"
     engine = RuleEngine()
@@ -202,6 +190,8 @@ def cmd_rules_print(argv: list[str]) -> int:
 
 
 def cmd_rules_dryrun(argv: list[str]) -> int:
+    from app.workers.dryrun import main as dryrun_main
+
     profile = _get_opt(argv, "--profile")
     report_date = _get_opt(argv, "--date")
 
@@ -211,10 +201,12 @@ def cmd_rules_dryrun(argv: list[str]) -> int:
     if not profile and email_profile and content_profile and email_profile == content_profile:
         profile = email_profile
 
-    return dryrun_main(profile=profile or "legacy", report_date=report_date)
+    return dryrun_main(profile=profile or "legacy", report_date=report_date, from_snapshot=_get_opt(argv, "--from-snapshot"))
 
 
 def cmd_rules_replay(argv: list[str]) -> int:
+    from app.workers.replay import main as replay_main
+
     run_id = _get_opt(argv, "--run-id")
     send_opt = _get_opt(argv, "--send")
     profile = _get_opt(argv, "--profile")
@@ -230,6 +222,9 @@ def cmd_rules_replay(argv: list[str]) -> int:
 
 
 def cmd_sources_list(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+    from app.services.source_registry import list_sources_for_profile
+
     profile = _get_opt(argv, "--profile") or "enhanced"
     engine = RuleEngine()
     sources = list_sources_for_profile(engine.project_root, profile)
@@ -244,6 +239,9 @@ def cmd_sources_list(argv: list[str]) -> int:
 
 
 def cmd_sources_validate(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+    from app.services.source_registry import validate_sources_registry
+
     _ = argv
     engine = RuleEngine()
     out = validate_sources_registry(engine.project_root)
@@ -252,6 +250,15 @@ def cmd_sources_validate(argv: list[str]) -> int:
 
 
 def cmd_sources_test(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+    from app.services.source_registry import (
+        load_sources_registry_bundle,
+        load_sources_registry,
+        run_sources_test_harness,
+        test_source,
+    )
+    from app.services.fetch_executor import DEFAULT_PER_HOST, progress_printer
+
     source_id = _get_opt(argv, "--source-id")
     limit = int(_get_opt(argv, "--limit") or "3")
     enabled_only = "--enabled-only" in argv
@@ -260,6 +267,9 @@ def cmd_sources_test(argv: list[str]) -> int:
     workers = int(_get_opt(argv, "--workers") or "6")
     timeout_seconds = int(_get_opt(argv, "--timeout-seconds") or "20")
     retries = int(_get_opt(argv, "--retries") or "2")
+    per_host = int(_get_opt(argv, "--per-host") or str(DEFAULT_PER_HOST))
+    deadline_seconds = float(_get_opt(argv, "--deadline-seconds") or "0")
+    show_progress = "--progress" in argv
     engine = RuleEngine()
     if source_id:
         sources = load_sources_registry(engine.project_root, rules_root=engine.rules_root)
@@ -280,6 +290,9 @@ def cmd_sources_test(argv: list[str]) -> int:
         max_workers=workers,
         timeout_seconds=timeout_seconds,
         retries=retries,
+        per_host=per_host,
+        deadline_seconds=deadline_seconds,
+        progress=progress_printer("sources-test") if show_progress else None,
     )
     if json_out:
         import os
@@ -306,6 +319,9 @@ def cmd_sources_test(argv: list[str]) -> int:
 
 
 def cmd_sources_diff(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+    from app.services.source_registry import diff_sources_for_profiles
+
     from_profile = _get_opt(argv, "--from") or "legacy"
     to_profile = _get_opt(argv, "--to") or "enhanced"
     engine = RuleEngine()
@@ -315,6 +331,9 @@ def cmd_sources_diff(argv: list[str]) -> int:
 
 
 def cmd_sources_retire(argv: list[str]) -> int:
+    from app.rules.engine import RuleEngine
+    from app.services.source_registry import retire_source
+
     source_id = _get_opt(argv, "--source-id")
     reason = _get_opt(argv, "--reason") or "retired via CLI"
     if not source_id:
@@ -327,6 +346,8 @@ def cmd_sources_retire(argv: list[str]) -> int:
 
 
 def cmd_db_migrate(argv: list[str]) -> int:
+    from app.services.db_migration import bulk_migrate_sqlite_to_target, migrate_sqlite_to_target
+
     from pathlib import Path
 
     from_value = _get_opt(argv, "--from") or _get_opt(argv, "--source-sqlite") or "sqlite:///data/rules.db"
@@ -335,46 +356,80 @@ def cmd_db_migrate(argv: list[str]) -> int:
     tables_arg = _get_opt(argv, "--tables") or ""
     batch_size = int(_get_opt(argv, "--batch-size") or "1000")
     resume = (_get_opt(argv, "--resume") or "true").strip().lower() != "false"
+    bulk = (_get_opt(argv, "--bulk") or "false").strip().lower() in {"1", "true", "yes", "on"}
+    use_copy = (_get_opt(argv, "--copy") or "true").strip().lower() != "false"
     if not target_url:
         print("--to/--target-url (or DATABASE_URL) is required", file=sys.stderr)
         return 2
     tables = [x.strip() for x in tables_arg.split(",") if x.strip()] if tables_arg else None
-    out = migrate_sqlite_to_target(
-        project_root=Path.cwd(),
-        target_url=target_url,
-        source_sqlite_url_or_path=from_value,
-        batch_size=batch_size,
-        resume=resume,
-        checkpoint_path=Path(checkpoint),
-        tables=tables,
-    )
+    if bulk:
+        out = bulk_migrate_sqlite_to_target(
+            project_root=Path.cwd(),
+            target_url=target_url,
+            source_sqlite_url_or_path=from_value,
+            batch_size=batch_size,
+            resume=resume,
+            checkpoint_path=Path(checkpoint),
+            tables=tables,
+            use_copy=use_copy,
+        )
+    else:
+        out = migrate_sqlite_to_target(
+            project_root=Path.cwd(),
+            target_url=target_url,
+            source_sqlite_url_or_path=from_value,
+            batch_size=batch_size,
+            resume=resume,
+            checkpoint_path=Path(checkpoint),
+            tables=tables,
+        )
     print(json.dumps(out, ensure_ascii=False, indent=2))
     return 0 if bool(out.get("ok")) else 4
 
 
 def cmd_db_verify(argv: list[str]) -> int:
+    from app.services.db_migration import verify_sqlite_vs_target, verify_sqlite_vs_target_chunked
+
     from pathlib import Path
 
     from_value = _get_opt(argv, "--from") or _get_opt(argv, "--source-sqlite") or "sqlite:///data/rules.db"
     target_url = _get_opt(argv, "--to") or _get_opt(argv, "--target-url") or os.environ.get("DATABASE_URL", "")
     tables_arg = _get_opt(argv, "--tables") or ""
     sample_rate = float(_get_opt(argv, "--sample") or "0.05")
+    chunked = (_get_opt(argv, "--chunked") or "false").strip().lower() in {"1", "true", "yes", "on"}
+    chunk_size = int(_get_opt(argv, "--chunk-size") or "2000")
+    deadline_seconds = float(_get_opt(argv, "--deadline-seconds") or "0")
+    state = _get_opt(argv, "--state") or ""
     if not target_url:
         print("--to/--target-url (or DATABASE_URL) is required", file=sys.stderr)
         return 2
     tables = [x.strip() for x in tables_arg.split(",") if x.strip()] if tables_arg else None
-    out = verify_sqlite_vs_target(
-        project_root=Path.cwd(),
-        target_url=target_url,
-        source_sqlite_url_or_path=from_value,
-        tables=tables,
-        sample_rate=sample_rate,
-    )
+    if chunked:
+        out = verify_sqlite_vs_target_chunked(
+            project_root=Path.cwd(),
+            target_url=target_url,
+            source_sqlite_url_or_path=from_value,
+            tables=tables,
+            chunk_size=chunk_size,
+            deadline_seconds=deadline_seconds,
+            state_path=Path(state) if state else None,
+        )
+    else:
+        out = verify_sqlite_vs_target(
+            project_root=Path.cwd(),
+            target_url=target_url,
+            source_sqlite_url_or_path=from_value,
+            tables=tables,
+            sample_rate=sample_rate,
+        )
     print(json.dumps(out, ensure_ascii=False, indent=2))
     return 0 if bool(out.get("ok")) else 4
 
 
 def cmd_db_dual_replay(argv: list[str]) -> int:
+    from app.services.db_migration import dual_replay_compare
+    from app.services.rules_store import RulesStore
+
     from pathlib import Path
 
     # Compatibility mode: explicit compare between two URLs.
@@ -384,7 +439,17 @@ def cmd_db_dual_replay(argv: list[str]) -> int:
         if not primary_url or not secondary_url:
             print("--primary-url/--secondary-url (or DATABASE_URL/DATABASE_URL_SECONDARY) are required", file=sys.stderr)
             return 2
-        out = dual_replay_compare(project_root=Path.cwd(), primary_url=primary_url, secondary_url=secondary_url)
+        tables_arg = _get_opt(argv, "--tables") or ""
+        state = _get_opt(argv, "--state") or ""
+        out = dual_replay_compare(
+            project_root=Path.cwd(),
+            primary_url=primary_url,
+            secondary_url=secondary_url,
+            tables=[x.strip() for x in tables_arg.split(",") if x.strip()] or None,
+            chunk_size=int(_get_opt(argv, "--chunk-size") or "2000"),
+            deadline_seconds=float(_get_opt(argv, "--deadline-seconds") or "0"),
+            state_path=Path(state) if state else None,
+        )
         print(json.dumps(out, ensure_ascii=False, indent=2))
         return 0 if bool(out.get("ok")) else 4
 
@@ -399,6 +464,8 @@ def cmd_db_dual_replay(argv: list[str]) -> int:
 
 
 def cmd_db_status(argv: list[str]) -> int:
+    from app.services.rules_store import RulesStore
+
     _ = argv
     from pathlib import Path
 
@@ -412,6 +479,8 @@ def cmd_db_status(argv: list[str]) -> int:
 
 
 def cmd_collect_now(argv: list[str]) -> int:
+    from app.workers.scheduler_worker import SchedulerWorker
+
     profile = _get_opt(argv, "--profile") or "enhanced"
     trigger = _get_opt(argv, "--trigger") or "manual"
     schedule_id = _get_opt(argv, "--schedule-id") or "manual"
@@ -434,6 +503,8 @@ def cmd_collect_now(argv: list[str]) -> int:
 
 
 def cmd_collect_clean(argv: list[str]) -> int:
+    from app.services.collect_asset_store import CollectAssetStore
+
     keep_days = int(_get_opt(argv, "--keep-days") or "30")
     asset_dir = _get_opt(argv, "--collect-asset-dir") or "artifacts/collect"
     root = Path(__file__).resolve().parents[2]
@@ -444,7 +515,25 @@ def cmd_collect_clean(argv: list[str]) -> int:
     return 0
 
 
+def cmd_collect_seal(argv: list[str]) -> int:
+    import datetime as dt
+
+    from app.services.collect_asset_store import CollectAssetStore
+
+    asset_dir = _get_opt(argv, "--collect-asset-dir") or "artifacts/collect"
+    before_raw = _get_opt(argv, "--before")
+    before = dt.date.fromisoformat(before_raw) if before_raw else None
+    root = Path(__file__).resolve().parents[2]
+    store = CollectAssetStore(root, asset_dir=asset_dir)
+    out = store.seal_days(before=before)
+    payload = {"ok": True, "collect_asset_dir": str(store.base_dir), **out}
+    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    return 0
+
+
 def cmd_analysis_clean(argv: list[str]) -> int:
+    from app.services.analysis_cache_store import AnalysisCacheStore
+
     keep_days = int(_get_opt(argv, "--keep-days") or "30")
     asset_dir = _get_opt(argv, "--analysis-asset-dir") or "artifacts/analysis"
     root = Path(__file__).resolve().parents[2]
@@ -455,7 +544,27 @@ def cmd_analysis_clean(argv: list[str]) -> int:
     return 0
 
 
+def cmd_artifacts_clean(argv: list[str]) -> int:
+    from app.services.artifact_retention import DEFAULT_POLICIES, run_retention
+
+    only = {x.strip() for x in str(_get_opt(argv, "--only") or "").split(",") if x.strip()}
+    policies = [p for p in DEFAULT_POLICIES if not only or p.name in only]
+    root = Path(__file__).resolve().parents[2]
+    out = run_retention(
+        root,
+        policies=policies,
+        dry_run="--dry-run" in argv,
+        codec=_get_opt(argv, "--codec"),
+    )
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
 def cmd_analysis_recompute(argv: list[str]) -> int:
+    from app.services.analysis_cache_store import AnalysisCacheStore
+    from app.services.analysis_generator import AnalysisGenerator, degraded_analysis
+    from app.services.artifact_io import artifact_glob, iter_artifact_lines
+
     model = _get_opt(argv, "--model") or "primary"
     prompt_version = _get_opt(argv, "--prompt-version") or "v2"
     sample = int(_get_opt(argv, "--sample") or "20")
@@ -463,23 +572,22 @@ def cmd_analysis_recompute(argv: list[str]) -> int:
     root = Path(__file__).resolve().parents[2]
     store = AnalysisCacheStore(root, asset_dir=asset_dir)
 
-    files = sorted(store.base_dir.glob("items-*.jsonl"), reverse=True)
+    files = sorted(artifact_glob(store.base_dir, "items-*.jsonl"), reverse=True)
     if not files:
         print(json.dumps({"ok": False, "error": "no analysis cache files found"}, ensure_ascii=False, indent=2))
         return 4
 
     rows: list[dict] = []
-    with files[0].open("r", encoding="utf-8") as f:
-        for ln in f:
-            ln = ln.strip()
-            if not ln:
-                continue
-            try:
-                rows.append(json.loads(ln))
-            except Exception:
-                continue
-            if len(rows) >= max(1, sample):
-                break
+    for ln in iter_artifact_lines(files[0]):
+        ln = ln.strip()
+        if not ln:
+            continue
+        try:
+            rows.append(json.loads(ln))
+        except Exception:
+            continue
+        if len(rows) >= max(1, sample):
+            break
     if not rows:
         print(json.dumps({"ok": False, "error": "no valid cache rows"}, ensure_ascii=False, indent=2))
         return 4
@@ -560,6 +668,8 @@ def cmd_analysis_recompute(argv: list[str]) -> int:
 
 
 def cmd_digest_now(argv: list[str]) -> int:
+    from app.workers.live_run import run_digest
+
     profile = _get_opt(argv, "--profile") or "enhanced"
     trigger = _get_opt(argv, "--trigger") or "manual"
     schedule_id = _get_opt(argv, "--schedule-id") or "manual"
@@ -602,6 +712,8 @@ def cmd_digest_now(argv: list[str]) -> int:
 
 
 def cmd_acceptance_run(argv: list[str]) -> int:
+    from scripts.acceptance_run import run_acceptance
+
     mode = (_get_opt(argv, "--mode") or "smoke").strip().lower()
     as_of = _get_opt(argv, "--as-of")
     keep_artifacts = "--keep-artifacts" in argv
@@ -612,6 +724,9 @@ def cmd_acceptance_run(argv: list[str]) -> int:
 
 
 def cmd_raw_ingest(argv: list[str]) -> int:
+    from app.services.rules_store import RulesStore
+    from app.services.feed_db import FeedDBService
+
     scan_days = int(_get_opt(argv, "--scan-artifacts-days") or "7")
     root = Path(__file__).resolve().parents[2]
     store = RulesStore(root)
@@ -623,6 +738,9 @@ def cmd_raw_ingest(argv: list[str]) -> int:
 
 
 def cmd_story_build(argv: list[str]) -> int:
+    from app.services.rules_store import RulesStore
+    from app.services.feed_db import FeedDBService
+
     window_days = int(_get_opt(argv, "--window-days") or "30")
     root = Path(__file__).resolve().parents[2]
     store = RulesStore(root)
@@ -634,6 +752,9 @@ def cmd_story_build(argv: list[str]) -> int:
 
 
 def cmd_backfill_meta(argv: list[str]) -> int:
+    from app.services.rules_store import RulesStore
+    from app.services.feed_db import FeedDBService
+
     execute = "--execute" in argv
     dry_run = "--dry-run" in argv
     if not execute and not dry_run:
@@ -649,6 +770,9 @@ def cmd_backfill_meta(argv: list[str]) -> int:
 
 
 def cmd_backfill_stories_meta(argv: list[str]) -> int:
+    from app.services.rules_store import RulesStore
+    from app.services.feed_db import FeedDBService
+
     execute = "--execute" in argv
     dry_run = "--dry-run" in argv
     if not execute and not dry_run:
@@ -678,7 +802,7 @@ def main() -> int:
             "rules:validate|rules:print|rules:dryrun|rules:replay|"
             "sources:list|sources:validate|sources:test|sources:diff|sources:retire|"
             "db:migrate|db:verify|db:dual-replay|db:status|"
-            "collect-now|collect-clean|analysis-clean|analysis-recompute|digest-now|acceptance-run|raw-ingest|story-build|backfill-meta|backfill-stories-meta|env-check [options]",
+            "collect-now|collect-clean|collect-seal|analysis-clean|artifacts-clean|analysis-recompute|digest-now|acceptance-run|raw-ingest|story-build|backfill-meta|backfill-stories-meta|env-check [options]",
             file=sys.stderr,
         )
         return 2
@@ -716,8 +840,12 @@ def main() -> int:
             return cmd_collect_now(tail)
         if cmd == "collect-clean":
             return cmd_collect_clean(tail)
+        if cmd == "collect-seal":
+            return cmd_collect_seal(tail)
         if cmd == "analysis-clean":
             return cmd_analysis_clean(tail)
+        if cmd == "artifacts-clean":
+            return cmd_artifacts_clean(tail)
         if cmd == "analysis-recompute":
             return cmd_analysis_recompute(tail)
         if cmd == "digest-now":
@@ -748,6 +876,8 @@ def main() -> int:
         )
         return 11
     except Exception as e:  # pragma: no cover - defensive
+        from app.services.source_registry import SourceRegistryError
+
         if isinstance(e, SourceRegistryError):
             print(
                 json.dumps(
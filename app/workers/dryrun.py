@@ -12,84 +12,14 @@ from pathlib import Path
 from typing import Any
 
 from app.rules.engine import RuleEngine
+from app.services.fetch_snapshot import snapshot_report_date, snapshots_enabled
+from app.services.report_engine import run_report
+from app.services.report_history_index import ReportHistoryIndex, item_repeat_key
+from app.services.report_history_index import parse_report_items as _parse_items_from_report
 from app.services.rules_store import RulesStore
 from app.services.source_registry import effective_source_ids_for_profile
 
 
-def _parse_items_from_report(text: str) -> list[dict]:
-    lines = text.splitlines()
-    items: list[dict] = []
-    in_a = False
-    current: dict | None = None
-
-    for raw in lines:
-        line = raw.strip()
-        if not line:
-            continue
-
-        if line.startswith("A. "):
-            in_a = True
-            continue
-        if in_a and re.match(r"^[B-G]\.\s", line):
-            if current:
-                items.append(current)
-                current = None
-            break
-        if not in_a:
-            continue
-
-        m = re.match(r"^(\d+)\)\s*\[(.*?)\]\s*(.*)$", line)
-        if m:
-            if current:
-                items.append(current)
-            current = {
-                "index": int(m.group(1)),
-                "window_tag": m.group(2),
-                "title": m.group(3),
-                "summary": "",
-                "published": "",
-                "source": "",
-                "link": "",
-                "region": "",
-                "lane": "",
-                "event_type": "",
-                "platform": "",
-            }
-            continue
-
-        if not current:
-            continue
-
-        if line.startswith("摘要：") or line.lower().startswith("summary:"):
-            current["summary"] = re.sub(r"^(摘要：|[Ss]ummary:\s*)", "", line, count=1).strip()
-        elif line.startswith("发布日期：") or line.lower().startswith("published:"):
-            current["published"] = re.sub(r"^(发布日期：|[Pp]ublished:\s*)", "", line, count=1).strip()
-        elif line.startswith("来源：") or line.lower().startswith("source:"):
-            src = re.sub(r"^(来源：|[Ss]ource:\s*)", "", line, count=1).strip()
-            if "|" in src:
-                left, right = src.split("|", 1)
-                current["source"] = left.strip()
-                current["link"] = right.strip()
-            else:
-                current["source"] = src
-        elif line.startswith("地区：") or line.lower().startswith("region:"):
-            current["region"] = re.sub(r"^(地区：|[Rr]egion:\s*)", "", line, count=1).strip()
-        elif line.startswith("赛道：") or line.lower().startswith("lane:"):
-            current["lane"] = re.sub(r"^(赛道：|[Ll]ane:\s*)", "", line, count=1).strip()
-        elif line.startswith("事件类型：") or line.lower().startswith("event type:"):
-            current["event_type"] = re.sub(r"^(事件类型：|[Ee]vent [Tt]ype:\s*)", "", line, count=1).strip()
-        elif line.startswith("技术平台：") or line.lower().startswith("platform:"):
-            current["platform"] = re.sub(r"^(技术平台：|[Pp]latform:\s*)", "", line, count=1).strip()
-        elif not current.get("summary"):
-            # 兼容历史格式（摘要行可能不以“摘要：”开头）
-            current["summary"] = line
-
-    if in_a and current:
-        items.append(current)
-
-    return items
-
-
 def _split_sections(text: str) -> dict[str, str]:
     lines = text.splitlines()
     buckets: dict[str, list[str]] = {}
@@ -149,14 +79,6 @@ def _required_sources_hits(required: list[str], items: list[dict]) -> tuple[str,
     return display, missing
 
 
-def _norm_title_fp(title: str) -> str:
-    s = str(title or "").strip().lower()
-    s = re.sub(r"^(update|breaking|exclusive)\s*[:：]\s*", "", s)
-    s = re.sub(r"[\W_]+", " ", s, flags=re.U)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-
 def _summary_sentence_count(summary: str) -> int:
     s = str(summary or "").strip()
     if not s:
@@ -167,16 +89,6 @@ def _summary_sentence_count(summary: str) -> int:
     return len(toks) if toks else (1 if s else 0)
 
 
-def _load_report_items(project_root: Path, date_str: str) -> list[dict]:
-    p = project_root / "reports" / f"ivd_morning_{date_str}.txt"
-    if not p.exists():
-        return []
-    try:
-        return _parse_items_from_report(p.read_text(encoding="utf-8", errors="ignore"))
-    except Exception:
-        return []
-
-
 def _calc_repeat_rates(project_root: Path, report_date: str | None, items: list[dict]) -> dict:
     if not report_date:
         return {
@@ -197,27 +109,15 @@ def _calc_repeat_rates(project_root: Path, report_date: str | None, items: list[
 
     today_keys = set()
     for it in items:
-        link = str(it.get("link", "")).strip()
-        if link:
-            today_keys.add(link)
-        else:
-            fp = _norm_title_fp(str(it.get("title", "")))
-            if fp:
-                today_keys.add(fp)
+        key = item_repeat_key(str(it.get("title", "")), str(it.get("link", "")))
+        if key:
+            today_keys.add(key)
 
     denom = max(1, len(today_keys))
+    history = ReportHistoryIndex(project_root / "reports")
 
     yday = d0 - dt.timedelta(days=1)
-    y_items = _load_report_items(project_root, yday.isoformat())
-    y_keys = set()
-    for it in y_items:
-        link = str(it.get("link", "")).strip()
-        if link:
-            y_keys.add(link)
-        else:
-            fp = _norm_title_fp(str(it.get("title", "")))
-            if fp:
-                y_keys.add(fp)
+    y_keys = history.keys(yday.isoformat(), "repeat_keys")
     y_overlap = len(today_keys & y_keys) if y_keys else 0
     y_rate = y_overlap / denom
 
@@ -225,18 +125,7 @@ def _calc_repeat_rates(project_root: Path, report_date: str | None, items: list[
     max_date: str | None = None
     for off in range(1, 8):
         di = d0 - dt.timedelta(days=off)
-        di_items = _load_report_items(project_root, di.isoformat())
-        if not di_items:
-            continue
-        di_keys = set()
-        for it in di_items:
-            link = str(it.get("link", "")).strip()
-            if link:
-                di_keys.add(link)
-            else:
-                fp = _norm_title_fp(str(it.get("title", "")))
-                if fp:
-                    di_keys.add(fp)
+        di_keys = history.keys(di.isoformat(), "repeat_keys")
         if not di_keys:
             continue
         overlap = len(today_keys & di_keys)
@@ -468,8 +357,20 @@ def run_dryrun(
     report_date: str | None = None,
     lite_mode: bool = False,
     progress_file: str | None = None,
+    from_snapshot: str | None = None,
+    report_mode: str | None = None,
 ) -> dict:
+    """
+    Run the report generator as a dry-run. With `from_snapshot=<run_id>` the generator
+    replays that run's recorded fetch snapshot (no network I/O, report date pinned);
+    otherwise it fetches live and records a snapshot under this dry-run's run_id.
+    `report_mode` selects `inprocess` (warm engine) or `subprocess`; see report_engine_mode.
+    """
     engine = RuleEngine()
+    snapshot_id = str(from_snapshot or "").strip()
+    if snapshot_id:
+        # Fail fast (before recording a run) when the snapshot does not exist.
+        snapshot_report_date(engine.project_root, snapshot_id)
     run_id = f"dryrun-{uuid.uuid4().hex[:10]}"
     decision = engine.build_decision(profile=profile, run_id=run_id)
 
@@ -518,6 +419,10 @@ def run_dryrun(
     if report_date:
         env["REPORT_DATE"] = report_date
     env["REPORT_RUN_ID"] = run_id
+    if snapshot_id:
+        env["FETCH_SNAPSHOT_REPLAY"] = snapshot_id
+    else:
+        env.pop("FETCH_SNAPSHOT_REPLAY", None)
     env["DRYRUN_ARTIFACTS_DIR"] = str(artifacts_dir)
     env["DRYRUN_PROGRESS_FILE"] = str(progress_path)
     if lite_mode:
@@ -527,6 +432,8 @@ def run_dryrun(
         env.setdefault("DRYRUN_FETCH_LIMIT", "20")
         env.setdefault("DRYRUN_FETCH_TIMEOUT_SECONDS", "8")
         env.setdefault("DRYRUN_FETCH_RETRIES", "1")
+        # Stop fetching well before the preview timeout so slow sources cost coverage, not the run.
+        env.setdefault("DRYRUN_FETCH_DEADLINE_SECONDS", "60")
         env.setdefault("DRYRUN_LITE_SKIP_OFFICIAL", "0")
     if profile == "enhanced":
         env["ENHANCED_RULES_PROFILE"] = "enhanced"
@@ -537,15 +444,7 @@ def run_dryrun(
     dryrun_timeout = int(os.environ.get("DRYRUN_TIMEOUT_SECONDS", default_timeout) or default_timeout)
     try:
         _write_progress("generate_report", message="生成报告中")
-        proc = subprocess.run(
-            ["python3", "scripts/generate_ivd_report.py"],
-            cwd=project_root,
-            env=env,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=max(30, dryrun_timeout),
-        )
+        proc = run_report(project_root, env, mode=report_mode, timeout=max(30, dryrun_timeout))
     except subprocess.TimeoutExpired as exc:
         _write_progress(
             "timeout",
@@ -976,6 +875,7 @@ def run_dryrun(
         "date": report_date,
         "rules_version": decision.get("rules_version", {}),
         "rulesets": (decision.get("explain", {}) or {}).get("rulesets", []),
+        "report_engine": proc.meta(),
     }
 
     (artifacts_dir / "run_id.json").write_text(
@@ -1083,6 +983,9 @@ def run_dryrun(
     return {
         "run_id": run_id,
         "mode": "dryrun",
+        "from_snapshot": snapshot_id,
+        "fetch_snapshot_run_id": snapshot_id or (run_id if snapshots_enabled() else ""),
+        "report_engine": proc.meta(),
         "profile": profile,
         "date": report_date,
         "artifacts_dir": str(artifacts_dir),
@@ -1139,6 +1042,12 @@ def run_dryrun(
     }
 
 
-def main(profile: str = "legacy", report_date: str | None = None) -> int:
-    print(json.dumps(run_dryrun(profile=profile, report_date=report_date), ensure_ascii=False, indent=2))
+def main(profile: str = "legacy", report_date: str | None = None, from_snapshot: str | None = None) -> int:
+    print(
+        json.dumps(
+            run_dryrun(profile=profile, report_date=report_date, from_snapshot=from_snapshot),
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
     return 0
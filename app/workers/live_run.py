@@ -15,6 +15,9 @@ from zoneinfo import ZoneInfo
 from app.adapters.rule_bridge import load_runtime_rules
 from app.rules.engine import RuleEngine
 from app.services.collect_asset_store import CollectAssetStore, render_digest_from_assets
+from app.services.ops_metrics import record_latest_artifact
+from app.services.report_engine import run_report
+from app.services.report_history_index import ReportHistoryIndex
 from app.services.rules_store import RulesStore
 
 
@@ -108,11 +111,13 @@ def run_digest(
     collect_asset_dir: str = "artifacts/collect",
     use_collect_assets: bool = False,
     project_root: Path | None = None,
+    report_mode: str | None = None,
 ) -> dict[str, Any]:
     """
     Live run: generate newsletter (network fetch) and optionally send email.
 
     This intentionally reuses existing scripts to avoid breaking behavior.
+    `report_mode` runs the report script in-process (warm) or as a subprocess.
     """
     engine = RuleEngine(project_root=project_root) if project_root else RuleEngine()
     root = engine.project_root
@@ -126,6 +131,7 @@ def run_digest(
     status = "success"
     error_summary = ""
     analysis_meta: dict[str, Any] = {}
+    report_engine_meta: dict[str, Any] = {}
     send_error_summary = ""
 
     # Build decision once for version recording & timezone.
@@ -221,6 +227,9 @@ def run_digest(
                     "timeout_seconds": int(analysis_cfg.get("timeout_seconds", 20) or 20),
                     "backoff_seconds": float(analysis_cfg.get("backoff_seconds", 0.5) or 0.5),
                     "asset_dir": str(analysis_cfg.get("asset_dir", "artifacts/analysis")),
+                    "content_cache_days": int(analysis_cfg.get("content_cache_days", 14) or 0),
+                    "generate_workers": int(analysis_cfg.get("generate_workers", 4) or 1),
+                    "generate_rate_per_sec": float(analysis_cfg.get("generate_rate_per_sec", 0) or 0),
                     "source_policy": content_cfg.get("source_policy", {}),
                     "source_guard": content_cfg.get("source_guard", {}),
                     "frontier_policy": content_cfg.get("frontier_policy", {}),
@@ -239,17 +248,12 @@ def run_digest(
                 report_text = str(rendered)
             out_file.write_text(report_text, encoding="utf-8")
         else:
-            proc = subprocess.run(
-                ["python3", "scripts/generate_ivd_report.py"],
-                cwd=root,
-                env=env,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            proc = run_report(root, env, mode=report_mode)
+            report_engine_meta = proc.meta()
             if proc.stderr:
                 print(proc.stderr, end="")
             out_file.write_text(proc.stdout, encoding="utf-8")
+        ReportHistoryIndex(out_dir).record(date_str)
 
         sent = False
         fallback_triggered = False
@@ -338,6 +342,7 @@ def run_digest(
             "edition": edition,
             "collect_asset_dir": str(collect_asset_dir),
             "analysis_meta": analysis_meta,
+            "report_engine": report_engine_meta,
             "sent": sent,
             "send_cmd": send_cmd,
             "fallback_triggered": fallback_triggered,
@@ -386,9 +391,11 @@ def run_digest(
             "started_at": _utc_iso(),
             "duration_ms": int((finished_at - started_at) * 1000),
             "analysis": analysis_meta,
+            "report_engine": report_engine_meta,
             "send_error_summary": send_error_summary,
         }
         (artifacts_dir / "run_meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        record_latest_artifact(root / "artifacts", "digest", artifacts_dir / "run_meta.json")
         try:
             store.record_report_artifact(
                 run_id=run_id,
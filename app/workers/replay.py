@@ -6,6 +6,7 @@ import subprocess
 from pathlib import Path
 
 from app.rules.engine import RuleEngine
+from app.services.artifact_io import read_artifact_text, resolve_artifact
 
 
 def _resolve_env_template(value: str, env: dict[str, str]) -> str:
@@ -49,11 +50,12 @@ def run_replay(
     preview_file = artifacts_dir / "newsletter_preview.md"
     items_file = artifacts_dir / "items.json"
 
-    if not explain_file.exists() or not preview_file.exists() or not items_file.exists():
+    # Retention may have compressed the run's JSON files (x.json -> x.json.gz).
+    if any(resolve_artifact(p) is None for p in (explain_file, preview_file, items_file)):
         raise FileNotFoundError(f"replay artifacts not complete: {artifacts_dir}")
 
-    explain = json.loads(explain_file.read_text(encoding="utf-8"))
-    items = json.loads(items_file.read_text(encoding="utf-8"))
+    explain = json.loads(read_artifact_text(explain_file))
+    items = json.loads(read_artifact_text(items_file))
 
     profile = profile or str(explain.get("profile", "legacy"))
     decision = engine.build_decision(profile=profile)
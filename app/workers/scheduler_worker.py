@@ -14,11 +14,15 @@ from urllib.parse import urlparse
 
 import yaml
 
+from app.services.report_engine import MODE_INPROCESS, report_engine_mode
 from app.services.run_lock import RunLockError, acquire_run_lock
 from app.services.rules_store import RulesStore
+from app.services.fetch_snapshot import MODE_RECORD, end_snapshot_session, snapshots_enabled, start_snapshot_session
 from app.services.source_registry import fetch_source_entries
 from app.workers.live_run import run_digest
-from app.services.collect_asset_store import CollectAssetStore
+from app.services.collect_asset_store import CollectAssetStore, relevance_runtime_for
+from app.services.collect_columnar import collect_asset_format
+from app.services.ops_metrics import record_latest_artifact
 
 
 def _log(msg: str) -> None:
@@ -75,6 +79,31 @@ def _active_scheduler_cfg(store: RulesStore, project_root: Path, profile: str) -
     return cfg, "file", str(cfg.get("version", ""))
 
 
+def _collect_relevance_runtime(profile: str) -> dict[str, Any]:
+    """
+    Relevance inputs (anchors/negatives packs) of the active content rules, so collect
+    rows are scored under the same rules fingerprint the digest uses and can be reused.
+    """
+    from app.adapters.rule_bridge import load_runtime_rules
+
+    env = os.environ.copy()
+    if profile == "enhanced":
+        env["ENHANCED_RULES_PROFILE"] = "enhanced"
+    else:
+        env.pop("ENHANCED_RULES_PROFILE", None)
+    try:
+        rt = load_runtime_rules(env=env)
+    except Exception:
+        return {}
+    content = rt.get("content", {}) if isinstance(rt.get("content"), dict) else {}
+    if not rt.get("enabled") or not content:
+        return {}
+    runtime = relevance_runtime_for(profile, content)
+    # append_items() also reads `profile` for source policy/guard defaults; keep collect filtering unchanged.
+    runtime.pop("profile", None)
+    return runtime
+
+
 @dataclass(frozen=True)
 class JobSpec:
     id: str
@@ -276,6 +305,7 @@ class SchedulerWorker:
                         collect_asset_dir=self._collect_asset_dir,
                         use_collect_assets=True,
                         project_root=self.project_root,
+                        report_mode=report_engine_mode(default=MODE_INPROCESS),
                     )
                 _log(
                     f"job_done schedule_id={schedule_id} purpose={purpose} ok={out.get('ok')} run_id={out.get('run_id')}"
@@ -333,181 +363,201 @@ class SchedulerWorker:
         rows = self.store.list_sources(enabled_only=True)
         if isinstance(max_sources, int) and max_sources > 0:
             rows = rows[: int(max_sources)]
-        for s in rows:
-            sid = str(s.get("id", "")).strip()
-            if not sid:
-                continue
-            t0 = time.time()
-            fetch_cfg = s.get("fetch", {}) if isinstance(s.get("fetch"), dict) else {}
-            interval_m = fetch_cfg.get("interval_minutes")
-            try:
-                interval_min = int(interval_m) if interval_m is not None and str(interval_m).strip() != "" else 0
-            except Exception:
-                interval_min = 0
-
-            last_fetched_at = str(s.get("last_fetched_at") or "").strip()
-            due = True
-            if interval_min > 0 and last_fetched_at:
+        relevance_runtime = _collect_relevance_runtime(profile)
+        fetch_snapshot = start_snapshot_session(self.project_root, run_id, MODE_RECORD) if snapshots_enabled() else None
+        try:
+            for s in rows:
+                sid = str(s.get("id", "")).strip()
+                if not sid:
+                    continue
+                t0 = time.time()
+                fetch_cfg = s.get("fetch", {}) if isinstance(s.get("fetch"), dict) else {}
+                interval_m = fetch_cfg.get("interval_minutes")
                 try:
-                    # stored as isoformat from _utc_now (timezone aware)
-                    dt_last = datetime.fromisoformat(last_fetched_at.replace("Z", "+00:00"))
-                    age = now - dt_last.timestamp()
-                    due = age >= interval_min * 60
+                    interval_min = int(interval_m) if interval_m is not None and str(interval_m).strip() != "" else 0
                 except Exception:
-                    due = True
+                    interval_min = 0
 
-            if not force and not due:
-                skipped += 1
-                # record as skipped (keep last_fetched_at unchanged)
-                # Keep last_fetched_at unchanged; only update status field.
-                try:
-                    self.store.record_source_fetch(sid, status="skipped", http_status=None, error=None)
-                    self.store.record_source_fetch_event(
-                        run_id=run_id,
-                        source_id=sid,
-                        status="skipped",
-                        http_status=None,
-                        items_count=0,
-                        error=None,
-                        duration_ms=int((time.time() - t0) * 1000),
-                    )
-                except Exception:
-                    pass
-                continue
+                last_fetched_at = str(s.get("last_fetched_at") or "").strip()
+                due = True
+                if interval_min > 0 and last_fetched_at:
+                    try:
+                        # stored as isoformat from _utc_now (timezone aware)
+                        dt_last = datetime.fromisoformat(last_fetched_at.replace("Z", "+00:00"))
+                        age = now - dt_last.timestamp()
+                        due = age >= interval_min * 60
+                    except Exception:
+                        due = True
 
-            timeout_s = 20
-            retries = 1
-            try:
-                if isinstance(fetch_cfg, dict):
-                    timeout_s = int(fetch_cfg.get("timeout_seconds") or 20)
-                    retries = int(fetch_cfg.get("retries") or 1)
-            except Exception:
-                timeout_s = 20
-                retries = 1
-            # Auto-fallback on consecutive failures: switch to backup URL/fetcher when configured.
-            source_for_fetch = dict(s)
-            source_for_fetch["fetch"] = dict(fetch_cfg) if isinstance(fetch_cfg, dict) else {}
-            fallback_used = False
-            try:
-                fallback_after = int(source_for_fetch["fetch"].get("fallback_after_failures") or 0)
-            except Exception:
-                fallback_after = 0
-            if fallback_after > 0:
-                consec_fail = int(self.store.source_consecutive_failures(sid, lookback=max(20, fallback_after * 3)))
-                if consec_fail >= fallback_after:
-                    f_url = str(
-                        source_for_fetch["fetch"].get("fallback_url")
-                        or source_for_fetch.get("fallback_url")
-                        or ""
-                    ).strip()
-                    f_fetcher = str(
-                        source_for_fetch["fetch"].get("fallback_fetcher")
-                        or source_for_fetch.get("fallback_fetcher")
-                        or ""
-                    ).strip().lower()
-                    if f_url:
-                        source_for_fetch["url"] = f_url
-                        fallback_used = True
-                    if f_fetcher in {"rss", "html", "rsshub", "google_news", "api", "web"}:
-                        source_for_fetch["fetcher"] = f_fetcher
-                        source_for_fetch["connector"] = "web" if f_fetcher == "html" else f_fetcher
-                        fallback_used = True
-                    if fallback_used:
-                        _log(
-                            f"source_fallback_applied source_id={sid} "
-                            f"consecutive_failures={consec_fail} threshold={fallback_after} "
-                            f"url={source_for_fetch.get('url','')} fetcher={source_for_fetch.get('fetcher') or source_for_fetch.get('connector')}"
+                if not force and not due:
+                    skipped += 1
+                    # record as skipped (keep last_fetched_at unchanged)
+                    # Keep last_fetched_at unchanged; only update status field.
+                    try:
+                        self.store.record_source_fetch(sid, status="skipped", http_status=None, error=None)
+                        self.store.record_source_fetch_event(
+                            run_id=run_id,
+                            source_id=sid,
+                            status="skipped",
+                            http_status=None,
+                            items_count=0,
+                            error=None,
+                            duration_ms=int((time.time() - t0) * 1000),
                         )
+                    except Exception:
+                        pass
+                    continue
 
-            result = fetch_source_entries(
-                source_for_fetch,
-                limit=max(5, int(fetch_limit or 50)),
-                timeout_seconds=max(3, timeout_s),
-                retries=max(0, retries),
-            )
-            ok = bool(result.get("ok"))
-            status = "ok" if ok else "fail"
-            if ok and fallback_used:
-                status = "ok_fallback"
-            http_status = result.get("http_status")
-            err = result.get("error")
-            if fallback_used and not ok:
-                err = f"[fallback] {err}" if err else "[fallback] fetch_failed"
-            items_count = len(result.get("samples", []) if isinstance(result.get("samples"), list) else [])
-            try:
-                self.store.record_source_fetch(
-                    sid,
-                    status=status,
-                    http_status=int(http_status) if http_status is not None else None,
-                    error=str(err or "") if not ok else None,
-                )
-                self.store.record_source_fetch_event(
-                    run_id=run_id,
-                    source_id=sid,
-                    status=status,
-                    http_status=int(http_status) if http_status is not None else None,
-                    items_count=int(items_count),
-                    error=str(err or "") if not ok else None,
-                    duration_ms=int((time.time() - t0) * 1000),
+                timeout_s = 20
+                retries = 1
+                try:
+                    if isinstance(fetch_cfg, dict):
+                        timeout_s = int(fetch_cfg.get("timeout_seconds") or 20)
+                        retries = int(fetch_cfg.get("retries") or 1)
+                except Exception:
+                    timeout_s = 20
+                    retries = 1
+                # Auto-fallback on consecutive failures: switch to backup URL/fetcher when configured.
+                source_for_fetch = dict(s)
+                source_for_fetch["fetch"] = dict(fetch_cfg) if isinstance(fetch_cfg, dict) else {}
+                fallback_used = False
+                try:
+                    fallback_after = int(source_for_fetch["fetch"].get("fallback_after_failures") or 0)
+                except Exception:
+                    fallback_after = 0
+                if fallback_after > 0:
+                    consec_fail = int(self.store.source_consecutive_failures(sid, lookback=max(20, fallback_after * 3)))
+                    if consec_fail >= fallback_after:
+                        f_url = str(
+                            source_for_fetch["fetch"].get("fallback_url")
+                            or source_for_fetch.get("fallback_url")
+                            or ""
+                        ).strip()
+                        f_fetcher = str(
+                            source_for_fetch["fetch"].get("fallback_fetcher")
+                            or source_for_fetch.get("fallback_fetcher")
+                            or ""
+                        ).strip().lower()
+                        if f_url:
+                            source_for_fetch["url"] = f_url
+                            fallback_used = True
+                        if f_fetcher in {"rss", "html", "rsshub", "google_news", "api", "web"}:
+                            source_for_fetch["fetcher"] = f_fetcher
+                            source_for_fetch["connector"] = "web" if f_fetcher == "html" else f_fetcher
+                            fallback_used = True
+                        if fallback_used:
+                            _log(
+                                f"source_fallback_applied source_id={sid} "
+                                f"consecutive_failures={consec_fail} threshold={fallback_after} "
+                                f"url={source_for_fetch.get('url','')} fetcher={source_for_fetch.get('fetcher') or source_for_fetch.get('connector')}"
+                            )
+
+                result = fetch_source_entries(
+                    source_for_fetch,
+                    limit=max(5, int(fetch_limit or 50)),
+                    timeout_seconds=max(3, timeout_s),
+                    retries=max(0, retries),
                 )
-            except Exception:
-                pass
-
-            if ok:
-                fetched += 1
-                sources_fetched_count += 1
+                ok = bool(result.get("ok"))
+                status = "ok" if ok else "fail"
+                if ok and fallback_used:
+                    status = "ok_fallback"
+                http_status = result.get("http_status")
+                err = result.get("error")
+                if fallback_used and not ok:
+                    err = f"[fallback] {err}" if err else "[fallback] fetch_failed"
+                items_count = len(result.get("samples", []) if isinstance(result.get("samples"), list) else [])
+                body_fetch = result.get("body_fetch") if isinstance(result.get("body_fetch"), dict) else {}
+                if body_fetch.get("candidates"):
+                    _log(
+                        f"rss_body_fetch source_id={sid} candidates={body_fetch.get('candidates')} "
+                        f"cache_hits={body_fetch.get('cache_hits')} not_modified={body_fetch.get('not_modified')} "
+                        f"downloaded={body_fetch.get('downloaded')} hit_rate={body_fetch.get('hit_rate')} "
+                        f"bytes_avoided={body_fetch.get('bytes_avoided')}"
+                    )
                 try:
-                    source_group = str(s.get("source_group", "")).strip() or "media"
-                    source_trust_tier = str(s.get("trust_tier", "C")).strip().upper() or "C"
-                    wr = collector.append_items(
+                    self.store.record_source_fetch(
+                        sid,
+                        status=status,
+                        http_status=int(http_status) if http_status is not None else None,
+                        error=str(err or "") if not ok else None,
+                    )
+                    self.store.record_source_fetch_event(
                         run_id=run_id,
                         source_id=sid,
-                        source_name=str(s.get("name", sid)),
-                        source_group=source_group,
-                        items=list(result.get("entries", [])) if isinstance(result.get("entries", []), list) else [],
-                        rules_runtime={},
-                        source_trust_tier=source_trust_tier,
+                        status=status,
+                        http_status=int(http_status) if http_status is not None else None,
+                        items_count=int(items_count),
+                        error=str(err or "") if not ok else None,
+                        duration_ms=int((time.time() - t0) * 1000),
                     )
-                    assets_written += int(wr.get("written", 0))
-                    deduped_count += int(wr.get("skipped", 0))
+                except Exception:
+                    pass
 
-                    # For non-RSS sources, keep at least one observable stub if parser produced no rows.
-                    connector = str(source_for_fetch.get("connector") or source_for_fetch.get("fetcher") or "").lower()
-                    is_non_rss = connector in {"html", "web", "api"}
-                    if is_non_rss and int(result.get("items_count") or 0) <= 0:
-                        sw = collector.append_stub_item(
-                            run_id=run_id,
-                            source_id=sid,
-                            source_name=str(s.get("name", sid)),
-                            source_group=source_group,
-                            url=str(source_for_fetch.get("url", "")),
-                            error=str(result.get("error_message") or ""),
-                        )
-                        assets_written += int(sw.get("written", 0))
-                        deduped_count += int(sw.get("skipped", 0))
-                except Exception as e:
-                    msg = f"{sid}:append_failed:{e}"
-                    errors.append(msg)
-            else:
-                failed += 1
-                sources_failed_count += 1
-                # Non-RSS source can still emit a stub item for observability.
-                connector = str(source_for_fetch.get("connector") or source_for_fetch.get("fetcher") or "").lower()
-                if connector in {"html", "web", "api"}:
+                if ok:
+                    fetched += 1
+                    sources_fetched_count += 1
                     try:
                         source_group = str(s.get("source_group", "")).strip() or "media"
-                        sw = collector.append_stub_item(
+                        source_trust_tier = str(s.get("trust_tier", "C")).strip().upper() or "C"
+                        wr = collector.append_items(
                             run_id=run_id,
                             source_id=sid,
                             source_name=str(s.get("name", sid)),
                             source_group=source_group,
-                            url=str(source_for_fetch.get("url", "")),
-                            error=str(err or ""),
+                            items=list(result.get("entries", [])) if isinstance(result.get("entries", []), list) else [],
+                            rules_runtime=relevance_runtime,
+                            source_trust_tier=source_trust_tier,
                         )
-                        assets_written += int(sw.get("written", 0))
-                        deduped_count += int(sw.get("skipped", 0))
+                        assets_written += int(wr.get("written", 0))
+                        deduped_count += int(wr.get("skipped", 0))
+
+                        # For non-RSS sources, keep at least one observable stub if parser produced no rows.
+                        connector = str(source_for_fetch.get("connector") or source_for_fetch.get("fetcher") or "").lower()
+                        is_non_rss = connector in {"html", "web", "api"}
+                        if is_non_rss and int(result.get("items_count") or 0) <= 0:
+                            sw = collector.append_stub_item(
+                                run_id=run_id,
+                                source_id=sid,
+                                source_name=str(s.get("name", sid)),
+                                source_group=source_group,
+                                url=str(source_for_fetch.get("url", "")),
+                                error=str(result.get("error_message") or ""),
+                            )
+                            assets_written += int(sw.get("written", 0))
+                            deduped_count += int(sw.get("skipped", 0))
                     except Exception as e:
-                        errors.append(f"{sid}:stub_failed:{e}")
+                        msg = f"{sid}:append_failed:{e}"
+                        errors.append(msg)
+                else:
+                    failed += 1
+                    sources_failed_count += 1
+                    # Non-RSS source can still emit a stub item for observability.
+                    connector = str(source_for_fetch.get("connector") or source_for_fetch.get("fetcher") or "").lower()
+                    if connector in {"html", "web", "api"}:
+                        try:
+                            source_group = str(s.get("source_group", "")).strip() or "media"
+                            sw = collector.append_stub_item(
+                                run_id=run_id,
+                                source_id=sid,
+                                source_name=str(s.get("name", sid)),
+                                source_group=source_group,
+                                url=str(source_for_fetch.get("url", "")),
+                                error=str(err or ""),
+                            )
+                            assets_written += int(sw.get("written", 0))
+                            deduped_count += int(sw.get("skipped", 0))
+                        except Exception as e:
+                            errors.append(f"{sid}:stub_failed:{e}")
+        finally:
+            snapshot_summary = end_snapshot_session(fetch_snapshot)
+
+        sealed: dict[str, Any] | None = None
+        if collect_asset_format() == "columnar":
+            try:
+                sealed = collector.seal_days()
+            except Exception as e:
+                errors.append(f"seal_failed:{e}")
 
         meta = {
             "run_id": run_id,
@@ -531,9 +581,12 @@ class SchedulerWorker:
             "sources_fetched_count": sources_fetched_count,
             "sources_failed_count": sources_failed_count,
             "errors": errors,
+            "fetch_snapshot": snapshot_summary,
+            "assets_sealed": sealed,
         }
         meta_path = artifacts_dir / "run_meta.json"
         meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        record_latest_artifact(self.project_root / "artifacts", "collect", meta_path)
         ended_iso = datetime.now(timezone.utc).isoformat()
         try:
             self.store.record_report_artifact(
@@ -14,7 +14,9 @@ from app.core.track_relevance import compute_relevance
 from app.rules.engine import RuleEngine
 from app.services.analysis_cache_store import AnalysisCacheStore
 from app.services.analysis_generator import AnalysisGenerator, degraded_analysis
+from app.services.artifact_io import artifact_glob, iter_artifact_lines
 from app.services.collect_asset_store import CollectAssetStore, render_digest_from_assets
+from app.services.ops_metrics import record_latest_artifact
 from app.services.story_clusterer import StoryClusterer
 
 
@@ -70,6 +72,13 @@ def _write_json(path: Path, payload: dict[str, Any]) -> None:
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
 
+def _write_report(acceptance_dir: Path, report: dict[str, Any]) -> None:
+    json_path = acceptance_dir / "acceptance_report.json"
+    _write_json(json_path, report)
+    (acceptance_dir / "acceptance_report.md").write_text(_render_md(report), encoding="utf-8")
+    record_latest_artifact(acceptance_dir.parent, "acceptance", json_path)
+
+
 def _render_md(report: dict[str, Any]) -> str:
     lines: list[str] = []
     lines.append("# Acceptance Report")
@@ -325,7 +334,8 @@ def _load_analysis_cache_map(project_root: Path, *, asset_dir: str = "artifacts/
     if not base.exists():
         return out
     today = dt.date.today()
-    files = sorted(base.glob("items-*.jsonl"), reverse=True)
+    # Retention compresses day files after a few days; the logical names cover both forms.
+    files = sorted(artifact_glob(base, "items-*.jsonl"), reverse=True)
     for p in files:
         m = re.match(r"items-(\d{8})\.jsonl$", p.name)
         if not m:
@@ -337,19 +347,18 @@ def _load_analysis_cache_map(project_root: Path, *, asset_dir: str = "artifacts/
         if (today - d).days > keep_days:
             continue
         try:
-            with p.open("r", encoding="utf-8") as f:
-                for ln in f:
-                    ln = ln.strip()
-                    if not ln:
-                        continue
-                    try:
-                        row = json.loads(ln)
-                    except Exception:
-                        continue
-                    k = str(row.get("item_key", "")).strip()
-                    if not k:
-                        continue
-                    out[k] = row
+            for ln in iter_artifact_lines(p):
+                ln = ln.strip()
+                if not ln:
+                    continue
+                try:
+                    row = json.loads(ln)
+                except Exception:
+                    continue
+                k = str(row.get("item_key", "")).strip()
+                if not k:
+                    continue
+                out[k] = row
         except Exception:
             continue
     return out
@@ -660,9 +669,7 @@ def run_acceptance(*, project_root: Path, mode: str = "smoke", as_of: str | None
                 "collect_jsonl": str(collect_file),
             },
         }
-        md = _render_md(report)
-        _write_json(acceptance_dir / "acceptance_report.json", report)
-        (acceptance_dir / "acceptance_report.md").write_text(md, encoding="utf-8")
+        _write_report(acceptance_dir, report)
         return report
 
     # PR-A2 regression: bad source + offline + model failure resilience.
@@ -839,9 +846,7 @@ def run_acceptance(*, project_root: Path, mode: str = "smoke", as_of: str | None
                 "regression_model_fail_digest": str(model_path),
             },
         }
-        md = _render_md(report)
-        _write_json(acceptance_dir / "acceptance_report.json", report)
-        (acceptance_dir / "acceptance_report.md").write_text(md, encoding="utf-8")
+        _write_report(acceptance_dir, report)
         return report
 
     # Seed collect assets with local synthetic rows (no network dependency).
@@ -992,9 +997,7 @@ def run_acceptance(*, project_root: Path, mode: str = "smoke", as_of: str | None
         }
         report["artifacts"]["quality_pack_md"] = qp.get("quality_pack_md", "")
         report["artifacts"]["quality_pack_json"] = qp.get("quality_pack_json", "")
-    md = _render_md(report)
-    _write_json(acceptance_dir / "acceptance_report.json", report)
-    (acceptance_dir / "acceptance_report.md").write_text(md, encoding="utf-8")
+    _write_report(acceptance_dir, report)
     return report
 
 
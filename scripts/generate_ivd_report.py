@@ -22,7 +22,7 @@ from dataclasses import dataclass, field
 from http.client import RemoteDisconnected
 from pathlib import Path
 from socket import timeout as SocketTimeout
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from urllib.parse import urljoin, urlparse
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
@@ -44,9 +44,22 @@ from app.core.track_relevance import (
     DEFAULT_NEGATIVES_PACK,
     DEFAULT_NEGATIVE_STRONG,
 )
+from app.services.fetch_executor import DEADLINE_EXCEEDED, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST, FetchExecutor, FetchJob, host_of
+from app.services.fetch_snapshot import (
+    MODE_RECORD,
+    MODE_REPLAY,
+    active_snapshot_session,
+    end_snapshot_session,
+    snapshot_report_date,
+    snapshots_enabled,
+    start_snapshot_session,
+)
 from app.services.story_clusterer import StoryClusterer
 from app.services.source_registry import fetch_source_entries, load_sources_registry, select_sources
+from app.services.report_history_index import ReportHistoryIndex, normalize_report_title, report_title_keys
 from app.services.rules_versioning import get_runtime_rules_root
+from app.utils.keyword_automaton import KeywordAutomaton, KeywordHits
+from app.utils.run_env import run_getenv
 
 
 @dataclass(frozen=True)
@@ -344,7 +357,7 @@ def dict_to_item(d: dict) -> Item:
 
 
 def env(name: str, default: str = "") -> str:
-    return os.environ.get(name, default).strip()
+    return run_getenv(name, default).strip()
 
 
 def _write_progress(stage: str, *, total_sources: int | None = None, completed_sources: int | None = None, message: str = "", **extra: Any) -> None:
@@ -401,36 +414,138 @@ def has_term(text_lc: str, term_lc: str) -> bool:
     return term_lc in text_lc
 
 
-def _map_label_by_keywords(text_lc: str, mapping: dict) -> Optional[str]:
+_KEYWORD_TABLES: dict[int, tuple[Any, Any]] = {}
+
+
+def _keyword_table(mapping: Any) -> tuple[tuple[str, tuple[str, ...], tuple[Any, ...]], ...]:
+    """
+    (label, keywords, raw keywords) of a label -> keyword-list mapping, in mapping order:
+    keywords stripped/lowercased with empties dropped, raw keywords aligned with them.
+    Memoized per mapping object (rules are loaded once per run).
+    """
     if not isinstance(mapping, dict):
-        return None
+        return ()
+    hit = _KEYWORD_TABLES.get(id(mapping))
+    if hit is not None and hit[0] is mapping:
+        return hit[1]
+    rows = []
     for label, kws in mapping.items():
         if not isinstance(kws, list):
             continue
-        for kw in kws:
-            k = str(kw).strip().lower()
-            if k and has_term(text_lc, k):
-                return str(label)
+        pairs = [(str(kw).strip().lower(), kw) for kw in kws]
+        pairs = [(k, kw) for k, kw in pairs if k]
+        rows.append((str(label), tuple(k for k, _ in pairs), tuple(kw for _, kw in pairs)))
+    table = tuple(rows)
+    if len(_KEYWORD_TABLES) >= 64:
+        _KEYWORD_TABLES.clear()
+    _KEYWORD_TABLES[id(mapping)] = (mapping, table)
+    return table
+
+
+def _keyword_list(values: Any) -> tuple[str, ...]:
+    if not isinstance(values, (list, tuple)):
+        return ()
+    hit = _KEYWORD_TABLES.get(id(values))
+    if hit is not None and hit[0] is values:
+        return hit[1]
+    out = tuple(k for k in (str(x).strip().lower() for x in values) if k)
+    if len(_KEYWORD_TABLES) >= 64:
+        _KEYWORD_TABLES.clear()
+    _KEYWORD_TABLES[id(values)] = (values, out)
+    return out
+
+
+class _TermProbe:
+    """
+    Keyword tests over one text. Without `hits` every test scans `text_lc` (has_term / `in`).
+    With a KeywordHits of the candidate (restricted to `fields`), the keywords present in the
+    text are known up front, so tests become set lookups; keywords the automaton was not
+    built with fall back to scanning the window text.
+    """
+
+    __slots__ = ("_text", "_hits", "_fields", "_known", "_matched", "_present")
+
+    def __init__(self, text_lc: str, hits: KeywordHits | None = None, fields: tuple[str, ...] | None = None) -> None:
+        self._hits = hits
+        self._fields = fields
+        if hits is None:
+            self._text = text_lc
+            return
+        self._text = None
+        auto = hits.automaton
+        present = hits.present(fields)
+        matched = present - auto.bounded
+        if "\\" in hits.text:
+            # has_term's pattern is a raw string with doubled backslashes: for short ASCII
+            # words it matches a literal backslash + "b" around the term, so they practically
+            # never hit. Kept as-is so decisions do not change.
+            wt = hits.window_text(fields)
+            matched |= {k for k in present & auto.bounded if "\\b" + k + "\\b" in wt}
+        self._known = auto.terms
+        self._present = present
+        self._matched = matched
+
+    def _window(self) -> str:
+        if self._text is None:
+            self._text = self._hits.window_text(self._fields)  # type: ignore[union-attr]
+        return self._text
+
+    def has(self, k: str) -> bool:
+        if self._hits is None or k not in self._known:
+            return has_term(self._window(), k)
+        return k in self._matched
+
+    def contains(self, k: str) -> bool:
+        if self._hits is None or k not in self._known:
+            return k in self._window()
+        return k in self._present
+
+    def has_any(self, kws: tuple[str, ...]) -> bool:
+        if self._hits is not None and self._known.issuperset(kws):
+            return not self._matched.isdisjoint(kws)
+        return any(self.has(k) for k in kws)
+
+    def contains_any(self, kws: tuple[str, ...]) -> bool:
+        if self._hits is not None and self._known.issuperset(kws):
+            return not self._present.isdisjoint(kws)
+        return any(self.contains(k) for k in kws)
+
+    def first_has(self, kws: tuple[str, ...]) -> str | None:
+        if not self.has_any(kws):
+            return None
+        return next(k for k in kws if self.has(k))
+
+
+def _map_label_by_keywords(text_lc: str, mapping: dict, probe: _TermProbe | None = None) -> Optional[str]:
+    if not isinstance(mapping, dict):
+        return None
+    probe = probe or _TermProbe(text_lc)
+    for label, kws, _raw in _keyword_table(mapping):
+        if probe.has_any(kws):
+            return label
     return None
 
 
-def cn_lane(text: str) -> str:
-    t = text.lower()
-    dynamic_lane = _map_label_by_keywords(t, RUNTIME_CONTENT.get("lane_mapping", {}))
+# Built-in keyword tables of the legacy taggers, checked in order. "contains" rows use plain
+# substring tests, "term" rows use has_term().
+CN_LANE_RULES: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    ("contains", "肿瘤检测", ("肿瘤", "癌", "肿瘤标志物")),
+    ("contains", "感染检测", ("感染", "病原", "病毒", "流感", "新冠", "呼吸道")),
+    ("contains", "生殖与遗传检测", ("生殖", "遗传", "产前", "nipt")),
+    ("term", "肿瘤检测", ("cancer", "tumor", "oncology", "carcinoma", "pd-l1", "biomarker")),
+    ("term", "感染检测", ("infect", "virus", "covid", "flu", "influenza", "pathogen", "sepsis")),
+    ("term", "生殖与遗传检测", ("prenatal", "nipt", "fertility", "reproductive", "genetic", "hereditary")),
+)
+
+
+def cn_lane(text: str, hits: KeywordHits | None = None) -> str:
+    probe = _TermProbe("" if hits is not None else text.lower(), hits)
+    dynamic_lane = _map_label_by_keywords("", RUNTIME_CONTENT.get("lane_mapping", {}), probe)
     if dynamic_lane:
         return dynamic_lane
-    if any(k in t for k in ["肿瘤", "癌", "肿瘤标志物"]):
-        return "肿瘤检测"
-    if any(k in t for k in ["感染", "病原", "病毒", "流感", "新冠", "呼吸道"]):
-        return "感染检测"
-    if any(k in t for k in ["生殖", "遗传", "产前", "nipt"]):
-        return "生殖与遗传检测"
-    if any(has_term(t, k) for k in ["cancer", "tumor", "oncology", "carcinoma", "pd-l1", "biomarker"]):
-        return "肿瘤检测"
-    if any(has_term(t, k) for k in ["infect", "virus", "covid", "flu", "influenza", "pathogen", "sepsis"]):
-        return "感染检测"
-    if any(has_term(t, k) for k in ["prenatal", "nipt", "fertility", "reproductive", "genetic", "hereditary"]):
-        return "生殖与遗传检测"
+    for mode, label, terms in CN_LANE_RULES:
+        if (probe.contains_any if mode == "contains" else probe.has_any)(terms):
+            return label
     return "其他"
 
 
@@ -442,34 +557,34 @@ def classify_lane(
     event_type: str,
     *,
     enhanced: bool,
+    text_hits: KeywordHits | None = None,
 ) -> tuple[str, dict]:
     """
     Lane (赛道) tagging v1 (explainable):
     - Prefer explicit keyword mapping from content_rules.lane_mapping.
     - If still no signal, keep "其他" with a clear reason for operators to expand mapping.
+    `text_hits` may carry a scan whose "title"/"summary" fields are these two texts.
     """
     mapping = (
         RUNTIME_CONTENT.get("lane_mapping", {})
         if isinstance(RUNTIME_CONTENT.get("lane_mapping"), dict)
         else {}
     )
-    text_lc = (str(title or "") + " " + str(summary or "")).lower()
+    probe = _TermProbe(
+        "" if text_hits is not None else (str(title or "") + " " + str(summary or "")).lower(),
+        text_hits,
+        ("title", "summary"),
+    )
     sg_lc = str(source_group or "").lower()
     url_lc = _url_text(url)
 
     hits: list[str] = []
     hit_terms: dict[str, list[str]] = {}
-    for label, kws in mapping.items():
-        if not isinstance(kws, list):
-            continue
-        for kw in kws:
-            k = str(kw).strip().lower()
-            if not k:
-                continue
-            if has_term(text_lc, k):
-                hits.append(str(label))
-                hit_terms.setdefault(str(label), []).append(k)
-                break
+    for label, kws, _raw in _keyword_table(mapping):
+        k = probe.first_has(kws)
+        if k is not None:
+            hits.append(label)
+            hit_terms.setdefault(label, []).append(k)
 
     if len(hits) >= 2:
         # Keep single-lane output for current template; mark ambiguity in explain.
@@ -521,6 +636,7 @@ def classify_platform(
     event_type: str,
     *,
     enhanced: bool,
+    text_hits: KeywordHits | None = None,
 ) -> tuple[str, dict]:
     """
     Platform tagging v1 (explainable, configurable via platform_mapping):
@@ -528,29 +644,28 @@ def classify_platform(
     - Use URL host/path hints as a weak signal when keywords miss.
     - If still no signal: treat some event types as cross-platform by default (enhanced only),
       otherwise mark as "未标注" to drive dictionary improvement.
+    `text_hits` may carry a scan whose "title"/"summary" fields are these two texts.
     """
     mapping = (
         RUNTIME_CONTENT.get("platform_mapping", {})
         if isinstance(RUNTIME_CONTENT.get("platform_mapping"), dict)
         else {}
     )
-    text_lc = (str(title or "") + " " + str(summary or "")).lower()
+    probe = _TermProbe(
+        "" if text_hits is not None else (str(title or "") + " " + str(summary or "")).lower(),
+        text_hits,
+        ("title", "summary"),
+    )
     url_lc = _url_text(url)
     sg_lc = str(source_group or "").lower()
 
     hits: list[str] = []
     hit_terms: dict[str, list[str]] = {}
-    for label, kws in mapping.items():
-        if not isinstance(kws, list):
-            continue
-        for kw in kws:
-            k = str(kw).strip().lower()
-            if not k:
-                continue
-            if has_term(text_lc, k):
-                hits.append(str(label))
-                hit_terms.setdefault(str(label), []).append(k)
-                break
+    for label, kws, _raw in _keyword_table(mapping):
+        k = probe.first_has(kws)
+        if k is not None:
+            hits.append(label)
+            hit_terms.setdefault(label, []).append(k)
 
     url_hits: list[str] = []
     # Weak URL/path heuristics (used only when keyword mapping misses).
@@ -647,87 +762,109 @@ DEFAULT_PLATFORM_URL_HINTS: dict[str, list[str]] = {
 }
 
 
-def cn_platform(text: str) -> str:
+CN_PLATFORM_ZH_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("免疫诊断（化学发光/ELISA/IHC等）", ("体外诊断", "化学发光", "免疫诊断")),
+    ("PCR", ("核酸", "pcr", "聚合酶链式反应")),
+    ("数字PCR", ("数字pcr",)),
+    ("流式细胞", ("流式",)),
+    ("质谱", ("质谱",)),
+)
+# Guardrails: avoid mis-tagging obvious pharma/business items as IVD platforms.
+CN_PLATFORM_BUSINESS_TERMS: tuple[str, ...] = (
+    "earnings",
+    "quarter",
+    "revenue",
+    "sales",
+    "layoff",
+    "restructur",
+    "acquisition",
+    "takeover",
+)
+CN_PLATFORM_IVD_TERMS: tuple[str, ...] = (
+    "diagnostic",
+    "assay",
+    "test",
+    "ivd",
+    "immunoassay",
+    "pcr",
+    "sequencing",
+    "ngs",
+    "poct",
+    "pathology",
+    "laboratory",
+)
+CN_PLATFORM_EN_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("NGS", ("ngs", "sequencing", "whole genome", "wgs", "rna-seq")),
+    ("数字PCR", ("digital pcr", "ddpcr")),
+    ("PCR", ("pcr",)),
+    ("质谱", ("mass spec", "lc-ms", "ms/ms")),
+    ("流式细胞", ("flow cytometry", "cytometry")),
+    ("免疫诊断（化学发光/ELISA/IHC等）", ("immunoassay", "chemiluminescence", "elisa", "ihc", "clia")),
+    ("POCT/分子POCT", ("point-of-care", "poc", "poct", "self-test", "rapid test")),
+    ("微流控/单分子", ("microfluidic", "lab-on-a-chip", "single molecule", "single-molecule", "simoa")),
+)
+
+
+def cn_platform(text: str, hits: KeywordHits | None = None) -> str:
     # Legacy-compatible heuristic tagger.
-    t = str(text or "").lower()
-    dynamic_platform = _map_label_by_keywords(t, RUNTIME_CONTENT.get("platform_mapping", {}))
+    probe = _TermProbe("" if hits is not None else str(text or "").lower(), hits)
+    dynamic_platform = _map_label_by_keywords("", RUNTIME_CONTENT.get("platform_mapping", {}), probe)
     if dynamic_platform:
         return dynamic_platform
-    if any(k in t for k in ["体外诊断", "化学发光", "免疫诊断"]):
-        return "免疫诊断（化学发光/ELISA/IHC等）"
-    if any(k in t for k in ["核酸", "pcr", "聚合酶链式反应"]):
-        return "PCR"
-    if "数字pcr" in t:
-        return "数字PCR"
-    if any(k in t for k in ["流式"]):
-        return "流式细胞"
-    if any(k in t for k in ["质谱"]):
-        return "质谱"
-    # Guardrails: avoid mis-tagging obvious pharma/business items as IVD platforms.
-    if any(
-        k in t
-        for k in [
-            "earnings",
-            "quarter",
-            "revenue",
-            "sales",
-            "layoff",
-            "restructur",
-            "acquisition",
-            "takeover",
-        ]
-    ):
-        if not any(
-            k in t
-            for k in [
-                "diagnostic",
-                "assay",
-                "test",
-                "ivd",
-                "immunoassay",
-                "pcr",
-                "sequencing",
-                "ngs",
-                "poct",
-                "pathology",
-                "laboratory",
-            ]
-        ):
+    for label, terms in CN_PLATFORM_ZH_RULES:
+        if probe.contains_any(terms):
+            return label
+    if probe.contains_any(CN_PLATFORM_BUSINESS_TERMS):
+        if not probe.contains_any(CN_PLATFORM_IVD_TERMS):
             return "跨平台/未标注"
-    if any(has_term(t, k) for k in ["ngs", "sequencing", "whole genome", "wgs", "rna-seq"]):
-        return "NGS"
-    if has_term(t, "digital pcr") or has_term(t, "ddpcr"):
-        return "数字PCR"
-    if has_term(t, "pcr"):
-        return "PCR"
-    if any(has_term(t, k) for k in ["mass spec", "lc-ms", "ms/ms"]):
-        return "质谱"
-    if any(has_term(t, k) for k in ["flow cytometry", "cytometry"]):
-        return "流式细胞"
-    if any(has_term(t, k) for k in ["immunoassay", "chemiluminescence", "elisa", "ihc", "clia"]):
-        return "免疫诊断（化学发光/ELISA/IHC等）"
-    if any(has_term(t, k) for k in ["point-of-care", "poc", "poct", "self-test", "rapid test"]):
-        return "POCT/分子POCT"
-    if any(has_term(t, k) for k in ["microfluidic", "lab-on-a-chip", "single molecule", "single-molecule", "simoa"]):
-        return "微流控/单分子"
+    for label, terms in CN_PLATFORM_EN_RULES:
+        if probe.has_any(terms):
+            return label
     return "跨平台/未标注"
 
 
-def detect_event_type(text: str, source: str, link: str) -> str:
-    t = (text + " " + source + " " + link).lower()
-    dynamic_event = _map_label_by_keywords(t, RUNTIME_CONTENT.get("event_mapping", {}))
+EVENT_TYPE_FALLBACK_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    (
+        "监管审批与指南",
+        (
+            "nmpa",
+            "cmde",
+            "fda",
+            "pmda",
+            "mfds",
+            "hsa.gov.sg",
+            "tga.gov.au",
+            "guideline",
+            "guidance",
+            "recall",
+            "safety alert",
+            "field safety",
+            "approved",
+            "审批",
+            "指导原则",
+            "通告",
+            "召回",
+        ),
+    ),
+    (
+        "并购融资/IPO与合作",
+        ("acquisition", "acquire", "merger", "ipo", "funding", "financing", "raise", "partnership", "collaboration", "deal"),
+    ),
+    ("注册上市/产品发布", ("launch", "introduce", "new test", "new assay", "registered", "clearance", "ce mark")),
+    ("临床与科研证据", ("study", "clinical", "data", "evidence", "validation", "trial", "publication")),
+    ("支付与招采", ("tender", "procurement", "reimbursement", "payment", "bid", "ccgp", "招标", "采购")),
+)
+
+
+def detect_event_type(text: str, source: str, link: str, hits: KeywordHits | None = None) -> str:
+    """`hits`, when given, is a scan of exactly `text + " " + source + " " + link`."""
+    probe = _TermProbe("" if hits is not None else (text + " " + source + " " + link).lower(), hits)
+    dynamic_event = _map_label_by_keywords("", RUNTIME_CONTENT.get("event_mapping", {}), probe)
     if dynamic_event:
         return dynamic_event
-    if any(k in t for k in ["nmpa", "cmde", "fda", "pmda", "mfds", "hsa.gov.sg", "tga.gov.au", "guideline", "guidance", "recall", "safety alert", "field safety", "approved", "审批", "指导原则", "通告", "召回"]):
-        return "监管审批与指南"
-    if any(k in t for k in ["acquisition", "acquire", "merger", "ipo", "funding", "financing", "raise", "partnership", "collaboration", "deal"]):
-        return "并购融资/IPO与合作"
-    if any(k in t for k in ["launch", "introduce", "new test", "new assay", "registered", "clearance", "ce mark"]):
-        return "注册上市/产品发布"
-    if any(k in t for k in ["study", "clinical", "data", "evidence", "validation", "trial", "publication"]):
-        return "临床与科研证据"
-    if any(k in t for k in ["tender", "procurement", "reimbursement", "payment", "bid", "ccgp", "招标", "采购"]):
-        return "支付与招采"
+    for label, terms in EVENT_TYPE_FALLBACK_RULES:
+        if probe.contains_any(terms):
+            return label
     return "政策与市场动态"
 
 
@@ -749,6 +886,15 @@ def infer_source_group(src: dict) -> str:
     return "media_global"
 
 
+def event_scan_fields(title: str, summary: str, source_group: str, url: str) -> dict[str, str]:
+    return {
+        "title": str(title or ""),
+        "summary": str(summary or ""),
+        "source_group": str(source_group or ""),
+        "url": str(url or ""),
+    }
+
+
 class EventTypeClassifier:
     def __init__(self, mapping: dict | None = None) -> None:
         self.mapping = mapping or {}
@@ -759,35 +905,33 @@ class EventTypeClassifier:
         summary: str,
         source_group: str,
         url: str,
+        hits: KeywordHits | None = None,
     ) -> tuple[str, dict]:
-        fields = {
-            "title": str(title or ""),
-            "summary": str(summary or ""),
-            "source_group": str(source_group or ""),
-            "url": str(url or ""),
-        }
-        combined = (
-            fields["title"]
-            + " "
-            + fields["summary"]
-            + " "
-            + fields["source_group"]
-            + " "
-            + fields["url"]
-        ).lower()
+        """`hits`, when given, is a scan of event_scan_fields() for the same four values."""
+        fields = event_scan_fields(title, summary, source_group, url)
+        combined = ""
+        if hits is None:
+            combined = (
+                fields["title"]
+                + " "
+                + fields["summary"]
+                + " "
+                + fields["source_group"]
+                + " "
+                + fields["url"]
+            ).lower()
+        probe = _TermProbe(combined, hits)
 
         if isinstance(self.mapping, dict) and self.mapping:
-            for label, kws in self.mapping.items():
-                if not isinstance(kws, list):
+            for label, kws, raw in _keyword_table(self.mapping):
+                if not probe.has_any(kws):
                     continue
-                for kw in kws:
-                    k = str(kw).strip().lower()
-                    if not k:
-                        continue
-                    if has_term(combined, k):
+                for k, kw in zip(kws, raw):
+                    if probe.has(k):
                         matched_field = None
                         for fn in ("title", "summary", "source_group", "url"):
-                            if has_term(fields[fn].lower(), k):
+                            fp = _TermProbe(fields[fn].lower() if hits is None else "", hits, (fn,))
+                            if fp.has(k):
                                 matched_field = fn
                                 break
                         return str(label), {
@@ -798,7 +942,7 @@ class EventTypeClassifier:
                         }
 
         # Fallback: legacy heuristic for robustness.
-        et = detect_event_type(fields["title"] + " " + fields["summary"], fields["source_group"], fields["url"])
+        et = detect_event_type(fields["title"] + " " + fields["summary"], fields["source_group"], fields["url"], hits=hits)
         return str(et), {
             "matched": False,
             "matched_label": str(et),
@@ -874,14 +1018,11 @@ def score_ivd(text: str) -> int:
     return base + (level - 2)
 
 
-def is_ivd_relevant(text: str) -> bool:
-    t = text.lower()
-    keep_terms = [str(x).strip().lower() for x in RUNTIME_CONTENT.get("keep_if_has_keywords", []) if str(x).strip()]
-    for x in RUNTIME_CONTENT.get("exclude_keywords", []):
-        kw = str(x).strip().lower()
-        if kw and has_term(t, kw):
-            if keep_terms and any(has_term(t, k) for k in keep_terms):
-                break
+def is_ivd_relevant(text: str, hits: KeywordHits | None = None) -> bool:
+    probe = _TermProbe("" if hits is not None else text.lower(), hits)
+    keep_terms = _keyword_list(RUNTIME_CONTENT.get("keep_if_has_keywords", []))
+    if probe.has_any(_keyword_list(RUNTIME_CONTENT.get("exclude_keywords", []))):
+        if not (keep_terms and probe.has_any(keep_terms)):
             return False
     _track, level, explain = compute_relevance(text, {}, {})
     # preserve high recall while dropping pure noise
@@ -896,32 +1037,31 @@ def is_ivd_relevant(text: str) -> bool:
     return int(level) >= 1
 
 
-def exclusion_reason(text: str) -> dict[str, Any] | None:
+def exclusion_reason(text: str, hits: KeywordHits | None = None) -> dict[str, Any] | None:
     """
     If text is excluded by exclude_keywords (and not rescued by keep_if_has_keywords), return why.
     Used only for dry-run diagnostics (operator visibility).
     """
-    t = str(text or "").lower()
-    keep_terms = [str(x).strip().lower() for x in RUNTIME_CONTENT.get("keep_if_has_keywords", []) if str(x).strip()]
-    for x in RUNTIME_CONTENT.get("exclude_keywords", []):
-        kw = str(x).strip().lower()
-        if kw and has_term(t, kw):
-            rescued = bool(keep_terms and any(has_term(t, k) for k in keep_terms))
-            if rescued:
-                return {
-                    "excluded": False,
-                    "matched_exclude": kw,
-                    "rescued_by_keep_if": True,
-                }
+    probe = _TermProbe("" if hits is not None else str(text or "").lower(), hits)
+    keep_terms = _keyword_list(RUNTIME_CONTENT.get("keep_if_has_keywords", []))
+    kw = probe.first_has(_keyword_list(RUNTIME_CONTENT.get("exclude_keywords", [])))
+    if kw is not None:
+        rescued = bool(keep_terms and probe.has_any(keep_terms))
+        if rescued:
             return {
-                "excluded": True,
+                "excluded": False,
                 "matched_exclude": kw,
-                "rescued_by_keep_if": False,
+                "rescued_by_keep_if": True,
             }
+        return {
+            "excluded": True,
+            "matched_exclude": kw,
+            "rescued_by_keep_if": False,
+        }
     return None
 
 
-def matched_keyword_packs(text: str) -> list[str]:
+def matched_keyword_packs(text: str, hits: KeywordHits | None = None) -> list[str]:
     """
     Return pack ids whose keywords match the given text (case-insensitive).
     Used for dry-run operability stats (not for selection logic).
@@ -930,88 +1070,127 @@ def matched_keyword_packs(text: str) -> list[str]:
         packs = RUNTIME_CONTENT.get("include_keywords_by_pack", {})
         if not isinstance(packs, dict) or not packs:
             return []
-        t = str(text or "").lower()
-        hits: list[str] = []
-        for pid, kws in packs.items():
-            if not isinstance(kws, list):
-                continue
-            for kw in kws:
-                k = str(kw).strip().lower()
-                if k and has_term(t, k):
-                    hits.append(str(pid))
-                    break
-        return hits
+        probe = _TermProbe("" if hits is not None else str(text or "").lower(), hits)
+        return [pid for pid, kws, _raw in _keyword_table(packs) if probe.has_any(kws)]
     except Exception:
         return []
 
 
-def is_regulatory_ivd_relevant(text: str) -> bool:
+REGULATORY_IVD_KEEP_TERMS: tuple[str, ...] = (
+    "ivd",
+    "in vitro",
+    "diagnostic",
+    "assay",
+    "test",
+    "field safety",
+    "medical device",
+    "medtech",
+    "device",
+    "laboratory",
+    "pathology",
+    "glucose",
+    "cgm",
+    "monitor",
+    "sensor",
+)
+RELAXED_HARD_EXCLUDE_TERMS: tuple[str, ...] = (
+    "earnings",
+    "drug",
+    "therapy",
+    "vaccine",
+    "phase ",
+    "trial",
+    "glp-1",
+    "food",
+    "insurance",
+    "hospital staffing",
+)
+RELAXED_ANCHOR_TERMS: tuple[str, ...] = (
+    "diagnostic",
+    "diagnostics",
+    "assay",
+    "ivd",
+    "laboratory",
+    "pathology",
+    "immunoassay",
+    "pcr",
+    "sequencing",
+    "ngs",
+    "poct",
+    "test",
+    "testing",
+    "medical device",
+    "medtech",
+    "device",
+    "reagent",
+    "analyzer",
+)
+
+
+def is_regulatory_ivd_relevant(text: str, hits: KeywordHits | None = None) -> bool:
     """
     Regulatory feeds (FDA/TGA) are device-wide. Keep only diagnostics/IVD-adjacent
     items to avoid flooding the briefing with non-IVD devices.
     """
-    t = text.lower()
-    keep_terms = [
-        "ivd",
-        "in vitro",
-        "diagnostic",
-        "assay",
-        "test",
-        "field safety",
-        "medical device",
-        "medtech",
-        "device",
-        "laboratory",
-        "pathology",
-        "glucose",
-        "cgm",
-        "monitor",
-        "sensor",
-    ]
-    return any(has_term(t, k) for k in keep_terms)
+    probe = _TermProbe("" if hits is not None else text.lower(), hits)
+    return probe.has_any(REGULATORY_IVD_KEEP_TERMS)
 
 
-def is_relaxed_relevant(text: str) -> bool:
+def is_relaxed_relevant(text: str, hits: KeywordHits | None = None) -> bool:
     """
     Fallback when strict filtering yields too few items (<8). Keeps out the
     noisiest pharma-only content while allowing general IVD-adjacent updates.
     """
-    t = text.lower()
-    hard_exclude = [
-        "earnings",
-        "drug",
-        "therapy",
-        "vaccine",
-        "phase ",
-        "trial",
-        "glp-1",
-        "food",
-        "insurance",
-        "hospital staffing",
-    ]
-    if any(has_term(t, k) for k in hard_exclude):
+    probe = _TermProbe("" if hits is not None else text.lower(), hits)
+    if probe.has_any(RELAXED_HARD_EXCLUDE_TERMS):
         return False
-    anchors = [
-        "diagnostic",
-        "diagnostics",
-        "assay",
-        "ivd",
-        "laboratory",
-        "pathology",
-        "immunoassay",
-        "pcr",
-        "sequencing",
-        "ngs",
-        "poct",
-        "test",
-        "testing",
-        "medical device",
-        "medtech",
-        "device",
-        "reagent",
-        "analyzer",
-    ]
-    return any(has_term(t, a) for a in anchors)
+    return probe.has_any(RELAXED_ANCHOR_TERMS)
+
+
+def build_text_automaton(event_mapping: dict | None = None) -> KeywordAutomaton:
+    """
+    One KeywordAutomaton over every keyword the candidate taggers and filters test: the
+    runtime content mappings/packs, the event classifier mapping and the built-in tables.
+    Build it after RUNTIME_CONTENT is loaded; keywords added later still work (direct scan).
+    """
+    terms: list[str] = []
+
+    def _add(value: Any) -> None:
+        if isinstance(value, dict):
+            for v in value.values():
+                _add(v)
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                _add(v)
+        elif value is not None:
+            k = str(value).strip().lower()
+            if k:
+                terms.append(k)
+
+    for key in (
+        "lane_mapping",
+        "platform_mapping",
+        "event_mapping",
+        "include_keywords_by_pack",
+        "exclude_keywords",
+        "keep_if_has_keywords",
+    ):
+        _add(RUNTIME_CONTENT.get(key))
+    _add(event_mapping or {})
+    for _mode, _label, kws in CN_LANE_RULES:
+        terms.extend(kws)
+    for rules in (CN_PLATFORM_ZH_RULES, CN_PLATFORM_EN_RULES, EVENT_TYPE_FALLBACK_RULES):
+        for _label, kws in rules:
+            terms.extend(kws)
+    for kws in (
+        CN_PLATFORM_BUSINESS_TERMS,
+        CN_PLATFORM_IVD_TERMS,
+        REGULATORY_IVD_KEEP_TERMS,
+        RELAXED_HARD_EXCLUDE_TERMS,
+        RELAXED_ANCHOR_TERMS,
+    ):
+        terms.extend(kws)
+    return KeywordAutomaton(terms)
 
 
 def cn_summary(entry) -> str:
@@ -1040,10 +1219,7 @@ def append_event_specific_note(summary: str, event_type: str) -> str:
 
 
 def normalize_title(title: str) -> str:
-    t = title.lower()
-    t = re.sub(r"https?://\S+", " ", t)
-    t = re.sub(r"[^0-9a-z\u4e00-\u9fff]+", " ", t)
-    return re.sub(r"\s+", " ", t).strip()
+    return normalize_report_title(title)
 
 
 def title_tokens(title: str) -> set[str]:
@@ -1086,52 +1262,50 @@ def window_tag(published: dt.datetime, now_utc: dt.datetime) -> str:
     return "7天补充"
 
 
-def fetch_text(url: str, timeout: int = 15) -> str:
+_ACCEPT_HTML = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+_ACCEPT_FEED = "application/rss+xml,application/xml,text/xml;q=0.9,*/*;q=0.8"
+
+
+def _http_get(url: str, timeout: int, accept: str) -> tuple[bytes, int]:
+    """
+    GET used by the official-site collectors. Recorded into / replayed from the active
+    fetch snapshot session (see app.services.fetch_snapshot), like fetch_source_entries.
+    """
+    snap = active_snapshot_session()
+    if snap is not None and snap.replaying:
+        rec = snap.replay(url)
+        return bytes(rec.get("data") or b""), int(rec.get("http_status") or 0)
     req = Request(
         url,
         headers={
             "User-Agent": "Mozilla/5.0 (compatible; IVDMorningBot/1.0)",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept": accept,
         },
     )
     try:
         with urlopen(req, timeout=timeout) as r:
-            data = r.read()
-            return data.decode("utf-8", errors="ignore")
-    except (HTTPError, URLError, SocketTimeout, TimeoutError, RemoteDisconnected):
-        return ""
+            data, status = r.read(), int(getattr(r, "status", 200))
+    except HTTPError as e:
+        data, status = b"", int(getattr(e, "code", 0) or 0)
+    except (URLError, SocketTimeout, TimeoutError, RemoteDisconnected):
+        data, status = b"", 0
+    if snap is not None:
+        snap.record(url, {"ok": bool(data), "data": data, "http_status": status})
+    return data, status
+
+
+def fetch_text(url: str, timeout: int = 15) -> str:
+    data, _status = _http_get(url, timeout, _ACCEPT_HTML)
+    return data.decode("utf-8", errors="ignore")
 
 
 def fetch_bytes(url: str, timeout: int = 15) -> bytes:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (compatible; IVDMorningBot/1.0)",
-            "Accept": "application/rss+xml,application/xml,text/xml;q=0.9,*/*;q=0.8",
-        },
-    )
-    try:
-        with urlopen(req, timeout=timeout) as r:
-            return r.read()
-    except (HTTPError, URLError, SocketTimeout, TimeoutError, RemoteDisconnected):
-        return b""
+    data, _status = _http_get(url, timeout, _ACCEPT_FEED)
+    return data
 
 
 def fetch_bytes_with_status(url: str, timeout: int = 15) -> tuple[bytes, int]:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (compatible; IVDMorningBot/1.0)",
-            "Accept": "application/rss+xml,application/xml,text/xml;q=0.9,*/*;q=0.8",
-        },
-    )
-    try:
-        with urlopen(req, timeout=timeout) as r:
-            return r.read(), int(getattr(r, "status", 200))
-    except HTTPError as e:
-        return b"", int(getattr(e, "code", 0) or 0)
-    except (URLError, SocketTimeout, TimeoutError, RemoteDisconnected):
-        return b"", 0
+    return _http_get(url, timeout, _ACCEPT_FEED)
 
 
 def fetch_web_entries(url: str, timeout: int = 15) -> list[dict]:
@@ -1400,64 +1574,209 @@ def collect_pmda_updates(now_utc: dt.datetime, tz_name: str, *, enhanced: bool)
     return out
 
 
-def dedupe_items(items: list[Item]) -> list[Item]:
+def _source_fetch_obj(source_id: str, connector: str, src_name: str, url: str, kind: str, fetch_cfg: dict | None) -> dict[str, Any]:
+    return {
+        "id": source_id,
+        "name": src_name,
+        "fetcher": "html" if connector == "web" else connector,
+        "connector": "html" if connector == "web" else connector,
+        "url": url,
+        "tags": ["regulatory"] if kind == "regulatory" else ["media"],
+        "fetch": fetch_cfg or {},
+    }
+
+
+def _failed_fetch_out(source_id: str, error_type: str, message: str) -> dict[str, Any]:
+    return {
+        "source_id": source_id,
+        "ok": False,
+        "status": "fail",
+        "entries": [],
+        "http_status": 0,
+        "error_type": error_type,
+        "error_message": message,
+    }
+
+
+def fetch_stage_settings() -> dict[str, Any]:
+    """Concurrency limits for the prefetch stage (env-tunable; deadline 0 = none)."""
+    return {
+        "max_workers": max(1, int(env("DRYRUN_FETCH_WORKERS", str(DEFAULT_MAX_WORKERS)) or DEFAULT_MAX_WORKERS)),
+        "per_host": max(1, int(env("DRYRUN_FETCH_PER_HOST", str(DEFAULT_PER_HOST)) or DEFAULT_PER_HOST)),
+        "deadline_seconds": max(0.0, float(env("DRYRUN_FETCH_DEADLINE_SECONDS", "0") or 0)),
+    }
+
+
+def prefetch_sources(
+    norm_sources: list[tuple],
+    *,
+    official: list[tuple[str, str, Callable[[], list[Item]]]],
+    limit: int,
+    timeout_seconds: int,
+    retries: int,
+    settings: dict[str, Any],
+) -> tuple[list[dict[str, Any]], list[list[Item]], dict[str, Any]]:
+    """
+    Concurrent fetch stage ahead of classification: the official-site collectors
+    (`official`: key, url, collect fn) and every registry source run on one FetchExecutor
+    with global/per-host limits and a whole-stage deadline. Results come back in input
+    order so the classification loop stays deterministic; completed_sources is reported
+    through _write_progress as fetches finish.
+    """
+    total_sources = len(norm_sources)
+    official_keys = {key for key, _url, _fn in official}
+    jobs = [FetchJob(key=key, host=host_of(url), run=fn) for key, url, fn in official]
+    for source_id, connector, src_name, url, _region, kind, _pri, _group, fetch_cfg in norm_sources:
+        source_obj = _source_fetch_obj(source_id, connector, src_name, url, kind, fetch_cfg)
+        jobs.append(
+            FetchJob(
+                key=str(source_id),
+                host=host_of(url),
+                run=lambda source_obj=source_obj: fetch_source_entries(
+                    source_obj, limit=limit, timeout_seconds=timeout_seconds, retries=retries
+                ),
+            )
+        )
+    done_sources = 0
+
+    def _on_progress(ev: dict[str, Any]) -> None:
+        nonlocal done_sources
+        if ev.get("key") in official_keys:
+            return
+        done_sources += 1
+        _write_progress(
+            "fetching_sources",
+            total_sources=total_sources,
+            completed_sources=done_sources,
+            message=f"抓取中：{ev.get('key')}",
+        )
+
+    def _on_error(job: FetchJob, e: BaseException) -> Any:
+        if job.key in official_keys:
+            return []
+        return _failed_fetch_out(job.key, type(e).__name__, str(e))
+
+    def _on_skip(job: FetchJob, reason: str) -> Any:
+        if job.key in official_keys:
+            return []
+        return _failed_fetch_out(job.key, reason, "fetch stage deadline exceeded")
+
+    executor = FetchExecutor(
+        max_workers=int(settings.get("max_workers", DEFAULT_MAX_WORKERS)),
+        per_host=int(settings.get("per_host", DEFAULT_PER_HOST)),
+        deadline_seconds=float(settings.get("deadline_seconds", 0) or 0),
+        on_progress=_on_progress,
+        name="ivd-fetch",
+    )
+    t0 = time.monotonic()
+    results = executor.map(jobs, on_error=_on_error, on_skip=_on_skip)
+    n_official = len(official)
+    fetched = list(results[n_official:])
+    stage = {
+        "max_workers": executor.max_workers,
+        "per_host": executor.per_host,
+        "deadline_seconds": executor.deadline_seconds,
+        "deadline_hit": executor.deadline_hit,
+        "sources": total_sources,
+        "official_collectors": n_official,
+        "skipped_by_deadline": sum(1 for r in fetched if r.get("error_type") == DEADLINE_EXCEEDED),
+        "elapsed_ms": int((time.monotonic() - t0) * 1000),
+    }
+    return fetched, [list(r or []) for r in results[:n_official]], stage
+
+
+def dedupe_items(items: list[Item], stats: dict[str, Any] | None = None) -> list[Item]:
     """
     Keep the best source for the same event title.
+
+    Near-duplicates are looked up through an inverted token index (token -> kept keys), so a
+    title is only scored against kept titles that share a token and whose token-set sizes
+    allow a Jaccard of at least `title_similarity_threshold`. Candidates are tried in the
+    order they were first kept, which matches the previous linear scan. `stats`, when given,
+    receives comparison counters.
     """
     best: dict[str, Item] = {}
     sim_th = float(RUNTIME_CONTENT.get("title_similarity_threshold", 0.78))
+    order: dict[str, int] = {}
+    key_tokens: dict[str, set[str]] = {}
+    index: dict[str, set[str]] = {}
+    comparisons = 0
+    pruned = 0
+
+    def _index(key: str, toks: set[str]) -> None:
+        for t in key_tokens.get(key, set()):
+            index[t].discard(key)
+        key_tokens[key] = toks
+        for t in toks:
+            index.setdefault(t, set()).add(key)
+
     for it in items:
         key = normalize_title(it.title)
         if not key:
             continue
+        toks = title_tokens(it.title)
         old_key = key
         old = best.get(old_key)
         if not old:
-            for k, v in best.items():
-                if title_similarity(it.title, v.title) >= sim_th:
-                    old_key = k
-                    old = v
-                    break
+            if sim_th <= 0:
+                # Every kept title matches a non-positive threshold; the first one wins.
+                old_key = next(iter(best), key)
+                old = best.get(old_key)
+            elif toks:
+                shared: dict[str, int] = {}
+                for t in toks:
+                    for k in index.get(t, ()):
+                        shared[k] = shared.get(k, 0) + 1
+                n = len(toks)
+                for k in sorted(shared, key=order.__getitem__):
+                    m = len(key_tokens[k])
+                    if min(n, m) / max(n, m) < sim_th:
+                        pruned += 1
+                        continue
+                    comparisons += 1
+                    inter = shared[k]
+                    if inter / (n + m - inter) >= sim_th:
+                        old_key = k
+                        old = best[k]
+                        break
         if not old:
             best[old_key] = it
+            order[old_key] = len(order)
+            _index(old_key, toks)
             continue
         old_rank = source_rank(old.source, old.link)
         new_rank = source_rank(it.source, it.link)
-        if new_rank < old_rank:
-            best[old_key] = it
-            continue
-        if new_rank == old_rank and len(it.summary_cn) > len(old.summary_cn):
+        if new_rank < old_rank or (new_rank == old_rank and len(it.summary_cn) > len(old.summary_cn)):
             best[old_key] = it
+            _index(old_key, toks)
+    if stats is not None:
+        n_items = len(items)
+        stats.update(
+            {
+                "items_in": n_items,
+                "items_out": len(best),
+                "comparisons": comparisons,
+                "comparisons_per_item": round(comparisons / n_items, 3) if n_items else 0.0,
+                "pruned_by_size": pruned,
+            }
+        )
     return list(best.values())
 
 
 def parse_titles_from_report(path: Path) -> set[str]:
-    out: set[str] = set()
     try:
         txt = path.read_text(encoding="utf-8")
     except Exception:
-        return out
-    for ln in txt.splitlines():
-        m = re.match(r"^\d+\)\s+\[[^\]]+\]\s+(.+)$", ln.strip())
-        if m:
-            out.add(normalize_title(m.group(1)))
-    return out
+        return set()
+    return report_title_keys(txt)
 
 
 def load_history_titles(reports_dir: Path, today: str) -> tuple[set[str], dict[str, set[str]]]:
-    files = sorted(reports_dir.glob("ivd_morning_*.txt"))
-    by_day: dict[str, set[str]] = {}
-    for p in files:
-        m = re.search(r"ivd_morning_(\d{4}-\d{2}-\d{2})\.txt$", p.name)
-        if not m:
-            continue
-        ds = m.group(1)
-        if ds >= today:
-            continue
-        by_day[ds] = parse_titles_from_report(p)
-    days = sorted(by_day.keys(), reverse=True)[:7]
-    recent = {d: by_day[d] for d in days}
-    yday = recent[days[0]] if days else set()
+    # Last 7 report days before `today`, answered from the per-day title index
+    # (reports/.history_index) rather than re-parsing every report on disk.
+    index = ReportHistoryIndex(reports_dir)
+    recent = {d: set(index.keys(d, "titles")) for d in index.recent_days(today, 7)}
+    yday = next(iter(recent.values()), set())
     return yday, recent
 
 
@@ -1739,7 +2058,9 @@ def _split_for_output_contract(items: list[Item], routing: dict[str, dict[str, A
 
 def main(dump_relevance_samples: int = 0) -> int:
     tz_name = env("REPORT_TZ", "Asia/Shanghai")
-    forced_date = env("REPORT_DATE", "")
+    # Offline replay of a recorded fetch snapshot: no network I/O, date pinned to the recorded run.
+    replay_run_id = env("FETCH_SNAPSHOT_REPLAY", "")
+    forced_date = env("REPORT_DATE", "") or (snapshot_report_date(ROOT_DIR, replay_run_id) if replay_run_id else "")
     if forced_date:
         # Replay mode: keep deterministic date header while preserving legacy default path.
         now_local = dt.datetime.strptime(forced_date, "%Y-%m-%d").replace(
@@ -1753,6 +2074,39 @@ def main(dump_relevance_samples: int = 0) -> int:
     reports_dir = root_dir / "reports"
 
     run_id = env("REPORT_RUN_ID", "") or f"run-{uuid.uuid4().hex[:10]}"
+    if replay_run_id:
+        fetch_snapshot = start_snapshot_session(root_dir, replay_run_id, MODE_REPLAY)
+    elif snapshots_enabled():
+        fetch_snapshot = start_snapshot_session(root_dir, run_id, MODE_RECORD, report_date=date_str)
+    else:
+        fetch_snapshot = None
+    # The session is scoped to this run: a failed run must not leave it installed for the process.
+    try:
+        return _generate_report(
+            tz_name=tz_name,
+            now_utc=now_utc,
+            date_str=date_str,
+            root_dir=root_dir,
+            reports_dir=reports_dir,
+            run_id=run_id,
+            dump_relevance_samples=dump_relevance_samples,
+        )
+    finally:
+        if fetch_snapshot is not None:
+            snap_summary = end_snapshot_session(fetch_snapshot)
+            print(f"[FETCH_SNAPSHOT] {json.dumps(snap_summary, ensure_ascii=False, sort_keys=True)}", file=sys.stderr)
+
+
+def _generate_report(
+    *,
+    tz_name: str,
+    now_utc: dt.datetime,
+    date_str: str,
+    root_dir: Path,
+    reports_dir: Path,
+    run_id: str,
+    dump_relevance_samples: int,
+) -> int:
     runtime_rules = load_runtime_rules(date_str=date_str, run_id=run_id)
     routing_rules = (
         runtime_rules.get("track_routing", {})
@@ -1783,6 +2137,8 @@ def main(dump_relevance_samples: int = 0) -> int:
             rth.get("frontier_min_level_for_F", routing_rules["F"].get("min_relevance_level", 2)) or 2
         )
     event_classifier = build_event_classifier(runtime_rules)
+    # Every candidate text is scanned once; the filters/taggers below read from that scan.
+    text_automaton = build_text_automaton(event_classifier.mapping)
     platform_explain_rows: list[dict] = []
     lane_explain_rows: list[dict] = []
     event_mapping_source = "content_rules"
@@ -1975,9 +2331,20 @@ def main(dump_relevance_samples: int = 0) -> int:
     lite_max_sources = max(1, int(env("DRYRUN_LITE_MAX_SOURCES", "24") or "24"))
     # China/APAC official top-ups can be slower; in lite preview mode we skip to keep UI responsive.
     skip_official = env("DRYRUN_LITE_SKIP_OFFICIAL", "").lower() in {"1", "true", "yes", "on"}
+    official_collectors: list[tuple[str, str, Callable[[], list[Item]]]] = []
     if not (lite_mode and skip_official):
-        items.extend(collect_nmpa_site_updates(now_utc, tz_name, enhanced=bool(use_enhanced)))
-        items.extend(collect_pmda_updates(now_utc, tz_name, enhanced=bool(use_enhanced)))
+        official_collectors = [
+            (
+                "official:nmpa_site",
+                "https://www.nmpa.gov.cn/",
+                lambda: collect_nmpa_site_updates(now_utc, tz_name, enhanced=bool(use_enhanced)),
+            ),
+            (
+                "official:pmda",
+                "https://www.pmda.go.jp/english/index.html",
+                lambda: collect_pmda_updates(now_utc, tz_name, enhanced=bool(use_enhanced)),
+            ),
+        ]
 
     # Normalize legacy tuples (7/8 fields) into new form (9 fields).
     norm_sources = []
@@ -2003,10 +2370,25 @@ def main(dump_relevance_samples: int = 0) -> int:
         completed_sources=completed_sources,
         message="开始抓取信源",
     )
+    fetched_sources, official_items, fetch_stage = prefetch_sources(
+        norm_sources,
+        official=official_collectors,
+        limit=fetch_limit,
+        timeout_seconds=fetch_timeout,
+        retries=fetch_retries,
+        settings=fetch_stage_settings(),
+    )
+    for batch in official_items:
+        items.extend(batch)
+    completed_sources = total_sources
+    classified_sources = 0
 
     event_explain_rows: list[dict] = []
 
-    for source_id, connector, src_name, url, default_region, kind, source_priority, source_group, fetch_cfg in norm_sources:
+    for (
+        (source_id, connector, src_name, url, default_region, kind, source_priority, source_group, fetch_cfg),
+        fetch_out,
+    ) in zip(norm_sources, fetched_sources):
         stat = source_stats.setdefault(
             source_id,
             {
@@ -2026,22 +2408,7 @@ def main(dump_relevance_samples: int = 0) -> int:
         )
         stat["fetch_count"] += 1
         entries: list[dict] = []
-        source_obj = {
-            "id": source_id,
-            "name": src_name,
-            "fetcher": "html" if connector == "web" else connector,
-            "connector": "html" if connector == "web" else connector,
-            "url": url,
-            "tags": ["regulatory"] if kind == "regulatory" else ["media"],
-            "fetch": fetch_cfg or {},
-        }
         try:
-            fetch_out = fetch_source_entries(
-                source_obj,
-                limit=fetch_limit,
-                timeout_seconds=fetch_timeout,
-                retries=fetch_retries,
-            )
             http_status = int(fetch_out.get("http_status") or 0)
             st_status = str(fetch_out.get("status", "")).strip().lower()
             if st_status in {"skip", "skipped"}:
@@ -2079,23 +2446,24 @@ def main(dump_relevance_samples: int = 0) -> int:
                     continue
                 fallback_ok = False
                 combined = title + " " + row["summary"]
-                exr = exclusion_reason(combined)
+                combined_hits = text_automaton.scan({"title": title, "summary": row["summary"]})
+                exr = exclusion_reason(combined, hits=combined_hits)
                 if exr and exr.get("rescued_by_keep_if"):
                     exclude_diag["rescued_count"] = int(exclude_diag.get("rescued_count", 0)) + 1
 
             # Operability stats: keyword pack hit distribution (dry-run panel).
             keyword_pack_stats["candidates_checked"] += 1
-            packs_hit = matched_keyword_packs(combined)
+            packs_hit = matched_keyword_packs(combined, hits=combined_hits)
             if packs_hit:
                 keyword_pack_stats["matched_any"] += 1
                 for pid in packs_hit:
                     p = keyword_pack_stats["packs"].setdefault(pid, {"matched": 0, "kept": 0})
                     p["matched"] += 1
                 if kind == "regulatory":
-                    if not is_regulatory_ivd_relevant(combined):
+                    if not is_regulatory_ivd_relevant(combined, hits=combined_hits):
                         continue
                 else:
-                    if not is_ivd_relevant(combined):
+                    if not is_ivd_relevant(combined, hits=combined_hits):
                         if exr and exr.get("excluded"):
                             k = str(exr.get("matched_exclude", "unknown"))
                             byk = exclude_diag.setdefault("excluded_by_keyword", {})
@@ -2112,7 +2480,7 @@ def main(dump_relevance_samples: int = 0) -> int:
                                     }
                                 )
                         # keep as a fallback candidate if it's not obviously pharma-only
-                        if not is_relaxed_relevant(combined):
+                        if not is_relaxed_relevant(combined, hits=combined_hits):
                             continue
                         fallback_ok = True
                     else:
@@ -2131,8 +2499,15 @@ def main(dump_relevance_samples: int = 0) -> int:
                 wt = window_tag(pub, now_utc)
                 region = cn_region(src_name, link) or default_region
                 summary = cn_summary(row["entry"]) if row["entry"] is not None else "摘要：该条来自网页源抓取。"
-                event_type, et_explain = event_classifier.classify(title, summary, source_group, link)
-                summary = append_event_specific_note(summary, event_type)
+                # A different text from `combined` (cn_summary, source group, URL), so it gets its own scan.
+                event_hits = text_automaton.scan(event_scan_fields(title, summary, source_group, link))
+                event_type, et_explain = event_classifier.classify(title, summary, source_group, link, hits=event_hits)
+                noted = append_event_specific_note(summary, event_type)
+                # Enhanced lane/platform read title+summary: reuse the event scan unless a note was appended.
+                tagging_hits = event_hits
+                if use_enhanced and noted != summary:
+                    tagging_hits = text_automaton.scan({"title": title, "summary": noted})
+                summary = noted
                 if use_enhanced:
                     lane, lane_explain = classify_lane(
                         title,
@@ -2141,9 +2516,10 @@ def main(dump_relevance_samples: int = 0) -> int:
                         link,
                         event_type,
                         enhanced=True,
+                        text_hits=tagging_hits,
                     )
                 else:
-                    lane = cn_lane(combined)
+                    lane = cn_lane(combined, hits=combined_hits)
                     lane_explain = {"reason": "legacy_cn_lane"}
                 lane_explain_rows.append(
                     {
@@ -2164,9 +2540,10 @@ def main(dump_relevance_samples: int = 0) -> int:
                         link,
                         event_type,
                         enhanced=True,
+                        text_hits=tagging_hits,
                     )
                 else:
-                    platform = cn_platform(combined)
+                    platform = cn_platform(combined, hits=combined_hits)
                     plat_explain = {"reason": "legacy_cn_platform"}
                 platform = normalize_platform_label(platform, event_type, enhanced=bool(use_enhanced))
                 track, relevance_level, relevance_explain = compute_relevance(
@@ -2252,12 +2629,13 @@ def main(dump_relevance_samples: int = 0) -> int:
                     items.append(it)
                 seen_links.add(link)
         finally:
-            completed_sources += 1
+            classified_sources += 1
             _write_progress(
-                "fetching_sources",
+                "classifying_sources",
                 total_sources=total_sources,
                 completed_sources=completed_sources,
-                message=f"抓取中：{src_name}",
+                classified_sources=classified_sources,
+                message=f"分类中：{src_name}",
             )
 
     # Pull a small number of relaxed items to improve international/source diversity.
@@ -2290,6 +2668,7 @@ def main(dump_relevance_samples: int = 0) -> int:
     items_before_cluster_count = len(items)
     items_after_cluster_count = len(items)
     cluster_explain = {"enabled": False, "clusters": []}
+    title_dedupe_stats: dict[str, Any] = {}
 
     _write_progress(
         "scoring",
@@ -2380,7 +2759,7 @@ def main(dump_relevance_samples: int = 0) -> int:
                 }
             )
     else:
-        items = dedupe_items(items)
+        items = dedupe_items(items, stats=title_dedupe_stats)
         items.sort(key=lambda x: x.published, reverse=True)
         items_before_cluster_count = len(items)
         cluster_explain = {"enabled": False, "clusters": []}
@@ -2916,6 +3295,7 @@ def main(dump_relevance_samples: int = 0) -> int:
             "items_after_count": items_after_cluster_count,
             "top_clusters": top_clusters,
             "explain": cluster_explain,
+            "title_dedupe": title_dedupe_stats,
         }
         (p / "cluster_explain.json").write_text(
             json.dumps(cluster_explain_out, ensure_ascii=False, indent=2, default=str),
@@ -3039,6 +3419,7 @@ def main(dump_relevance_samples: int = 0) -> int:
                         "items_after_count": items_after_cluster_count,
                         "top_clusters_count": len(top_clusters),
                     },
+                    "fetch_stage": fetch_stage,
                 },
                 ensure_ascii=False,
                 indent=2,
@@ -3054,7 +3435,6 @@ def main(dump_relevance_samples: int = 0) -> int:
         status="completed",
         report_items_count=len(report_items),
     )
-
     return 0
 
 
@@ -3067,4 +3447,9 @@ if __name__ == "__main__":
                 dump_n = int(args[idx + 1])
             except Exception:
                 dump_n = 5
+        if a == "--from-snapshot":
+            if idx + 1 >= len(args) or not args[idx + 1].strip():
+                print("--from-snapshot requires a run_id", file=sys.stderr)
+                raise SystemExit(2)
+            os.environ["FETCH_SNAPSHOT_REPLAY"] = args[idx + 1].strip()
     raise SystemExit(main(dump_relevance_samples=max(0, dump_n)))
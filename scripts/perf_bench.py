@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for hot paths (rules decision, registry, policy, stores).
+
+Usage:
+  python3 scripts/perf_bench.py --list
+  python3 scripts/perf_bench.py rules-decision --iterations 50
+  python3 scripts/perf_bench.py opportunity-signals --size 5000
+  python3 scripts/perf_bench.py title-dedupe --size 1500
+  python3 scripts/perf_bench.py text-features --size 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def _timings(fn: Callable[[], Any], iterations: int) -> dict[str, Any]:
+    samples: list[float] = []
+    for _ in range(max(1, iterations)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    ordered = sorted(samples)
+    return {
+        "iterations": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "total_ms": round(sum(samples), 3),
+    }
+
+
+def bench_rules_decision(args: argparse.Namespace) -> dict[str, Any]:
+    from app.rules.decision_cache import decision_cache_stats, invalidate_decision_cache
+    from app.rules.engine import RuleEngine
+
+    engine = RuleEngine(project_root=ROOT_DIR)
+    profile = str(args.profile)
+    invalidate_decision_cache()
+    uncached = _timings(lambda: engine._build_decision_uncached(profile), args.iterations)
+    invalidate_decision_cache()
+    cold = _timings(lambda: engine.build_decision(profile), 1)
+    warm = _timings(lambda: engine.build_decision(profile), args.iterations)
+    return {
+        "bench": "rules-decision",
+        "profile": profile,
+        "uncached": uncached,
+        "cached_cold": cold,
+        "cached_warm": warm,
+        "speedup_x": round(uncached["mean_ms"] / max(warm["mean_ms"], 1e-6), 2),
+        "cache": decision_cache_stats(),
+    }
+
+
+def _synthetic_urls(n: int) -> list[str]:
+    hosts = ["www.fda.gov", "news.example.com", "www.nmpa.gov.cn", "ivd.example.co.uk", "journals.example.org"]
+    out: list[str] = []
+    for i in range(n):
+        host = hosts[i % len(hosts)]
+        out.append(f"https://{host}/news/2026/item-{i}/?id={i}&utm_source=rss")
+    return out
+
+
+def bench_url_parse(args: argparse.Namespace) -> dict[str, Any]:
+    """
+    Replays the per-item URL call sites of collect + digest on a synthetic digest.
+    `per_call` re-parses at every call site (pre-ParsedUrl behaviour); `shared` parses once per item.
+    """
+    import cProfile
+    import importlib
+    import pstats
+    from contextlib import contextmanager
+
+    import app.services.classification_maps as classification_maps
+    import app.services.collect_asset_store as collect_asset_store
+    import app.services.opportunity_store as opportunity_store
+    import app.services.page_classifier as page_classifier
+    from app.services.analysis_cache_store import AnalysisCacheStore
+    from app.services.source_policy import exclusion_reason, normalize_source_policy
+
+    # app.utils re-exports the url_norm function under the submodule's name.
+    url_norm_mod = importlib.import_module("app.utils.url_norm")
+    n = int(args.size or 10000)
+    urls = _synthetic_urls(n)
+    policy = normalize_source_policy({"exclude_domains": ["blocked.example.com"]}, profile="enhanced")
+    region_maps = classification_maps.load_region_matcher(ROOT_DIR)
+
+    def _pipeline(as_item: Callable[[str], Any]) -> None:
+        for u in urls:
+            pu = as_item(u)
+            # collect: append_items
+            page_classifier.is_static_or_listing_url(pu)
+            exclusion_reason("src", pu, policy)
+            url_norm_mod.url_norm(pu)
+            # digest: filter_rows_for_digest + guard + maps + signal + cache key + dedupe
+            exclusion_reason("src", pu, policy)
+            page_classifier.is_static_or_listing_url(pu)
+            classification_maps.classify_region(pu, region_maps)
+            opportunity_store.normalize_event_type("", text="", url=pu)
+            url_norm_mod.url_norm(pu)
+            AnalysisCacheStore.item_key({"url": u}, parsed_url=pu if isinstance(pu, url_norm_mod.ParsedUrl) else None)
+            url_norm_mod.url_norm(pu)
+
+    @contextmanager
+    def _unmemoized():
+        raw = url_norm_mod.parse_url.__wrapped__
+        mods = (url_norm_mod, page_classifier, collect_asset_store, opportunity_store)
+        saved = [(m, m.parse_url) for m in mods]
+        try:
+            for m in mods:
+                m.parse_url = raw
+            yield
+        finally:
+            for m, fn in saved:
+                m.parse_url = fn
+
+    def _profiled(fn: Callable[[], None]) -> dict[str, Any]:
+        prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        prof.enable()
+        fn()
+        prof.disable()
+        wall = (time.perf_counter() - t0) * 1000.0
+        calls = 0
+        tottime = 0.0
+        for (filename, _line, func), stat in pstats.Stats(prof).stats.items():  # type: ignore[attr-defined]
+            # urlsplit is lru-cached inside the stdlib; urlparse (+ its cumulative time) is what call sites pay.
+            if func == "urlparse" and filename.endswith("parse.py"):
+                calls += int(stat[1])
+                tottime += float(stat[3])
+        return {"wall_ms_profiled": round(wall, 3), "urlparse_calls": calls, "urlparse_cum_ms": round(tottime * 1000.0, 3)}
+
+    with _unmemoized():
+        per_call = _profiled(lambda: _pipeline(lambda u: u))
+    url_norm_mod.parse_url.cache_clear()
+    shared = _profiled(lambda: _pipeline(url_norm_mod.parse_url))
+    return {
+        "bench": "url-parse",
+        "items": n,
+        "per_call": per_call,
+        "shared": shared,
+        "urlparse_calls_removed": per_call["urlparse_calls"] - shared["urlparse_calls"],
+        "urlparse_ms_removed": round(per_call["urlparse_cum_ms"] - shared["urlparse_cum_ms"], 3),
+        "parse_cache": url_norm_mod.parse_url_cache_info(),
+    }
+
+
+def bench_source_policy(args: argparse.Namespace) -> dict[str, Any]:
+    """
+    Throughput of source-policy checks over a synthetic digest (default 50k rows).
+    `per_item` replays the old exclusion_reason (set rebuild + linear domain scan + re.search per pattern);
+    `compiled` uses the SourcePolicy returned by normalize_source_policy.
+    """
+    import logging
+    import re
+
+    from app.services.source_policy import filter_rows_for_digest, host_from_url, normalize_source_policy
+    from app.utils.url_norm import parse_url
+
+    n = int(args.size or 50000)
+    urls = _synthetic_urls(n)
+    rows = [{"source_id": f"src-{i % 40}", "url": u, "trust_tier": "A"} for i, u in enumerate(urls)]
+    raw_policy = {
+        "exclude_domains": [f"blocked{i}.example.net" for i in range(20)] + ["ivd.example.co.uk"],
+        "exclude_source_ids": [f"src-{i}" for i in range(30, 40)],
+        "drop_if_url_matches": [r"/sponsored/", r"utm_campaign=promo", r"/tag/[a-z]+$", r"[unclosed"] + [f"/ads{i}/" for i in range(6)],
+    }
+    logging.getLogger("source_policy").setLevel(logging.ERROR)
+    policy = normalize_source_policy(raw_policy, profile="enhanced")
+
+    def _legacy_reason(source_id: str, url: Any) -> str:
+        sid = str(source_id or "").strip()
+        if sid and sid in set(policy["exclude_source_ids"]):
+            return "excluded_source"
+        host = host_from_url(url)
+        for d in policy["exclude_domains"]:
+            if host and (host == d or host.endswith("." + d)):
+                return "excluded_domain"
+        for ptn in policy["drop_if_url_matches"]:
+            try:
+                if re.search(ptn, url.raw, flags=re.IGNORECASE):
+                    return "excluded_url_pattern"
+            except Exception:
+                continue
+        return ""
+
+    # URLs are parsed up front (as append_items does) so the timings isolate the policy checks.
+    parsed = [(r["source_id"], parse_url(r["url"])) for r in rows]
+    legacy_reasons: dict[str, int] = {}
+    compiled_reasons: dict[str, int] = {}
+
+    def _run(reason_fn: Callable[[str, Any], str], out: dict[str, int]) -> None:
+        out.clear()
+        for sid, pu in parsed:
+            rs = reason_fn(sid, pu)
+            if rs:
+                out[rs] = out.get(rs, 0) + 1
+
+    per_item = _timings(lambda: _run(_legacy_reason, legacy_reasons), args.iterations)
+    compiled = _timings(lambda: _run(policy.exclusion_reason, compiled_reasons), args.iterations)
+    digest = _timings(lambda: filter_rows_for_digest(rows, policy=policy), args.iterations)
+    return {
+        "bench": "source-policy",
+        "rows": n,
+        "per_item": per_item,
+        "compiled": compiled,
+        "filter_rows_for_digest_end_to_end": digest,
+        "per_item_rows_per_s": round(n / max(per_item["mean_ms"], 1e-6) * 1000.0),
+        "compiled_rows_per_s": round(n / max(compiled["mean_ms"], 1e-6) * 1000.0),
+        "speedup_x": round(per_item["mean_ms"] / max(compiled["mean_ms"], 1e-6), 2),
+        "same_reasons": legacy_reasons == compiled_reasons,
+        "reasons": compiled_reasons,
+        "invalid_patterns": list(policy.invalid_url_patterns),
+    }
+
+
+def bench_opportunity_signals(args: argparse.Namespace) -> dict[str, Any]:
+    """
+    Opportunity signal writes for one digest (default 5k signals, ~10% duplicates, a few probes):
+    `per_signal` calls append_signal() per item (one open/append/close each);
+    `batch` calls append_signals_batch() once. Each iteration starts from an empty store.
+    """
+    import shutil
+    import tempfile
+
+    from app.services.opportunity_store import OpportunityStore
+
+    n = int(args.size or 5000)
+    regions = ["中国", "北美", "欧洲", "亚太", ""]
+    lanes = ["肿瘤检测", "感染检测", "生殖与遗传检测", "其他"]
+    signals: list[dict[str, Any]] = []
+    for i in range(n):
+        j = i if i % 10 else max(0, i - 7)  # every 10th signal repeats an earlier one
+        signals.append(
+            {
+                "date": "2026-02-20",
+                "region": "__window_probe__" if i % 997 == 0 else regions[j % len(regions)],
+                "lane": lanes[j % len(lanes)],
+                "event_type": "regulatory" if j % 3 else "procurement",
+                "weight": 4,
+                "source_id": f"src-{j % 40}",
+                "url_norm": f"example{j % 50}.com/news/{j}",
+            }
+        )
+    tmp = Path(tempfile.mkdtemp(prefix="bench-opp-"))
+    results: dict[str, dict[str, int]] = {}
+
+    def _store(tag: str) -> OpportunityStore:
+        d = tmp / tag
+        shutil.rmtree(d, ignore_errors=True)
+        return OpportunityStore(d, asset_dir="opp")
+
+    def _per_signal() -> None:
+        store = _store("per_signal")
+        out = {"written": 0, "deduped": 0, "dropped_probe": 0}
+        for sig in signals:
+            for k, v in store.append_signal(sig).items():
+                out[k] += int(v)
+        results["per_signal"] = out
+
+    def _batch() -> None:
+        results["batch"] = _store("batch").append_signals_batch(signals)
+
+    try:
+        per_signal = _timings(_per_signal, args.iterations)
+        batch = _timings(_batch, args.iterations)
+        rows = {
+            tag: sum(len(p.read_text(encoding="utf-8").splitlines()) for p in (tmp / tag / "opp").glob("*.jsonl"))
+            for tag in ("per_signal", "batch")
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {
+        "bench": "opportunity-signals",
+        "signals": n,
+        "per_signal": per_signal,
+        "batch": batch,
+        "speedup_x": round(per_signal["mean_ms"] / max(batch["mean_ms"], 1e-6), 2),
+        "same_counters": results.get("per_signal") == results.get("batch"),
+        "counters": results.get("batch", {}),
+        "rows_written": rows,
+    }
+
+
+def bench_title_dedupe(args: argparse.Namespace) -> dict[str, Any]:
+    """
+    generate_ivd_report.dedupe_items over synthetic registry-sized candidates (default 1.5k,
+    ~20% near-duplicate rewrites): `linear` is the old scan of every kept title,
+    `indexed` is the inverted-token-index version. Both must keep the same items.
+    """
+    import datetime as dt
+    import random
+
+    from scripts.generate_ivd_report import Item, RUNTIME_CONTENT, dedupe_items, normalize_title, source_rank, title_similarity
+
+    n = int(args.size or 1500)
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(4000)]
+    sources = [("Reuters", "https://reuters.com/a"), ("NMPA", "https://nmpa.gov.cn/a"), ("Blog", "https://blog.example/a")]
+    titles: list[str] = []
+    items: list[Any] = []
+    for i in range(n):
+        if titles and rng.random() < 0.2:
+            words = rng.choice(titles).split(" ")
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+            title = " ".join(words + ["update"])
+        else:
+            title = " ".join(rng.sample(vocab, rng.randint(6, 12)))
+        titles.append(title)
+        src = rng.choice(sources)
+        items.append(
+            Item(
+                title=title,
+                link=src[1],
+                published=dt.datetime(2026, 2, 20, tzinfo=dt.timezone.utc),
+                source=src[0],
+                region="",
+                lane="",
+                platform="",
+                event_type="",
+                window_tag="24小时内",
+                summary_cn="s" * rng.randint(1, 40),
+            )
+        )
+    sim_th = float(RUNTIME_CONTENT.get("title_similarity_threshold", 0.78))
+
+    def _linear() -> list[Any]:
+        best: dict[str, Any] = {}
+        for it in items:
+            key = normalize_title(it.title)
+            old_key, old = key, best.get(key)
+            if not old:
+                for k, v in best.items():
+                    if title_similarity(it.title, v.title) >= sim_th:
+                        old_key, old = k, v
+                        break
+            if not old:
+                best[old_key] = it
+                continue
+            o, r = source_rank(old.source, old.link), source_rank(it.source, it.link)
+            if r < o or (r == o and len(it.summary_cn) > len(old.summary_cn)):
+                best[old_key] = it
+        return list(best.values())
+
+    stats: dict[str, Any] = {}
+    out: dict[str, list[Any]] = {}
+    linear = _timings(lambda: out.__setitem__("linear", _linear()), max(1, args.iterations // 10))
+    indexed = _timings(lambda: out.__setitem__("indexed", dedupe_items(items, stats=stats)), args.iterations)
+    return {
+        "bench": "title-dedupe",
+        "items": n,
+        "threshold": sim_th,
+        "linear": linear,
+        "indexed": indexed,
+        "speedup_x": round(linear["mean_ms"] / max(indexed["mean_ms"], 1e-6), 2),
+        "same_result": out.get("linear") == out.get("indexed"),
+        "kept": len(out.get("indexed", [])),
+        "dedupe_stats": stats,
+    }
+
+
+def bench_text_features(args: argparse.Namespace) -> dict[str, Any]:
+    """
+    Per-candidate keyword decisions of generate_ivd_report (exclusion, packs, relevance
+    filters, event/lane/platform taggers) with the enhanced content rules: `per_call` lets
+    every function lowercase and scan the text itself, `automaton` scans each text once with
+    build_text_automaton() and answers all decisions from that. compute_relevance is not
+    included (it is the same in both). Reports per-item CPU time and decision parity.
+    """
+    import random
+
+    import yaml
+
+    import scripts.generate_ivd_report as gen
+
+    raw = yaml.safe_load((ROOT_DIR / "rules" / "content_rules" / f"{args.profile}.yaml").read_text(encoding="utf-8")) or {}
+    content: dict[str, Any] = {}
+    for rule in raw.get("rules", []) if isinstance(raw.get("rules"), list) else []:
+        params = rule.get("params") or {}
+        t = rule.get("type")
+        if t in {"lane_mapping", "platform_mapping", "event_mapping"}:
+            content[t] = params
+        elif t == "include_filter":
+            content["include_keywords_by_pack"] = params
+        elif t == "exclude_filter":
+            content["exclude_keywords"] = params.get("exclude_keywords", [])
+            content["keep_if_has_keywords"] = params.get("keep_if_has_keywords", [])
+    gen.RUNTIME_CONTENT.update(content)
+    event_mapping = content.get("event_mapping", {})
+    clf = gen.EventTypeClassifier(mapping=event_mapping)
+    automaton = gen.build_text_automaton(event_mapping)
+
+    n = int(args.size or 500)
+    rng = random.Random(11)
+    vocab = sorted(automaton.terms)
+    filler = "the of and with for new data company update report announced market global latest".split()
+    rows = []
+    for _ in range(n):
+        title = " ".join(rng.choice(vocab) if rng.random() < 0.15 else rng.choice(filler) for _ in range(12))
+        summary = " ".join(rng.choice(vocab) if rng.random() < 0.1 else rng.choice(filler) for _ in range(60))
+        rows.append((title, summary, "media_global", f"https://example.com/news/{rng.randrange(10**6)}"))
+
+    def _decide(title: str, summary: str, sg: str, url: str, ch: Any = None, eh: Any = None) -> tuple:
+        combined = title + " " + summary
+        return (
+            gen.exclusion_reason(combined, hits=ch),
+            gen.matched_keyword_packs(combined, hits=ch),
+            gen.is_regulatory_ivd_relevant(combined, hits=ch),
+            gen.is_relaxed_relevant(combined, hits=ch),
+            gen.cn_lane(combined, hits=ch),
+            gen.cn_platform(combined, hits=ch),
+            clf.classify(title, summary, sg, url, hits=eh),
+            gen.classify_lane(title, summary, sg, url, "", enhanced=True, text_hits=eh),
+            gen.classify_platform(title, summary, sg, url, "", enhanced=True, text_hits=eh),
+        )
+
+    out: dict[str, list[tuple]] = {}
+
+    def _per_call() -> None:
+        out["per_call"] = [_decide(*r) for r in rows]
+
+    def _automaton() -> None:
+        res = []
+        for title, summary, sg, url in rows:
+            ch = automaton.scan({"title": title, "summary": summary})
+            eh = automaton.scan(gen.event_scan_fields(title, summary, sg, url))
+            res.append(_decide(title, summary, sg, url, ch, eh))
+        out["automaton"] = res
+
+    per_call = _timings(_per_call, args.iterations)
+    auto = _timings(_automaton, args.iterations)
+    return {
+        "bench": "text-features",
+        "profile": args.profile,
+        "items": n,
+        "keywords": len(automaton),
+        "per_call": per_call,
+        "automaton": auto,
+        "per_item_us": {
+            "per_call": round(per_call["mean_ms"] * 1000 / n, 1),
+            "automaton": round(auto["mean_ms"] * 1000 / n, 1),
+        },
+        "speedup_x": round(per_call["mean_ms"] / max(auto["mean_ms"], 1e-6), 2),
+        "same_decisions": out.get("per_call") == out.get("automaton"),
+    }
+
+
+BENCHES: dict[str, Callable[[argparse.Namespace], dict[str, Any]]] = {
+    "rules-decision": bench_rules_decision,
+    "url-parse": bench_url_parse,
+    "source-policy": bench_source_policy,
+    "opportunity-signals": bench_opportunity_signals,
+    "title-dedupe": bench_title_dedupe,
+    "text-features": bench_text_features,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Run hot-path micro-benchmarks and print JSON results")
+    p.add_argument("bench", nargs="?", default="", help="benchmark name (see --list)")
+    p.add_argument("--list", action="store_true", help="list available benchmarks")
+    p.add_argument("--iterations", type=int, default=20)
+    p.add_argument("--profile", default="enhanced")
+    p.add_argument("--size", type=int, default=0, help="input size override for throughput benchmarks")
+    args = p.parse_args(argv)
+
+    if args.list or not args.bench:
+        print(json.dumps({"benches": sorted(BENCHES)}, ensure_ascii=False, indent=2))
+        return 0
+    fn = BENCHES.get(args.bench)
+    if fn is None:
+        print(json.dumps({"ok": False, "error": f"unknown bench: {args.bench}"}, ensure_ascii=False))
+        return 2
+    out = fn(args)
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(None))
@@ -135,6 +135,8 @@ def main(argv: list[str] | None = None) -> int:
     p.add_argument("--workers", type=int, default=6)
     p.add_argument("--timeout-seconds", type=int, default=20)
     p.add_argument("--retries", type=int, default=2)
+    p.add_argument("--per-host", type=int, default=2, help="Max concurrent requests per host")
+    p.add_argument("--deadline-seconds", type=float, default=0, help="Budget for the whole probe (0 = none)")
     args = p.parse_args(argv)
 
     registry = Path(args.registry)
@@ -161,6 +163,8 @@ def main(argv: list[str] | None = None) -> int:
         max_workers=max(1, int(args.workers)),
         timeout_seconds=max(3, int(args.timeout_seconds)),
         retries=max(0, int(args.retries)),
+        per_host=max(1, int(args.per_host)),
+        deadline_seconds=max(0.0, float(args.deadline_seconds)),
     )
 
     by_id = load_registry_sources(registry)
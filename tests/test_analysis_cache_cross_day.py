@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.services.analysis_cache_store import AnalysisCacheStore
+from app.services.collect_asset_store import render_digest_from_assets
+
+
+class _CountingGenerator:
+    def __init__(self) -> None:
+        self.called = 0
+
+    def generate(self, item, rules=None):  # noqa: ANN001
+        self.called += 1
+        return {
+            "summary": f"摘要：生成#{self.called}。",
+            "impact": "影响：测试。",
+            "action": "建议：测试。",
+            "model": "local-heuristic-v1",
+            "prompt_version": "v2",
+            "token_usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            "generated_at": "2026-02-20T08:30:00Z",
+            "degraded": False,
+            "degraded_reason": "",
+            "ok": True,
+        }
+
+
+ITEM = {
+    "title": "FDA clears new IVD assay",
+    "url": "https://example.com/a?utm_source=x",
+    "source": "FDA",
+    "track": "core",
+    "relevance_level": 4,
+    "published_at": "2026-02-20T08:00:00Z",
+    "summary": "The FDA cleared a new IVD assay for sepsis testing in hospital laboratories.",
+}
+
+
+def _render(cache: AnalysisCacheStore, gen: _CountingGenerator, date_str: str, **cfg) -> dict:  # noqa: ANN003
+    rendered = render_digest_from_assets(
+        date_str=date_str,
+        items=[dict(ITEM)],
+        subject=f"全球IVD晨报 - {date_str}",
+        analysis_cfg={"enable_analysis_cache": True, "prompt_version": "v2", **cfg},
+        return_meta=True,
+        _cache_store=cache,
+        _generator=gen,
+    )
+    assert isinstance(rendered, dict)
+    return rendered
+
+
+class AnalysisCacheCrossDayTests(unittest.TestCase):
+    def test_content_key_tracks_text_model_and_prompt(self) -> None:
+        base = AnalysisCacheStore.content_key(ITEM, model="m1", prompt_version="v2", snippet="s")
+        self.assertEqual(base, AnalysisCacheStore.content_key({**ITEM, "url": "https://example.com/a"}, model="m1", prompt_version="v2", snippet="s"))
+        self.assertNotEqual(base, AnalysisCacheStore.content_key(ITEM, model="m2", prompt_version="v2", snippet="s"))
+        self.assertNotEqual(base, AnalysisCacheStore.content_key(ITEM, model="m1", prompt_version="v3", snippet="s"))
+        self.assertNotEqual(base, AnalysisCacheStore.content_key({**ITEM, "title": "Other"}, model="m1", prompt_version="v2", snippet="s"))
+
+    def test_get_content_respects_retention_window(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = AnalysisCacheStore(Path(td))
+            t0 = dt.datetime(2026, 2, 20, 8, 0, tzinfo=dt.timezone.utc)
+            store.put_content("ab" * 32, {"summary": "摘要：x"}, now_utc=t0)
+            self.assertIsNotNone(store.get_content("ab" * 32, max_age_days=7, now_utc=t0 + dt.timedelta(days=6)))
+            self.assertIsNone(store.get_content("ab" * 32, max_age_days=7, now_utc=t0 + dt.timedelta(days=8)))
+            self.assertIsNone(store.get_content("ab" * 32, max_age_days=0, now_utc=t0))
+
+    def test_next_day_digest_reuses_analysis_across_days(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = AnalysisCacheStore(Path(td))
+            gen = _CountingGenerator()
+            first = _render(cache, gen, "2026-02-20")
+            self.assertEqual(gen.called, 1)
+            self.assertEqual(int(first["meta"]["analysis_cache_cross_day_hit"]), 0)
+
+            second = _render(cache, gen, "2026-02-21")
+            self.assertEqual(gen.called, 1)
+            meta = second["meta"]
+            self.assertEqual(int(meta["analysis_cache_hit"]), 1)
+            self.assertEqual(int(meta["analysis_cache_cross_day_hit"]), 1)
+            self.assertEqual(float(meta["analysis_cache_cross_day_hit_rate"]), 1.0)
+            self.assertIn("摘要：生成#1。", str(second["text"]))
+            self.assertIn("analysis_cache_cross_day_hit：1", str(second["text"]))
+            # The day file for the reuse day still records what the digest used.
+            self.assertIsNotNone(cache.get(AnalysisCacheStore.item_key(ITEM), dt.date(2026, 2, 21)))
+
+            _render(cache, gen, "2026-02-22", prompt_version="v3")
+            self.assertEqual(gen.called, 2)
+            _render(cache, gen, "2026-02-23", content_cache_days=0)
+            self.assertEqual(gen.called, 3)
+
+    def test_cleanup_prunes_expired_content_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = AnalysisCacheStore(Path(td))
+            store.put_content("cd" * 32, {"summary": "摘要：old"})
+            p = store.content_dir / "cd" / f"{'cd' * 32}.json"
+            old = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=40)).timestamp()
+            os.utime(p, (old, old))
+            store.put_content("ef" * 32, {"summary": "摘要：new"})
+            out = store.cleanup(keep_days=30)
+            self.assertEqual(out["removed_content_entries"], 1)
+            self.assertFalse(p.exists())
+            self.assertIsNotNone(store.get_content("ef" * 32))
+
+
+if __name__ == "__main__":
+    unittest.main()
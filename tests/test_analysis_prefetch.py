@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import datetime as dt
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.analysis_cache_store import AnalysisCacheStore
+from app.services.analysis_generator import generate_many, latency_percentiles
+from app.services.collect_asset_store import render_digest_from_assets
+
+
+class _SlowGenerator:
+    def __init__(self, delay: float = 0.05, fail_titles: set[str] | None = None) -> None:
+        self.delay = delay
+        self.fail_titles = fail_titles or set()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, item, rules=None):  # noqa: ANN001
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            title = str(item.get("title", ""))
+            if title in self.fail_titles:
+                raise RuntimeError("upstream_timeout")
+            return {
+                "summary": f"摘要：{title}。",
+                "impact": "影响：测试。",
+                "action": "建议：测试。",
+                "model": "m",
+                "used_model": "m",
+                "prompt_version": "v2",
+                "token_usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+                "generated_at": "2026-02-20T08:30:00Z",
+                "degraded": False,
+                "degraded_reason": "",
+                "ok": True,
+            }
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _items(n: int) -> list[dict]:
+    return [
+        {
+            "title": f"IVD assay cleared #{i}",
+            "url": f"https://example.com/a/{i}",
+            "source": "FDA",
+            "track": "core",
+            "relevance_level": 4,
+            "published_at": "2026-02-20T08:00:00Z",
+        }
+        for i in range(n)
+    ]
+
+
+class AnalysisPrefetchTests(unittest.TestCase):
+    def test_generate_many_is_concurrent_and_keeps_order(self) -> None:
+        gen = _SlowGenerator(fail_titles={"IVD assay cleared #2"})
+        items = _items(8)
+        t0 = time.perf_counter()
+        outcomes = generate_many(gen, items, max_workers=4)
+        elapsed = time.perf_counter() - t0
+        self.assertGreater(gen.peak, 1)
+        self.assertLess(elapsed, 8 * gen.delay)
+        self.assertEqual([o.analysis["summary"] if o.analysis else o.error for o in outcomes][:3], ["摘要：IVD assay cleared #0。", "摘要：IVD assay cleared #1。", "upstream_timeout"])
+        self.assertEqual(latency_percentiles([o.latency_ms for o in outcomes])["count"], 8)
+
+    def test_rate_limit_spaces_calls(self) -> None:
+        gen = _SlowGenerator(delay=0.0)
+        t0 = time.perf_counter()
+        generate_many(gen, _items(5), max_workers=5, rate_per_sec=20)
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.18)
+
+    def test_digest_prefetch_records_latency_and_tokens(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = AnalysisCacheStore(Path(td))
+            gen = _SlowGenerator(fail_titles={"IVD assay cleared #1"})
+            rendered = render_digest_from_assets(
+                date_str="2026-02-20",
+                items=_items(6),
+                subject="全球IVD晨报 - 2026-02-20",
+                analysis_cfg={"enable_analysis_cache": True, "prompt_version": "v2", "generate_workers": 3},
+                return_meta=True,
+                _cache_store=cache,
+                _generator=gen,
+            )
+            self.assertIsInstance(rendered, dict)
+            meta = rendered["meta"]
+            text = str(rendered["text"])
+            self.assertGreater(gen.peak, 1)
+            self.assertEqual(int(meta["analysis_generated_count"]), 5)
+            self.assertEqual(int(meta["analysis_degraded_count"]), 1)
+            self.assertEqual(meta["analysis_token_usage"], {"prompt_tokens": 15, "completion_tokens": 10, "total_tokens": 25})
+            self.assertEqual(int(meta["analysis_generate_latency_ms"]["count"]), 6)
+            self.assertLess(text.index("IVD assay cleared #0"), text.index("IVD assay cleared #3"))
+
+    def test_tiered_fallback_survives_concurrent_prefetch(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = AnalysisCacheStore(Path(td))
+            with patch.dict("os.environ", {"ANALYSIS_FAIL_MODELS": "model-primary"}, clear=False):
+                render_digest_from_assets(
+                    date_str="2026-02-20",
+                    items=_items(4),
+                    subject="全球IVD晨报 - 2026-02-20",
+                    analysis_cfg={
+                        "enable_analysis_cache": True,
+                        "prompt_version": "v2",
+                        "model_primary": "model-primary",
+                        "model_fallback": "model-fallback",
+                        "model_policy": "tiered",
+                        "generate_workers": 4,
+                    },
+                    return_meta=True,
+                    _cache_store=cache,
+                )
+            for it in _items(4):
+                got = cache.get(AnalysisCacheStore.item_key(it), dt.date(2026, 2, 20)) or {}
+                self.assertEqual(got.get("used_model"), "model-fallback")
+                self.assertEqual(got.get("fallback_from"), "model-primary")
+
+
+if __name__ == "__main__":
+    unittest.main()
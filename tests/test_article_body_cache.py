@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.article_body_cache import ArticleBodyCache
+from app.services.source_registry import _enrich_rss_rows_with_body
+
+
+def _article_html(n: int) -> str:
+    paras = "".join(f"<p>Paragraph {i} for article {n} with diagnostics workflow details for labs.</p>" for i in range(3))
+    return f"<html><head><meta property='og:type' content='article'/></head><body><article><h1>A{n}</h1>{paras}</article></body></html>"
+
+
+class ArticleBodyCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._td.name) / "article_cache"
+        self._env = patch.dict(os.environ, {"ARTICLE_BODY_CACHE_DIR": str(self.cache_dir), "ARTICLE_BODY_CACHE_ENABLED": "1"})
+        self._env.start()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        self._td.cleanup()
+
+    def _enrich(self, rows: list[dict[str, str]], stats: dict) -> list[dict[str, str]]:
+        return _enrich_rss_rows_with_body(
+            rows,
+            headers={"User-Agent": "t"},
+            timeout=3,
+            retry_n=0,
+            limit=50,
+            source_group="media",
+            fetch_cfg={"body_fetch_concurrency": 4},
+            stats=stats,
+        )
+
+    def test_second_run_is_served_from_cache(self) -> None:
+        rows = [{"title": f"Entry {i}", "url": f"https://example.com/a/{i}"} for i in range(6)]
+        rows.append({"title": "Has summary", "url": "https://example.com/s", "summary": "kept"})
+        calls: list[str] = []
+        lock = threading.Lock()
+
+        def _fake(url, headers, timeout, retries):  # noqa: ANN001
+            with lock:
+                calls.append(url)
+            n = int(url.rsplit("/", 1)[-1])
+            return {"ok": True, "data": _article_html(n).encode("utf-8"), "http_status": 200, "etag": f'"e{n}"'}
+
+        with patch("app.services.source_registry._fetch_url_with_retry", side_effect=_fake):
+            s1: dict = {}
+            out1 = self._enrich(rows, s1)
+            s2: dict = {}
+            out2 = self._enrich(rows, s2)
+
+        self.assertEqual(len(calls), 6)
+        self.assertEqual([r["title"] for r in out1], [r["title"] for r in rows])
+        self.assertIn("article 3", out1[3]["summary"])
+        self.assertEqual(out1, out2)
+        self.assertEqual((s1["downloaded"], s1["cache_hits"], s1["hit_rate"]), (6, 0, 0.0))
+        self.assertEqual((s2["downloaded"], s2["cache_hits"], s2["hit_rate"]), (0, 6, 1.0))
+        self.assertGreater(s2["bytes_avoided"], 0)
+
+    def test_stale_entry_revalidates_with_etag(self) -> None:
+        cache = ArticleBodyCache(self.cache_dir, ttl_seconds=60)
+        old = dt.datetime.now(dt.timezone.utc) - dt.timedelta(seconds=120)
+        cache.put("https://example.com/a/1", snippet="cached body", ok=True, etag='"v1"', body_bytes=500, now_utc=old)
+        seen: dict = {}
+
+        def _fake(url, headers, timeout, retries):  # noqa: ANN001
+            seen.update(headers)
+            return {"ok": False, "not_modified": True, "http_status": 304, "data": b""}
+
+        with patch("app.services.source_registry._fetch_url_with_retry", side_effect=_fake), patch.dict(
+            os.environ, {"ARTICLE_BODY_CACHE_TTL_SECONDS": "60"}
+        ):
+            stats: dict = {}
+            out = self._enrich([{"title": "t", "url": "https://example.com/a/1"}], stats)
+        self.assertEqual(seen.get("If-None-Match"), '"v1"')
+        self.assertEqual(out[0]["summary"], "cached body")
+        self.assertEqual((stats["not_modified"], stats["downloaded"], stats["bytes_avoided"]), (1, 0, 500))
+
+    def test_stale_entry_survives_eviction_and_revalidates(self) -> None:
+        cache = ArticleBodyCache(self.cache_dir, ttl_seconds=60, max_age_seconds=3600)
+        now = dt.datetime.now(dt.timezone.utc)
+        cache.put("https://example.com/a/7", snippet="kept body", ok=True, etag='"v7"', body_bytes=800, now_utc=now - dt.timedelta(minutes=5))
+        cache.put("https://example.com/a/8", snippet="gone", ok=True, now_utc=now - dt.timedelta(hours=2))
+        out = cache.evict(now_utc=now)
+        self.assertEqual((out["removed_expired"], out["entries"]), (1, 1))
+        self.assertFalse(cache.get("https://example.com/a/7", now_utc=now)["fresh"])
+
+        seen: dict = {}
+
+        def _fake(url, headers, timeout, retries):  # noqa: ANN001
+            seen.update(headers)
+            return {"ok": False, "not_modified": True, "http_status": 304, "data": b""}
+
+        with patch("app.services.source_registry._fetch_url_with_retry", side_effect=_fake), patch(
+            "app.services.source_registry.get_article_body_cache", return_value=cache
+        ):
+            stats: dict = {}
+            rows = self._enrich([{"title": "t", "url": "https://example.com/a/7"}], stats)
+        self.assertEqual(seen.get("If-None-Match"), '"v7"')
+        self.assertEqual(rows[0]["summary"], "kept body")
+        self.assertEqual((stats["not_modified"], stats["downloaded"], stats["bytes_avoided"]), (1, 0, 800))
+        # The 304 refreshed the entry, so the next lookup is fresh again.
+        self.assertTrue(cache.get("https://example.com/a/7")["fresh"])
+
+    def test_eviction_by_max_age_and_capacity(self) -> None:
+        cache = ArticleBodyCache(self.cache_dir, ttl_seconds=600, max_age_seconds=3600, max_entries=2)
+        self.assertEqual(ArticleBodyCache(self.cache_dir, ttl_seconds=600).max_age_seconds, 2400)
+        now = dt.datetime.now(dt.timezone.utc)
+        cache.put("https://example.com/expired", snippet="x", ok=True, now_utc=now - dt.timedelta(hours=2))
+        for i in range(3):
+            cache.put(f"https://example.com/n/{i}", snippet="x", ok=True, now_utc=now - dt.timedelta(minutes=30 - i))
+        out = cache.evict(now_utc=now)
+        self.assertEqual((out["removed_expired"], out["removed_capacity"], out["entries"]), (1, 1, 2))
+        self.assertIsNone(cache.get("https://example.com/expired"))
+        self.assertIsNone(cache.get("https://example.com/n/0"))
+        self.assertFalse(cache.get("https://example.com/n/2", now_utc=now)["fresh"])
+
+
+if __name__ == "__main__":
+    unittest.main()
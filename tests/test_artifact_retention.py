@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from app.services.analysis_cache_store import AnalysisCacheStore
+from app.services.artifact_io import (
+    artifact_glob,
+    compress_artifact,
+    iter_artifact_lines,
+    locked_append,
+    read_artifact_text,
+)
+from app.services.artifact_retention import DEFAULT_POLICIES, RetentionPolicy, load_retention_report, run_retention
+from app.services.fetch_snapshot import FetchSnapshotStore
+
+NOW = dt.datetime(2026, 3, 1, 12, 0, tzinfo=dt.timezone.utc)
+
+
+def _run_dir(artifacts: Path, name: str, age_days: float) -> Path:
+    d = artifacts / name
+    d.mkdir(parents=True)
+    (d / "run_meta.json").write_text(json.dumps({"run_id": name, "rows": ["x" * 40] * 50}), encoding="utf-8")
+    (d / "newsletter.txt").write_text("report body\n", encoding="utf-8")
+    ts = (NOW - dt.timedelta(days=age_days)).timestamp()
+    for p in d.iterdir():
+        os.utime(p, (ts, ts))
+    return d
+
+
+def _age(p: Path, age_days: float) -> None:
+    ts = (NOW - dt.timedelta(days=age_days)).timestamp()
+    os.utime(p, (ts, ts))
+
+
+class ArtifactIoTests(unittest.TestCase):
+    def test_compressed_jsonl_reads_through_and_accepts_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "items-20260220.jsonl"
+            p.write_text("".join(json.dumps({"i": i, "pad": "y" * 30}) + "\n" for i in range(20)), encoding="utf-8")
+            before, after = compress_artifact(p)
+            self.assertLess(after, before)
+            self.assertFalse(p.exists())
+            with p.open("a", encoding="utf-8") as f:
+                f.write("".join(json.dumps({"i": i, "pad": "w" * 30}) + "\n" for i in range(20, 30)))
+            self.assertEqual([json.loads(ln)["i"] for ln in iter_artifact_lines(p)], list(range(30)))
+            # Compressing again appends a second gzip member to the existing part.
+            self.assertIsNotNone(compress_artifact(p))
+            self.assertEqual(len(read_artifact_text(p).splitlines()), 30)
+            self.assertEqual(artifact_glob(Path(td), "items-*.jsonl"), [p])
+
+    def test_analysis_cache_reads_compressed_day_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            day = dt.date(2026, 2, 20)
+            store = AnalysisCacheStore(Path(td), asset_dir="artifacts/analysis")
+            for i in range(10):
+                store.put(f"k{i}", {"summary": "摘要：" + "z" * 40}, day)
+            compress_artifact(store._day_file(day))
+            store.put("late", {"summary": "摘要：late"}, day)
+            fresh = AnalysisCacheStore(Path(td), asset_dir="artifacts/analysis")
+            self.assertIsNotNone(fresh.get("k3", day))
+            self.assertEqual(fresh.get("late", day)["summary"], "摘要：late")
+
+    def test_compress_waits_for_the_appender_and_keeps_its_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "items-20260220.jsonl"
+            with locked_append(p) as f:
+                f.write("".join(json.dumps({"i": i, "pad": "y" * 30}) + "\n" for i in range(20)))
+                worker = threading.Thread(target=compress_artifact, args=(p,))
+                worker.start()
+                time.sleep(0.2)
+                self.assertTrue(worker.is_alive())
+                f.write(json.dumps({"i": 20}) + "\n")
+            worker.join(5)
+            self.assertFalse(p.exists())
+            with locked_append(p) as f:
+                f.write(json.dumps({"i": 21}) + "\n")
+            self.assertEqual([json.loads(ln)["i"] for ln in iter_artifact_lines(p)], list(range(22)))
+
+
+class ArtifactRetentionTests(unittest.TestCase):
+    def test_policy_keeps_recent_and_referenced_runs_and_compresses(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            artifacts = Path(td) / "artifacts"
+            for i, age in enumerate([0.5, 5, 40, 50, 60]):
+                _run_dir(artifacts, f"run-{i}", age)
+            policy = RetentionPolicy("digest_runs", "run-*", keep_last=2, keep_days=30, compress_after_days=3, protect_referenced=True)
+            plan = run_retention(
+                Path(td), policies=[policy], referenced_run_ids={"run-3"}, dry_run=True, now=NOW, codec="gzip"
+            )
+            self.assertEqual(plan["classes"]["digest_runs"]["deleted"], 2)
+            self.assertTrue((artifacts / "run-4").exists())
+            self.assertIsNone(load_retention_report(artifacts))
+
+            out = run_retention(Path(td), policies=[policy], referenced_run_ids={"run-3"}, now=NOW, codec="gzip")
+            stats = out["classes"]["digest_runs"]
+            self.assertEqual((stats["kept"], stats["kept_referenced"], stats["deleted"]), (3, 1, 2))
+            self.assertEqual(sorted(p.name for p in artifacts.glob("run-*")), ["run-0", "run-1", "run-3"])
+            # The fresh run stays plain; older kept runs have their JSON compressed, text untouched.
+            self.assertTrue((artifacts / "run-0" / "run_meta.json").exists())
+            self.assertTrue((artifacts / "run-3" / "run_meta.json.gz").exists())
+            self.assertTrue((artifacts / "run-3" / "newsletter.txt").exists())
+            self.assertEqual(json.loads(read_artifact_text(artifacts / "run-1" / "run_meta.json"))["run_id"], "run-1")
+            self.assertGreater(stats["bytes_deleted"], 0)
+            self.assertGreater(stats["bytes_saved_by_compression"], 0)
+            report = load_retention_report(artifacts)
+            self.assertEqual(report["bytes_reclaimed"], stats["bytes_deleted"] + stats["bytes_saved_by_compression"])
+            self.assertEqual(report["bytes_reclaimed_total"], report["bytes_reclaimed"])
+
+            # Compression left directory ages alone: a second pass changes nothing.
+            again = run_retention(Path(td), policies=[policy], referenced_run_ids={"run-3"}, now=NOW, codec="gzip")
+            self.assertEqual(again["bytes_reclaimed"], 0)
+            self.assertEqual(load_retention_report(artifacts)["bytes_reclaimed_total"], report["bytes_reclaimed"])
+
+    def test_day_files_age_by_name_date(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td) / "artifacts" / "collect"
+            base.mkdir(parents=True)
+            for day in ("20260101", "20260225", "20260301"):
+                p = base / f"items-{day}.jsonl"
+                p.write_text(json.dumps({"d": day, "pad": "q" * 60}) * 5 + "\n", encoding="utf-8")
+                _age(p, (NOW.date() - dt.datetime.strptime(day, "%Y%m%d").date()).days)
+            compress_artifact(base / "items-20260101.jsonl")
+            policy = RetentionPolicy("collect_assets", "collect/items-*.jsonl", unit="file", keep_days=30, compress_after_days=3)
+            out = run_retention(Path(td), policies=[policy], referenced_run_ids=set(), now=NOW)
+            self.assertEqual(out["classes"]["collect_assets"]["deleted"], 1)
+            self.assertEqual(sorted(p.name for p in base.iterdir()), ["items-20260225.jsonl.gz", "items-20260301.jsonl"])
+
+    def test_files_still_being_written_are_not_compressed(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            base = Path(td) / "artifacts" / "collect"
+            base.mkdir(parents=True)
+            p = base / "items-20260220.jsonl"
+            p.write_text(json.dumps({"pad": "q" * 60}) * 5 + "\n", encoding="utf-8")
+            policy = RetentionPolicy("collect_assets", "collect/items-*.jsonl", unit="file", keep_days=30, compress_after_days=3)
+            out = run_retention(Path(td), policies=[policy], referenced_run_ids=set(), now=NOW)
+            self.assertEqual(out["classes"]["collect_assets"]["compress_skipped_active"], 1)
+            self.assertTrue(p.exists())
+
+    def test_default_policies_expire_snapshots_and_content_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            artifacts = Path(td) / "artifacts"
+            store = FetchSnapshotStore(artifacts / "fetch_snapshots")
+            kept_blob, old_blob, orphan = store.put_blob(b"kept"), store.put_blob(b"old"), store.put_blob(b"orphan")
+            store.write_manifest("run-new", {"requests": {"u": {"blob": kept_blob}}})
+            store.write_manifest("run-old", {"requests": {"u": {"blob": old_blob}}})
+            _age(store.manifest_path("run-new"), 1)
+            _age(store.manifest_path("run-old"), 60)
+            for digest in (kept_blob, old_blob, orphan):
+                _age(store._blob_path(digest), 60)
+            content = artifacts / "analysis" / "content" / "12"
+            content.mkdir(parents=True)
+            # Hex content keys may contain eight digits in a row; their age is the file mtime.
+            (content / "1234567800aa.json").write_text("{}", encoding="utf-8")
+            (content / "12ff.json").write_text("{}", encoding="utf-8")
+            _age(content / "1234567800aa.json", 1)
+            _age(content / "12ff.json", 45)
+
+            names = ("analysis_content", "fetch_snapshots", "fetch_snapshot_blobs")
+            # keep_last=1 so the 60-day-old manifest is not kept as one of the newest runs.
+            policies = [replace(p, keep_last=1) if p.name == "fetch_snapshots" else p for p in DEFAULT_POLICIES if p.name in names]
+            out = run_retention(Path(td), policies=policies, referenced_run_ids=set(), now=NOW)
+            self.assertEqual({n: out["classes"][n]["deleted"] for n in names}, {n: 2 if n == "fetch_snapshot_blobs" else 1 for n in names})
+            self.assertEqual(store.list_runs(), ["run-new"])
+            self.assertEqual(store.get_blob(kept_blob), b"kept")
+            self.assertFalse(store._blob_path(old_blob).exists())
+            self.assertFalse(store._blob_path(orphan).exists())
+            self.assertEqual([p.name for p in content.iterdir()], ["1234567800aa.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,9 +6,10 @@ import unittest
 from pathlib import Path
 
 from app.services.analysis_cache_store import AnalysisCacheStore
+from app.services.artifact_io import compress_artifact
 from app.services.collect_asset_store import CollectAssetStore
 from app.utils.url_norm import url_norm
-from scripts.acceptance_run import _build_quality_pack
+from scripts.acceptance_run import _build_quality_pack, _load_analysis_cache_map
 
 
 class CacheKeyAuditPR7Tests(unittest.TestCase):
@@ -80,6 +81,17 @@ class CacheKeyAuditPR7Tests(unittest.TestCase):
             self.assertGreaterEqual(int(analysis_cache.get("hit", 0) or 0), 1)
             self.assertEqual(int(analysis_cache.get("mismatch", 0) or 0), 0)
 
+    def test_acceptance_reads_compressed_analysis_days(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            cache = AnalysisCacheStore(root, asset_dir="artifacts/analysis")
+            old_day = dt.date.today() - dt.timedelta(days=5)
+            for i in range(10):
+                cache.put(f"k{i}", {"summary": "摘要：" + "z" * 40}, old_day)
+            # Retention compresses analysis day files older than 3 days.
+            self.assertIsNotNone(compress_artifact(cache._day_file(old_day)))
+            self.assertEqual(sorted(_load_analysis_cache_map(root)), [f"k{i}" for i in range(10)])
+
 
 if __name__ == "__main__":
     unittest.main()
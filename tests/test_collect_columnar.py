@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app.services.artifact_io import compress_artifact, locked_append
+from app.services.collect_asset_store import CollectAssetStore
+from app.services.collect_columnar import ColumnarDayFile, iter_collect_rows, seal_day_file, write_columnar
+
+DAY1 = dt.datetime(2026, 2, 20, 8, 0, tzinfo=dt.timezone.utc)
+DAY2 = dt.datetime(2026, 2, 21, 8, 0, tzinfo=dt.timezone.utc)
+
+
+def _items(prefix: str, n: int) -> list[dict]:
+    return [
+        {
+            "title": f"{prefix} IVD assay update {i}",
+            "url": f"https://news.example.com/{prefix}/{i}",
+            "summary": f"Company {i % 3} reports   new  diagnostic results for panel {i}.",
+            "published_at": "2026-02-20T06:00:00Z",
+        }
+        for i in range(n)
+    ]
+
+
+def _fill(store: CollectAssetStore) -> None:
+    for src in ("s1", "s2"):
+        store.append_items(
+            run_id="r1",
+            source_id=src,
+            source_name=f"Source {src}",
+            source_group="media",
+            items=_items(src, 30),
+            now_utc=DAY1,
+        )
+    store.append_stub_item(
+        run_id="r1", source_id="s3", source_name="Stub", source_group="web", url="https://s3.example.com", observed_at=DAY1
+    )
+
+
+class CollectColumnarTests(unittest.TestCase):
+    def test_round_trip_preserves_rows_and_key_order(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            rows = [
+                {"a": 1, "title": "T", "summary": "S x", "raw_text": "T S x", "normalized_text": "t s x", "extra": None},
+                {"a": 2, "title": "U", "summary": "", "raw_text": "stub", "normalized_text": "stub", "stub": True},
+                {"a": 3, "explain": {"hits": ["x"]}, "raw_text": None},
+            ]
+            p = Path(td) / "items-20260220.cols"
+            write_columnar(p, rows)
+            got = ColumnarDayFile(p).rows()
+            self.assertEqual(got, rows)
+            self.assertEqual([list(r) for r in got], [list(r) for r in rows])
+
+    def test_sealed_day_matches_jsonl_and_projects_columns(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = CollectAssetStore(Path(td), asset_dir="artifacts/collect")
+            _fill(store)
+            jsonl = store._day_file(DAY1.date())
+            before_size = jsonl.stat().st_size
+            window = {"window_hours": 72, "now_utc": DAY1 + dt.timedelta(hours=1)}
+            expected = store.load_window_items(**window)
+            self.assertEqual(len(expected), 61)
+
+            out = store.seal_days(before=DAY2.date())
+            self.assertEqual(out["sealed_days"], ["2026-02-20"])
+            self.assertFalse(jsonl.exists())
+            sealed = jsonl.with_name("items-20260220.cols")
+            self.assertLess(sealed.stat().st_size, before_size / 2)
+            self.assertEqual(store.load_window_items(**window), expected)
+
+            cf = ColumnarDayFile(sealed)
+            proj = cf.rows(["source_id", "track"])
+            self.assertEqual(len(proj), 61)
+            self.assertEqual(cf.loaded_columns, {"source_id", "track"})
+            self.assertEqual(set(proj[0]), {"source_id", "track"})
+
+            # A window that misses the sealed day only decodes its collected_at column.
+            self.assertEqual(store.load_window_items(window_hours=2, now_utc=DAY1 + dt.timedelta(hours=5)), [])
+
+    def test_late_rows_and_compressed_parts_fold_into_sealed_day(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = CollectAssetStore(Path(td), asset_dir="artifacts/collect")
+            _fill(store)
+            store.seal_days(before=DAY2.date())
+            store.append_stub_item(
+                run_id="r2", source_id="s4", source_name="Late", source_group="web", url="https://s4.example.com", observed_at=DAY1
+            )
+            store.append_items(
+                run_id="r2", source_id="s1", source_name="Source s1", source_group="media", items=_items("d2", 5), now_utc=DAY2
+            )
+            base = store.base_dir
+            ids = [r["source_id"] for r in iter_collect_rows(base, columns=["source_id"])]
+            self.assertEqual(len(ids), 67)
+            self.assertEqual(ids[61], "s4")
+
+            compress_artifact(store._day_file(DAY1.date()))
+            store.seal_days(before=DAY2.date())
+            self.assertEqual(sorted(p.name for p in base.glob("items-*")), ["items-20260220.cols", "items-20260221.jsonl"])
+            self.assertEqual([r["source_id"] for r in iter_collect_rows(base, columns=["source_id"])], ids)
+
+            removed = store.cleanup(keep_days=1, now_utc=DAY2 + dt.timedelta(days=1))
+            self.assertEqual(removed["removed_files"], 1)
+            self.assertEqual(sorted(p.name for p in base.glob("items-*")), ["items-20260221.jsonl"])
+
+    def test_seal_waits_for_an_in_flight_append(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = CollectAssetStore(Path(td), asset_dir="artifacts/collect")
+            _fill(store)
+            day_file = store._day_file(DAY1.date())
+            with locked_append(day_file) as f:
+                worker = threading.Thread(target=seal_day_file, args=(day_file,))
+                worker.start()
+                time.sleep(0.2)
+                self.assertTrue(worker.is_alive())
+                f.write(json.dumps({"source_id": "in-flight"}) + "\n")
+            worker.join(5)
+            self.assertFalse(day_file.exists())
+            store.append_stub_item(
+                run_id="r2", source_id="s4", source_name="Late", source_group="web", url="https://s4.example.com", observed_at=DAY1
+            )
+            ids = [r["source_id"] for r in iter_collect_rows(store.base_dir, columns=["source_id"])]
+            self.assertEqual(ids[-2:], ["in-flight", "s4"])
+            self.assertEqual(len(ids), 63)
+
+
+if __name__ == "__main__":
+    unittest.main()
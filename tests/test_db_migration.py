@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import json
 import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
 
-from app.services.db_migration import migrate_sqlite_to_target, verify_sqlite_vs_target
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import create_engine
+
+from app.db.base import Base
+from app.services import db_migration
+from app.services.db_migration import (
+    _copy_text_field,
+    bulk_migrate_sqlite_to_target,
+    migrate_sqlite_to_target,
+    verify_sqlite_vs_target,
+    verify_sqlite_vs_target_chunked,
+)
 
 
 def _create_source_db(path: Path) -> None:
@@ -130,6 +143,42 @@ def _create_source_db(path: Path) -> None:
     conn.close()
 
 
+def _create_full_source_db(path: Path, n_items: int = 23) -> None:
+    engine = create_engine(f"sqlite:///{path.as_posix()}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    for i in range(n_items):
+        conn.execute(
+            "INSERT INTO raw_items(id,source_id,fetched_at,published_at,title_raw,title_norm,url_raw,canonical_url,"
+            "content_snippet,raw_payload,priority) VALUES(?,?,?,?,?,?,?,?,?,?,?)",
+            (
+                f"ri-{i:03d}",
+                "s1",
+                "2026-01-01T00:00:00Z",
+                None if i % 5 == 0 else "2026-01-01T00:00:00Z",
+                f"Title\t{i}\nline\\x",
+                f"title {i}",
+                f"https://e.example/{i}",
+                f"https://e.example/{i}",
+                "",
+                json.dumps({"i": i, "zh": "体外诊断"}),
+                i,
+            ),
+        )
+        conn.execute(
+            "INSERT INTO source_fetch_events(run_id,source_id,status,http_status,items_count,error,duration_ms) "
+            "VALUES(?,?,?,?,?,?,?)",
+            ("run-1", "s1", "ok", 200 if i % 3 else None, i, None, 10 * i),
+        )
+    conn.execute(
+        "INSERT INTO run_executions(run_id,run_key,profile,triggered_by,window,status,started_at) VALUES(?,?,?,?,?,?,?)",
+        ("run-1", "k1", "legacy", "test", "", "success", "2026-01-01T00:00:00Z"),
+    )
+    conn.commit()
+    conn.close()
+
+
 class DBMigrationTests(unittest.TestCase):
     def test_migrate_with_checkpoint_resume(self) -> None:
         with tempfile.TemporaryDirectory() as td:
@@ -185,6 +234,120 @@ class DBMigrationTests(unittest.TestCase):
             self.assertTrue(out["ok"])
             self.assertEqual(set(out["tables"]), {"email_rules_versions", "sources"})
 
+    def test_copy_text_escaping(self) -> None:
+        self.assertEqual(_copy_text_field(None), "\\N")
+        self.assertEqual(_copy_text_field("a\tb\nc\\d\re"), "a\\tb\\nc\\\\d\\re")
+        self.assertEqual(_copy_text_field({"k": "体"}, as_json=True), '{"k": "体"}')
+
+    def test_bulk_migrate_resumes_and_verifies_by_chunk(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "src.db"
+            tgt = root / "tgt.db"
+            cp = root / "checkpoint.json"
+            _create_full_source_db(src)
+            kwargs = dict(
+                project_root=Path.cwd(),
+                target_url=f"sqlite:///{tgt.as_posix()}",
+                source_sqlite_url_or_path=f"sqlite:///{src.as_posix()}",
+                batch_size=5,
+                checkpoint_path=cp,
+            )
+            real = db_migration._insert_upsert
+            calls = {"n": 0}
+
+            def flaky(session, table, cols, rows):  # noqa: ANN001
+                if table.name == "raw_items":
+                    calls["n"] += 1
+                    if calls["n"] == 3:
+                        raise RuntimeError("connection lost")
+                return real(session, table, cols, rows)
+
+            with patch.object(db_migration, "_insert_upsert", side_effect=flaky):
+                with self.assertRaises(RuntimeError):
+                    bulk_migrate_sqlite_to_target(resume=False, **kwargs)
+            self.assertEqual(json.loads(cp.read_text(encoding="utf-8"))["tables"]["raw_items"], "ri-009")
+
+            out = bulk_migrate_sqlite_to_target(resume=True, **kwargs)
+            self.assertTrue(out["ok"])
+            self.assertEqual(out["moved"]["raw_items"], 13)
+            self.assertEqual(out["moved"]["source_fetch_events"], 0)
+            self.assertIn("rows_per_sec", out["stats"]["raw_items"])
+            self.assertEqual(out["stats"]["raw_items"]["writer"], "insert")
+
+            ver = verify_sqlite_vs_target_chunked(
+                project_root=Path.cwd(),
+                target_url=kwargs["target_url"],
+                source_sqlite_url_or_path=kwargs["source_sqlite_url_or_path"],
+                chunk_size=4,
+            )
+            self.assertTrue(ver["ok"], ver["mismatches"])
+            self.assertEqual(ver["counts"]["raw_items"], {"source": 23, "target": 23})
+            self.assertEqual(ver["chunks"]["raw_items"]["chunks"], 6)
+
+            conn = sqlite3.connect(tgt)
+            conn.execute("UPDATE raw_items SET title_norm = 'changed' WHERE id = 'ri-010'")
+            conn.execute("INSERT INTO source_fetch_events(id,run_id,source_id,status,items_count,duration_ms) VALUES(999,'r','s','ok',0,0)")
+            conn.commit()
+            conn.close()
+            ver = verify_sqlite_vs_target_chunked(
+                project_root=Path.cwd(),
+                target_url=kwargs["target_url"],
+                source_sqlite_url_or_path=kwargs["source_sqlite_url_or_path"],
+                chunk_size=4,
+            )
+            self.assertFalse(ver["ok"])
+            bad = {(m["table"], m["key_after"], m["key_through"]) for m in ver["mismatches"]}
+            self.assertEqual(bad, {("raw_items", "ri-007", "ri-011"), ("source_fetch_events", 20, None)})
+
+    def test_bulk_migrate_syncs_sequences_for_post_cutover_inserts(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            src = root / "src.db"
+            tgt = root / "tgt.db"
+            _create_full_source_db(src)
+            synced: list[str] = []
+            real = db_migration._sync_pk_sequence
+
+            def spy(session, table, pk):  # noqa: ANN001
+                synced.append(table.name)
+                return real(session, table, pk)
+
+            with patch.object(db_migration, "_sync_pk_sequence", side_effect=spy):
+                out = bulk_migrate_sqlite_to_target(
+                    project_root=Path.cwd(),
+                    target_url=f"sqlite:///{tgt.as_posix()}",
+                    source_sqlite_url_or_path=f"sqlite:///{src.as_posix()}",
+                    batch_size=5,
+                    resume=False,
+                    checkpoint_path=root / "checkpoint.json",
+                )
+            self.assertTrue(out["ok"])
+            self.assertIn("source_fetch_events", synced)
+            self.assertIn("email_rules_versions", synced)
+            self.assertNotIn("raw_items", synced)  # string primary key: no sequence
+            self.assertFalse(out["stats"]["source_fetch_events"]["sequence_synced"])
+
+            # The first application insert after cutover gets a fresh id.
+            engine = create_engine(f"sqlite:///{tgt.as_posix()}")
+            table = Base.metadata.tables["source_fetch_events"]
+            with engine.begin() as conn:
+                new_id = conn.execute(
+                    table.insert().values(run_id="run-2", source_id="s1", status="ok", items_count=0, duration_ms=0)
+                ).inserted_primary_key[0]
+            engine.dispose()
+            self.assertEqual(new_id, 24)
+
+            # On Postgres the serial sequence is advanced to MAX(pk).
+            session = MagicMock()
+            session.get_bind.return_value.dialect.name = "postgresql"
+            self.assertTrue(db_migration._sync_pk_sequence(session, table, table.c.id))
+            stmt, params = session.execute.call_args.args
+            self.assertIn("setval(pg_get_serial_sequence(:table, :pk)", str(stmt))
+            self.assertIn('COALESCE((SELECT MAX("id") FROM "source_fetch_events"), 1)', str(stmt))
+            self.assertEqual(params, {"table": "source_fetch_events", "pk": "id"})
+            session.commit.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
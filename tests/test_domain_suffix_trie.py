@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+
+from app.services.classification_maps import (
+    classify_lane,
+    classify_region,
+    compile_region_map,
+    load_lane_map,
+    load_lane_matcher,
+    load_region_map,
+    load_region_matcher,
+    normalize_unknown,
+)
+from app.services.source_policy import is_domain_excluded
+from app.utils.domain_trie import DomainSuffixTrie
+from app.utils.url_norm import parse_url
+
+
+def _legacy_classify_region(url: str, mm: dict[str, Any]) -> str:
+    host = parse_url(url).netloc.strip()
+    if not host:
+        return "__unknown__"
+    for k, v in sorted(mm.get("domain_contains", {}).items(), key=lambda kv: len(str(kv[0])), reverse=True):
+        kk = str(k).strip().lower()
+        vv = normalize_unknown(v)
+        if kk and kk in host and vv != "__unknown__":
+            return vv
+    for k, v in mm.get("domain_suffix", {}).items():
+        kk = str(k).strip().lower()
+        vv = normalize_unknown(v)
+        if not kk or vv == "__unknown__":
+            continue
+        clean = kk[1:] if kk.startswith(".") else kk
+        if host == clean or host.endswith("." + clean):
+            return vv
+    return "__unknown__"
+
+
+def _legacy_is_domain_excluded(url: str, exclude_domains: list[str]) -> bool:
+    host = parse_url(url).host
+    if not host:
+        return False
+    for d in exclude_domains:
+        dd = str(d or "").strip().lower().lstrip(".")
+        if dd and (host == dd or host.endswith("." + dd)):
+            return True
+    return False
+
+
+URLS = [
+    "https://www.fda.gov/news",
+    "https://fda.gov.evil.com/x",
+    "https://notfda.gov/x",
+    "https://a.b.example.co.uk/y",
+    "https://example.co.uk/y",
+    "https://www.nmpa.gov.cn/z",
+    "https://host.example.com:8443/p",
+    "https://news.example.eu/ivd",
+    "https://localhost/",
+    "not a url",
+    "",
+]
+
+
+class DomainSuffixTrieTests(unittest.TestCase):
+    def test_first_added_wins_and_label_boundaries(self) -> None:
+        trie = DomainSuffixTrie([("com", "generic"), ("example.com", "specific"), ("com", "dup")])
+        self.assertEqual(len(trie), 2)
+        self.assertEqual(trie.lookup("a.example.com"), "generic")
+        self.assertIsNone(trie.lookup("example.org"))
+        self.assertTrue(DomainSuffixTrie([("example.com", True)]).matches("x.example.com"))
+        self.assertFalse(DomainSuffixTrie([("example.com", True)]).matches("badexample.com"))
+
+    def test_region_matches_legacy_scan(self) -> None:
+        maps = {
+            "domain_suffix": {".com": "北美", "co.uk": "欧洲", ".uk": "英国", ".cn": "中国", ".eu": "欧洲", "": "x"},
+            "domain_contains": {"fda.gov": "北美", "gov.cn": "中国", "example": "__unknown__", "host.example.com": "测试"},
+        }
+        repo_maps = load_region_map(Path(__file__).resolve().parents[1] / "rules")
+        for mm in (maps, repo_maps):
+            compiled = compile_region_map(mm)
+            for u in URLS:
+                self.assertEqual(classify_region(u, compiled), _legacy_classify_region(u, mm), u)
+                self.assertEqual(classify_region(u, mm), _legacy_classify_region(u, mm), u)
+
+    def test_domain_exclusion_matches_legacy_scan(self) -> None:
+        domains = ["gov", ".example.co.uk", "EXAMPLE.EU", "", "fda.gov.evil.com"]
+        for u in URLS:
+            self.assertEqual(is_domain_excluded(u, domains), _legacy_is_domain_excluded(u, domains), u)
+
+    def test_maps_cached_per_rules_root_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            mdir = Path(td) / "rules" / "mappings"
+            mdir.mkdir(parents=True)
+            region_path = mdir / "region_map.v1.yaml"
+            region_path.write_text('domain_suffix:\n  ".cn": "中国"\n', encoding="utf-8")
+            (mdir / "lane_map.v1.yaml").write_text('lanes:\n  分子诊断:\n    any: ["pcr"]\n', encoding="utf-8")
+
+            m1 = load_region_matcher(td)
+            self.assertIs(load_region_matcher(Path(td) / "rules"), m1)
+            self.assertIs(load_lane_matcher(td), load_lane_matcher(td))
+            self.assertEqual(classify_region("https://x.gov.cn/a", m1), "中国")
+            self.assertEqual(classify_lane("PCR panel", load_lane_matcher(td)), "分子诊断")
+            self.assertEqual(classify_lane("PCR panel", load_lane_map(td)), "分子诊断")
+
+            loaded = load_region_map(td)
+            loaded["domain_suffix"][".cn"] = "mutated"
+            self.assertEqual(load_region_map(td)["domain_suffix"][".cn"], "中国")
+
+            region_path.write_text('domain_suffix:\n  ".cn": "亚太"\n', encoding="utf-8")
+            st = region_path.stat()
+            os.utime(region_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            m2 = load_region_matcher(td)
+            self.assertIsNot(m2, m1)
+            self.assertEqual(classify_region("https://x.gov.cn/a", m2), "亚太")
+
+
+if __name__ == "__main__":
+    unittest.main()
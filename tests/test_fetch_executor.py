@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.fetch_executor import DEADLINE_EXCEEDED, FetchExecutor, FetchJob, host_of
+from app.services.fetch_probe import run_procurement_probe
+
+
+class _Tracker:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.total_active = 0
+        self.total_peak = 0
+
+    def job(self, key: str, host: str, delay: float) -> FetchJob:
+        def _run() -> str:
+            with self.lock:
+                self.active[host] = self.active.get(host, 0) + 1
+                self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+                self.total_active += 1
+                self.total_peak = max(self.total_peak, self.total_active)
+            try:
+                time.sleep(delay)
+                return key
+            finally:
+                with self.lock:
+                    self.active[host] -= 1
+                    self.total_active -= 1
+
+        return FetchJob(key=key, host=host, run=_run)
+
+
+def _fail(job: FetchJob, e: BaseException) -> str:
+    return f"error:{job.key}:{e}"
+
+
+def _skip(job: FetchJob, reason: str) -> str:
+    return f"{reason}:{job.key}"
+
+
+class FetchExecutorTests(unittest.TestCase):
+    def test_host_of(self) -> None:
+        self.assertEqual(host_of("https://WWW.Example.com:8443/a?b=1"), "www.example.com")
+        self.assertEqual(host_of(""), "")
+
+    def test_results_keep_input_order(self) -> None:
+        tr = _Tracker()
+        delays = [0.08, 0.01, 0.05, 0.0, 0.03, 0.02]
+        jobs = [tr.job(f"s{i}", f"h{i}", d) for i, d in enumerate(delays)]
+        out = FetchExecutor(max_workers=6).map(jobs, on_error=_fail, on_skip=_skip)
+        self.assertEqual(out, [f"s{i}" for i in range(6)])
+        self.assertGreater(tr.total_peak, 1)
+
+    def test_per_host_and_global_caps(self) -> None:
+        tr = _Tracker()
+        jobs = [tr.job(f"a{i}", "a.example", 0.03) for i in range(6)]
+        jobs += [tr.job(f"b{i}", "b.example", 0.03) for i in range(6)]
+        jobs += [tr.job(f"c{i}", "c.example", 0.03) for i in range(6)]
+        out = FetchExecutor(max_workers=4, per_host=2).map(jobs, on_error=_fail, on_skip=_skip)
+        self.assertEqual(out, [j.key for j in jobs])
+        self.assertLessEqual(max(tr.peak.values()), 2)
+        self.assertLessEqual(tr.total_peak, 4)
+        self.assertGreater(tr.total_peak, 2)
+
+    def test_errors_are_reported_per_job(self) -> None:
+        def boom() -> str:
+            raise RuntimeError("bad feed")
+
+        jobs = [FetchJob("ok", "h", lambda: "ok"), FetchJob("bad", "h", boom)]
+        out = FetchExecutor(max_workers=2).map(jobs, on_error=_fail, on_skip=_skip)
+        self.assertEqual(out, ["ok", "error:bad:bad feed"])
+
+    def test_deadline_skips_slow_and_queued_jobs(self) -> None:
+        tr = _Tracker()
+        jobs = [tr.job("fast", "a", 0.0), tr.job("slow", "b", 1.0), tr.job("queued", "c", 0.0)]
+        ex = FetchExecutor(max_workers=2, deadline_seconds=0.2)
+        t0 = time.perf_counter()
+        out = ex.map(jobs, on_error=_fail, on_skip=_skip)
+        self.assertLess(time.perf_counter() - t0, 0.8)
+        self.assertTrue(ex.deadline_hit)
+        self.assertEqual(out[0], "fast")
+        self.assertEqual(out[1], f"{DEADLINE_EXCEEDED}:slow")
+
+    def test_progress_events(self) -> None:
+        events: list[dict] = []
+        jobs = [FetchJob(f"s{i}", "h", lambda i=i: i) for i in range(3)]
+        FetchExecutor(max_workers=2, on_progress=events.append).map(jobs, on_error=_fail, on_skip=_skip)
+        self.assertEqual([e["done"] for e in events], [1, 2, 3])
+        self.assertTrue(all(e["total"] == 3 and e["status"] == "ok" for e in events))
+        self.assertEqual(sorted(e["key"] for e in events), ["s0", "s1", "s2"])
+
+
+class ProcurementProbeConcurrencyTests(unittest.TestCase):
+    def test_probe_rows_follow_selection_order(self) -> None:
+        sources = [
+            {"id": f"p{i}", "name": f"P{i}", "url": f"https://host{i % 2}.example/feed", "fetcher": "rss", "enabled": True}
+            for i in range(5)
+        ]
+
+        def fake_fetch(src, limit=5, source_guard=None):  # noqa: ANN001
+            time.sleep(0.05 if src["id"] == "p0" else 0.0)
+            if src["id"] == "p3":
+                raise RuntimeError("boom")
+            return {"ok": True, "entries": [], "http_status": 200}
+
+        with tempfile.TemporaryDirectory() as td, patch(
+            "app.services.fetch_probe._select_sources", return_value=sources
+        ), patch("app.services.fetch_probe.fetch_source_entries", side_effect=fake_fetch):
+            report = run_procurement_probe(project_root=Path(td), max_workers=4, per_host=1)
+        self.assertEqual([r.get("source_id") for r in report["per_source"]], [f"p{i}" for i in range(5)])
+        self.assertEqual(report["concurrency"]["per_host"], 1)
+        self.assertEqual(report["per_source"][3].get("status"), "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.fetch_executor import FetchExecutor, FetchJob
+from app.services.fetch_snapshot import (
+    MODE_RECORD,
+    MODE_REPLAY,
+    FetchSnapshotError,
+    FetchSnapshotStore,
+    active_snapshot_session,
+    snapshot_report_date,
+    snapshot_session,
+)
+from app.services.source_registry import _fetch_url_with_retry, fetch_source_entries
+from app.utils.run_env import run_env
+from scripts import generate_ivd_report as report
+
+
+RSS = b"""<rss version='2.0'><channel><title>x</title>
+<item><title>IVD assay cleared</title><link>https://example.com/a/1</link><description>first</description></item>
+<item><title>PCR panel launch</title><link>https://example.com/a/2</link><description>second</description></item>
+</channel></rss>"""
+
+
+def _live(url, headers, timeout, retries):  # noqa: ANN001
+    if url.endswith("feed.xml"):
+        return {"ok": True, "data": RSS, "http_status": 200, "content_type": "application/rss+xml", "etag": '"f1"'}
+    if url.endswith("/missing"):
+        return {"ok": False, "data": b"", "http_status": None, "error_type": "http_error", "error_message": "HTTPError: 404"}
+    return {"ok": True, "data": b"<html>same body</html>", "http_status": 200, "content_type": "text/html"}
+
+
+def _no_network(*args, **kwargs):  # noqa: ANN002, ANN003
+    raise AssertionError("network access during snapshot replay")
+
+
+class FetchSnapshotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self._env = patch.dict(os.environ, {"FETCH_SNAPSHOT_DIR": str(self.root / "snaps")})
+        self._env.start()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        self._td.cleanup()
+
+    def test_record_then_replay_without_network(self) -> None:
+        with patch("app.services.source_registry._fetch_url_live", side_effect=_live):
+            with snapshot_session(self.root, "collect-1", MODE_RECORD, report_date="2026-02-20") as sess:
+                live = [_fetch_url_with_retry(u, {}, 5, 0) for u in ("https://example.com/p/1", "https://example.com/p/2", "https://example.com/missing")]
+                self.assertIs(active_snapshot_session(), sess)
+        self.assertIsNone(active_snapshot_session())
+        store = FetchSnapshotStore(self.root / "snaps")
+        self.assertEqual(len(list((self.root / "snaps" / "blobs").glob("*/*.gz"))), 1)
+        self.assertEqual(snapshot_report_date(self.root, "collect-1"), "2026-02-20")
+        self.assertEqual(store.list_runs(), ["collect-1"])
+
+        with patch("app.services.source_registry._fetch_url_live", side_effect=_no_network):
+            with snapshot_session(self.root, "collect-1", MODE_REPLAY) as sess:
+                replayed = [_fetch_url_with_retry(u, {}, 5, 0) for u in ("https://example.com/p/1", "https://example.com/p/2", "https://example.com/missing")]
+                miss = _fetch_url_with_retry("https://example.com/never", {}, 5, 0)
+                self.assertEqual(sess.summary()["misses"], 1)
+        for a, b in zip(live, replayed):
+            self.assertEqual(
+                (a["ok"], a["data"], a["http_status"], a.get("error_type", "")),
+                (b["ok"], b["data"], b["http_status"], b.get("error_type", "")),
+            )
+        self.assertEqual(miss["error_type"], "snapshot_miss")
+
+    def test_fetch_source_entries_replay_is_identical(self) -> None:
+        source = {"id": "s1", "name": "S1", "connector": "rss", "url": "https://example.com/feed.xml", "fetch": {}}
+        with patch("app.services.source_registry._fetch_url_live", side_effect=_live):
+            with snapshot_session(self.root, "run-a", MODE_RECORD):
+                live = fetch_source_entries(source, limit=10)
+        with patch("app.services.source_registry._fetch_url_live", side_effect=_no_network):
+            with snapshot_session(self.root, "run-a", MODE_REPLAY):
+                replayed = fetch_source_entries(source, limit=10)
+        live.pop("duration_ms", None)
+        replayed.pop("duration_ms", None)
+        self.assertTrue(live["ok"])
+        self.assertEqual(live, replayed)
+
+    def test_session_is_scoped_to_its_context_and_fetch_pool(self) -> None:
+        other: list[tuple] = []
+
+        def _admin_request() -> None:
+            other.append((active_snapshot_session(), _fetch_url_with_retry("https://example.com/x", {}, 5, 0)))
+
+        with patch("app.services.source_registry._fetch_url_live", side_effect=_live):
+            with snapshot_session(self.root, "scoped", MODE_RECORD) as sess:
+                # An unrelated thread (another admin request) neither sees nor records into the session.
+                t = threading.Thread(target=_admin_request)
+                t.start()
+                t.join()
+                pooled = FetchExecutor(max_workers=2).map(
+                    [FetchJob(key=str(i), host="", run=active_snapshot_session) for i in range(3)],
+                    on_error=lambda job, e: None,
+                    on_skip=lambda job, reason: None,
+                )
+                self.assertEqual(sess.summary()["recorded"], 0)
+        self.assertIsNone(other[0][0])
+        self.assertTrue(other[0][1]["ok"])
+        self.assertEqual(pooled, [sess, sess, sess])
+
+    def test_failed_report_run_ends_its_session(self) -> None:
+        env = {**os.environ, "REPORT_DATE": "2026-02-20", "REPORT_RUN_ID": "run-fail", "FETCH_SNAPSHOT_ENABLED": "1"}
+        with run_env(env), patch.object(report, "load_runtime_rules", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                report.main()
+            self.assertIsNone(active_snapshot_session())
+        self.assertEqual(FetchSnapshotStore(self.root / "snaps").list_runs(), ["run-fail"])
+
+    def test_missing_or_invalid_snapshot_raises(self) -> None:
+        with self.assertRaises(FetchSnapshotError):
+            snapshot_report_date(self.root, "nope")
+        with self.assertRaises(FetchSnapshotError):
+            FetchSnapshotStore(self.root).manifest_path("../escape")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import itertools
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from app.db.base import Base
+from app.services.db_migration import dual_replay_compare
+from app.services.merkle_verify import MerkleTableCompare, merkle_verify, table_sides
+
+
+def _db(path: Path, n: int = 600):  # noqa: ANN202
+    engine = create_engine(f"sqlite:///{path.as_posix()}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO raw_items(id,source_id,fetched_at,title_raw,title_norm,url_raw,canonical_url,raw_payload,priority) "
+                "VALUES(:id,'s1','2026-01-01T00:00:00Z',:t,:t,:u,:u,:p,0)"
+            ),
+            [{"id": f"ri-{i:05d}", "t": f"title {i}", "u": f"https://e.example/{i}", "p": json.dumps({"i": i})} for i in range(n)],
+        )
+        conn.execute(
+            text("INSERT INTO source_fetch_events(run_id,source_id,status,items_count,duration_ms) VALUES('r','s','ok',:i,0)"),
+            [{"i": i} for i in range(n)],
+        )
+    return engine
+
+
+def _diverge(engine) -> None:  # noqa: ANN001
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE raw_items SET title_norm = 'changed' WHERE id = 'ri-00137'"))
+        conn.execute(text("DELETE FROM raw_items WHERE id = 'ri-00402'"))
+        conn.execute(
+            text(
+                "INSERT INTO raw_items(id,source_id,fetched_at,title_raw,title_norm,url_raw,canonical_url,raw_payload,priority) "
+                "VALUES(:id,'s1','x','t','t','u','u','{}',0)"
+            ),
+            [{"id": "ri-00250a"}, {"id": "zz-extra"}],
+        )
+        conn.execute(text("UPDATE source_fetch_events SET items_count = -1 WHERE id = 333"))
+
+
+EXPECTED = [
+    {"key": "ri-00137", "kind": "content_differs"},
+    {"key": "ri-00250a", "kind": "missing_in_left"},
+    {"key": "ri-00402", "kind": "missing_in_right"},
+    {"key": "zz-extra", "kind": "missing_in_left"},
+]
+
+
+class MerkleVerifyTests(unittest.TestCase):
+    def test_identical_tables_match(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            left, right = _db(Path(td) / "l.db"), _db(Path(td) / "r.db")
+            out = merkle_verify(left, right, ["raw_items", "source_fetch_events", "stories"], chunk_size=100)
+            self.assertTrue(out["ok"])
+            self.assertTrue(out["complete"])
+            self.assertEqual(out["tables"]["raw_items"]["chunks_checked"], 7)
+            self.assertEqual(out["tables"]["stories"]["chunks_checked"], 1)
+
+    def test_drills_only_into_mismatching_ranges(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            left, right = _db(Path(td) / "l.db"), _db(Path(td) / "r.db")
+            _diverge(right)
+            sides = table_sides(left, right, "raw_items")
+            cmp = MerkleTableCompare(*sides, chunk_size=100, fanout=4, leaf_size=8)
+            out = cmp.run()
+            self.assertEqual(out["diverged_keys"], EXPECTED)
+            self.assertEqual(out["chunks_mismatched"], 4)
+            # Each mismatching chunk of 100 descends 100 -> 25 -> 7: 1 + 1 + 1 ranges, not whole chunks.
+            self.assertLessEqual(out["ranges_drilled"], 4 * 3)
+
+            events = MerkleTableCompare(*table_sides(left, right, "source_fetch_events"), chunk_size=100).run()
+            self.assertEqual(events["diverged_keys"], [{"key": 333, "kind": "content_differs"}])
+
+    def test_time_bounded_runs_resume_from_state(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            left, right = _db(Path(td) / "l.db"), _db(Path(td) / "r.db")
+            _diverge(right)
+            state = Path(td) / "state.json"
+            clock = itertools.count()
+            found: list[dict] = []
+            runs = 0
+            with patch("app.services.merkle_verify.time.monotonic", side_effect=lambda: float(next(clock))):
+                while True:
+                    runs += 1
+                    out = merkle_verify(
+                        left, right, ["raw_items", "source_fetch_events"], chunk_size=100, deadline_seconds=3, state_path=state
+                    )
+                    for res in out["tables"].values():
+                        found.extend(res["diverged_keys"])
+                    if out["complete"] or runs > 20:
+                        break
+            self.assertGreater(runs, 3)
+            self.assertEqual([k for k in found if isinstance(k["key"], str)], EXPECTED)
+            self.assertIn({"key": 333, "kind": "content_differs"}, found)
+            saved = json.loads(state.read_text(encoding="utf-8"))
+            self.assertEqual(saved["tables"]["raw_items"]["passes"], 1)
+
+    def test_dual_replay_compare_with_feed_tables(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            lp, rp = Path(td) / "l.db", Path(td) / "r.db"
+            _db(lp, 50)
+            _diverge(_db(rp, 50))
+            out = dual_replay_compare(
+                project_root=Path.cwd(),
+                primary_url=f"sqlite:///{lp.as_posix()}",
+                secondary_url=f"sqlite:///{rp.as_posix()}",
+                tables=["raw_items"],
+                chunk_size=16,
+            )
+            self.assertFalse(out["ok"])
+            self.assertEqual([m["type"] for m in out["mismatches"]], ["merkle_range_diff"])
+            self.assertEqual(out["merkle"]["tables"]["raw_items"]["diverged_keys"], [EXPECTED[1], EXPECTED[3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
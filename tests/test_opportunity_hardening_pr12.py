@@ -163,5 +163,39 @@ class OpportunityHardeningPR12Tests(unittest.TestCase):
         self.assertFalse(bool(l_opp.get("enabled", True)))
         self.assertEqual(int(((e_opp.get("dedupe", {}) or {}).get("tail_lines_scan", 0) or 0)), 2000)
 
+    def test_batch_append_matches_per_signal_counters(self) -> None:
+        signals = []
+        for i in range(30):
+            j = i if i % 5 else max(0, i - 3)
+            signals.append(
+                {
+                    "date": "2026-02-21" if j % 2 else "2026-02-22",
+                    "region": "__window_probe__r" if i == 7 else "中国",
+                    "lane": "感染检测",
+                    "event_type": "regulatory",
+                    "weight": 4,
+                    "source_id": "fda",
+                    "url_norm": f"https://example.com/{j}",
+                }
+            )
+        with tempfile.TemporaryDirectory() as td:
+            single = OpportunityStore(Path(td) / "single", asset_dir="opp")
+            expected = {"written": 0, "deduped": 0, "dropped_probe": 0}
+            for sig in signals:
+                for k, v in single.append_signal(sig).items():
+                    expected[k] += int(v)
+            batch = OpportunityStore(Path(td) / "batch", asset_dir="opp")
+            got = batch.append_signals_batch(signals)
+            self.assertEqual(got, expected)
+            self.assertEqual(got["dropped_probe"], 1)
+            self.assertGreater(got["deduped"], 0)
+            now = dt.datetime(2026, 2, 22, tzinfo=dt.timezone.utc)
+            keys = lambda s: sorted(r["signal_key"] for r in s.load_signals(7, now_utc=now))  # noqa: E731
+            self.assertEqual(keys(batch), keys(single))
+            # A fresh store rebuilds the seen index from the day files and dedupes the whole batch.
+            again = OpportunityStore(Path(td) / "batch", asset_dir="opp").append_signals_batch(signals)
+            self.assertEqual((again["written"], again["deduped"]), (0, expected["written"] + expected["deduped"]))
+
+
 if __name__ == "__main__":
     unittest.main()
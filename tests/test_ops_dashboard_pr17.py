@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import json
 import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
+from app.services import ops_metrics
+from app.services.ops_metrics import read_latest_artifact, record_latest_artifact
 from app.web.rules_admin_api import create_app
 
 
@@ -106,6 +110,44 @@ class OpsDashboardPr17Tests(unittest.TestCase):
         self.assertEqual(page.status_code, 200)
         self.assertIn("Ops Dashboard Lite", page.text)
 
+    def test_summary_reads_latest_pointers_and_caches_until_files_change(self) -> None:
+        art = self.root / "artifacts"
+        self._write_fixture("run_meta_digest.json", art / "run-abc" / "run_meta.json")
+        self._write_fixture("run_meta_collect.json", art / "collect-1771737600" / "run_meta.json")
+        self._write_fixture("probe_report.json", art / "procurement" / "probe_report-20260222-0100.json")
+        first = self._auth_get("/admin/api/ops/summary")
+        # The first request had no pointers: it scanned once and recorded what it found.
+        self.assertEqual(read_latest_artifact(art, "collect"), str(art / "collect-1771737600" / "run_meta.json"))
+
+        newer = art / "collect-1771800000" / "run_meta.json"
+        self._write_fixture("run_meta_collect.json", newer)
+        with patch.object(ops_metrics, "find_latest_json", side_effect=AssertionError("scanned")), patch(
+            "app.web.rules_admin_api.safe_load_json", side_effect=AssertionError("reparsed")
+        ):
+            self.assertEqual(self._auth_get("/admin/api/ops/summary"), first)
+
+        payload = json.loads(newer.read_text(encoding="utf-8"))
+        payload["assets_written_count"] = 7
+        newer.write_text(json.dumps(payload), encoding="utf-8")
+        record_latest_artifact(art, "collect", newer)
+        body = self._auth_get("/admin/api/ops/summary")
+        self.assertEqual(body["collect"]["assets_written_count"], 7)
+        self.assertEqual(body["files"]["collect_meta_path"], "artifacts/collect-1771800000/run_meta.json")
+
+    def test_record_latest_keeps_newest_run(self) -> None:
+        art = self.root / "artifacts"
+        old, new = art / "run-a" / "run_meta.json", art / "run-b" / "run_meta.json"
+        self._write_fixture("run_meta_digest.json", old)
+        self._write_fixture("run_meta_digest.json", new)
+        os.utime(old, (1_700_000_000, 1_700_000_000))
+        record_latest_artifact(art, "digest", new)
+        record_latest_artifact(art, "digest", old)
+        self.assertEqual(read_latest_artifact(art, "digest"), str(new))
+        new.unlink()
+        self.assertIsNone(read_latest_artifact(art, "digest"))
+        # With the pointed-at file gone the summary falls back to scanning.
+        self.assertEqual(self._auth_get("/admin/api/ops/summary")["files"]["digest_meta_path"], "artifacts/run-a/run_meta.json")
+
 
 if __name__ == "__main__":
     unittest.main()
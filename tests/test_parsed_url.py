@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import unittest
+from urllib.parse import urlparse
+
+from app.services.analysis_cache_store import AnalysisCacheStore
+from app.services.classification_maps import classify_region
+from app.services.opportunity_store import normalize_event_type
+from app.services.page_classifier import is_static_or_listing_url
+from app.services.source_policy import exclusion_reason, host_from_url, normalize_source_policy
+from app.utils.url_norm import ParsedUrl, parse_url, url_norm
+
+
+def _legacy_url_norm(url: str) -> str:
+    try:
+        p = urlparse(str(url or ""))
+        host = (p.netloc or "").lower()
+        path = (p.path or "").rstrip("/")
+        query = p.query.strip()
+        kept_query = ""
+        if query:
+            low = query.lower()
+            if any(k in low for k in ("id=", "article=", "story=", "p=", "item=")):
+                kept_query = "?" + query
+        return f"{host}{path}{kept_query}"
+    except Exception:
+        return str(url or "").strip().lower()
+
+
+URLS = [
+    "https://Example.com/path/item/?utm_source=x#frag",
+    "https://www.fda.gov/news-events/press?id=123",
+    "http://user:pw@Host.EXAMPLE.org:8080/a/b/",
+    "https://news.example.co.uk/category/ivd",
+    "https://example.com",
+    "not a url",
+    "",
+    "http://[::1/broken",
+]
+
+
+class ParsedUrlTests(unittest.TestCase):
+    def test_norm_matches_legacy(self) -> None:
+        for u in URLS:
+            self.assertEqual(url_norm(u), _legacy_url_norm(u), u)
+            self.assertEqual(parse_url(u).norm, _legacy_url_norm(u), u)
+
+    def test_host_and_suffix_chain(self) -> None:
+        p = parse_url("http://user:pw@Host.EXAMPLE.org:8080/a/b/")
+        self.assertIsInstance(p, ParsedUrl)
+        self.assertEqual(p.host, "host.example.org")
+        self.assertEqual(p.netloc, "user:pw@host.example.org:8080")
+        self.assertEqual(p.suffixes, ("host.example.org", "example.org", "org"))
+        self.assertFalse(parse_url("http://[::1/broken").ok)
+
+    def test_parse_is_memoized(self) -> None:
+        self.assertIs(parse_url("https://memo.example.com/x"), parse_url("https://memo.example.com/x"))
+
+    def test_call_sites_accept_parsed_url(self) -> None:
+        policy = normalize_source_policy(
+            {"exclude_domains": ["blocked.example.com"], "drop_if_url_matches": [r"/sponsored/"]},
+            profile="enhanced",
+        )
+        region_maps = {"domain_suffix": {".gov": "北美", ".cn": "中国"}}
+        samples = URLS + [
+            "https://sub.blocked.example.com/news/1",
+            "https://example.com/sponsored/2",
+            "https://www.nmpa.gov.cn/xxgk/notice/1.html",
+            "https://www.fda.gov/fda/news/1",
+        ]
+        for u in samples:
+            p = parse_url(u)
+            self.assertEqual(host_from_url(p), host_from_url(u), u)
+            self.assertEqual(exclusion_reason("s", p, policy), exclusion_reason("s", u, policy), u)
+            self.assertEqual(is_static_or_listing_url(p), is_static_or_listing_url(u), u)
+            self.assertEqual(classify_region(p, region_maps), classify_region(u, region_maps), u)
+            self.assertEqual(normalize_event_type("", url=p), normalize_event_type("", url=u), u)
+            self.assertEqual(
+                AnalysisCacheStore.item_key({"url": u, "story_id": "s1"}, parsed_url=p),
+                AnalysisCacheStore.item_key({"url": u, "story_id": "s1"}),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import datetime as dt
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.core.track_relevance import relevance_rules_fingerprint
+from app.services.collect_asset_store import CollectAssetStore, relevance_runtime_for, render_digest_from_assets
+
+
+NOW = dt.datetime(2026, 2, 20, 9, 0, tzinfo=dt.timezone.utc)
+ITEMS = [
+    {"title": "FDA clears PCR assay for sepsis", "url": "https://example.com/a", "summary": "diagnostic test cleared", "published_at": "2026-02-20T08:00:00Z"},
+    {"title": "Single-cell sequencing platform launch", "url": "https://example.com/b", "summary": "ngs assay", "published_at": "2026-02-20T07:00:00Z"},
+    {"title": "Quarterly revenue update", "url": "https://example.com/c", "summary": "earnings call", "published_at": "2026-02-20T06:00:00Z"},
+]
+
+
+def _collect(root: Path, runtime: dict) -> list[dict]:
+    store = CollectAssetStore(root, asset_dir="artifacts/collect")
+    store.append_items(
+        run_id="collect-1",
+        source_id="src-1",
+        source_name="Example",
+        source_group="media",
+        items=[dict(x) for x in ITEMS],
+        rules_runtime=runtime,
+        now_utc=NOW,
+    )
+    return store.load_window_items(window_hours=24, now_utc=NOW)
+
+
+def _render(rows: list[dict], cfg: dict) -> dict:
+    rendered = render_digest_from_assets(
+        date_str="2026-02-20",
+        items=rows,
+        subject="全球IVD晨报 - 2026-02-20",
+        analysis_cfg={"enable_analysis_cache": False, **cfg},
+        return_meta=True,
+    )
+    assert isinstance(rendered, dict)
+    return rendered
+
+
+class RelevanceReuseTests(unittest.TestCase):
+    def test_fingerprint_tracks_packs_and_flags(self) -> None:
+        base = relevance_rules_fingerprint({})
+        self.assertEqual(base, relevance_rules_fingerprint({"anchors_pack": {}, "negatives_pack": []}))
+        self.assertNotEqual(base, relevance_rules_fingerprint({"investment_scope_enabled": True}))
+        self.assertNotEqual(base, relevance_rules_fingerprint({"anchors_pack": {"core": ["ivd"], "frontier": []}}))
+        self.assertNotEqual(base, relevance_rules_fingerprint({"negatives_pack": ["layoff"]}))
+
+    def test_digest_reuses_collect_time_relevance_when_rules_match(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            runtime = relevance_runtime_for("legacy", {})
+            rows = _collect(Path(td), runtime)
+            self.assertTrue(all(r.get("relevance_fingerprint") == relevance_rules_fingerprint(runtime) for r in rows))
+
+            with patch("app.services.collect_asset_store.compute_relevance") as scorer:
+                meta = _render(rows, {"profile": "legacy"})["meta"]
+            scorer.assert_not_called()
+            self.assertEqual((meta["relevance_reused"], meta["relevance_recomputed"]), (len(rows), 0))
+
+            reused = _render(rows, {"profile": "legacy"})
+            fresh = _render([{k: v for k, v in r.items() if k != "relevance_fingerprint"} for r in rows], {"profile": "legacy"})
+            strip = lambda t: [ln for ln in str(t).splitlines() if not ln.startswith("relevance_reused/recomputed")]  # noqa: E731
+            self.assertEqual(strip(reused["text"]), strip(fresh["text"]))
+            self.assertEqual(fresh["meta"]["relevance_recomputed"], len(rows))
+
+    def test_rule_or_text_change_forces_rescore(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            rows = _collect(Path(td), relevance_runtime_for("legacy", {}))
+            meta = _render(rows, {"profile": "legacy", "anchors_pack": {"core": ["sepsis"], "frontier": ["single-cell"]}})["meta"]
+            self.assertEqual((meta["relevance_reused"], meta["relevance_recomputed"]), (0, len(rows)))
+
+            edited = [dict(r) for r in rows]
+            edited[0]["summary"] = "diagnostic test cleared with updated label"
+            meta = _render(edited, {"profile": "legacy"})["meta"]
+            self.assertEqual((meta["relevance_reused"], meta["relevance_recomputed"]), (len(rows) - 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.report_engine import (
+    MODE_INPROCESS,
+    MODE_SUBPROCESS,
+    ReportEngine,
+    report_engine_mode,
+    run_report,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+FAKE_SCRIPT = '''
+import sys
+import time
+
+from app.utils.run_env import run_getenv
+
+RUNTIME_CONTENT = {"seen": []}
+
+
+def main() -> int:
+    RUNTIME_CONTENT["seen"].append(run_getenv("REPORT_RUN_ID", ""))
+    if run_getenv("FAKE_FAIL") == "1":
+        raise RuntimeError("boom")
+    if run_getenv("FAKE_BLOCK") == "1":
+        time.sleep(0.5)
+    print("subject " + run_getenv("REPORT_DATE", ""))
+    print("seen=" + ",".join(RUNTIME_CONTENT["seen"]))
+    print("progress", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+'''
+
+
+class ReportEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        (self.root / "scripts").mkdir()
+        (self.root / "scripts" / "generate_ivd_report.py").write_text(FAKE_SCRIPT, encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _env(self, run_id: str, **extra: str) -> dict[str, str]:
+        env = {k: v for k, v in os.environ.items() if k not in ("FAKE_FAIL", "FAKE_BLOCK")}
+        # The subprocess-mode fake script imports app.* from the repo.
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (str(REPO_ROOT), env.get("PYTHONPATH", "")) if p)
+        env.update({"REPORT_RUN_ID": run_id, "REPORT_DATE": "2026-02-16", **extra})
+        return env
+
+    def test_warm_runs_are_isolated(self) -> None:
+        engine = ReportEngine(self.root)
+        first = engine.run(self._env("r1"))
+        second = engine.run(self._env("r2"))
+        self.assertEqual(first.stdout, "subject 2026-02-16\nseen=r1\n")
+        self.assertEqual(second.stdout, "subject 2026-02-16\nseen=r2\n")
+        self.assertEqual(first.stderr, "progress\n")
+        self.assertEqual((first.warm, second.warm, second.import_ms), (False, True, 0))
+        self.assertEqual(second.meta()["mode"], MODE_INPROCESS)
+        self.assertNotIn("REPORT_RUN_ID", os.environ)
+
+    def test_failure_raises_called_process_error(self) -> None:
+        engine = ReportEngine(self.root)
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            engine.run(self._env("r1", FAKE_FAIL="1"))
+        self.assertIn("RuntimeError: boom", cm.exception.stderr)
+        self.assertNotIn("FAKE_FAIL", os.environ)
+        self.assertEqual(engine.run(self._env("r2")).returncode, 0)
+
+    def test_timed_out_run_does_not_touch_process_env(self) -> None:
+        engine = ReportEngine(self.root)
+        with self.assertRaises(subprocess.TimeoutExpired):
+            engine.run(self._env("r1", FAKE_BLOCK="1"), timeout=0.05)
+        # The run is still going on its own thread; the process env never carried its overlay.
+        self.assertNotIn("REPORT_RUN_ID", os.environ)
+        self.assertNotIn("FAKE_BLOCK", os.environ)
+        self.assertEqual(engine.run(self._env("r2")).returncode, 0)
+
+    def test_subprocess_mode_matches_inprocess_output(self) -> None:
+        inproc = run_report(self.root, self._env("r1"), mode=MODE_INPROCESS)
+        sub = run_report(self.root, self._env("r1"), mode=MODE_SUBPROCESS)
+        self.assertEqual(inproc.stdout, sub.stdout)
+        self.assertEqual(sub.meta()["warm"], False)
+
+    def test_repo_report_script_loads_in_process(self) -> None:
+        engine = ReportEngine(REPO_ROOT)
+        module, import_ms = engine._load()
+        self.assertTrue(callable(module.main))
+        self.assertGreaterEqual(import_ms, 0)
+        self.assertTrue(engine.warm)
+
+    def test_mode_resolution(self) -> None:
+        with patch.dict(os.environ, {"REPORT_ENGINE_MODE": ""}):
+            self.assertEqual(report_engine_mode(), MODE_SUBPROCESS)
+            self.assertEqual(report_engine_mode(default=MODE_INPROCESS), MODE_INPROCESS)
+            self.assertEqual(report_engine_mode("in-process"), MODE_INPROCESS)
+        with patch.dict(os.environ, {"REPORT_ENGINE_MODE": "subprocess"}):
+            self.assertEqual(report_engine_mode(default=MODE_INPROCESS), MODE_SUBPROCESS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.report_history_index import (
+    INDEX_DIRNAME,
+    ReportHistoryIndex,
+    item_repeat_key,
+    parse_report_items,
+    report_repeat_keys,
+)
+from app.workers.dryrun import _calc_repeat_rates, _parse_items_from_report
+from scripts.generate_ivd_report import load_history_titles, normalize_title
+
+
+def _report(day: str, items: list[tuple[str, str]]) -> str:
+    lines = [f"全球IVD晨报 - {day}", "", "A. 今日要点"]
+    for i, (title, link) in enumerate(items, 1):
+        lines.append(f"{i}) [24h] {title}")
+        lines.append("摘要：some summary")
+        lines.append(f"来源：Src | {link}" if link else "来源：Src")
+    lines += ["", "B. 分赛道速览", "1) [7d] Not An A Item"]
+    return "\n".join(lines) + "\n"
+
+
+def _write(reports: Path, day: str, items: list[tuple[str, str]]) -> Path:
+    p = reports / f"ivd_morning_{day}.txt"
+    p.write_text(_report(day, items), encoding="utf-8")
+    return p
+
+
+def _glob_history(reports: Path, today: str) -> dict[str, set[str]]:
+    # Pre-index behaviour: parse every report on disk, keep the 7 latest before today.
+    import re
+
+    by_day: dict[str, set[str]] = {}
+    for p in sorted(reports.glob("ivd_morning_*.txt")):
+        m = re.search(r"ivd_morning_(\d{4}-\d{2}-\d{2})\.txt$", p.name)
+        if not m or m.group(1) >= today:
+            continue
+        out = set()
+        for ln in p.read_text(encoding="utf-8").splitlines():
+            mm = re.match(r"^\d+\)\s+\[[^\]]+\]\s+(.+)$", ln.strip())
+            if mm:
+                out.add(normalize_title(mm.group(1)))
+        by_day[m.group(1)] = out
+    return {d: by_day[d] for d in sorted(by_day, reverse=True)[:7]}
+
+
+class ReportHistoryIndexTests(unittest.TestCase):
+    def test_repeat_keys_match_dryrun_parser(self) -> None:
+        text = _report(
+            "2026-03-01",
+            [("Breaking: FDA clears assay", ""), ("Roche launches test", "https://x.example/1"), ("", ""), ("PCR kit", "")],
+        ) + "\n来源：orphan | https://ignored.example\n"
+        expected = set()
+        for it in _parse_items_from_report(text):
+            k = item_repeat_key(it["title"], it["link"])
+            if k:
+                expected.add(k)
+        self.assertEqual(report_repeat_keys(text), expected)
+        self.assertIn("fda clears assay", expected)
+        # One section-A parser: the dry-run uses the index's.
+        self.assertIs(_parse_items_from_report, parse_report_items)
+
+    def test_history_titles_match_full_scan(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            reports = Path(td)
+            d0 = dt.date(2026, 3, 20)
+            # Dense recent days, a gap, then old reports (exercises the listing fallback too).
+            days = [d0 - dt.timedelta(days=o) for o in (0, 1, 2, 4)] + [d0 - dt.timedelta(days=o) for o in (60, 61, 90, 400)]
+            for d in days:
+                _write(reports, d.isoformat(), [(f"Story {d.isoformat()}", ""), ("Shared story", "")])
+            (reports / "ivd_morning_replay_run-1.txt").write_text("1) [x] replay\n", encoding="utf-8")
+            for today in ("2026-03-20", "2026-03-21", "2026-01-30"):
+                yday, recent = load_history_titles(reports, today)
+                expected = _glob_history(reports, today)
+                self.assertEqual(recent, expected)
+                self.assertEqual(list(recent), list(expected))
+                self.assertEqual(yday, next(iter(expected.values()), set()))
+            self.assertTrue((reports / INDEX_DIRNAME / "2026-03-19.json").exists())
+
+    def test_rewritten_report_is_reindexed(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            reports = Path(td)
+            p = _write(reports, "2026-03-01", [("First title", "")])
+            self.assertEqual(ReportHistoryIndex(reports).keys("2026-03-01", "repeat_keys"), {"first title"})
+            p.write_text(_report("2026-03-01", [("Second longer title", "")]), encoding="utf-8")
+            st = p.stat()
+            os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(ReportHistoryIndex(reports).keys("2026-03-01", "repeat_keys"), {"second longer title"})
+            # A corrupt index file is rebuilt, a missing report answers empty.
+            (reports / INDEX_DIRNAME / "2026-03-01.json").write_text("{", encoding="utf-8")
+            self.assertEqual(ReportHistoryIndex(reports).keys("2026-03-01", "repeat_keys"), {"second longer title"})
+            self.assertEqual(ReportHistoryIndex(reports).keys("2026-03-02"), frozenset())
+
+    def test_index_is_read_without_reparsing(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            reports = Path(td)
+            _write(reports, "2026-03-01", [("Real title", "")])
+            idx = ReportHistoryIndex(reports)
+            idx.keys("2026-03-01")
+            ip = reports / INDEX_DIRNAME / "2026-03-01.json"
+            entry = json.loads(ip.read_text(encoding="utf-8"))
+            entry["titles"] = ["from index"]
+            ip.write_text(json.dumps(entry), encoding="utf-8")
+            self.assertEqual(ReportHistoryIndex(reports).keys("2026-03-01"), {"from index"})
+
+    def test_repeat_rates_from_index(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            reports = root / "reports"
+            reports.mkdir()
+            _write(reports, "2026-03-09", [("A story", "https://e.example/a"), ("Update: B story", "")])
+            _write(reports, "2026-03-05", [("A story", "https://e.example/a"), ("B story", ""), ("C story", "")])
+            items = [
+                {"title": "A story", "link": "https://e.example/a"},
+                {"title": "B story", "link": ""},
+                {"title": "C story", "link": ""},
+                {"title": "D story", "link": "https://e.example/d"},
+            ]
+            out = _calc_repeat_rates(root, "2026-03-10", items)
+            self.assertEqual(out["repeat_yesterday_count"], 2)
+            self.assertAlmostEqual(out["repeat_rate_yesterday"], 0.5)
+            self.assertAlmostEqual(out["repeat_rate_7d_max"], 0.75)
+            self.assertEqual(out["repeat_7d_max_date"], "2026-03-05")
+
+
+if __name__ == "__main__":
+    unittest.main()
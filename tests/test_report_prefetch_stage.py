@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.fetch_executor import DEADLINE_EXCEEDED
+from scripts import generate_ivd_report as report
+
+
+def _sources(n: int) -> list[tuple]:
+    return [
+        (f"s{i}", "rss", f"Source {i}", f"https://host{i % 3}.example/feed", "北美", "media", 50, "media_global", {})
+        for i in range(n)
+    ]
+
+
+class ReportPrefetchStageTests(unittest.TestCase):
+    def test_results_follow_registry_order_under_limits(self) -> None:
+        lock = threading.Lock()
+        active: dict[str, int] = {}
+        peak: dict[str, int] = {}
+
+        def fake_fetch(src, limit=50, timeout_seconds=None, retries=None):  # noqa: ANN001
+            host = src["url"].split("/")[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            try:
+                time.sleep(0.03 if src["id"] in {"s0", "s4"} else 0.005)
+                if src["id"] == "s5":
+                    raise RuntimeError("boom")
+                return {"ok": True, "entries": [{"title": src["id"], "url": src["url"]}], "http_status": 200}
+            finally:
+                with lock:
+                    active[host] -= 1
+
+        official = [("official:a", "https://www.nmpa.gov.cn/", lambda: ["nmpa-item"])]
+        with patch.object(report, "fetch_source_entries", side_effect=fake_fetch):
+            fetched, official_items, stage = report.prefetch_sources(
+                _sources(9),
+                official=official,
+                limit=5,
+                timeout_seconds=3,
+                retries=0,
+                settings={"max_workers": 4, "per_host": 1, "deadline_seconds": 0},
+            )
+        titles = [f["entries"][0]["title"] if f["ok"] else None for f in fetched]
+        self.assertEqual(titles, ["s0", "s1", "s2", "s3", "s4", None, "s6", "s7", "s8"])
+        self.assertEqual(fetched[5]["error_type"], "RuntimeError")
+        self.assertEqual(official_items, [["nmpa-item"]])
+        self.assertLessEqual(max(peak.values()), 1)
+        self.assertEqual((stage["sources"], stage["per_host"], stage["deadline_hit"]), (9, 1, False))
+
+    def test_deadline_and_live_progress(self) -> None:
+        def fake_fetch(src, limit=50, timeout_seconds=None, retries=None):  # noqa: ANN001
+            time.sleep(1.0 if src["id"] == "s1" else 0.0)
+            return {"ok": True, "entries": [], "http_status": 200}
+
+        with tempfile.TemporaryDirectory() as td:
+            progress = Path(td) / "progress.json"
+            with patch.dict(os.environ, {"DRYRUN_PROGRESS_FILE": str(progress)}), patch.object(
+                report, "fetch_source_entries", side_effect=fake_fetch
+            ):
+                t0 = time.perf_counter()
+                fetched, _official, stage = report.prefetch_sources(
+                    _sources(2),
+                    official=[],
+                    limit=5,
+                    timeout_seconds=3,
+                    retries=0,
+                    settings={"max_workers": 2, "per_host": 2, "deadline_seconds": 0.2},
+                )
+                self.assertLess(time.perf_counter() - t0, 0.8)
+            last = json.loads(progress.read_text(encoding="utf-8"))
+        self.assertTrue(stage["deadline_hit"])
+        self.assertEqual(stage["skipped_by_deadline"], 1)
+        self.assertTrue(fetched[0]["ok"])
+        self.assertEqual(fetched[1]["error_type"], DEADLINE_EXCEEDED)
+        self.assertEqual((last["stage"], last["total_sources"], last["completed_sources"]), ("fetching_sources", 2, 2))
+
+    def test_settings_from_env(self) -> None:
+        with patch.dict(
+            os.environ,
+            {"DRYRUN_FETCH_WORKERS": "3", "DRYRUN_FETCH_PER_HOST": "1", "DRYRUN_FETCH_DEADLINE_SECONDS": "45"},
+        ):
+            self.assertEqual(
+                report.fetch_stage_settings(), {"max_workers": 3, "per_host": 1, "deadline_seconds": 45.0}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
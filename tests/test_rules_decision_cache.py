@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+from app.rules.decision_cache import decision_cache_stats, invalidate_decision_cache
+from app.rules.engine import RuleEngine
+from app.services.rules_store import RulesStore
+
+
+def _make_project(root: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    for d in ("email_rules", "content_rules", "qc_rules", "output_rules", "schemas"):
+        shutil.copytree(repo_root / "rules" / d, root / "rules" / d)
+
+
+class RulesDecisionCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        _make_project(self.root)
+        self._env = patch.dict(os.environ, {"DATABASE_URL": "", "RULES_WORKSPACE_DIR": ""})
+        self._env.start()
+        invalidate_decision_cache()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        self._td.cleanup()
+
+    def test_repeated_build_decision_hits_cache_with_fresh_run_ids(self) -> None:
+        engine = RuleEngine(project_root=self.root)
+        s0 = decision_cache_stats()
+        d1 = engine.build_decision("enhanced")
+        d2 = engine.build_decision("enhanced", run_id="fixed-run")
+        s1 = decision_cache_stats()
+        self.assertEqual(s1["misses"] - s0["misses"], 1)
+        self.assertEqual(s1["hits"] - s0["hits"], 1)
+        self.assertNotEqual(d1["run_id"], d2["run_id"])
+        self.assertEqual(d2["run_id"], "fixed-run")
+        self.assertEqual(d2["explain"]["run_id"], "fixed-run")
+        d1.pop("run_id")
+        d1["explain"].pop("run_id")
+        d2.pop("run_id")
+        d2["explain"].pop("run_id")
+        self.assertEqual(d1, d2)
+
+    def test_cached_decision_matches_uncached_and_is_isolated(self) -> None:
+        engine = RuleEngine(project_root=self.root)
+        cached = engine.build_decision("enhanced", run_id="r1")
+        fresh = engine._build_decision_uncached("enhanced", run_id="r1")
+        self.assertEqual(cached, fresh)
+        cached["content_decision"]["keyword_sets"]["exclude_keywords"].append("mutated")
+        again = engine.build_decision("enhanced", run_id="r1")
+        self.assertNotIn("mutated", again["content_decision"]["keyword_sets"]["exclude_keywords"])
+
+    def test_compiled_decision_is_a_shared_template(self) -> None:
+        engine = RuleEngine(project_root=self.root)
+        compiled = engine.compiled_decision("enhanced")
+        self.assertIs(engine.compiled_decision("enhanced"), compiled)
+        self.assertEqual(compiled.meta["rules_version"], compiled.decision["rules_version"])
+        copy = engine.build_decision("enhanced")
+        copy["content_decision"]["mutated"] = True
+        self.assertNotIn("mutated", compiled.decision["content_decision"])
+
+    def test_rules_file_change_rebuilds(self) -> None:
+        engine = RuleEngine(project_root=self.root)
+        before = engine.build_decision("enhanced")
+        qc_path = engine._profile_path("qc_rules", "enhanced")
+        doc = yaml.safe_load(qc_path.read_text(encoding="utf-8"))
+        doc["version"] = "9.9.9-test"
+        qc_path.write_text(yaml.safe_dump(doc, allow_unicode=True, sort_keys=False), encoding="utf-8")
+        after = engine.build_decision("enhanced")
+        self.assertNotEqual(before["rules_version"]["qc"], "9.9.9-test")
+        self.assertEqual(after["rules_version"]["qc"], "9.9.9-test")
+
+    def test_activation_invalidates(self) -> None:
+        engine = RuleEngine(project_root=self.root)
+        engine.build_decision("enhanced")
+        inv0 = decision_cache_stats()["invalidations"]
+        email = dict(engine.load("email_rules", "enhanced").data)
+        email.pop("_store_meta", None)
+        RulesStore(self.root).create_version(
+            "email_rules",
+            profile="enhanced",
+            version="v-cache-test",
+            config=email,
+            created_by="tester",
+            activate=True,
+        )
+        self.assertEqual(decision_cache_stats()["invalidations"], inv0 + 1)
+        out = RuleEngine(project_root=self.root).build_decision("enhanced")
+        self.assertEqual(out["rules_version"]["email"], "v-cache-test")
+
+
+if __name__ == "__main__":
+    unittest.main()
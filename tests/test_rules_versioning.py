@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from app.services import rules_versioning
 from app.services.rules_store import RulesStore
 from app.services.rules_versioning import (
     ensure_bootstrap_published,
+    get_objects_root,
     get_published_pointer,
     get_runtime_rules_root,
+    get_version_rules_root,
     list_versions,
     publish_rules_version,
     rollback_to_previous,
     stage_rules_overlay,
 )
+from app.services.source_registry import upsert_source_registry
 
 
 def _seed_rules(root: Path) -> None:
@@ -59,6 +66,104 @@ class RulesVersioningTests(unittest.TestCase):
             runtime = get_runtime_rules_root(root)
             self.assertTrue(runtime.exists())
 
+    def test_versions_share_unchanged_blobs_and_sync_only_changed_sources(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            _seed_rules(root)
+            ensure_bootstrap_published(root)
+            v1 = get_published_pointer(root)["active_version"]
+            src = "version: '1'\nsources:\n  - {id: a, connector: rss, name: A, trust_tier: B, priority: 1}\n  - {id: b, connector: rss, name: B, trust_tier: B, priority: 1}\n"
+            out2 = publish_rules_version(root, stage_rules_overlay(root, {"sources/rss.yaml": src}), created_by="t")
+            v2 = out2["version"]
+            self.assertEqual(out2["changes"], {"added": [], "modified": ["sources/rss.yaml"], "removed": []})
+            self.assertEqual((out2["sources_sync"]["inserted"], out2["sources_sync"]["updated"]), (2, 0))
+
+            store = RulesStore(root)
+            store.record_source_fetch("a", status="ok", http_status=200, fetched_at="2030-01-01T00:00:00+00:00")
+            out3 = publish_rules_version(
+                root, stage_rules_overlay(root, {"sources/rss.yaml": src.replace("name: B", "name: B2")}), created_by="t"
+            )
+            self.assertEqual(
+                {k: out3["sources_sync"][k] for k in ("inserted", "updated", "deleted", "unchanged")},
+                {"inserted": 0, "updated": 1, "deleted": 0, "unchanged": 1},
+            )
+            # The untouched row was not rewritten: its fetch status survives the publish.
+            self.assertEqual(store.get_source("a")["last_fetch_status"], "ok")
+
+            # Unchanged files are the same blob in every manifest; the staged overlay never wrote through it.
+            manifests = [
+                json.loads((get_version_rules_root(root, v).parent / "manifest.json").read_text(encoding="utf-8"))["files"]
+                for v in (v1, v2, out3["version"])
+            ]
+            self.assertEqual(len({m["email_rules/legacy.yaml"] for m in manifests}), 1)
+            v1_rss = get_objects_root(root) / manifests[0]["sources/rss.yaml"][:2] / manifests[0]["sources/rss.yaml"]
+            self.assertEqual(v1_rss.read_text(encoding="utf-8"), "version: '1'\nsources: []\n")
+            # Only the active version keeps a laid-out tree.
+            self.assertFalse(get_version_rules_root(root, v1).exists())
+            self.assertFalse(get_version_rules_root(root, v2).exists())
+            blobs = [p for p in get_objects_root(root).rglob("*") if p.is_file()]
+            # 6 seed files (the three identical schemas are one blob) + one new rss.yaml per publish.
+            self.assertEqual(len(blobs), 4 + 2)
+
+            # A removed version tree is laid back out from its manifest on rollback.
+            rollback_to_previous(root, created_by="t")
+            self.assertEqual(get_runtime_rules_root(root), get_version_rules_root(root, v2))
+            self.assertIn("name: B,", (get_runtime_rules_root(root) / "sources" / "rss.yaml").read_text(encoding="utf-8"))
+            manifest = json.loads((get_version_rules_root(root, v2).parent / "manifest.json").read_text(encoding="utf-8"))
+            runtime = get_runtime_rules_root(root)
+            laid_out = sorted(p.relative_to(runtime).as_posix() for p in runtime.rglob("*") if p.is_file())
+            self.assertEqual(sorted(manifest["files"]), laid_out)
+            self.assertFalse(get_version_rules_root(root, out3["version"]).exists())
+
+    def test_unchanged_publishes_hash_nothing_and_add_no_tree_bytes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            _seed_rules(root)
+            ensure_bootstrap_published(root)
+            console = get_objects_root(root).parent
+
+            def tree_bytes() -> int:
+                # Blobs plus laid-out trees; a version's own manifest.json/meta.json are left out.
+                files = [p for d in ("objects", "versions") for p in (console / d).rglob("*") if p.is_file()]
+                return sum(p.stat().st_size for p in files if p.parent.parent != console / "versions")
+
+            baseline = tree_bytes()
+            with patch("app.services.rules_versioning._store_blob", wraps=rules_versioning._store_blob) as store_blob:
+                for _ in range(5):
+                    publish_rules_version(root, stage_rules_overlay(root, {}), created_by="t")
+            self.assertEqual(store_blob.call_count, 0)
+            # Blobs and the single active tree: five more versions cost only their JSON metadata.
+            self.assertEqual(tree_bytes(), baseline)
+            trees = [p for p in (console / "versions").glob("*/rules") if p.is_dir()]
+            self.assertEqual(trees, [get_runtime_rules_root(root)])
+
+    def test_source_edit_in_runtime_tree_leaves_blobs_intact(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            _seed_rules(root)
+            (root / "rules" / "sources_registry.v1.yaml").write_text(
+                "version: '1.0.0'\nsources:\n  - {id: a, fetcher: rss, name: A, url: 'https://a.example/feed'}\ngroups: {}\n",
+                encoding="utf-8",
+            )
+            ensure_bootstrap_published(root)
+            runtime = get_runtime_rules_root(root)
+            self.assertTrue((runtime / "sources_registry.v1.yaml").exists())
+
+            upsert_source_registry(
+                root, {"id": "b", "fetcher": "rss", "name": "B", "url": "https://b.example/feed"}, rules_root=runtime
+            )
+            self.assertIn("id: b", (runtime / "sources_registry.v1.yaml").read_text(encoding="utf-8"))
+
+            # Every blob still hashes to its name, so no manifest that references it was corrupted.
+            for blob in (p for p in get_objects_root(root).rglob("*") if p.is_file()):
+                self.assertEqual(hashlib.sha256(blob.read_bytes()).hexdigest(), blob.name)
+
+            # The edit is carried into the next staged tree and survives the publish.
+            staged = stage_rules_overlay(root, {"sources/rss.yaml": "version: '1'\nsources: []\n"})
+            self.assertIn("id: b", (staged / "sources_registry.v1.yaml").read_text(encoding="utf-8"))
+            publish_rules_version(root, staged, created_by="t")
+            self.assertIn("id: b", (get_runtime_rules_root(root) / "sources_registry.v1.yaml").read_text(encoding="utf-8"))
+
 
 if __name__ == "__main__":
     unittest.main()
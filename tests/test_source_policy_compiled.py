@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.services.rules_store import RulesStore
+from app.services.source_policy import (
+    SourcePolicy,
+    as_source_policy,
+    compile_url_patterns,
+    exclusion_reason,
+    filter_rows_for_digest,
+    normalize_source_policy,
+)
+from app.utils.url_norm import parse_url
+
+
+class CompiledSourcePolicyTests(unittest.TestCase):
+    def test_normalize_returns_compiled_dict(self) -> None:
+        policy = normalize_source_policy(
+            {
+                "exclude_domains": ["https://Blocked.Example.com/x", ".ads.net"],
+                "exclude_source_ids": ["bad-src"],
+                "drop_if_url_matches": [r"/sponsored/"],
+            },
+            profile="enhanced",
+        )
+        self.assertIsInstance(policy, SourcePolicy)
+        self.assertEqual(policy["exclude_domains"], ["blocked.example.com", "ads.net"])
+        self.assertEqual(policy.excluded_source_ids, frozenset({"bad-src"}))
+        self.assertEqual(json.loads(json.dumps(policy))["min_trust_tier"], "B")
+        self.assertIs(as_source_policy(policy), policy)
+
+    def test_reasons_match_for_str_parsed_and_plain_dict(self) -> None:
+        raw = {
+            "enabled": True,
+            "min_trust_tier": "C",
+            "exclude_domains": ["blocked.example.com"],
+            "exclude_source_ids": ["bad-src"],
+            "drop_if_url_matches": [r"/SPONSORED/", r"utm_campaign=promo"],
+        }
+        policy = normalize_source_policy(raw)
+        cases = [
+            ("bad-src", "https://ok.example.org/a", "excluded_source"),
+            ("s", "https://news.blocked.example.com/a", "excluded_domain"),
+            ("s", "https://ok.example.org/sponsored/1", "excluded_url_pattern"),
+            ("s", "https://ok.example.org/a?utm_campaign=promo", "excluded_url_pattern"),
+            ("s", "https://notblocked.example.com/a", ""),
+            ("s", "", ""),
+        ]
+        for sid, url, want in cases:
+            self.assertEqual(policy.exclusion_reason(sid, url), want, url)
+            self.assertEqual(exclusion_reason(sid, parse_url(url), policy), want, url)
+            self.assertEqual(exclusion_reason(sid, url, dict(raw)), want, url)
+
+    def test_invalid_pattern_reported_once_and_ignored(self) -> None:
+        # Migrations run by a RulesStore reconfigure logging; the warning must still get out.
+        with tempfile.TemporaryDirectory() as td:
+            RulesStore(Path(td))
+        compile_url_patterns.cache_clear()
+        patterns = ["[unclosed-once-test", r"/drop/"]
+        with self.assertLogs("source_policy", level=logging.WARNING) as cm:
+            p1 = normalize_source_policy({"drop_if_url_matches": patterns})
+            p2 = normalize_source_policy({"drop_if_url_matches": patterns})
+        self.assertEqual(len(cm.records), 1)
+        self.assertEqual(p1.invalid_url_patterns, ("[unclosed-once-test",))
+        rows = [{"source_id": "s", "url": f"https://x.example.com/{seg}/{i}"} for i, seg in enumerate(["drop", "keep"] * 3)]
+        kept, dropped, reasons = filter_rows_for_digest(rows, policy=p2)
+        self.assertEqual((len(kept), dropped), (3, 3))
+        self.assertEqual(reasons, {"excluded_url_pattern": 3})
+
+    def test_backreference_patterns_are_not_combined(self) -> None:
+        compiled = compile_url_patterns((r"/(\w+)/\1/", r"/promo/"))
+        self.assertIsNone(compiled.combined)
+        self.assertTrue(compiled.search("https://x.com/ab/ab/"))
+        self.assertFalse(compiled.search("https://x.com/ab/cd/"))
+        self.assertIsNotNone(compile_url_patterns((r"/a/", r"/b/")).combined)
+
+    def test_min_trust_tier_precomputed(self) -> None:
+        policy = normalize_source_policy({"min_trust_tier": {"enhanced": "A"}}, profile="enhanced")
+        rows = [{"source_id": "s", "url": "https://x.com/1", "trust_tier": t} for t in ("A", "B", "")]
+        kept, dropped, reasons = filter_rows_for_digest(rows, policy=policy)
+        self.assertEqual([r["trust_tier"] for r in kept], ["A", ""])
+        self.assertEqual(reasons, {"below_min_trust_tier": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
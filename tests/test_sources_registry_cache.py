@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+from app.services import source_registry
+from app.services.rules_store import RulesStore
+from app.services.source_registry import (
+    invalidate_sources_registry_cache,
+    load_sources_registry_bundle,
+    load_sources_registry_snapshot,
+    retire_source,
+    set_source_enabled_override,
+    sources_registry_cache_stats,
+    upsert_source_registry,
+)
+
+
+def _write_registry(root: Path, ids: list[str]) -> Path:
+    p = root / "rules" / "sources_registry.v1.yaml"
+    p.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "version": "1.0.0",
+        "sources": [
+            {"id": sid, "name": sid, "fetcher": "rss", "url": f"https://example.com/{sid}.xml", "trust_tier": "B"}
+            for sid in ids
+        ],
+        "groups": {"media_global": list(ids)},
+    }
+    p.write_text(yaml.safe_dump(doc, sort_keys=False), encoding="utf-8")
+    return p
+
+
+class SourcesRegistryCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self._env = patch.dict(os.environ, {"DATABASE_URL": "", "RULES_WORKSPACE_DIR": ""})
+        self._env.start()
+        invalidate_sources_registry_cache()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        self._td.cleanup()
+
+    def test_repeated_loads_hit_cache(self) -> None:
+        _write_registry(self.root, ["a", "b"])
+        before = sources_registry_cache_stats()
+        b1 = load_sources_registry_bundle(self.root)
+        b2 = load_sources_registry_bundle(self.root)
+        after = sources_registry_cache_stats()
+        self.assertEqual([s["id"] for s in b1["sources"]], ["a", "b"])
+        self.assertEqual(b1, b2)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_cache_hits_reuse_one_rules_store(self) -> None:
+        _write_registry(self.root, ["a", "b"])
+        with patch("app.services.source_registry._open_rules_store", wraps=source_registry._open_rules_store) as opened:
+            for _ in range(3):
+                load_sources_registry_bundle(self.root)
+        self.assertEqual(opened.call_count, 1)
+
+    def test_returned_bundle_is_a_copy_and_snapshot_is_frozen(self) -> None:
+        reg = _write_registry(self.root, ["a"])
+        b1 = load_sources_registry_bundle(self.root)
+        b1["sources"][0]["enabled"] = False
+        b1["sources"].append({"id": "zzz"})
+        b2 = load_sources_registry_bundle(self.root)
+        self.assertEqual(len(b2["sources"]), 1)
+        self.assertTrue(b2["sources"][0]["enabled"])
+        snap = load_sources_registry_snapshot(self.root, reg)
+        with self.assertRaises(TypeError):
+            snap["sources"][0]["enabled"] = False  # type: ignore[index]
+
+    def test_file_change_is_detected(self) -> None:
+        _write_registry(self.root, ["a"])
+        self.assertEqual(len(load_sources_registry_bundle(self.root)["sources"]), 1)
+        _write_registry(self.root, ["a", "b", "c"])
+        self.assertEqual(len(load_sources_registry_bundle(self.root)["sources"]), 3)
+
+    def test_db_watermark_change_is_detected(self) -> None:
+        _write_registry(self.root, ["a"])
+        store = RulesStore(self.root)
+        store.upsert_sources(
+            [{"id": "a", "name": "a", "connector": "rss", "url": "https://example.com/a.xml", "trust_tier": "B"}]
+        )
+        self.assertEqual(load_sources_registry_bundle(self.root)["sources"][0].get("last_fetch_status"), "")
+        store.record_source_fetch("a", status="ok", http_status=200, fetched_at="2030-01-01T00:00:00+00:00")
+        row = load_sources_registry_bundle(self.root)["sources"][0]
+        self.assertEqual(row.get("last_fetch_status"), "ok")
+        self.assertEqual(row.get("last_fetch_http_status"), 200)
+
+    def test_writers_invalidate_cache(self) -> None:
+        _write_registry(self.root, ["a", "b"])
+        load_sources_registry_bundle(self.root)
+        inv0 = sources_registry_cache_stats()["invalidations"]
+
+        set_source_enabled_override(self.root, "a", enabled=False)
+        self.assertFalse(load_sources_registry_bundle(self.root)["sources"][0]["enabled"])
+
+        upsert_source_registry(
+            self.root,
+            {"id": "c", "name": "c", "fetcher": "rss", "url": "https://example.com/c.xml", "trust_tier": "A"},
+        )
+        self.assertIn("c", [s["id"] for s in load_sources_registry_bundle(self.root)["sources"]])
+
+        retire_source(self.root, "b")
+        b = next(s for s in load_sources_registry_bundle(self.root)["sources"] if s["id"] == "b")
+        self.assertFalse(b["enabled"])
+        self.assertEqual(sources_registry_cache_stats()["invalidations"] - inv0, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
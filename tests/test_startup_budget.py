@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# Cumulative `-X importtime` budget for `import app.workers.cli` (cold interpreter, best of 3).
+CLI_IMPORT_BUDGET_MS = int(os.environ.get("CLI_IMPORT_BUDGET_MS", "250") or 250)
+HEAVY_MODULES = ("sqlalchemy", "alembic", "fastapi", "feedparser", "app.services.rules_store", "app.workers.scheduler_worker")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=120, check=True)
+
+
+def _cumulative_import_us(module: str) -> int:
+    proc = _python("-X", "importtime", "-c", f"import {module}")
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"no importtime line for {module}")
+
+
+class StartupBudgetTests(unittest.TestCase):
+    def test_cli_import_does_not_load_heavy_stacks(self) -> None:
+        code = (
+            "import json, sys, app.workers.cli, app.rules.engine; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        self.assertEqual(json.loads(_python("-c", code).stdout), [])
+
+    def test_cli_cold_import_within_budget(self) -> None:
+        best_ms = min(_cumulative_import_us("app.workers.cli") for _ in range(3)) / 1000.0
+        self.assertLessEqual(best_ms, CLI_IMPORT_BUDGET_MS, f"app.workers.cli cold import {best_ms:.1f}ms")
+
+    def test_admin_api_module_defers_app_construction(self) -> None:
+        code = (
+            "import json, sys, app.web.rules_admin_api as m; "
+            "print(json.dumps(['app' in vars(m), 'app.services.feed_db' in sys.modules]))"
+        )
+        self.assertEqual(json.loads(_python("-c", code).stdout), [False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+import yaml
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import scripts.generate_ivd_report as gen
+from app.utils.keyword_automaton import KeywordAutomaton
+
+
+def _enhanced_content() -> dict:
+    raw = yaml.safe_load(Path(ROOT_DIR / "rules/content_rules/enhanced.yaml").read_text(encoding="utf-8"))
+    out: dict = {}
+    for rule in raw.get("rules", []):
+        params = rule.get("params") or {}
+        t = rule.get("type")
+        if t in {"lane_mapping", "platform_mapping", "event_mapping"}:
+            out[t] = params
+        elif t == "include_filter":
+            out["include_keywords_by_pack"] = params
+        elif t == "exclude_filter":
+            out["exclude_keywords"] = params.get("exclude_keywords", [])
+            out["keep_if_has_keywords"] = params.get("keep_if_has_keywords", [])
+    return out
+
+
+FIXED = [
+    ("FDA clears Roche ddPCR assay for sepsis", "Latest test data; 新冠 检测试剂 approved", "regulatory_global", "https://fda.gov/a"),
+    ("Abbott quarterly revenue beats", "earnings call, no diagnostic news", "media_global", "https://reuters.com/b"),
+    ("NMPA 批准 肿瘤标志物 试剂盒", "化学发光 平台 上市 通告", "regulatory_cn", "https://nmpa.gov.cn/c"),
+    ("Phase 3 drug trial readout", "therapy only; GLP-1 vaccine", "media_global", "https://example.com/d"),
+    ("Single-molecule Simoa lab-on-a-chip", "point-of-care POCT self-test launch", "media_global", "https://example.com/e"),
+    ("İstanbul lab PCR", "ΟΔΟΣ test", "media_global", "https://example.com/f"),
+    ("Escaped \\btest\\b marker", "raw \\bpcr\\b text", "media_global", "https://example.com/g"),
+    ("", "", "", ""),
+]
+
+
+def _corpus(vocab: list[str], seed: int, n: int) -> list[tuple[str, str, str, str]]:
+    rng = random.Random(seed)
+    glue = [" ", "", "-", "_", "/", "检", "x", "1", ". ", ", "]
+    out = list(FIXED)
+    for _ in range(n):
+        parts = []
+        for _ in range(4):
+            words = []
+            for _ in range(rng.randint(0, 8)):
+                w = rng.choice(vocab)
+                words.append(w.upper() if rng.random() < 0.2 else w)
+                words.append(rng.choice(glue))
+            parts.append("".join(words))
+        out.append((parts[0], parts[1], parts[2][:20], "https://example.com/" + parts[3].replace(" ", "-")[:40]))
+    return out
+
+
+class KeywordAutomatonTests(unittest.TestCase):
+    def test_term_probe_matches_report_has_term_on_text_and_field_windows(self) -> None:
+        vocab = ["pcr", "ddpcr", "digital pcr", "rt-pcr", "test", "testing", "phase ", "检测", "检测试剂", "ab", "abc", "a_b", "ms/ms", "he", "she", "his", "hers"]
+        ka = KeywordAutomaton(vocab)
+        for title, summary, sg, url in _corpus(vocab, 1, 300):
+            fields = {"title": title, "summary": summary, "source_group": sg, "url": url}
+            hits = ka.scan(fields)
+            windows = {
+                None: hits.text,
+                ("title", "summary"): (title + " " + summary).lower(),
+                ("url",): url.lower(),
+            }
+            for win, text in windows.items():
+                self.assertEqual(hits.present(win), frozenset(k for k in ka.terms if k in text), (win, text))
+                probe = gen._TermProbe("", hits, win)
+                for t in vocab + ["unindexed", "pc"]:
+                    self.assertEqual(probe.has(t), gen.has_term(text, t), (t, text))
+                    self.assertEqual(probe.contains(t), t in text, (t, text))
+
+
+class TextFeatureParityTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._saved = {k: gen.RUNTIME_CONTENT.get(k) for k in ("lane_mapping", "platform_mapping", "event_mapping", "include_keywords_by_pack", "exclude_keywords", "keep_if_has_keywords")}
+
+    def tearDown(self) -> None:
+        gen.RUNTIME_CONTENT.update(self._saved)
+
+    def _check(self, content: dict, event_mapping: dict, n: int) -> None:
+        gen.RUNTIME_CONTENT.update(content)
+        ka = gen.build_text_automaton(event_mapping)
+        clf = gen.EventTypeClassifier(mapping=event_mapping)
+        vocab = sorted(ka.terms) + ["latest", "contest", "Roche", "季度"]
+        for title, summary, sg, url in _corpus(vocab, 7, n):
+            combined = title + " " + summary
+            ch = ka.scan({"title": title, "summary": summary})
+            eh = ka.scan(gen.event_scan_fields(title, summary, sg, url))
+            self.assertEqual(gen.exclusion_reason(combined, hits=ch), gen.exclusion_reason(combined))
+            self.assertEqual(gen.matched_keyword_packs(combined, hits=ch), gen.matched_keyword_packs(combined))
+            self.assertEqual(gen.is_regulatory_ivd_relevant(combined, hits=ch), gen.is_regulatory_ivd_relevant(combined))
+            self.assertEqual(gen.is_relaxed_relevant(combined, hits=ch), gen.is_relaxed_relevant(combined))
+            self.assertEqual(gen.cn_lane(combined, hits=ch), gen.cn_lane(combined))
+            self.assertEqual(gen.cn_platform(combined, hits=ch), gen.cn_platform(combined))
+            self.assertEqual(clf.classify(title, summary, sg, url, hits=eh), clf.classify(title, summary, sg, url))
+            for fn in (gen.classify_lane, gen.classify_platform):
+                self.assertEqual(
+                    fn(title, summary, sg, url, "技术进展", enhanced=True, text_hits=eh),
+                    fn(title, summary, sg, url, "技术进展", enhanced=True),
+                )
+        for title, summary, _sg, _url in _corpus(vocab, 8, 40):
+            combined = title + " " + summary
+            ch = ka.scan({"title": title, "summary": summary})
+            self.assertEqual(gen.is_ivd_relevant(combined, hits=ch), gen.is_ivd_relevant(combined))
+
+    def test_enhanced_rules_parity(self) -> None:
+        content = _enhanced_content()
+        self._check(content, content["event_mapping"], 400)
+
+    def test_builtin_tables_parity(self) -> None:
+        empty = {"lane_mapping": {}, "platform_mapping": {}, "event_mapping": {}, "include_keywords_by_pack": {}, "exclude_keywords": [], "keep_if_has_keywords": []}
+        self._check(empty, {}, 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
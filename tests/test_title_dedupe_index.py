@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import scripts.generate_ivd_report as gen
+from scripts.generate_ivd_report import Item, dedupe_items, normalize_title, source_rank, title_similarity
+
+
+WORDS = ["roche", "abbott", "pcr", "assay", "sepsis", "cleared", "fda", "launch", "ngs", "panel", "covid", "flu", "nmpa", "批准", "试剂盒", "上市"]
+SOURCES = [("Reuters", "https://reuters.com/x"), ("NMPA", "https://nmpa.gov.cn/x"), ("Blog", "https://blog.example/x"), ("Fierce", "https://fierce.example/x")]
+
+
+def _item(title: str, source: tuple[str, str], summary: str) -> Item:
+    return Item(
+        title=title,
+        link=source[1],
+        published=dt.datetime(2026, 2, 20, tzinfo=dt.timezone.utc),
+        source=source[0],
+        region="北美",
+        lane="其他",
+        platform="分子诊断",
+        event_type="技术进展",
+        window_tag="24小时内",
+        summary_cn=summary,
+    )
+
+
+def _linear(items: list[Item], sim_th: float) -> list[Item]:
+    # The pre-index implementation, kept as the reference for merge semantics.
+    best: dict[str, Item] = {}
+    for it in items:
+        key = normalize_title(it.title)
+        if not key:
+            continue
+        old_key = key
+        old = best.get(old_key)
+        if not old:
+            for k, v in best.items():
+                if title_similarity(it.title, v.title) >= sim_th:
+                    old_key = k
+                    old = v
+                    break
+        if not old:
+            best[old_key] = it
+            continue
+        old_rank = source_rank(old.source, old.link)
+        new_rank = source_rank(it.source, it.link)
+        if new_rank < old_rank:
+            best[old_key] = it
+            continue
+        if new_rank == old_rank and len(it.summary_cn) > len(old.summary_cn):
+            best[old_key] = it
+    return list(best.values())
+
+
+def _corpus(seed: int, n: int) -> list[Item]:
+    rng = random.Random(seed)
+    out: list[Item] = []
+    for _ in range(n):
+        title = " ".join(rng.sample(WORDS, rng.randint(1, 6)))
+        if rng.random() < 0.05:
+            title = "!!"
+        out.append(_item(title, rng.choice(SOURCES), "s" * rng.randint(1, 30)))
+    return out
+
+
+class TitleDedupeIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._saved = gen.RUNTIME_CONTENT.get("title_similarity_threshold")
+
+    def tearDown(self) -> None:
+        gen.RUNTIME_CONTENT["title_similarity_threshold"] = self._saved
+
+    def test_matches_linear_scan(self) -> None:
+        for th in (0.0, 0.3, 0.5, 0.78, 1.0):
+            gen.RUNTIME_CONTENT["title_similarity_threshold"] = th
+            for seed in range(5):
+                items = _corpus(seed, 150)
+                self.assertEqual(dedupe_items(items), _linear(items, th), f"th={th} seed={seed}")
+
+    def test_reports_comparisons(self) -> None:
+        gen.RUNTIME_CONTENT["title_similarity_threshold"] = 0.78
+        items = [_item(f"story{i} launch{i} assay{i} panel{i}", SOURCES[2], "s") for i in range(200)]
+        items.append(_item("story7 launch7 assay7 panel7 ivd", SOURCES[1], "longer summary"))
+        stats: dict = {}
+        out = dedupe_items(items, stats=stats)
+        self.assertEqual(len(out), 200)
+        self.assertEqual(out[7].source, "NMPA")
+        self.assertEqual(stats["items_in"], 201)
+        self.assertEqual(stats["items_out"], 200)
+        # Only titles sharing a token are scored, instead of every kept title.
+        self.assertEqual(stats["comparisons"], 1)
+        self.assertLess(stats["comparisons_per_item"], 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from app.services.zh_enricher import ZhEnricher
+from app.services.zh_enrichment_cache import ZhEnrichmentCache
+
+
+def test_legacy_jsonl_is_imported_once_and_compacted(tmp_path: Path) -> None:
+    legacy = tmp_path / "cache.jsonl"
+    rows = [
+        {"cache_key": "k1", "title_zh": "旧", "used_model": "heuristic"},
+        {"cache_key": "k2", "title_zh": "二", "used_model": "heuristic"},
+        {"cache_key": "k1", "title_zh": "新", "used_model": "gpt-4o-mini"},
+    ]
+    legacy.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows) + "\nnot-json\n", encoding="utf-8")
+    cache = ZhEnrichmentCache(tmp_path / "cache.sqlite3", legacy_jsonl=legacy)
+    assert cache.get("k1")["title_zh"] == "新"
+    assert cache.stats()["rows"] == 2
+    assert not legacy.exists()
+    assert (tmp_path / "cache.jsonl.imported").exists()
+
+
+def test_lru_residency_is_bounded_and_misses_fall_back_to_table(tmp_path: Path) -> None:
+    cache = ZhEnrichmentCache(tmp_path / "cache.sqlite3", max_resident=2)
+    for i in range(3):
+        cache.put(f"k{i}", {"title_zh": f"t{i}"})
+    cache.put("k0", {"title_zh": "t0-llm", "used_model": "m"})
+    stats = cache.stats()
+    assert (stats["rows"], stats["resident"]) == (3, 2)
+    assert cache.get("k1")["title_zh"] == "t1"
+    assert cache.get("k0")["used_model"] == "m"
+    assert cache.get("missing") is None
+
+
+def test_ttl_expiry_and_compaction(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = ZhEnrichmentCache(path, ttl_seconds=3600)
+    cache.put("old", {"title_zh": "x"})
+    out = cache.compact(now=time.time() + 7200)
+    assert (out["removed_expired"], out["rows"], out["resident"]) == (1, 0, 0)
+    assert cache.get("old") is None
+    cache.close()
+    assert ZhEnrichmentCache(path, ttl_seconds=3600).stats()["rows"] == 0
+
+
+def test_enricher_reuses_persisted_rows_across_instances(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("FEED_ZH_CACHE_MAX_RESIDENT", "1")
+    kwargs = dict(
+        title="BigCo receives FDA clearance",
+        snippet="The assay was cleared for use in clinical laboratories.",
+        source_id="s",
+        url="https://example.com/x",
+        event_type="regulatory",
+    )
+    first = ZhEnricher(tmp_path).enrich(**kwargs)
+    second = ZhEnricher(tmp_path).enrich(**kwargs)
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["title_zh"] == first["title_zh"]
+    assert (tmp_path / "artifacts" / "zh_enrichment" / "cache.sqlite3").exists()